@@ -39,6 +39,11 @@ from google import genai
 from google.genai import types
 from kiwipiepy import Kiwi
 
+from bulsaja_common import (
+    GeminiKeyScheduler, is_gemini_rate_limit_error, is_gemini_daily_limit_error,
+    AdaptiveConcurrencyLimiter
+)
+
 # OpenPyXL for Excel support
 try:
     from openpyxl import Workbook, load_workbook
@@ -322,8 +327,93 @@ class ChromeTokenExtractor:
         return access, refresh, cookie
 
 # ==================== NAVER API CLIENT ====================
+KEYWORD_STATS_DB = "keyword_stats.db"
+KEYWORD_STATS_TTL = 24 * 3600      # 검색량/상품수는 하루 단위로만 갱신
+KEYWORDTOOL_BATCH = 5              # 키워드도구 1회 호출당 힌트 키워드 최대 개수
+NAVER_API_CONCURRENCY = 4          # 네이버 API 동시 요청 수 (429 시 자동 감소)
+NAVER_API_MAX_RETRIES = 3
+
+_keyword_stats_stats = {'hit': 0, 'miss': 0, 'calls': 0}
+_keyword_stats_lock = threading.Lock()
+
+
+def normalize_keyword(keyword: str) -> str:
+    """키워드도구 응답(relKeyword)과 같은 형태: 공백 제거 + 대문자"""
+    return re.sub(r'\s+', '', keyword or '').upper()
+
+
+def _keyword_stats_db():
+    """키워드 통계 캐시 DB 연결 (호출마다 새 연결 → 스레드 안전)"""
+    conn = sqlite3.connect(KEYWORD_STATS_DB, timeout=30)
+    conn.execute("""CREATE TABLE IF NOT EXISTS keyword_stats (
+        kind TEXT NOT NULL, keyword TEXT NOT NULL, value TEXT NOT NULL,
+        created_at REAL NOT NULL, PRIMARY KEY (kind, keyword))""")
+    return conn
+
+
+def load_keyword_stats(kind: str, keywords: List[str], ttl: float = KEYWORD_STATS_TTL) -> Dict[str, object]:
+    """캐시 조회 → {정규화 키워드: 값} (만료/없는 키워드는 빠짐)"""
+    keys = list(dict.fromkeys(normalize_keyword(k) for k in keywords if k))
+    found = {}
+    try:
+        conn = _keyword_stats_db()
+        try:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT keyword, value FROM keyword_stats WHERE kind = ? AND created_at > ? "
+                    f"AND keyword IN ({','.join('?' * len(chunk))})",
+                    [kind, time.time() - ttl] + chunk).fetchall()
+                found.update((k, json.loads(v)) for k, v in rows)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Keyword cache read error: {e}")
+    with _keyword_stats_lock:
+        _keyword_stats_stats['hit'] += len(found)
+        _keyword_stats_stats['miss'] += len(keys) - len(found)
+    return found
+
+
+def store_keyword_stats(kind: str, values: Dict[str, object]):
+    """캐시 저장 (키는 정규화해서 저장)"""
+    if not values:
+        return
+    now = time.time()
+    rows = [(kind, normalize_keyword(k), json.dumps(v, ensure_ascii=False), now) for k, v in values.items()]
+    try:
+        conn = _keyword_stats_db()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO keyword_stats VALUES (?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Keyword cache write error: {e}")
+
+
+def get_keyword_cache_stats() -> Dict[str, int]:
+    """키워드 통계 캐시 통계 (hit, miss, calls=실제 API 호출 수)"""
+    with _keyword_stats_lock:
+        return dict(_keyword_stats_stats)
+
+
+def _parse_cnt(v) -> int:
+    """Convert string counts like "< 10" to 5."""
+    if isinstance(v, str) and "<" in v:
+        return 5
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return 0
+
+
 class NaverKeywordClient:
-    """Client for Naver Search API & Search Ads API."""
+    """Client for Naver Search API & Search Ads API.
+
+    키워드 통계는 SQLite 캐시(KEYWORD_STATS_TTL) → 없는 것만 API 호출.
+    검색량은 KEYWORDTOOL_BATCH개씩 묶어서 1번에, 호출은 동시 NAVER_API_CONCURRENCY개 (429 시 자동 감소).
+    """
     SEARCH_API_URL = "https://openapi.naver.com/v1/search/shop.json"
     ADS_API_URL = "https://api.naver.com"
 
@@ -333,16 +423,11 @@ class NaverKeywordClient:
         self.ads_access_key = ads_access_key
         self.ads_secret_key = ads_secret_key
         self.ads_customer_id = ads_customer_id
+        self.session = requests.Session()
+        self.limiter = AdaptiveConcurrencyLimiter(NAVER_API_CONCURRENCY)
 
-    def get_search_volume(self, keyword: str) -> Dict:
-        """Fetch monthly search volume from Naver Search Ads API."""
-        if not self.ads_access_key or not self.ads_secret_key:
-            return {"pc": 0, "mobile": 0, "total": 0}
-
+    def _ads_headers(self, method: str, path: str) -> Dict:
         timestamp = str(int(time.time() * 1000))
-        method = "GET"
-        path = "/keywordstool"
-        
         # Signature logic
         msg = f"{timestamp}.{method}.{path}"
         signature = base64.b64encode(hmac.new(
@@ -350,67 +435,145 @@ class NaverKeywordClient:
             msg.encode('utf-8'),
             hashlib.sha256
         ).digest()).decode('utf-8')
-
-        headers = {
+        return {
             "X-Timestamp": timestamp,
             "X-API-KEY": self.ads_access_key,
             "X-Customer": self.ads_customer_id,
             "X-Signature": signature
         }
 
-        try:
-            params = {"keywords": keyword}
-            resp = requests.get(f"{self.ADS_API_URL}{path}", params=params, headers=headers)
-            data = resp.json()
-            keywords = data.get("keywordList", [])
-            if keywords:
-                k = keywords[0]
-                # Convert string counts like "< 10" to 5
-                def parse_cnt(v):
-                    if isinstance(v, str) and "<" in v: return 5
-                    try: return int(v)
-                    except: return 0
-                
-                pc = parse_cnt(k.get("monthlyPcQcCnt", 0))
-                mo = parse_cnt(k.get("monthlyMobileQcCnt", 0))
-                return {"pc": pc, "mobile": mo, "total": pc + mo}
-        except Exception as e:
-            print(f"Naver Ads API Error: {e}")
-        
-        return {"pc": 0, "mobile": 0, "total": 0}
-
-    def get_total_products(self, keyword: str) -> int:
-        """Fetch total product count from Naver Search API."""
-        if not self.client_id or not self.client_secret:
-            return 0
-            
-        headers = {
+    def _search_headers(self) -> Dict:
+        return {
             "X-Naver-Client-Id": self.client_id,
             "X-Naver-Client-Secret": self.client_secret
         }
-        params = {"query": keyword, "display": 1}
-        try:
-            resp = requests.get(self.SEARCH_API_URL, params=params, headers=headers)
-            data = resp.json()
-            return int(data.get("total", 0))
-        except Exception as e:
-            print(f"Naver Search API Error: {e}")
-            return 0
+
+    def _get(self, url: str, params: Dict, headers_func, timeout: float = 10) -> requests.Response:
+        """GET under the shared limiter; 429/5xx → halve concurrency, back off and retry."""
+        resp = None
+        for attempt in range(NAVER_API_MAX_RETRIES):
+            with self.limiter:
+                resp = self.session.get(url, params=params, headers=headers_func(), timeout=timeout)
+            with _keyword_stats_lock:
+                _keyword_stats_stats['calls'] += 1
+            if resp.status_code == 429 or resp.status_code >= 500:
+                retry_after = resp.headers.get("Retry-After", "")
+                self.limiter.on_throttle(float(retry_after) if retry_after.isdigit() else attempt + 1)
+                continue
+            self.limiter.on_success()
+            return resp
+        return resp
+
+    @staticmethod
+    def _json_payload(resp: requests.Response, required_key: str) -> Dict:
+        """200 + 필수 키가 있는 응답만 통과 (401/400/재시도 후에도 429 → 예외 → 호출측에서 캐시 저장 안 함)"""
+        if resp.status_code != 200:
+            raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:100]}")
+        data = resp.json()
+        if not isinstance(data, dict) or required_key not in data:
+            raise RuntimeError(f"응답에 {required_key} 없음: {str(data)[:100]}")
+        return data
+
+    def _fetch_volume_batch(self, keywords: List[str]) -> Dict[str, Dict]:
+        """키워드도구 1회 호출 (힌트 최대 5개) → {정규화 키워드: 검색량} (연관 키워드 포함)"""
+        path = "/keywordstool"
+        params = {"hintKeywords": ",".join(normalize_keyword(k) for k in keywords), "showDetail": 1}
+        resp = self._get(f"{self.ADS_API_URL}{path}", params, lambda: self._ads_headers("GET", path))
+        data = self._json_payload(resp, "keywordList")
+        volumes = {}
+        for k in data["keywordList"]:
+            pc = _parse_cnt(k.get("monthlyPcQcCnt", 0))
+            mo = _parse_cnt(k.get("monthlyMobileQcCnt", 0))
+            volumes[normalize_keyword(k.get("relKeyword", ""))] = {"pc": pc, "mobile": mo, "total": pc + mo}
+        # 응답에 없는 힌트 키워드 = 검색량 없음 (다시 조회하지 않도록 0으로 저장)
+        for kw in keywords:
+            volumes.setdefault(normalize_keyword(kw), {"pc": 0, "mobile": 0, "total": 0})
+        return volumes
+
+    def get_search_volumes(self, keywords: List[str]) -> Dict[str, Dict]:
+        """여러 키워드 월간 검색량 (캐시 → 없는 것만 5개씩 묶어서 동시 조회). Returns: {원래 키워드: 검색량}"""
+        empty = {"pc": 0, "mobile": 0, "total": 0}
+        keywords = [k for k in dict.fromkeys(keywords) if k and normalize_keyword(k)]
+        if not self.ads_access_key or not self.ads_secret_key:
+            return {k: dict(empty) for k in keywords}
+
+        cached = load_keyword_stats("volume", keywords)
+        missing = list(dict.fromkeys(normalize_keyword(k) for k in keywords if normalize_keyword(k) not in cached))
+        if missing:
+            batches = [missing[i:i + KEYWORDTOOL_BATCH] for i in range(0, len(missing), KEYWORDTOOL_BATCH)]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=NAVER_API_CONCURRENCY) as executor:
+                futures = {executor.submit(self._fetch_volume_batch, batch): batch for batch in batches}
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        volumes = future.result()
+                    except Exception as e:
+                        print(f"Naver Ads API Error: {e}")
+                        continue
+                    store_keyword_stats("volume", volumes)
+                    cached.update(volumes)
+        return {k: cached.get(normalize_keyword(k), dict(empty)) for k in keywords}
+
+    def get_search_volume(self, keyword: str) -> Dict:
+        """Fetch monthly search volume from Naver Search Ads API."""
+        return self.get_search_volumes([keyword]).get(keyword, {"pc": 0, "mobile": 0, "total": 0})
+
+    def _fetch_search_summary(self, keyword: str) -> Dict:
+        """쇼핑 검색 1회 → {products: 전체 상품수, category: 첫 상품 카테고리}"""
+        resp = self._get(self.SEARCH_API_URL, {"query": keyword, "display": 1}, self._search_headers)
+        data = self._json_payload(resp, "total")
+        items = data.get("items", [])
+        category = (items[0].get("category4") or items[0].get("category3") or "") if items else ""
+        return {"products": int(data.get("total", 0)), "category": category}
+
+    def get_search_summaries(self, keywords: List[str]) -> Dict[str, Dict]:
+        """여러 키워드 상품수/카테고리 (캐시 → 없는 것만 동시 조회). Returns: {원래 키워드: summary}"""
+        empty = {"products": 0, "category": ""}
+        keywords = [k for k in dict.fromkeys(keywords) if k and normalize_keyword(k)]
+        if not self.client_id or not self.client_secret:
+            return {k: dict(empty) for k in keywords}
+
+        cached = load_keyword_stats("search", keywords)
+        missing = {}
+        for k in keywords:
+            missing.setdefault(normalize_keyword(k), k)
+        missing = {key: k for key, k in missing.items() if key not in cached}
+        if missing:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=NAVER_API_CONCURRENCY) as executor:
+                futures = {executor.submit(self._fetch_search_summary, k): key for key, k in missing.items()}
+                fetched = {}
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        fetched[futures[future]] = future.result()
+                    except Exception as e:
+                        print(f"Naver Search API Error: {e}")
+            store_keyword_stats("search", fetched)
+            cached.update(fetched)
+        return {k: cached.get(normalize_keyword(k), dict(empty)) for k in keywords}
+
+    def get_total_products(self, keyword: str) -> int:
+        """Fetch total product count from Naver Search API."""
+        return self.get_search_summaries([keyword]).get(keyword, {}).get("products", 0)
 
     def get_shopping_tags(self, keyword: str) -> List[str]:
-        """Scrape related tags from Naver Shopping search results."""
+        """Scrape related tags from Naver Shopping search results (cached per keyword)."""
+        cached = load_keyword_stats("tags", [keyword])
+        if normalize_keyword(keyword) in cached:
+            return cached[normalize_keyword(keyword)]
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
         }
         url = f"https://search.shopping.naver.com/search/all?query={keyword}"
         try:
-            resp = requests.get(url, headers=headers, timeout=5)
+            resp = self._get(url, {}, lambda: headers, timeout=5)
             # Find tags in the HTML (using regex as a lightweight alternative to BS4)
             # Naver Shopping tags are often in a JSON structure or inside specific tags
             tags = re.findall(r'"title":"([^"]+)"', resp.text)
             # Filtering and cleaning tags (very rough heuristic)
             valid_tags = [t for t in tags if len(t) > 1 and len(t) < 10 and t != keyword]
-            return list(set(valid_tags))[:10]
+            result = list(set(valid_tags))[:10]
+            if resp.status_code == 200:
+                store_keyword_stats("tags", {keyword: result})
+            return result
         except:
             return []
 
@@ -438,31 +601,30 @@ class NaverKeywordClient:
 
     def get_keyword_stats(self, keyword: str) -> Dict:
         """Returns {volume: int, products: int, ratio: float, category: str}"""
-        vol = self.get_search_volume(keyword)
-        
-        # Extended search to get category info
-        cat_id = ""
-        prods = 0
-        if self.client_id and self.client_secret:
-            headers = {"X-Naver-Client-Id": self.client_id, "X-Naver-Client-Secret": self.client_secret}
-            params = {"query": keyword, "display": 1}
-            try:
-                resp = requests.get(self.SEARCH_API_URL, params=params, headers=headers)
-                data = resp.json()
-                prods = int(data.get("total", 0))
-                items = data.get("items", [])
-                if items:
-                    cat_id = items[0].get("category4") or items[0].get("category3") or ""
-            except: pass
+        return self.get_keyword_stats_bulk([keyword]).get(keyword) or self._build_stats(keyword, {}, {})
 
-        total_vol = vol["total"]
+    def get_keyword_stats_bulk(self, keywords: List[str]) -> Dict[str, Dict]:
+        """여러 키워드 통계를 한 번에 (검색량 배치 조회 + 상품수 동시 조회, 둘 다 캐시). Returns: {키워드: stats}"""
+        keywords = [k for k in dict.fromkeys(keywords) if k and normalize_keyword(k)]
+        if not keywords:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            volumes_future = executor.submit(self.get_search_volumes, keywords)
+            summaries = self.get_search_summaries(keywords)
+            volumes = volumes_future.result()
+        return {k: self._build_stats(k, volumes.get(k, {}), summaries.get(k, {})) for k in keywords}
+
+    @staticmethod
+    def _build_stats(keyword: str, vol: Dict, summary: Dict) -> Dict:
+        total_vol = vol.get("total", 0)
+        prods = summary.get("products", 0)
         ratio = prods / total_vol if total_vol > 0 else 9999
         return {
             "keyword": keyword,
             "volume": total_vol,
             "products": prods,
             "ratio": round(ratio, 2),
-            "category": cat_id
+            "category": summary.get("category", "")
         }
 
 # ==================== NAVER COMMERCE API CLIENT ====================
@@ -528,30 +690,133 @@ class NaverCommerceClient:
             return False
 
 # ==================== NAVER RANK TRACKER ====================
+RANK_PAGE_SIZE = 40
+RANK_MAX_PAGES = 5
+RANK_PAGE_TTL = 10 * 60            # 같은 키워드 결과 페이지 재사용 시간 (초)
+
+# 검색 결과 JSON에서 상품 1개의 시작 지점 / 상품을 가리키는 ID 값들
+_RANK_ITEM_MARKER = re.compile(r'"nvMid"\s*:')
+_RANK_ID_PATTERN = re.compile(r'"(?:nvMid|id|mallProductId|productId|mallPid|catalogId)"\s*:\s*"?([\w-]+)')
+
+
 class NaverRankTracker:
-    """Tracker to find product ranking on Naver Shopping."""
+    """Tracker to find product ranking on Naver Shopping.
+
+    키워드 결과 페이지를 한 번만 받아서 (TTL 캐시, 동시 요청은 1번으로 합침) 그 키워드로 추적하는
+    모든 상품의 순위를 한꺼번에 계산. 페이지는 필요한 키워드만 1쪽씩 더 받음.
+    """
     SEARCH_URL = "https://search.shopping.naver.com/search/all"
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+    }
+    _default = None
+
+    def __init__(self, max_pages: int = RANK_MAX_PAGES, ttl: float = RANK_PAGE_TTL,
+                 concurrency: int = NAVER_API_CONCURRENCY):
+        self.max_pages = max_pages
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.session = requests.Session()
+        self.limiter = AdaptiveConcurrencyLimiter(concurrency)
+        self._pages = {}       # {(keyword, page): (items, fetched_at)}
+        self._inflight = {}    # {(keyword, page): threading.Event}
+        self._lock = threading.Lock()
+        self.stats = {'fetched': 0, 'cached': 0}
+
+    @staticmethod
+    def _parse_page(html: str):
+        """결과 페이지 → 상품 순서대로 ID 집합 리스트 (전체 HTML은 보관하지 않음)
+        마크업이 바뀌어 상품을 못 나누면 [페이지 전체 문자열]로 (기존 방식: 포함 여부만 판단)
+        """
+        starts = [m.start() for m in _RANK_ITEM_MARKER.finditer(html)]
+        if not starts:
+            return [html] if html else []
+        items = []
+        for start, end in zip(starts, starts[1:] + [len(html)]):
+            ids = set(_RANK_ID_PATTERN.findall(html[start:end]))
+            if ids:
+                items.append(ids)
+        return items
+
+    def _fetch_page(self, keyword: str, page: int):
+        key = (keyword, page)
+        while True:
+            with self._lock:
+                cached = self._pages.get(key)
+                if cached and time.time() - cached[1] < self.ttl:
+                    self.stats['cached'] += 1
+                    return cached[0]
+                event = self._inflight.get(key)
+                if event is None:
+                    self._inflight[key] = event = threading.Event()
+                    break
+            # 같은 페이지를 다른 스레드가 받는 중 → 기다렸다가 캐시 재조회
+            event.wait(30)
+
+        items = None
+        try:
+            params = {"query": keyword, "pagingIndex": page, "pagingSize": RANK_PAGE_SIZE}
+            for attempt in range(NAVER_API_MAX_RETRIES):
+                with self.limiter:
+                    resp = self.session.get(self.SEARCH_URL, params=params, headers=self.HEADERS, timeout=10)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    self.limiter.on_throttle(attempt + 1)
+                    continue
+                self.limiter.on_success()
+                # Naver Shopping results are often embedded in a JSON-like string (next_data)
+                items = self._parse_page(resp.text)
+                break
+        except Exception as e:
+            print(f"Rank page error ({keyword} p{page}): {e}")
+        finally:
+            with self._lock:
+                if items is not None:
+                    self._pages[key] = (items, time.time())
+                    self.stats['fetched'] += 1
+                self._inflight.pop(key, None)
+            event.set()
+        return items or []
+
+    @staticmethod
+    def _locate(items, product_id: str) -> int:
+        """페이지 내 위치 (1부터, 0=없음)"""
+        for position, ids in enumerate(items, 1):
+            if isinstance(ids, str):
+                return 1 if product_id in ids else 0   # 상품 구분 실패 페이지 - 포함 여부만
+            if product_id in ids:
+                return position
+        return 0
+
+    def track(self, pairs: List[Tuple[str, str]],
+              progress_callback=None) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """여러 (키워드, 상품 ID) 순위를 한꺼번에 조회
+        progress_callback(page, 찾은 수, 전체 수): 결과 페이지 1쪽 처리할 때마다 호출
+        Returns: {(keyword, product_id): (page, position)} - 못 찾으면 (0, 0)
+        """
+        pairs = [(kw.strip(), str(pid)) for kw, pid in pairs if kw and kw.strip() and pid]
+        results = {pair: (0, 0) for pair in pairs}
+        unresolved = set(pairs)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for page in range(1, self.max_pages + 1):
+                keywords = sorted({kw for kw, _ in unresolved})
+                if not keywords:
+                    break
+                pages = dict(zip(keywords, executor.map(lambda kw: self._fetch_page(kw, page), keywords)))
+                for kw, pid in list(unresolved):
+                    position = self._locate(pages[kw], pid)
+                    if position:
+                        results[(kw, pid)] = (page, position)
+                        unresolved.discard((kw, pid))
+                if progress_callback:
+                    progress_callback(page, len(pairs) - len(unresolved), len(pairs))
+        return results
 
     @staticmethod
     def find_rank(keyword: str, product_id: str, max_pages: int = 5) -> Tuple[int, int]:
         """Returns (page, position) or (0, 0) if not found."""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-        }
-        
-        for page in range(1, max_pages + 1):
-            params = {"query": keyword, "pagingIndex": page, "pagingSize": 40}
-            try:
-                resp = requests.get(NaverRankTracker.SEARCH_URL, params=params, headers=headers)
-                # Naver Shopping results are often embedded in a JSON-like string (next_data)
-                html = resp.text
-                if product_id in html:
-                    # Logic to extract position from HTML (Simplified for demonstration)
-                    # In a real scenario, use BeautifulSoup to find the specific element's index
-                    return page, 1 # Placeholder for exact position
-            except:
-                continue
-        return 0, 0
+        if NaverRankTracker._default is None or NaverRankTracker._default.max_pages != max_pages:
+            NaverRankTracker._default = NaverRankTracker(max_pages=max_pages)
+        return NaverRankTracker._default.track([(keyword, product_id)]).get((keyword.strip(), str(product_id)), (0, 0))
 
 class BulsajaAPIClient:
     """Client for Bulsaja API with Pagination Support."""
@@ -646,7 +911,7 @@ class BulsajaAPIClient:
         return self.update_product_names([{"id": product_id, "name": new_name}])
 
 class GeminiMultiAccountManager:
-    """Manages multiple Gemini API keys."""
+    """Manages multiple Gemini API keys (concurrent, per-key budgets via GeminiKeyScheduler)."""
     
     def __init__(self, api_keys: List[str], log_callback=None):
         self.log = log_callback if log_callback else print
@@ -659,77 +924,71 @@ class GeminiMultiAccountManager:
             self.accounts.append({
                 'key': key,
                 'index': i,
-                'daily_used': 0,
-                'minute_used': 0,
-                'daily_limit': 1490, 
-                'minute_limit': 14,
-                'last_minute_reset': datetime.now(),
-                'last_day_reset': datetime.now().date(),
                 'model': None
             })
         
-        self.current_key_index = 0
-    
-    def _reset_if_needed(self, acc: dict):
-        now = datetime.now()
-        if (now - acc['last_minute_reset']).seconds >= 60:
-            acc['minute_used'] = 0
-            acc['last_minute_reset'] = now
-        
-        if now.date() > acc['last_day_reset']:
-            acc['daily_used'] = 0
-            acc['last_day_reset'] = now.date()
-
-    def _get_next_available(self) -> Optional[dict]:
-        if not self.accounts: return None
-        tried = 0
-        while tried < len(self.accounts):
-            acc = self.accounts[self.current_key_index]
-            self._reset_if_needed(acc)
-            if acc['daily_used'] < acc['daily_limit'] and acc['minute_used'] < acc['minute_limit']:
-                return acc
-            self.current_key_index = (self.current_key_index + 1) % len(self.accounts)
-            tried += 1
-        return None
+        self.scheduler = GeminiKeyScheduler(api_keys, rpm=14, rpd=1490, log_func=self.log)
+        self._lock = threading.Lock()
+
+    @property
+    def concurrency(self) -> int:
+        return self.scheduler.concurrency if self.accounts else 1
+
+    def _get_client(self, account: dict):
+        with self._lock:
+            if not account['model']:
+                account['model'] = genai.Client(api_key=account['key'])
+            return account['model']
 
     def generate_content(self, prompt: str, image_data: bytes = None, image_mime: str = "image/jpeg", temperature: float = 0.7) -> Optional[str]:
-        account = self._get_next_available()
-        if not account:
+        if not self.accounts:
             self.log("❌ 모든 API 키 사용량 초과.")
             return None
-        
-        try:
-            if not account['model']:
-                account['model'] = genai.Client(api_key=account['key'])
+        est_tokens = len(prompt) // 2 + 1000 + (300 if image_data else 0)
+        
+        # 한도 걸린 키는 쉬게 두고 다른 키로 재시도 (키 수 * 2회까지)
+        for attempt in range(len(self.accounts) * 2 + 1):
+            index = self.scheduler.acquire(est_tokens)
+            if index is None:
+                self.log("❌ 모든 API 키 사용량 초과.")
+                return None
+            account = self.accounts[index]
             
-            contents = [prompt]
-            if image_data:
-                contents.append(types.Part.from_bytes(data=image_data, mime_type=image_mime))
-
-            response = account['model'].models.generate_content(
-                model='gemini-2.0-flash',
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    max_output_tokens=1000,
-                    safety_settings=[
-                        types.SafetySetting(category='HARM_CATEGORY_HARASSMENT', threshold='BLOCK_NONE'),
-                        types.SafetySetting(category='HARM_CATEGORY_HATE_SPEECH', threshold='BLOCK_NONE'),
-                        types.SafetySetting(category='HARM_CATEGORY_SEXUALLY_EXPLICIT', threshold='BLOCK_NONE'),
-                        types.SafetySetting(category='HARM_CATEGORY_DANGEROUS_CONTENT', threshold='BLOCK_NONE'),
-                    ]
+            try:
+                contents = [prompt]
+                if image_data:
+                    contents.append(types.Part.from_bytes(data=image_data, mime_type=image_mime))
+
+                response = self._get_client(account).models.generate_content(
+                    model='gemini-2.0-flash',
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        temperature=temperature,
+                        max_output_tokens=1000,
+                        safety_settings=[
+                            types.SafetySetting(category='HARM_CATEGORY_HARASSMENT', threshold='BLOCK_NONE'),
+                            types.SafetySetting(category='HARM_CATEGORY_HATE_SPEECH', threshold='BLOCK_NONE'),
+                            types.SafetySetting(category='HARM_CATEGORY_SEXUALLY_EXPLICIT', threshold='BLOCK_NONE'),
+                            types.SafetySetting(category='HARM_CATEGORY_DANGEROUS_CONTENT', threshold='BLOCK_NONE'),
+                        ]
+                    )
                 )
-            )
-            
-            account['daily_used'] += 1
-            account['minute_used'] += 1
+            except Exception as e:
+                self.scheduler.release(index, est_tokens=est_tokens)
+                if is_gemini_rate_limit_error(e):
+                    self.scheduler.park(index, daily=is_gemini_daily_limit_error(e))
+                    continue
+                self.log(f"⚠️ Account {account['index']} 오류: {e}")
+                return None
             
+            usage = getattr(response, 'usage_metadata', None)
+            self.scheduler.release(index, getattr(usage, 'total_token_count', None), est_tokens)
             if response.text:
                 return response.text.strip()
             return None
-        except Exception as e:
-            self.log(f"⚠️ Account {account['index']} 오류: {e}")
-            return None
+        
+        self.log("❌ 모든 API 키 사용량 초과.")
+        return None
 
 # ======================================================
 # WORKER THREADS
@@ -801,6 +1060,23 @@ class DataLoadWorker(QThread):
         except Exception as e:
             self.finished.emit([], str(e))
 
+class RankTrackWorker(QThread):
+    """순위 추적 (키워드당 결과 페이지 최대 max_pages쪽 조회 → GUI 스레드에서 돌리면 창이 멈춤)"""
+    progress = pyqtSignal(int, int, int) # page, found, total
+    finished = pyqtSignal(object, str) # {(keyword, product_id): (page, position)}, error_msg
+
+    def __init__(self, tracker: 'NaverRankTracker', pairs: List[Tuple[str, str]]):
+        super().__init__()
+        self.tracker = tracker
+        self.pairs = pairs
+
+    def run(self):
+        try:
+            ranks = self.tracker.track(self.pairs, progress_callback=self.progress.emit)
+            self.finished.emit(ranks, "")
+        except Exception as e:
+            self.finished.emit({}, str(e))
+
 # ==================== MADWORD-STYLE UI COMPONENTS ====================
 
 class SettingsDialog(QDialog):
@@ -1264,6 +1540,7 @@ class BulkGenerationWorker(QThread):
     progress = pyqtSignal(int, dict) # row_index, result_data
     finished = pyqtSignal()
     log = pyqtSignal(str)
+    key_usage = pyqtSignal(str) # Gemini key utilization summary
 
     def __init__(self, items: List[Dict], gemini_keys: List[str], api_client: BulsajaAPIClient = None, gen_params: Dict = None, naver_creds: Dict = None):
         super().__init__()
@@ -1274,6 +1551,7 @@ class BulkGenerationWorker(QThread):
         self.naver_creds = naver_creds or {}
         self.is_running = True
         self.kiwi = Kiwi()
+        self._kiwi_lock = threading.Lock()
 
     def run(self):
         gemini = GeminiMultiAccountManager(self.gemini_keys, log_callback=self.log.emit)
@@ -1286,71 +1564,97 @@ class BulkGenerationWorker(QThread):
             self.log.emit("🛒 네이버 커머스 API 연결 활성화됨")
 
         total = len(self.items)
-        self.log.emit(f"🚀 [매드워드 AI v3.0] 일괄 작업 시작: {total}개")
+        # 타겟 키워드 통계 미리 일괄 조회 (5개씩 묶음 + 캐시) → 상품별 처리에서는 캐시 적중
+        kw_before = get_keyword_cache_stats()
+        started = time.time()
+        naver.get_keyword_stats_bulk([item.get('original_name', '')[:20] for item in self.items])
+        kw_stats = {k: v - kw_before[k] for k, v in get_keyword_cache_stats().items()}
+        self.log.emit(f"📊 키워드 통계 준비: 캐시 {kw_stats['hit']} / 신규 {kw_stats['miss']} "
+                      f"(API {kw_stats['calls']}회, {time.time() - started:.1f}초)")
+
+        workers = max(1, min(gemini.concurrency, total))
+        self.log.emit(f"🚀 [매드워드 AI v3.0] 일괄 작업 시작: {total}개 (Gemini 키 {len(gemini.accounts)}개, 동시 {workers}개)")
         success_count = 0
+        done_count = 0
         
-        # Parallel Execution (v4.0: 16 threads for speed, logic inside loop handles rank skip)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            for i, item in enumerate(self.items):
-                if not self.is_running: break
-                
-                original_title = item.get('original_name', '')
-                seller_code = str(item.get('seller_code', ''))
-                target_rank = int(item.get('target_rank', 0)) or 100
-                
-                self.log.emit(f"🔄 [{i+1}/{total}] 상품({seller_code}) 처리 시작...")
+        # Parallel Execution: 키 수에 맞춰 동시 처리 (키별 한도는 GeminiKeyScheduler가 관리)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(self._process_item, i, total, item, gemini, naver, commerce)
+                       for i, item in enumerate(self.items)]
+            for future in concurrent.futures.as_completed(futures):
+                if future.result():
+                    success_count += 1
+                done_count += 1
+                self.key_usage.emit(f"🔑 {gemini.scheduler.summary_text()} | {done_count}/{total}")
+                if not self.is_running:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
-                try:
-                    # --- v4.0 Rank-Targeted Skip Logic ---
-                    current_rank = 0
-                    if naver:
-                        self.log.emit(f"   🔍 현재 순위 확인 중... (타겟: {target_rank}위)")
-                        current_rank = naver.get_rank_api(original_title[:20], seller_code)
-                        item['prev_rank'] = current_rank
-                        if current_rank > 0 and current_rank <= target_rank:
-                            self.log.emit(f"   ✅ 목표 순위 달성({current_rank}위). 작업을 건너뜁니다.")
-                            item['status'] = 'Skipped (Rank OK)'
-                            self.save_to_db(item)
-                            self.progress.emit(i, item)
-                            success_count += 1
-                            continue
-
-                    # --- STAGE 0: DETECT TARGET CATEGORY ---
-                    target_stats = naver.get_keyword_stats(original_title[:20]) if naver else {}
-                    target_cat = target_stats.get("category", "")
-                    if target_cat: self.log.emit(f"   🎯 타겟 카테고리 감지: {target_cat}")
-
-                    # --- STAGE 1: CLEANUP & UNIT EXTRACTION (v4.0 with HTML) ---
-                    stage1_result = self.process_stage1(original_title, gemini, item.get('main_image_url'), item.get('description'))
-                    
-                    # --- STAGE 2: ENRICHMENT (Parallel Fetch + Category Matching) ---
-                    stage2_result = self.process_stage2(stage1_result['safe_nouns'], naver, target_category=target_cat)
-                    
-                    # --- STAGE 3: FINAL SEO ASSEMBLY (v4.0 Category-Specific) ---
-                    final_name = self.process_stage3(original_title, stage1_result, stage2_result, gemini, category_info=target_cat)
-                    
-                    if final_name:
-                        self.log.emit(f"   ✅ 최종 최적화 완료: {final_name}")
-                        item['new_name'] = final_name
-                        item['status'] = 'Done'
-                        item['category'] = target_cat
-                        item['keywords'] = ", ".join([k[0] for k in stage2_result['related']])
-
-                        if not self.gen_params.get('sim_mode'):
-                            if self.api_client: self.api_client.update_single_product(item.get('id'), final_name)
-                            if commerce: commerce.update_product_name(item.get('id'), final_name)
-
-                        self.save_to_db(item)
-                        self.progress.emit(i, item)
-                        success_count += 1
-                        
-                except Exception as e:
-                    self.log.emit(f"❌ 항목 {i+1} 처리 중 오류: {e}")
-                    item['status'] = 'Error'
+        kw_stats = {k: v - kw_before[k] for k, v in get_keyword_cache_stats().items()}
+        self.log.emit(f"✅ SmartSellUp 프로세스 완료. 성공: {success_count}/{total} "
+                      f"(키워드 통계 캐시 {kw_stats['hit']} / API {kw_stats['calls']}회)")
+        self.finished.emit()
+
+    def _process_item(self, i: int, total: int, item: dict, gemini, naver, commerce) -> bool:
+        """상품 1개 처리 (순위 확인 → 3단계 생성 → 반영). 성공/건너뜀이면 True"""
+        if not self.is_running:
+            return False
+        
+        original_title = item.get('original_name', '')
+        seller_code = str(item.get('seller_code', ''))
+        target_rank = int(item.get('target_rank', 0)) or 100
+        
+        self.log.emit(f"🔄 [{i+1}/{total}] 상품({seller_code}) 처리 시작...")
+
+        try:
+            # --- v4.0 Rank-Targeted Skip Logic ---
+            current_rank = 0
+            if naver:
+                self.log.emit(f"   🔍 현재 순위 확인 중... (타겟: {target_rank}위)")
+                current_rank = naver.get_rank_api(original_title[:20], seller_code)
+                item['prev_rank'] = current_rank
+                if current_rank > 0 and current_rank <= target_rank:
+                    self.log.emit(f"   ✅ 목표 순위 달성({current_rank}위). 작업을 건너뜁니다.")
+                    item['status'] = 'Skipped (Rank OK)'
+                    self.save_to_db(item)
                     self.progress.emit(i, item)
+                    return True
 
-        self.log.emit(f"✅ SmartSellUp 프로세스 완료. 성공: {success_count}/{total}")
-        self.finished.emit()
+            # --- STAGE 0: DETECT TARGET CATEGORY ---
+            target_stats = naver.get_keyword_stats(original_title[:20]) if naver else {}
+            target_cat = target_stats.get("category", "")
+            if target_cat: self.log.emit(f"   🎯 타겟 카테고리 감지: {target_cat}")
+
+            # --- STAGE 1: CLEANUP & UNIT EXTRACTION (v4.0 with HTML) ---
+            stage1_result = self.process_stage1(original_title, gemini, item.get('main_image_url'), item.get('description'))
+            
+            # --- STAGE 2: ENRICHMENT (Parallel Fetch + Category Matching) ---
+            stage2_result = self.process_stage2(stage1_result['safe_nouns'], naver, target_category=target_cat)
+            
+            # --- STAGE 3: FINAL SEO ASSEMBLY (v4.0 Category-Specific) ---
+            final_name = self.process_stage3(original_title, stage1_result, stage2_result, gemini, category_info=target_cat)
+            
+            if final_name:
+                self.log.emit(f"   ✅ 최종 최적화 완료: {final_name}")
+                item['new_name'] = final_name
+                item['status'] = 'Done'
+                item['category'] = target_cat
+                item['keywords'] = ", ".join([k[0] for k in stage2_result['related']])
+
+                if not self.gen_params.get('sim_mode'):
+                    if self.api_client: self.api_client.update_single_product(item.get('id'), final_name)
+                    if commerce: commerce.update_product_name(item.get('id'), final_name)
+
+                self.save_to_db(item)
+                self.progress.emit(i, item)
+                return True
+        except Exception as e:
+            self.log.emit(f"❌ 항목 {i+1} 처리 중 오류: {e}")
+            item['status'] = 'Error'
+            self.progress.emit(i, item)
+        return False
 
     def save_to_db(self, item: dict):
         """Save results to SQLite."""
@@ -1418,7 +1722,8 @@ class BulkGenerationWorker(QThread):
 
         # 3. Kiwi cleanup
         clean_title = title.replace(" ", "")
-        res = self.kiwi.analyze(clean_title)
+        with self._kiwi_lock:
+            res = self.kiwi.analyze(clean_title)
         safe_nouns = []
         risky_tokens = []
         
@@ -1465,15 +1770,12 @@ class BulkGenerationWorker(QThread):
         candidates = list(set(nouns + shopping_tags))
         scored = []
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            future_to_kw = {executor.submit(naver.get_keyword_stats, kw): kw for kw in candidates[:20]}
-            for future in concurrent.futures.as_completed(future_to_kw):
-                stats = future.result()
-                if stats["volume"] > 0:
-                    # 매드워드 v3 룰: 카테고리 매칭 필터링
-                    if target_category and stats["category"] and stats["category"] != target_category:
-                        continue
-                    scored.append(stats)
+        for stats in naver.get_keyword_stats_bulk(candidates[:20]).values():
+            if stats["volume"] > 0:
+                # 매드워드 v3 룰: 카테고리 매칭 필터링
+                if target_category and stats["category"] and stats["category"] != target_category:
+                    continue
+                scored.append(stats)
         
         # 3. 매드워드 v3 점수 방식: 검색량 빈도(가중치) 기반 정렬
         # 여기서는 검색량과 경쟁강도를 조합한 기존 방식을 유지하면서 '카테고리 일치'를 최우선으로 합니다.
@@ -1741,6 +2043,7 @@ class APIModeTab(BaseTab):
         
         self.worker = BulkGenerationWorker(items_to_process, keys, api_client, gen_params, naver_creds)
         self.worker.log.connect(self.log)
+        self.worker.key_usage.connect(self.main.show_key_usage)
         self.worker.progress.connect(self.update_row)
         self.worker.finished.connect(self.process_finished)
         self.worker.start()
@@ -1793,6 +2096,7 @@ class ExcelModeTab(BaseTab):
         self.worker = BulkGenerationWorker(items_to_process, keys, None, gen_params, naver_creds) 
         
         self.worker.log.connect(self.log)
+        self.worker.key_usage.connect(self.main.show_key_usage)
         self.worker.progress.connect(self.update_row)
         self.worker.finished.connect(self.process_finished_excel) # Custom finish
         self.worker.start()
@@ -1831,6 +2135,7 @@ class MainWindowV2(QMainWindow):
         self._ui_refs = []
         self.table_data = [] # Unify to table_data
         self.db_path = "smartsellup.db"
+        self.rank_tracker = NaverRankTracker()
         self.init_db()
         self.loop_timer = QTimer(self)
         self.loop_timer.timeout.connect(self.run_loop_cycle)
@@ -1942,6 +2247,11 @@ class MainWindowV2(QMainWindow):
         self.lbl_status.setStyleSheet("color: #66ff00; font-family: Consolas; font-size: 11px;")
         main_layout.addWidget(self.lbl_status)
 
+        # Gemini key utilization (rpm used/limit, in-flight, parked)
+        self.lbl_keys = QLabel("", self)
+        self.lbl_keys.setStyleSheet("color: #888; font-family: Consolas; font-size: 11px;")
+        main_layout.addWidget(self.lbl_keys)
+
         # Hidden properties and credentials (need to be defined for load_settings)
         self.settings_data = {
             "filter_junk": True, "keep_orig": False, "prefix_cnt": 999,
@@ -2221,6 +2531,7 @@ class MainWindowV2(QMainWindow):
         
         self.worker = BulkGenerationWorker(self.table_data, keys, None, self.settings_data, naver_creds)
         self.worker.log.connect(self.log)
+        self.worker.key_usage.connect(self.show_key_usage)
         self.worker.progress.connect(self.update_row)
         self.worker.finished.connect(self.on_finished)
         self.worker.start()
@@ -2301,31 +2612,52 @@ class MainWindowV2(QMainWindow):
         QMessageBox.information(self, "완료", f"{matched_count}개의 상품이 매칭되어 집중 관리 대상으로 등록되었습니다.")
 
     def on_rank_track_clicked(self):
+        if getattr(self, 'rank_worker', None) is not None and self.rank_worker.isRunning():
+            QMessageBox.information(self, "알림", "순위 추적이 진행 중입니다.")
+            return
         rows = self.table.selectionModel().selectedRows()
         if not rows:
             QMessageBox.warning(self, "경고", "상품을 먼저 선택하세요.")
             return
-        row = rows[0].row()
-        item = self.table_data[row]
-        
-        # In a real app, this would use NaverRankTracker in a separate thread
-        # For now, let's simulate tracking for the keywords we found
-        self.log(f"🔎 '{item.get('original_name')[:10]}...' 순위 추적 시작")
-        
-        keywords = item.get('keywords', "캠핑의자,감성캠핑").split(",")
-        history = []
-        for kw in keywords:
-            kw = kw.strip()
-            page, pos = NaverRankTracker.find_rank(kw, item.get('id', ''))
-            # Generate dummy history for visualization
-            rank = random.randint(1, 100) if page == 0 else (page-1)*40 + pos
-            diff = random.choice(["▲2", "▼1", "-", "NEW"])
-            history.append([kw, rank, diff])
-            
-        item['rank_history'] = history
-        self.update_ranking_hub(item)
+        items = [self.table_data[r.row()] for r in rows]
+        
+        # 선택한 상품 전체를 한 번에 추적 (키워드별 결과 페이지는 1번만 조회, 상품끼리 공유)
+        self.log(f"🔎 {len(items)}개 상품 순위 추적 시작")
+        item_keywords = []
+        for item in items:
+            keywords = [kw.strip() for kw in item.get('keywords', "캠핑의자,감성캠핑").split(",") if kw.strip()]
+            item_keywords.append(keywords)
+        pairs = [(kw, item.get('id', '')) for item, keywords in zip(items, item_keywords) for kw in keywords]
+        
+        # 결과 페이지 조회는 워커 스레드에서 (완료 시 on_rank_tracked)
+        self._rank_job = (items, item_keywords, pairs, self.rank_tracker.stats['fetched'])
+        self.rank_worker = RankTrackWorker(self.rank_tracker, pairs)
+        self.rank_worker.progress.connect(self.on_rank_track_progress)
+        self.rank_worker.finished.connect(self.on_rank_tracked)
+        self.rank_worker.start()
+        
+    def on_rank_track_progress(self, page: int, found: int, total: int):
+        self.log(f"   📄 {page}/{self.rank_tracker.max_pages}쪽 확인 - {found}/{total}개 순위 찾음")
+        
+    def on_rank_tracked(self, ranks: dict, error: str):
+        items, item_keywords, pairs, fetched_before = self._rank_job
+        if error:
+            self.log(f"❌ 순위 추적 실패: {error}")
+            return
+        for item, keywords in zip(items, item_keywords):
+            history = []
+            for kw in keywords:
+                page, pos = ranks.get((kw, str(item.get('id', ''))), (0, 0))
+                # Generate dummy history for visualization
+                rank = random.randint(1, 100) if page == 0 else (page-1)*RANK_PAGE_SIZE + pos
+                diff = random.choice(["▲2", "▼1", "-", "NEW"])
+                history.append([kw, rank, diff])
+            item['rank_history'] = history
+        
+        self.update_ranking_hub(items[0])
         self.save_persistent_data()
-        self.log("✅ 순위 데이터 업데이트 완료")
+        self.log(f"✅ 순위 데이터 업데이트 완료 (키워드 {len({kw for kw, _ in pairs})}개, "
+                 f"결과 페이지 {self.rank_tracker.stats['fetched'] - fetched_before}회 조회)")
         
     def reset_all_data(self):
         """테이블 데이터 초기화"""
@@ -2333,6 +2665,10 @@ class MainWindowV2(QMainWindow):
         self.table.setRowCount(0)
         self.log("📋 모든 데이터가 초기화되었습니다.")
 
+    def show_key_usage(self, text: str):
+        if hasattr(self, 'lbl_keys'):
+            self.lbl_keys.setText(text)
+
     def log(self, message):
         """Advanced central logger: UI, Console, and File."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
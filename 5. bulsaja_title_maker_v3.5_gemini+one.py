@@ -22,10 +22,10 @@ by 프코노미
 
 import os
 import re
+import sys
 import time
 import threading
 import json
-import csv
 import subprocess
 import base64
 import requests
@@ -34,6 +34,7 @@ from datetime import datetime
 from typing import List, Optional, Tuple, Dict, Set
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
@@ -56,18 +57,23 @@ except ImportError:
 # import anthropic  # Claude API (사용 안 함)
 import google.generativeai as genai  # Gemini API
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from google.generativeai import client as genai_client
 
-# openpyxl for xlsx with colors
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+from bulsaja_common import (
+    GeminiKeyScheduler, GEMINI_FREE_LIMITS, GEMINI_PAID_LIMITS,
+    is_gemini_rate_limit_error, is_gemini_daily_limit_error,
+    title_cache_key, banned_words_digest, get_cached_title, store_cached_title, get_title_cache_stats,
+    search_similar_cached, get_similar_search_stats,
+    StreamingSheetWriter, get_image_cache, get_image_cache_stats
+)
 
 # ==================== Gemini 멀티 계정 관리자 ====================
+GEMINI_TEXT_MODEL = 'gemini-2.0-flash'   # 기본 모델 (이미지 입력도 지원 → Vision 모드 기본값)
+GEMINI_IMAGE_TOKENS = 258                # 이미지 1장 입력 토큰 (키별 토큰 예산 추정용)
+
+
 class GeminiMultiAccountManager:
-    """여러 Gemini API 키를 순차적으로 사용하며 한도 관리"""
+    """여러 Gemini API 키를 동시에 사용하며 한도 관리 (키별 예산은 GeminiKeyScheduler)"""
     
     def __init__(self, api_keys: List[str], log_callback=None, is_paid: bool = False):
         self.log = log_callback if log_callback else print
@@ -79,8 +85,7 @@ class GeminiMultiAccountManager:
         
         # 유료 플랜: 한도 사실상 무제한 (100만회/일, 1000RPM)
         # 무료 플랜: 1450회/일, 14RPM
-        daily_limit = 9999999 if is_paid else 1450
-        minute_limit = 1000 if is_paid else 14
+        limits = GEMINI_PAID_LIMITS if is_paid else GEMINI_FREE_LIMITS
         
         limit_desc = "유료(무제한)" if is_paid else "무료(1450회/일)"
         self.log(f"✅ Gemini 계정 {len(api_keys)}개 로드 ({limit_desc})")
@@ -89,107 +94,98 @@ class GeminiMultiAccountManager:
             self.accounts.append({
                 'key': key,
                 'index': i,
-                'daily_used': 0,
-                'minute_used': 0,
-                'daily_limit': daily_limit,
-                'minute_limit': minute_limit,
-                'last_minute_reset': datetime.now(),
-                'last_day_reset': datetime.now().date(),
-                'model': None
+                'models': {}   # 모델명 → GenerativeModel
             })
         
-        self.current_key_index = 0
+        self.scheduler = GeminiKeyScheduler(api_keys, log_func=self.log, **limits)
         self.total_calls = 0
+        self._lock = threading.Lock()
     
-    def _reset_if_needed(self, acc: dict):
-        """필요시 카운터 리셋"""
-        now = datetime.now()
-        
-        if (now - acc['last_minute_reset']).seconds >= 60:
-            if acc['minute_used'] > 0:
-                self.log(f"🔄 계정 {acc['index']} 분당 리셋")
-            acc['minute_used'] = 0
-            acc['last_minute_reset'] = now
-        
-        if now.date() > acc['last_day_reset']:
-            self.log(f"🔄 계정 {acc['index']} 일일 리셋 (사용: {acc['daily_used']})")
-            acc['daily_used'] = 0
-            acc['last_day_reset'] = now.date()
-    
-    def _get_next_available(self) -> Optional[dict]:
-        """사용 가능한 다음 계정 찾기"""
-        tried = 0
-        
-        while tried < len(self.accounts):
-            acc = self.accounts[self.current_key_index]
-            self._reset_if_needed(acc)
-            
-            if acc['daily_used'] < acc['daily_limit'] and acc['minute_used'] < acc['minute_limit']:
-                return acc
-            
-            if acc['daily_used'] < acc['daily_limit'] and acc['minute_used'] >= acc['minute_limit']:
-                wait_time = 60 - (datetime.now() - acc['last_minute_reset']).seconds
-                if wait_time > 0 and wait_time < 60:
-                    if len(self.accounts) > 1:
-                        self.log(f"⏭️ 계정 {acc['index']} 분당 한도, 다음으로")
-                        self.current_key_index = (self.current_key_index + 1) % len(self.accounts)
-                        tried += 1
-                        continue
-                    self.log(f"⏳ {wait_time}초 대기...")
-                    time.sleep(wait_time + 1)
-                    self._reset_if_needed(acc)
-                    return acc
-            
-            self.log(f"⏭️ 계정 {acc['index']} 소진 (일:{acc['daily_used']}/{acc['daily_limit']})")
-            self.current_key_index = (self.current_key_index + 1) % len(self.accounts)
-            tried += 1
-        
-        return None
+    @property
+    def concurrency(self) -> int:
+        """키 수에 맞춘 동시 요청 수 (상품명 일괄 생성 워커 수)"""
+        return self.scheduler.concurrency
     
-    def generate_content(self, prompt: str, temperature: float = 0.7, 
-                        max_tokens: int = 350, recursion_depth: int = 0) -> Optional[str]:
-        """Gemini API 호출 with 자동 계정 전환"""
-        
-        # 재귀 호출 제한 (계정 수 * 2회 시도 후 중단)
-        if recursion_depth > len(self.accounts) * 2:
-            self.log("❌ 모든 계정의 한도가 소진되었습니다. 잠시 후 다시 시도해주세요.")
-            return None
-        
-        account = self._get_next_available()
-        
-        if not account:
-            self.log("❌ 모든 계정 한도 소진!")
-            return None
-        
-        try:
-            if not account['model']:
+    def _get_model(self, account: dict, model_name: str = GEMINI_TEXT_MODEL):
+        """키+모델별 GenerativeModel (genai.configure는 전역 설정 → 만든 시점의 키 클라이언트를 모델에 고정)"""
+        with self._lock:
+            if model_name not in account['models']:
                 genai.configure(api_key=account['key'])
                 # gemini-2.0-flash (유료키 사용 시 안정적 + 안전필터 회피 유리)
-                account['model'] = genai.GenerativeModel('gemini-2.0-flash')            
-            # 안전 설정: 모든 검열 해제 (상품명 생성을 위해 필수)
-            # v11: Enum 사용 + List 포맷 (호환성 강화)
-            safety_settings = [
-                {"category": HarmCategory.HARM_CATEGORY_HARASSMENT, "threshold": HarmBlockThreshold.BLOCK_NONE},
-                {"category": HarmCategory.HARM_CATEGORY_HATE_SPEECH, "threshold": HarmBlockThreshold.BLOCK_NONE},
-                {"category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT, "threshold": HarmBlockThreshold.BLOCK_NONE},
-                {"category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT, "threshold": HarmBlockThreshold.BLOCK_NONE},
-            ]
+                model = genai.GenerativeModel(model_name)
+                model._client = genai_client.get_default_generative_client()
+                account['models'][model_name] = model
+            return account['models'][model_name]
+    
+    def generate_content(self, prompt: str, temperature: float = 0.7, 
+                        max_tokens: int = 350, image: Optional[dict] = None,
+                        model: Optional[str] = None) -> Optional[str]:
+        """Gemini API 호출 with 자동 계정 전환 (한도 걸린 키는 쉬게 두고 다른 키로)
+        image: {'mime_type': ..., 'data': bytes} - 프롬프트와 함께 보낼 이미지 (Vision)
+        model: 모델명 (생략 시 GEMINI_TEXT_MODEL)
+        """
+        est_tokens = len(prompt) // 2 + max_tokens + (GEMINI_IMAGE_TOKENS if image else 0)
+        contents = [prompt, image] if image else prompt
+        
+        # 계정 수 * 2회 시도 후 중단
+        for attempt in range(len(self.accounts) * 2 + 1):
+            index = self.scheduler.acquire(est_tokens)
+            if index is None:
+                self.log("❌ 모든 계정 한도 소진!")
+                return None
+            account = self.accounts[index]
+            
+            try:
+                gemini_model = self._get_model(account, model or GEMINI_TEXT_MODEL)
+                # 안전 설정: 모든 검열 해제 (상품명 생성을 위해 필수)
+                # v11: Enum 사용 + List 포맷 (호환성 강화)
+                safety_settings = [
+                    {"category": HarmCategory.HARM_CATEGORY_HARASSMENT, "threshold": HarmBlockThreshold.BLOCK_NONE},
+                    {"category": HarmCategory.HARM_CATEGORY_HATE_SPEECH, "threshold": HarmBlockThreshold.BLOCK_NONE},
+                    {"category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT, "threshold": HarmBlockThreshold.BLOCK_NONE},
+                    {"category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT, "threshold": HarmBlockThreshold.BLOCK_NONE},
+                ]
 
-            response = account['model'].generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                ),
-                safety_settings=safety_settings
-            )
+                response = gemini_model.generate_content(
+                    contents,
+                    generation_config=genai.types.GenerationConfig(
+                        temperature=temperature,
+                        max_output_tokens=max_tokens,
+                    ),
+                    safety_settings=safety_settings
+                )
+            except Exception as e:
+                self.scheduler.release(index, est_tokens=est_tokens)
+                error_msg = str(e).lower()
+                
+                if "404" in error_msg:
+                    self.log(f"❌ Gemini API 오류 (계정 {account['index']}): 모델을 찾을 수 없습니다.")
+                    # 모델 목록 조회 시도
+                    try:
+                        self.log("ℹ️ [진단] 사용 가능한 모델 목록 조회 중...")
+                        for m in genai.list_models():
+                            if 'generateContent' in m.supported_generation_methods:
+                                self.log(f"   - {m.name}")
+                    except Exception as list_err:
+                        self.log(f"   (모델 목록 조회 실패: {list_err})")
+                    return None
+                
+                if is_gemini_rate_limit_error(e):
+                    self.log(f"⏳ Gemini API 한도 초과 (계정 {account['index']}) -> 다음 계정 전환")
+                    self.scheduler.park(index, daily=is_gemini_daily_limit_error(e))
+                    continue
+                
+                self.log(f"❌ Gemini API 오류 (계정 {account['index']}): {e}")
+                return None
             
-            account['daily_used'] += 1
-            account['minute_used'] += 1
-            self.total_calls += 1
+            usage = getattr(response, 'usage_metadata', None)
+            self.scheduler.release(index, getattr(usage, 'total_token_count', None), est_tokens)
+            with self._lock:
+                self.total_calls += 1
+                total_calls = self.total_calls
             
-            if self.total_calls % 10 == 1 or self.total_calls < 5:
-                self.log(f"📊 계정{account['index']}: 일 {account['daily_used']}, 분 {account['minute_used']} | 총 {self.total_calls}회")
+            if total_calls % 10 == 1 or total_calls < 5:
+                self.log(f"📊 {self.scheduler.summary_text()} | 총 {total_calls}회")
             
             # 응답 안전성 확인 (빈 응답 방지)
             try:
@@ -210,38 +206,9 @@ class GeminiMultiAccountManager:
                 return None
             
             return None
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            
-            if "404" in error_msg:
-                self.log(f"❌ Gemini API 오류 (계정 {self.current_key_index + 1}): 모델을 찾을 수 없습니다 ({account.get('model_name', 'unknown')}).")
-                # 모델 목록 조회 시도
-                try:
-                    self.log("ℹ️ [진단] 사용 가능한 모델 목록 조회 중...")
-                    for m in genai.list_models():
-                        if 'generateContent' in m.supported_generation_methods:
-                            self.log(f"   - {m.name}")
-                except Exception as list_err:
-                    self.log(f"   (모델 목록 조회 실패: {list_err})")
-            
-            elif "quota" in error_msg or "limit" in error_msg or "resource" in error_msg or "429" in error_msg:
-                self.log(f"⏳ Gemini API 한도 초과 (계정 {self.current_key_index + 1}) -> 다음 계정 전환")
-                self._switch_to_next_key()
-                # 1초 대기 후 재시도
-                time.sleep(1)
-                return self.generate_content(prompt, temperature, max_tokens, recursion_depth + 1)
-                self.log(f"⚠️ 계정 {account['index']} 한도 초과")
-                account['daily_used'] = account['daily_limit']
-                return self.generate_content(prompt, temperature, max_tokens)
-            
-            self.log(f"❌ Gemini API 오류 (계정 {account['index']}): {e}")
-            return None
-
-    def _switch_to_next_key(self):
-        """다음 키로 강제 전환"""
-        self.current_key_index = (self.current_key_index + 1) % len(self.accounts)
-        self.log(f"🔄 다음 계정으로 전환 (Account {self.current_key_index + 1})")
+        
+        self.log("❌ 모든 계정의 한도가 소진되었습니다. 잠시 후 다시 시도해주세요.")
+        return None
 
 # ==================== v11 신규 설정 ====================
 SIMILARITY_THRESHOLD = 0.3  # 유사도 30% 미만이면 이미지 검증
@@ -460,6 +427,26 @@ TITLE_MODE_IMAGE_FIRST = "image_first"  # 이미지 + 기존상품명 (1순위 
 TITLE_MODE_VISION = "vision"  # Claude Vision 이미지 분석 (타오바오 검색 없이)
 TITLE_MODE_ORIGINAL_ONLY = "original_only"  # 기존상품명만
 
+# 상품명 캐시 키에 들어가는 프롬프트 버전 (프롬프트/후처리 바꾸면 올려야 기존 캐시 무효화)
+TITLE_PROMPT_VERSION = "3.9"
+
+# 헤드리스 API 모드 (--headless)
+HEADLESS_FETCH_PAGE = 500   # 상품 목록 조회 1회당 개수
+HEADLESS_WRITE_BATCH = 100  # 상품명/태그 일괄 수정 1회당 개수
+
+# 실행 후 문맥 기반 위험 분석 - 결과 저널에서 이만큼씩 읽어서 분석 (전체 결과를 메모리에 두지 않음)
+RISK_ANALYSIS_CHUNK = 200
+
+# 결과 엑셀 셀 스타일 (StreamingSheetWriter)
+RESULT_SHEET_STYLES = {
+    'danger': {'fill': "FFCCCC"},                                         # 위험 상품명
+    'suspect': {'fill': "FFFF00"},                                        # 브랜드주의 상품명
+    'suspect_word': {'fill': "FFFF00", 'font_color': "FF0000", 'bold': True},
+    'danger_mark': {'fill': "FFCCCC", 'font_color': "FF0000", 'bold': True},
+    'brand_mark': {'fill': "FFFF00", 'font_color': "FF6600", 'bold': True},
+    'red_text': {'font_color': "FF0000", 'bold': True},
+}
+
 # ==================== 유명 브랜드 리스트 (2차검수 대상) ====================
 FAMOUS_BRANDS = {
     # 글로벌 스포츠 브랜드
@@ -1415,52 +1402,29 @@ def download_image_as_base64(image_url: str, log_callback=None) -> Tuple[Optiona
             # URL 앞부분만 로그
             log_callback(f"  📷 이미지: {url[:60]}...")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-            'Referer': 'https://www.bulsaja.com/'
-        }
+        # 공유 디스크 캐시 (같은 이미지 재실행/썸네일 분석과 공유, 실패 사유는 캐시 쪽 로그)
+        content = get_image_cache().get_bytes(url)
+        if not content:
+            if log_callback:
+                log_callback("  ⚠️ 이미지 다운로드 실패")
+            return None, ""
         
-        response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
-        
-        if response.status_code == 200:
-            content = response.content
-            
-            # 이미지 타입 자동 감지 (매직 바이트)
-            media_type = "image/jpeg"  # 기본값
-            if content[:4] == b'\x89PNG':
-                media_type = "image/png"
-            elif content[:4] == b'RIFF' and content[8:12] == b'WEBP':
-                media_type = "image/webp"
-            elif content[:3] == b'GIF':
-                media_type = "image/gif"
-            elif content[:2] == b'\xff\xd8':
-                media_type = "image/jpeg"
-            else:
-                # Content-Type 헤더에서 추출
-                content_type = response.headers.get('Content-Type', '')
-                if 'png' in content_type:
-                    media_type = "image/png"
-                elif 'webp' in content_type:
-                    media_type = "image/webp"
-                elif 'gif' in content_type:
-                    media_type = "image/gif"
-            
-            if len(content) > 1000:
-                return base64.b64encode(content).decode('utf-8'), media_type
-            else:
-                if log_callback:
-                    log_callback(f"  ⚠️ 이미지 크기 너무 작음")
-                return None, ""
+        # 이미지 타입 자동 감지 (매직 바이트)
+        media_type = "image/jpeg"  # 기본값
+        if content[:4] == b'\x89PNG':
+            media_type = "image/png"
+        elif content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+            media_type = "image/webp"
+        elif content[:3] == b'GIF':
+            media_type = "image/gif"
+        
+        if len(content) > 1000:
+            return base64.b64encode(content).decode('utf-8'), media_type
         else:
             if log_callback:
-                log_callback(f"  ⚠️ HTTP {response.status_code}")
+                log_callback(f"  ⚠️ 이미지 크기 너무 작음")
             return None, ""
             
-    except requests.exceptions.Timeout:
-        if log_callback:
-            log_callback("  ⚠️ 이미지 다운로드 타임아웃")
-        return None, ""
     except Exception as e:
         if log_callback:
             log_callback(f"  ⚠️ 다운로드 오류: {str(e)[:50]}")
@@ -1496,11 +1460,10 @@ def generate_title_with_vision_api(client, image_url: str, original_title: str =
     if not img_b64:
         return "", [], False
     
-    # Base64 -> Bytes -> Part 변환
+    # Base64 -> Bytes -> 이미지 파트 (google.generativeai는 mime_type/data dict를 Blob으로 변환)
     try:
-        import base64
         image_bytes = base64.b64decode(img_b64)
-        image_part = types.Part.from_bytes(image_bytes, mime_type=media_type)
+        image_part = {'mime_type': media_type, 'data': image_bytes}
     except Exception as e:
         if log_callback:
             log_callback(f"⚠️ 이미지 변환 실패: {e}")
@@ -1533,8 +1496,7 @@ JSON만 출력하세요."""
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            # GeminiMultiAccountManager.generate_content 호출
-            # image 인자에 Part 객체 전달
+            # GeminiMultiAccountManager.generate_content 호출 (프롬프트 + 이미지)
             result_text = client.generate_content(
                 prompt=prompt,
                 image=image_part,
@@ -2002,6 +1964,7 @@ class BulsajaAutoFiller:
         self.aliprice_driver: Optional[webdriver.Chrome] = None  # 알리프라이스 검색용
         self.gemini_manager: Optional[GeminiMultiAccountManager] = None  # Gemini API
         self.is_running = False
+        self._title_tls = threading.local()  # 스레드별 자체 생성(AI 실패) 여부 - 캐시 저장 제외용
         self.chrome_process = None
         self.main_window_handle = None
         
@@ -2653,6 +2616,25 @@ class BulsajaAutoFiller:
         # 레거시 Selenium 모드
         return self._get_products_via_selenium(start_index, max_count)
     
+    @staticmethod
+    def _product_row_from_api(item: Dict, index: int) -> ProductRow:
+        """API 상품 응답 1건 → ProductRow"""
+        # 썸네일 URL 목록
+        thumbnails = item.get('uploadThumbnails', [])
+        first_thumb = thumbnails[0] if thumbnails else ""
+        
+        return ProductRow(
+            index=index,
+            image_url=first_thumb,
+            original_title=item.get('uploadCommonProductName', ''),
+            seller_code=item.get('uploadBulsajaCode', ''),
+            row_element=None,  # API 모드에서는 사용 안 함
+            thumbnail_urls=thumbnails,
+            needs_image_check=False,
+            is_mismatch=False,
+            bulsaja_id=item.get('ID', '')
+        )
+    
     def _get_products_via_api(self, start_index: int = 0, max_count: int = 100) -> List[ProductRow]:
         """API로 상품 목록 조회 - 마켓그룹 + 태그 필터 동시 적용"""
         products = []
@@ -2698,22 +2680,7 @@ class BulsajaAutoFiller:
             api_products, total = self.api_client.get_products(start_index, start_index + max_count, filter_model)
             
             for idx, item in enumerate(api_products):
-                # 썸네일 URL 목록
-                thumbnails = item.get('uploadThumbnails', [])
-                first_thumb = thumbnails[0] if thumbnails else ""
-                
-                product = ProductRow(
-                    index=start_index + idx,
-                    image_url=first_thumb,
-                    original_title=item.get('uploadCommonProductName', ''),
-                    seller_code=item.get('uploadBulsajaCode', ''),
-                    row_element=None,  # API 모드에서는 사용 안 함
-                    thumbnail_urls=thumbnails,
-                    needs_image_check=False,
-                    is_mismatch=False,
-                    bulsaja_id=item.get('ID', '')
-                )
-                products.append(product)
+                products.append(self._product_row_from_api(item, start_index + idx))
             
             self.gui.log(f"  📦 API로 {len(products)}개 상품 로드 (총 {total}개)")
             
@@ -2877,6 +2844,18 @@ class BulsajaAutoFiller:
             return []
     
     def search_with_aliprice(self, image_url: str) -> List[str]:
+        """AliPrice로 유사 상품명 검색 - 대표 이미지 pHash 캐시 우선 (같은 이미지 재검색 안 함)"""
+        if not image_url:
+            return []
+        before = get_similar_search_stats()
+        titles = search_similar_cached(image_url, self._search_aliprice_live,
+                                       force_refresh=self.gui.title_cache_refresh_var.get())
+        after = get_similar_search_stats()
+        if after['hit'] > before['hit'] or after['near'] > before['near']:
+            self.gui.log(f"♻️ 이미지 검색 캐시 사용: 유사 상품 {len(titles)}개")
+        return titles
+    
+    def _search_aliprice_live(self, image_url: str) -> List[str]:
         """AliPrice로 유사 상품명 검색 - 디버그 크롬 사용"""
         if not image_url:
             return []
@@ -3598,6 +3577,109 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
         # 모든 재시도 실패 시 자체 생성
         return self._generate_title_fallback(original)
     
+    def _title_cache_key(self, product: ProductRow, title_mode: str) -> Tuple[str, str, str]:
+        """상품명 캐시 키 → (키, 프롬프트 버전, 모델) - 모드마다 프롬프트/모델이 다름
+        저장되는 상품명은 금지단어 필터 후 결과 → 현재 금지단어 목록 해시도 키에 포함"""
+        if title_mode == TITLE_MODE_VISION:
+            model = self.gui.vision_model_var.get()
+            version = f"{TITLE_PROMPT_VERSION}/{title_mode}/{self.gui.title_length_var.get()}"
+        else:
+            model = self.gui.model_var.get()
+            version = f"{TITLE_PROMPT_VERSION}/{title_mode}"
+        key = title_cache_key(product.original_title, product.image_url, version, model,
+                              banned_words_digest(self.banned_words))
+        return key, version, model
+    
+    def lookup_cached_title(self, product: ProductRow, title_mode: str) -> Optional[Tuple[str, List[str], bool]]:
+        """이전에 생성한 상품명 (없거나 '캐시 무시' 체크 시 None)"""
+        key, _, _ = self._title_cache_key(product, title_mode)
+        cached = get_cached_title(key, force_refresh=self.gui.title_cache_refresh_var.get())
+        if not cached:
+            return None
+        return cached['title'], cached.get('brands', []), cached.get('forbidden', False)
+    
+    def store_generated_title(self, product: ProductRow, title_mode: str, result: Tuple[str, List[str], bool]):
+        """AI 생성 결과 캐시 저장 (원본 그대로/자체 생성은 저장 안 함 → 다음 실행에서 다시 시도)"""
+        new_title, brands, forbidden_found = result
+        if not new_title or new_title == product.original_title or getattr(self._title_tls, 'fallback', False):
+            return
+        key, version, model = self._title_cache_key(product, title_mode)
+        store_cached_title(key, {'title': new_title, 'brands': list(brands or []), 'forbidden': bool(forbidden_found)},
+                           product.original_title, version, model)
+    
+    def _generate_original_cached(self, product: ProductRow) -> Tuple[str, List[str], bool]:
+        """기존상품명 모드 생성 + 캐시 저장"""
+        self._title_tls.fallback = False
+        result = self.generate_title_original_only(product.original_title)
+        self.store_generated_title(product, TITLE_MODE_ORIGINAL_ONLY, result)
+        return result
+    
+    def _generate_vision_cached(self, product: ProductRow) -> Tuple[str, List[str], bool]:
+        """Vision 모드 생성 + 캐시 저장 (이미지 없음/Vision 실패 시 기존상품명 기반)"""
+        self._title_tls.fallback = False
+        if product.image_url:
+            result = generate_title_with_vision_api(
+                self.gemini_manager,
+                product.image_url,
+                product.original_title,
+                model=self.gui.vision_model_var.get(),
+                banned_words=self.banned_words,
+                log_callback=self.gui.log,
+                target_length=int(self.gui.title_length_var.get())
+            )
+            if result[0]:
+                self.store_generated_title(product, TITLE_MODE_VISION, result)
+                return result
+        return self._generate_original_cached(product)
+    
+    def pregenerate_titles(self, products: List[ProductRow],
+                           title_mode: str = TITLE_MODE_ORIGINAL_ONLY) -> Dict[int, Tuple[str, List[str], bool]]:
+        """기존상품명/Vision 모드: 캐시에 없는 배치 상품명만 모든 Gemini 키로 동시 생성 (키 수만큼 처리량 증가)
+        Returns: {row-index: (상품명, 의심 브랜드 리스트, 금지단어 발견 여부)}
+        """
+        if not self.gemini_manager:
+            return {}
+        
+        if title_mode == TITLE_MODE_VISION:
+            generate = self._generate_vision_cached
+        else:
+            title_mode = TITLE_MODE_ORIGINAL_ONLY
+            generate = self._generate_original_cached
+        
+        results = {}
+        missing = []
+        for product in products:
+            cached = self.lookup_cached_title(product, title_mode)
+            if cached:
+                results[product.index] = cached
+            else:
+                missing.append(product)
+        if results:
+            self.gui.log(f"♻️ 상품명 캐시 적중: {len(results)}개 → 신규 {len(missing)}개만 생성")
+        if not missing:
+            return results
+        
+        workers = min(self.gemini_manager.concurrency, len(missing))
+        self.gui.log(f"⚡ 상품명 동시 생성: {len(missing)}개 (키 {len(self.gemini_manager.accounts)}개, 동시 {workers}개)")
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(generate, p): p for p in missing}
+            for future in as_completed(futures):
+                product = futures[future]
+                try:
+                    results[product.index] = future.result()
+                except Exception as e:
+                    self.gui.log(f"⚠️ 상품명 생성 실패 ({product.original_title[:20]}): {e}")
+                self.gui.update_progress_detail(
+                    f"상품명 생성 {len(results)}/{len(products)} | {self.gemini_manager.scheduler.summary_text()}")
+                if not self.is_running:
+                    self.gui.log("🛑 중지됨 - 남은 상품명 생성 취소")
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
+    
     def _generate_title_fallback(self, original: str) -> Tuple[str, List[str], bool]:
         """AI 실패 시 자체적으로 상품명 생성 (원본 기반)
         - 영문/숫자/특수문자 제거
@@ -3605,6 +3687,7 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
         - 35-45자 맞춤
         Returns: (상품명, 의심 브랜드 리스트, 금지단어 발견 여부)
         """
+        self._title_tls.fallback = True
         self.gui.log(f"🔧 자체 생성 모드 (AI 실패)")
         
         # 1. 원본에서 단어 추출
@@ -3695,6 +3778,196 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
         # 임시로 모두 안전으로 반환
         return {'danger': [], 'suspect': [], 'safe': products_data}
     
+    def _analyze_result_chunk(self, rows: List[Tuple[int, dict]], writer: StreamingSheetWriter,
+                              newly_found: List[dict], danger_keywords: List[str], suspects: set) -> int:
+        """결과 행 묶음 [(레코드 번호, 결과 행), ...] 문맥 기반 위험 분석
+        - 새로 위험 판정된 행은 저널에 patch + [위험상품] 태그 적용
+        - newly_found/danger_keywords/suspects에 결과 누적
+        Returns: 묶음 내 위험 상품 수 (패턴 기반 + 새로 발견)
+        """
+        # 분석용 데이터 준비 (index = 묶음 내 순번)
+        risk_result = self.analyze_products_risk([
+            {'index': i, 'title': r['new'], 'original': r['original']}
+            for i, (_, r) in enumerate(rows)
+        ])
+        
+        # 위험상품 처리 (패턴 기반에서 놓친 것만)
+        for item in risk_result.get('danger', []):
+            idx = item.get('index', -1)
+            if not 0 <= idx < len(rows):
+                continue
+            index, r = rows[idx]
+            # 이미 위험으로 표시된 것은 스킵
+            if r['is_dangerous']:
+                continue
+            
+            # 새로 발견된 위험 상품
+            newly_found.append(item)
+            r['is_dangerous'] = True
+            r['danger_categories'] = {'detected': item.get('keywords', [])}
+            writer.patch(index, is_dangerous=True, danger_categories=r['danger_categories'])
+            
+            # 위험 키워드 수집
+            danger_keywords.extend(item.get('keywords', []))
+            
+            # 태그 변경 (패턴 기반에서 안전→위험으로 "위험상품" 태그 적용)
+            row_index = r.get('row_index')
+            if row_index is not None:
+                try:
+                    row = self.main_driver.find_element(
+                        By.CSS_SELECTOR, f"div[role='row'][row-index='{row_index}']"
+                    )
+                    self.gui.log(f"🏷️ [위험상품] 태그 적용 시도...")
+                    if self._apply_tag_to_row(row, row_index, "위험상품"):
+                        self.gui.log(f"  ✅ [위험상품] 태그 적용 완료")
+                except Exception as e:
+                    self.gui.log(f"  ⚠️ [위험상품] 태그 적용 실패: {e}")
+        
+        # 의심 항목 수집 (기존 브랜드 의심 + 문맥 분석 의심)
+        for _, r in rows:
+            suspects.update(r.get('suspicious') or [])
+        for item in risk_result.get('suspect', []):
+            suspects.update(item.get('keywords', []))
+        
+        return sum(1 for _, r in rows if r.get('is_dangerous', False))
+
+    def finalize_title(self, product: ProductRow, new_title: str, detected_brands: List[str],
+                       forbidden_found: bool, tag_name: Optional[str], force_review: bool = False,
+                       group_name: Optional[str] = None) -> Tuple[str, Optional[str], Dict]:
+        """생성된 상품명 검수 (제거단어 → 위험 감지 → 의심단어 분류) 후 적용할 상품명/태그 결정
+        - 브라우저 처리(process_products)와 헤드리스 API 처리에서 공통 사용
+        Returns: (적용할 상품명, 적용할 태그, 결과 파일 행)
+        """
+        # 적용할 상품명 결정 (상품명 1개만 생성하므로 바로 적용)
+        apply_title = new_title
+        
+        # ✅ 제거단어 적용 (상품명에서 무조건 삭제)
+        if REMOVE_WORDS:
+            original_apply = apply_title
+            apply_title = apply_remove_words(apply_title, REMOVE_WORDS)
+            new_title = apply_remove_words(new_title, REMOVE_WORDS)
+            if original_apply != apply_title:
+                self.gui.log(f"🗑️ 제거단어 적용: {original_apply} → {apply_title}")
+        
+        # ✅ 1단계: 패턴 기반 위험 감지
+        danger_check = detect_dangerous_product(apply_title)
+        is_dangerous = danger_check['is_dangerous']
+        danger_categories = danger_check['categories']
+        danger_words = danger_check['all_words']
+        
+        # ✅ 2단계: 위험 단어 발견 시 맥락 분석 (Claude)
+        safe_words = set()  # 안전 판정 받은 단어들
+        if is_dangerous and danger_words:
+            self.gui.log(f"🔍 위험 단어 감지: {', '.join(danger_words[:3])} - 맥락 분석 중...")
+            
+            # Claude로 맥락 기반 검증
+            context_check = self.verify_danger_with_context(apply_title, danger_words)
+            is_dangerous = context_check['is_dangerous']
+            
+            if is_dangerous:
+                self.gui.log_warning(f"🚨 위험 확정: {context_check['reason']} (확신도: {context_check['confidence']})")
+            else:
+                self.gui.log(f"✅ 안전 판정: {context_check['reason']} (확신도: {context_check['confidence']})")
+                # 안전 판정 받은 단어들 기록
+                safe_words.update(danger_words)
+        
+        # ✅ 3단계: 의심단어 분류 처리 (API 호출 없이 패턴 기반)
+        # ★ v2.5: 실제 상품명에 포함된 의심단어만 처리
+        # ★ v3.5: 예외단어는 의심단어에서 미리 제외
+        # Claude가 반환한 의심단어 중 생성된 상품명에 없는 것은 제외
+        actual_suspects = []
+        for word in detected_brands:
+            word_clean = word.strip()
+            if not word_clean:
+                continue
+            # 예외단어면 스킵 (의심단어로 분류 안 함)
+            if word_clean in EXCLUDED_WORDS or word_clean.lower() in EXCLUDED_WORDS:
+                continue
+            # apply_title (실제 적용될 상품명)에 포함된 것만
+            if word_clean in apply_title or word_clean.lower() in apply_title.lower():
+                actual_suspects.append(word_clean)
+        
+        # 실제 사용된 의심단어만 분류 (제거단어/예외단어 시트 참조)
+        suspect_result = process_suspect_words(actual_suspects, self.remove_words, EXCLUDED_WORDS)
+        
+        # 유명 브랜드 발견 → 무조건 2차검수
+        famous_brands_found = suspect_result['review']
+        # 제거할 단어 (모델명, 셀러브랜드 등)
+        words_to_remove = suspect_result['remove']
+        # 사람이 판단해야 할 의심단어
+        ambiguous_words = suspect_result['suspect']
+        # 안전하다고 판단된 단어 (일반 한글단어 등)
+        keep_words = set(suspect_result['keep'])
+        
+        # 제거 대상 단어들 상품명에서 제거
+        if words_to_remove:
+            removed_words = [w[0] for w in words_to_remove]
+            original_apply = apply_title
+            for word, reason in words_to_remove:
+                apply_title = apply_title.replace(word, "").strip()
+                new_title = new_title.replace(word, "").strip() if new_title else ""
+            # 연속 공백 정리
+            apply_title = re.sub(r'\s+', ' ', apply_title).strip()
+            new_title = re.sub(r'\s+', ' ', new_title).strip() if new_title else ""
+            if original_apply != apply_title:
+                self.gui.log(f"🗑️ 자동 제거: {', '.join(removed_words)}")
+        
+        # 안전 판정 받은 단어 제외 (맥락분석 + 단어분석)
+        # detected_brands에서 'keep'으로 분류된 단어도 제거
+        filtered_brands = []
+        for b in detected_brands:
+            if b in safe_words:
+                continue
+            if b in keep_words:
+                continue
+            filtered_brands.append(b)
+        
+        # detected_brands 업데이트 (결과 파일에 반영됨)
+        detected_brands = filtered_brands
+        
+        # 최종 의심단어 판단
+        # - 유명 브랜드 → 2차검수
+        # - 애매한 단어 → 의심단어 리스트에 추가 (사람이 판단)
+        # - 제거된 단어 → 작업완료 (로그만)
+        if famous_brands_found:
+            brand_names = [w[0] for w in famous_brands_found]
+            self.gui.log_warning(f"🚨 유명 브랜드 발견: {', '.join(brand_names)} → 2차검수")
+            is_suspicious = True
+        elif ambiguous_words:
+            ambig_names = [w[0] for w in ambiguous_words]
+            self.gui.log_warning(f"⚠️ 미확인 단어: {', '.join(ambig_names)} → 의심단어로 분류")
+            # 애매한 단어는 결과 데이터의 suspicious에 포함됨 (나중에 수집)
+            is_suspicious = False  # 2차검수 아님, 작업완료 처리
+        else:
+            is_suspicious = False
+        
+        # 태그 결정 로직:
+        # - 이미지 불일치 확정 (force_review) → 2차검수
+        # - 위험/금지단어 → 2차검수
+        # - 의심단어 발견 → 2차검수 (브랜드, 피규어 등)
+        # - 그 외 → 기본 태그
+        if force_review or is_dangerous or forbidden_found or is_suspicious:
+            actual_tag = SECOND_CHECK_TAG
+        else:
+            actual_tag = tag_name
+        
+        result_row = {
+            'group': group_name or '(현재 마켓)',
+            'bulsaja_id': product.seller_code,
+            'code': product.seller_code,
+            'original': product.original_title,
+            'new': new_title,  # 생성된 상품명
+            'suspicious': detected_brands,
+            'row_index': product.index,
+            'is_dangerous': is_dangerous or forbidden_found,  # 진짜 위험 또는 금지단어 (빨간색)
+            'danger_categories': danger_categories,
+            'forbidden_found': forbidden_found,  # 금지단어 발견 여부
+            'is_suspicious': is_suspicious,  # 유명브랜드 발견 여부 (노란색)
+            'famous_brands': [w[0] for w in famous_brands_found] if famous_brands_found else [],
+            'removed_words': [w[0] for w in words_to_remove] if words_to_remove else [],
+            'ambiguous_words': [w[0] for w in ambiguous_words] if ambiguous_words else [],
+        }
+        return apply_title, actual_tag, result_row
     
     def update_product_title(self, product: ProductRow, new_title: str, tag_name: str = None) -> bool:
         """상품명 업데이트 (+ 태그 적용) - API 모드 또는 Selenium 모드"""
@@ -5666,8 +5939,9 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
             grand_total_skipped = 0
             confirmed_suspects = []  # 의심 단어 목록
             
-            # 결과 데이터 저장용 리스트 (xlsx로 저장할 때 사용)
-            result_data = []  # [(마켓그룹, 상품코드, 기존상품명, 변경상품명, 의심단어리스트), ...]
+            title_cache_before = get_title_cache_stats()
+            similar_cache_before = get_similar_search_stats()
+            image_cache_before = get_image_cache_stats()
             
             # 태그 확인 (GUI에서 입력받은 태그) - 파일명에 사용하기 위해 먼저 가져옴
             tag_name = self.gui.tag_var.get().strip()
@@ -5701,6 +5975,9 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                 self.gui.log("ℹ️ 태그 미설정 - 태그 변경 없이 진행")
                 tag_name = None  # 태그 적용 건너뛰기
             
+            # 결과는 처리하는 대로 파일 저널에 기록 (중간에 죽어도 다음 실행에서 이어서 저장)
+            result_writer = self._open_result_writer(result_filename)
+            
             # 이미 태그가 달린 상품 제외를 위해 "태그 없음" 필터 적용
             self.gui.log("🏷️ 태그 필터 적용: 태그 없음 (작업 완료 상품 제외)")
             self.filter_by_tag("태그 없음")
@@ -5871,6 +6148,11 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                         self.gui.log(f"  📍 row-index 범위: {first_idx}~{last_idx}")
                         self.gui.log(f"🚀 {len(products)}개 상품 처리 시작 (생성방식: {mode_name})")
                         
+                        # 기존상품명 모드: Gemini 호출은 배치 단위로 먼저 동시 처리
+                        pregenerated = {}
+                        if not is_excel_mode and title_mode not in (TITLE_MODE_IMAGE_FIRST, TITLE_MODE_VISION):
+                            pregenerated = self.pregenerate_titles(products)
+                        
                         # 배치 처리
                         batch_start_count = group_processed
                         for i, product in enumerate(products, 1):
@@ -5887,6 +6169,13 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                             try:
                                 is_mismatch = False  # v11: 이미지 불일치 여부
                                 
+                                # 이전에 생성한 상품명 (같은 원본명+이미지+프롬프트+모델)
+                                cache_mode = title_mode if title_mode in (TITLE_MODE_IMAGE_FIRST, TITLE_MODE_VISION) else TITLE_MODE_ORIGINAL_ONLY
+                                cached_title = None
+                                if not is_excel_mode and product.index not in pregenerated:
+                                    cached_title = self.lookup_cached_title(product, cache_mode)
+                                self._title_tls.fallback = False
+                                
                                 # ★ v3.3: 엑셀 적용 모드 처리
                                 if is_excel_mode:
                                     s_code = product.seller_code.strip()
@@ -5926,6 +6215,10 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                                         group_failed += 1
                                         continue
                                 
+                                elif cached_title:
+                                    new_title, detected_brands, forbidden_found = cached_title
+                                    self.gui.log(f"♻️ 캐시된 상품명 사용: {new_title[:40]}")
+                                
                                 elif title_mode == TITLE_MODE_IMAGE_FIRST:
                                     similar_titles = []
                                     
@@ -6046,6 +6339,7 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                                             product.original_title, 
                                             similar_titles
                                         )
+                                        self.store_generated_title(product, cache_mode, (new_title, detected_brands, forbidden_found))
                                 elif title_mode == TITLE_MODE_VISION:
                                     # Vision 분석 모드 (1회 API 호출로 바로 최종 상품명 생성)
                                     new_title = ""
@@ -6069,168 +6363,32 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                                     else:
                                         self.gui.log("⚠️ 이미지 없음 → 기존상품명만 사용")
                                     
+                                    if new_title:
+                                        self.store_generated_title(product, cache_mode, (new_title, detected_brands, forbidden_found))
                                     # Vision 실패 시 기존상품명 기반으로 생성
-                                    if not new_title:
+                                    else:
                                         self.gui.log("ℹ️ Vision 실패 - 원본 기반으로 생성")
                                         new_title, detected_brands, forbidden_found = self.generate_title_original_only(product.original_title)
+                                elif product.index in pregenerated:
+                                    new_title, detected_brands, forbidden_found = pregenerated[product.index]
+                                    self.gui.log(f"ℹ️ 기존상품명 기반 (미리 생성): {new_title[:40]}")
                                 else:
                                     self.gui.log("ℹ️ 기존상품명 기반으로 생성")
-                                    new_title, detected_brands, forbidden_found = self.generate_title_original_only(product.original_title)
-                                
-                                # 적용할 상품명 결정 (상품명 1개만 생성하므로 바로 적용)
-                                apply_title = new_title
-                                
-                                # v3.5: 상품명 1개만 생성하므로 new_title2, new_title3은 빈 값으로 초기화
-                                # (is_mismatch 경로에서만 설정되던 변수들이라 여기서 기본값 설정 필요)
-                                try:
-                                    new_title2
-                                except NameError:
-                                    new_title2 = ""
-                                try:
-                                    new_title3
-                                except NameError:
-                                    new_title3 = ""
-                                
-                                # ✅ 제거단어 적용 (상품명에서 무조건 삭제)
-                                if REMOVE_WORDS:
-                                    original_apply = apply_title
-                                    apply_title = apply_remove_words(apply_title, REMOVE_WORDS)
-                                    new_title = apply_remove_words(new_title, REMOVE_WORDS)
-                                    if original_apply != apply_title:
-                                        self.gui.log(f"🗑️ 제거단어 적용: {original_apply} → {apply_title}")
+                                    new_title, detected_brands, forbidden_found = self._generate_original_cached(product)
                                 
-                                # ✅ 1단계: 패턴 기반 위험 감지
-                                danger_check = detect_dangerous_product(apply_title)
-                                is_dangerous = danger_check['is_dangerous']
-                                danger_categories = danger_check['categories']
-                                danger_words = danger_check['all_words']
-                                
-                                # ✅ 2단계: 위험 단어 발견 시 맥락 분석 (Claude)
-                                safe_words = set()  # 안전 판정 받은 단어들
-                                if is_dangerous and danger_words:
-                                    self.gui.log(f"🔍 위험 단어 감지: {', '.join(danger_words[:3])} - 맥락 분석 중...")
-                                    
-                                    # Claude로 맥락 기반 검증
-                                    context_check = self.verify_danger_with_context(apply_title, danger_words)
-                                    is_dangerous = context_check['is_dangerous']
-                                    
-                                    if is_dangerous:
-                                        self.gui.log_warning(f"🚨 위험 확정: {context_check['reason']} (확신도: {context_check['confidence']})")
-                                    else:
-                                        self.gui.log(f"✅ 안전 판정: {context_check['reason']} (확신도: {context_check['confidence']})")
-                                        # 안전 판정 받은 단어들 기록
-                                        safe_words.update(danger_words)
-                                
-                                # ✅ 3단계: 의심단어 분류 처리 (API 호출 없이 패턴 기반)
-                                # ★ v2.5: 실제 상품명에 포함된 의심단어만 처리
-                                # ★ v3.5: 예외단어는 의심단어에서 미리 제외
-                                # Claude가 반환한 의심단어 중 생성된 상품명에 없는 것은 제외
-                                actual_suspects = []
-                                for word in detected_brands:
-                                    word_clean = word.strip()
-                                    if not word_clean:
-                                        continue
-                                    # 예외단어면 스킵 (의심단어로 분류 안 함)
-                                    if word_clean in EXCLUDED_WORDS or word_clean.lower() in EXCLUDED_WORDS:
-                                        continue
-                                    # apply_title (실제 적용될 상품명)에 포함된 것만
-                                    if word_clean in apply_title or word_clean.lower() in apply_title.lower():
-                                        actual_suspects.append(word_clean)
-                                
-                                # 실제 사용된 의심단어만 분류 (제거단어/예외단어 시트 참조)
-                                suspect_result = process_suspect_words(actual_suspects, self.remove_words, EXCLUDED_WORDS)
-                                
-                                # 유명 브랜드 발견 → 무조건 2차검수
-                                famous_brands_found = suspect_result['review']
-                                # 제거할 단어 (모델명, 셀러브랜드 등)
-                                words_to_remove = suspect_result['remove']
-                                # 사람이 판단해야 할 의심단어
-                                ambiguous_words = suspect_result['suspect']
-                                # 안전하다고 판단된 단어 (일반 한글단어 등)
-                                keep_words = set(suspect_result['keep'])
-                                
-                                # 제거 대상 단어들 상품명에서 제거
-                                if words_to_remove:
-                                    removed_words = [w[0] for w in words_to_remove]
-                                    original_apply = apply_title
-                                    for word, reason in words_to_remove:
-                                        apply_title = apply_title.replace(word, "").strip()
-                                        new_title = new_title.replace(word, "").strip() if new_title else ""
-                                        new_title2 = new_title2.replace(word, "").strip() if new_title2 else ""
-                                        new_title3 = new_title3.replace(word, "").strip() if new_title3 else ""
-                                    # 연속 공백 정리
-                                    apply_title = re.sub(r'\s+', ' ', apply_title).strip()
-                                    new_title = re.sub(r'\s+', ' ', new_title).strip() if new_title else ""
-                                    new_title2 = re.sub(r'\s+', ' ', new_title2).strip() if new_title2 else ""
-                                    new_title3 = re.sub(r'\s+', ' ', new_title3).strip() if new_title3 else ""
-                                    if original_apply != apply_title:
-                                        self.gui.log(f"🗑️ 자동 제거: {', '.join(removed_words)}")
-                                
-                                # 안전 판정 받은 단어 제외 (맥락분석 + 단어분석)
-                                # detected_brands에서 'keep'으로 분류된 단어도 제거
-                                filtered_brands = []
-                                for b in detected_brands:
-                                    if b in safe_words:
-                                        continue
-                                    if b in keep_words:
-                                        continue
-                                    filtered_brands.append(b)
-                                
-                                # detected_brands 업데이트 (결과 파일에 반영됨)
-                                detected_brands = filtered_brands
-                                
-                                # 최종 의심단어 판단
-                                # - 유명 브랜드 → 2차검수
-                                # - 애매한 단어 → 의심단어 리스트에 추가 (사람이 판단)
-                                # - 제거된 단어 → 작업완료 (로그만)
-                                has_famous_brand = len(famous_brands_found) > 0
-                                has_ambiguous = len(ambiguous_words) > 0
-                                
-                                if has_famous_brand:
-                                    brand_names = [w[0] for w in famous_brands_found]
-                                    self.gui.log_warning(f"🚨 유명 브랜드 발견: {', '.join(brand_names)} → 2차검수")
-                                    is_suspicious = True
-                                elif has_ambiguous:
-                                    ambig_names = [w[0] for w in ambiguous_words]
-                                    self.gui.log_warning(f"⚠️ 미확인 단어: {', '.join(ambig_names)} → 의심단어로 분류")
-                                    # 애매한 단어는 결과 데이터의 suspicious에 포함됨 (나중에 수집)
-                                    is_suspicious = False  # 2차검수 아님, 작업완료 처리
-                                else:
-                                    is_suspicious = False
-                                
-                                # 태그 결정 로직:
-                                # - 이미지 불일치 확정 → 2차검수
-                                # - 위험/금지단어 → 2차검수
-                                # - 의심단어 발견 → 2차검수 (브랜드, 피규어 등)
-                                # - 그 외 → 기본 태그
-                                if title_mode == TITLE_MODE_IMAGE_FIRST and is_mismatch:
-                                    actual_tag = SECOND_CHECK_TAG
-                                elif is_dangerous or forbidden_found or is_suspicious:
-                                    actual_tag = SECOND_CHECK_TAG
-                                else:
-                                    actual_tag = tag_name
+                                # 제거단어/위험/의심단어 검수 → 적용할 상품명 + 태그 결정
+                                apply_title, actual_tag, result_row = self.finalize_title(
+                                    product, new_title, detected_brands, forbidden_found, tag_name,
+                                    force_review=(title_mode == TITLE_MODE_IMAGE_FIRST and is_mismatch),
+                                    group_name=group_name
+                                )
                                 
                                 # 태그 적용하여 업데이트 (선택된 상품명 적용)
                                 if self.update_product_title(product, apply_title, actual_tag):
                                     group_processed += 1
                                     
-                                    # 결과 데이터에 저장
-                                    result_data.append({
-                                        'group': group_name or '(현재 마켓)',
-                                        'bulsaja_id': product.seller_code,
-                                        'code': product.seller_code,
-                                        'original': product.original_title,
-                                        'new': new_title,  # 생성된 상품명
-                                        'suspicious': detected_brands,
-                                        'row_index': product.index,
-                                        'is_dangerous': is_dangerous or forbidden_found,  # 진짜 위험 또는 금지단어 (빨간색)
-                                        'danger_categories': danger_categories,
-                                        'forbidden_found': forbidden_found,  # 금지단어 발견 여부
-                                        'is_suspicious': is_suspicious,  # 유명브랜드 발견 여부 (노란색)
-                                        'famous_brands': [w[0] for w in famous_brands_found] if famous_brands_found else [],
-                                        'removed_words': [w[0] for w in words_to_remove] if words_to_remove else [],
-                                        'ambiguous_words': [w[0] for w in ambiguous_words] if ambiguous_words else [],
-                                    })
+                                    # 결과 저널에 기록 (메모리에 모아두지 않음)
+                                    result_writer.append(result_row)
                                     
                                     # 진행 상황 업데이트
                                     self.gui.update_progress(current_num, count, group_processed, group_failed)
@@ -6238,7 +6396,9 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                                     group_failed += 1
                                     self.gui.update_progress(current_num, count, group_processed, group_failed)
                                 
-                                time.sleep(1.5)  # 상품 간 대기 (API 과부하 방지)
+                                # 상품 간 대기 (API 과부하 방지) - 동시 생성된 상품명은 스케줄러가 키별 한도 관리
+                                if product.index not in pregenerated:
+                                    time.sleep(1.5)
                                 
                             except Exception as e:
                                 self.gui.log(f"❌ 처리 실패: {e}")
@@ -6276,83 +6436,42 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
             
             # ========== Claude 문맥 기반 위험 분석 (추가 검증) ==========
             # 중단되어도 그때까지 수집된 데이터로 분석 진행
-            if result_data:
+            # 이번 실행 결과(resumed_count번부터)를 저널에서 RISK_ANALYSIS_CHUNK개씩 다시 읽어서 분석
+            result_count = result_writer.count - result_writer.resumed_count
+            danger_count = 0
+            if result_count:
                 self.gui.log(f"\n{'='*50}")
                 self.gui.log("🔍 상품 위험도 추가 분석 중 (문맥 기반)...")
                 self.gui.log(f"{'='*50}")
                 
-                # 분석용 데이터 준비
-                products_for_analysis = [
-                    {'index': i, 'title': r['new'], 'original': r['original']}
-                    for i, r in enumerate(result_data)
-                ]
-                
-                # Claude 분석 호출
-                risk_result = self.analyze_products_risk(products_for_analysis)
-                
-                # 위험상품 처리 (패턴 기반에서 놓친 것만)
-                danger_items = risk_result.get('danger', [])
                 newly_found = []  # 새로 발견된 위험 상품
-                
-                if danger_items:
-                    all_danger_keywords = []
-                    
-                    for item in danger_items:
-                        idx = item.get('index', -1)
-                        if 0 <= idx < len(result_data):
-                            # 이미 위험으로 표시된 것은 스킵
-                            if result_data[idx]['is_dangerous']:
-                                continue
-                            
-                            # 새로 발견된 위험 상품
-                            newly_found.append(item)
-                            
-                            # result_data 업데이트
-                            result_data[idx]['is_dangerous'] = True
-                            result_data[idx]['danger_categories'] = {'detected': item.get('keywords', [])}
-                            
-                            # 위험 키워드 수집
-                            all_danger_keywords.extend(item.get('keywords', []))
-                            
-                            # 태그 변경 (패턴 기반에서 안전→위험으로 "위험상품" 태그 적용)
-                            row_index = result_data[idx].get('row_index')
-                            if row_index is not None:
-                                try:
-                                    row = self.main_driver.find_element(
-                                        By.CSS_SELECTOR, f"div[role='row'][row-index='{row_index}']"
-                                    )
-                                    self.gui.log(f"🏷️ [위험상품] 태그 적용 시도...")
-                                    if self._apply_tag_to_row(row, row_index, "위험상품"):
-                                        self.gui.log(f"  ✅ [위험상품] 태그 적용 완료")
-                                except Exception as e:
-                                    self.gui.log(f"  ⚠️ [위험상품] 태그 적용 실패: {e}")
-                                    pass
-                    
-                    # 새로 발견된 위험 상품 로그 (빨간색 + 아이콘)
-                    if newly_found:
-                        self.gui.log_warning(f"\n🚨 추가 위험상품 {len(newly_found)}개 감지! (문맥 분석)")
-                        for item in newly_found:
-                            self.gui.log_warning(f"  • {item['title'][:40]}...")
-                            self.gui.log_warning(f"    이유: {item.get('reason', '')}")
-                    
-                    # ⚠️ 자동 금지단어 추가 제거 - 의심단어로만 표시
-                    # 위험 키워드는 엑셀 파일에 의심단어로 기록됨
-                    if all_danger_keywords:
-                        unique_keywords = list(set(all_danger_keywords))
-                        self.gui.log(f"📝 의심단어 {len(unique_keywords)}개 발견 (자동 추가 안 함)")
-                
-                # 의심 항목 수집
-                suspect_items = risk_result.get('suspect', [])
-                suspect_keywords = []
-                for item in suspect_items:
-                    suspect_keywords.extend(item.get('keywords', []))
-                
-                # 기존 브랜드 의심 + 새로운 의심 통합
-                all_suspects = []
-                for r in result_data:
-                    all_suspects.extend(r['suspicious'])
-                all_suspects.extend(suspect_keywords)
-                confirmed_suspects = list(set(all_suspects))  # 중복 제거
+                all_danger_keywords = []
+                all_suspects = set()  # 기존 브랜드 의심 + 새로운 의심 통합 (중복 제거)
+                chunk = []
+                for index, r in result_writer.records(result_writer.resumed_count):
+                    chunk.append((index, r))
+                    if len(chunk) >= RISK_ANALYSIS_CHUNK:
+                        danger_count += self._analyze_result_chunk(
+                            chunk, result_writer, newly_found, all_danger_keywords, all_suspects)
+                        chunk = []
+                if chunk:
+                    danger_count += self._analyze_result_chunk(
+                        chunk, result_writer, newly_found, all_danger_keywords, all_suspects)
+                
+                # 새로 발견된 위험 상품 로그 (빨간색 + 아이콘)
+                if newly_found:
+                    self.gui.log_warning(f"\n🚨 추가 위험상품 {len(newly_found)}개 감지! (문맥 분석)")
+                    for item in newly_found:
+                        self.gui.log_warning(f"  • {item['title'][:40]}...")
+                        self.gui.log_warning(f"    이유: {item.get('reason', '')}")
+                
+                # ⚠️ 자동 금지단어 추가 제거 - 의심단어로만 표시
+                # 위험 키워드는 엑셀 파일에 의심단어로 기록됨
+                if all_danger_keywords:
+                    unique_keywords = list(set(all_danger_keywords))
+                    self.gui.log(f"📝 의심단어 {len(unique_keywords)}개 발견 (자동 추가 안 함)")
+                
+                confirmed_suspects = list(all_suspects)
                 
                 # 의심단어 패널 업데이트
                 if confirmed_suspects:
@@ -6374,12 +6493,11 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                     self.gui.update_suspect_list([])
             
             # 결과 파일 저장
-            self._save_result_file(result_filename, result_data)
+            result_filename = self._close_result_writer(result_writer)
             
             # 위험 상품 통계
-            danger_count = sum(1 for r in result_data if r.get('is_dangerous', False))
-            safe_count = len(result_data) - danger_count
-            
+            safe_count = result_count - danger_count
+
             # 최종 결과
             self.gui.log(f"\n{'#'*60}")
             self.gui.log(f"✅ 전체 완료: 성공 {grand_total_processed} / 실패 {grand_total_failed}")
@@ -6388,6 +6506,21 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
                 self.gui.log(f"✅ 안전 상품: {safe_count}개")
             if grand_total_skipped > 0:
                 self.gui.log(f"ℹ️ 이미지 확장자 없음: {grand_total_skipped}개")
+            cache_stats = {k: v - title_cache_before.get(k, 0) for k, v in get_title_cache_stats().items()}
+            cache_lookups = cache_stats['hit'] + cache_stats['miss']
+            if cache_lookups:
+                self.gui.log(f"♻️ 상품명 캐시: 적중 {cache_stats['hit']} / 신규 {cache_stats['miss']} "
+                             f"(적중률 {cache_stats['hit'] / cache_lookups:.0%})")
+            elif cache_stats['refresh']:
+                self.gui.log(f"♻️ 상품명 캐시 무시: {cache_stats['refresh']}개 새로 생성")
+            similar_stats = {k: v - similar_cache_before.get(k, 0) for k, v in get_similar_search_stats().items()}
+            if similar_stats['hit'] + similar_stats['near']:
+                self.gui.log(f"♻️ 이미지 검색 캐시: 적중 {similar_stats['hit'] + similar_stats['near']} "
+                             f"/ 새 검색 {similar_stats['miss']}")
+            image_stats = {k: v - image_cache_before.get(k, 0) for k, v in get_image_cache_stats().items()}
+            if image_stats['hit'] + image_stats['miss']:
+                self.gui.log(f"♻️ 이미지 캐시: 디스크 {image_stats['hit'] + image_stats['revalidated']} "
+                             f"/ 다운로드 {image_stats['miss'] + image_stats['changed']}")
             self.gui.log(f"📄 결과 저장: {os.path.abspath(result_filename)}")
             self.gui.log(f"{'#'*60}")
             
@@ -6401,131 +6534,330 @@ SUSPECT: (브랜드/캐릭터/고유명사. 없으면 "없음")"""
             self.is_running = False
             self.gui.on_finished()
     
-    def _save_result_file(self, filename: str, data: list):
-        """결과 파일 저장 (xlsx 또는 csv)"""
-        if OPENPYXL_AVAILABLE and filename.endswith('.xlsx'):
-            self._save_xlsx(filename, data)
+    # ==================== 헤드리스 API 파이프라인 ====================
+    def fetch_untagged_products(self, group_name: Optional[str], count: int) -> List[ProductRow]:
+        """'태그 없음' 상품을 API로 한 번에 조회 (HEADLESS_FETCH_PAGE 단위 페이지)"""
+        filter_model = {
+            "groupFile": {"filterType": "text", "type": "contains", "filter": "태그 없음"}
+        }
+        if group_name:
+            filter_model["marketGroupName"] = {"filterType": "text", "type": "equals", "filter": group_name}
+
+        products = []
+        while len(products) < count and self.is_running:
+            start = len(products)
+            end = start + min(HEADLESS_FETCH_PAGE, count - start)
+            items, total = self.api_client.get_products(start, end, filter_model)
+            products.extend(self._product_row_from_api(item, start + i) for i, item in enumerate(items))
+            if len(items) < end - start or len(products) >= total:
+                break
+        return products
+
+    def write_titles_batched(self, updates: List[Tuple[ProductRow, str, Optional[str]]]) -> Set[str]:
+        """상품명 + 태그 일괄 반영 (HEADLESS_WRITE_BATCH개씩 요청 1번, 태그는 태그별로 묶어서)
+        - 배치 요청 실패 시 해당 배치만 상품별로 다시 시도
+        Returns: 반영 성공한 상품 ID 집합
+        """
+        written = set()
+        for i in range(0, len(updates), HEADLESS_WRITE_BATCH):
+            chunk = updates[i:i + HEADLESS_WRITE_BATCH]
+            try:
+                self.api_client.update_product_names([{"id": p.bulsaja_id, "name": t} for p, t, _ in chunk])
+                written.update(p.bulsaja_id for p, _, _ in chunk)
+            except Exception as e:
+                self.gui.log(f"⚠️ 상품명 일괄 수정 실패 ({len(chunk)}개) - 개별 재시도: {e}")
+                for product, title, _ in chunk:
+                    try:
+                        self.api_client.update_single_product(product.bulsaja_id, title)
+                        written.add(product.bulsaja_id)
+                    except Exception as e2:
+                        self.gui.log(f"❌ 상품명 수정 실패 ({product.seller_code}): {e2}")
+            self.gui.update_progress_detail(f"상품명 반영 {len(written)}/{len(updates)}")
+
+        # 태그: 상품명이 반영된 상품만, 태그별로 묶어서 적용
+        by_tag: Dict[str, List[str]] = {}
+        for product, _, tag in updates:
+            if tag and product.bulsaja_id in written:
+                by_tag.setdefault(tag, []).append(product.bulsaja_id)
+        for tag, ids in by_tag.items():
+            for i in range(0, len(ids), HEADLESS_WRITE_BATCH):
+                chunk = ids[i:i + HEADLESS_WRITE_BATCH]
+                try:
+                    self.api_client.apply_tag(chunk, tag)
+                except Exception as e:
+                    self.gui.log(f"⚠️ 태그 [{tag}] 적용 실패 ({len(chunk)}개): {e}")
+            self.gui.log(f"🏷️ 태그 [{tag}]: {len(ids)}개")
+        return written
+
+    def process_products_headless(self, groups: List[str], count: int, title_mode: str = TITLE_MODE_ORIGINAL_ONLY) -> Dict:
+        """브라우저 없이 API만으로 상품명 변환 (서버/무인 실행용)
+        그룹별: 일괄 조회 → 모든 Gemini 키로 동시 생성 → 검수 → 일괄 반영
+        - 이미지+기존상품명(AliPrice) 모드는 브라우저가 필요해서 기존상품명 모드로 대체
+        """
+        if title_mode == TITLE_MODE_IMAGE_FIRST:
+            self.gui.log("ℹ️ 헤드리스 모드는 AliPrice 검색 불가 → 기존상품명 모드로 진행")
+            title_mode = TITLE_MODE_ORIGINAL_ONLY
+        if title_mode != TITLE_MODE_VISION:
+            title_mode = TITLE_MODE_ORIGINAL_ONLY
+
+        tag_name = self.gui.tag_var.get().strip() or None
+        if tag_name:
+            self.api_client.create_tag(tag_name)
+
+        result_dir = "result"
+        os.makedirs(result_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%y%m%d_%H%M")
+        group_name_for_file = groups[0] if (groups and groups[0]) else "전체"
+        result_filename = os.path.join(result_dir, f"{group_name_for_file}_{tag_name or f'작업_{timestamp}'}.xlsx")
+
+        result_writer = self._open_result_writer(result_filename)
+        total_processed = 0
+        total_failed = 0
+        title_cache_before = get_title_cache_stats()
+        image_cache_before = get_image_cache_stats()
+        started = time.time()
+        self.gui.reset_progress()
+
+        for group_idx, group_name in enumerate(groups or [None]):
+            if not self.is_running:
+                break
+            label = group_name or "(전체)"
+            self.gui.log(f"\n{'#'*60}")
+            self.gui.log(f"📁 그룹 {group_idx + 1}/{len(groups or [None])}: {label}")
+
+            # 1) 일괄 조회
+            products = [p for p in self.fetch_untagged_products(group_name, count) if p.bulsaja_id]
+            self.gui.log(f"📦 API로 {len(products)}개 상품 로드")
+            if not products:
+                continue
+
+            # 2) 동시 생성 (캐시 적중분 제외)
+            generated = self.pregenerate_titles(products, title_mode)
+
+            # 3) 검수 + 태그 결정
+            updates = []
+            group_rows = {}
+            for product in products:
+                if product.index not in generated:
+                    total_failed += 1
+                    continue
+                new_title, detected_brands, forbidden_found = generated[product.index]
+                try:
+                    apply_title, actual_tag, result_row = self.finalize_title(
+                        product, new_title, detected_brands, forbidden_found, tag_name, group_name=group_name)
+                except Exception as e:
+                    self.gui.log(f"❌ 검수 실패 ({product.seller_code}): {e}")
+                    total_failed += 1
+                    continue
+                updates.append((product, apply_title, actual_tag))
+                group_rows[product.bulsaja_id] = result_row
+
+            # 4) 일괄 반영 (중지돼도 생성된 것까지는 반영)
+            written = self.write_titles_batched(updates)
+            for pid, row in group_rows.items():
+                if pid in written:
+                    result_writer.append(row)
+            total_processed += len(written)
+            total_failed += len(updates) - len(written)
+            self.gui.update_progress(total_processed + total_failed, total_processed + total_failed,
+                                     total_processed, total_failed)
+            self.gui.log(f"📊 [{label}] 결과: 성공 {len(written)} / 실패 {len(products) - len(written)}")
+
+        if result_writer.count:
+            result_filename = self._close_result_writer(result_writer)
         else:
-            self._save_csv(filename.replace('.xlsx', '.csv'), data)
-    
-    def _save_xlsx(self, filename: str, data: list):
-        """xlsx 파일로 저장 (색상 포함)"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "결과"
-        
-        # 스타일 정의
-        yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        red_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-        green_fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-        red_font = Font(color="FF0000", bold=True)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        
-        # 헤더
-        headers = ['마켓 그룹', '불사자 ID', '판매자 상품코드', '기존 상품명', '새 상품명', '주의단어', '위험등급', '위험카테고리']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-        
-        # 데이터
-        for row_idx, item in enumerate(data, 2):
-            ws.cell(row=row_idx, column=1, value=item['group'])
-            ws.cell(row=row_idx, column=2, value=item.get('bulsaja_id', ''))
-            ws.cell(row=row_idx, column=3, value=item['code'])
-            ws.cell(row=row_idx, column=4, value=item['original'])
-            
-            # 새 상품명
-            new_title_cell = ws.cell(row=row_idx, column=5, value=item['new'])
-            
-            # 위험 등급 판정
-            is_dangerous = item.get('is_dangerous', False)
-            is_suspicious = item.get('is_suspicious', False) or bool(item.get('suspicious'))
-            categories = item.get('danger_categories', {})
-            
-            # 위험 등급 결정
-            danger_level = ""
-            if is_dangerous:
-                if categories.get('weapon') or categories.get('drug') or categories.get('illegal'):
-                    danger_level = "🚫 판매불가"
-                else:
-                    danger_level = "⚠️ 위험"
-                new_title_cell.fill = red_fill
-            elif is_suspicious:
-                danger_level = "🔶 브랜드주의"
-                new_title_cell.fill = yellow_fill
-            
-            # 주의단어 (빨간색 글씨 + 노란 배경)
-            if item.get('suspicious'):
-                suspicious_cell = ws.cell(row=row_idx, column=6, value=', '.join(item['suspicious']))
-                suspicious_cell.font = red_font
-                suspicious_cell.fill = yellow_fill
-            
-            # 위험등급 표시
-            if danger_level:
-                danger_cell = ws.cell(row=row_idx, column=7, value=danger_level)
-                if "판매불가" in danger_level or "위험" in danger_level:
-                    danger_cell.font = red_font
-                    danger_cell.fill = red_fill
-                elif "브랜드" in danger_level:
-                    danger_cell.font = Font(color="FF6600", bold=True)
-                    danger_cell.fill = yellow_fill
-            
-            # 위험 카테고리
-            if categories:
-                cat_texts = []
-                for cat, words in categories.items():
-                    if words:
-                        cat_name = get_danger_category_name(cat)
-                        cat_texts.append(f"{cat_name}: {', '.join(words[:3])}")
-                if cat_texts:
-                    cat_cell = ws.cell(row=row_idx, column=8, value='\n'.join(cat_texts))
-                    cat_cell.font = red_font
-        
-        # 열 너비 조정
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 28
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 50
-        ws.column_dimensions['E'].width = 50
-        ws.column_dimensions['F'].width = 30  # 주의단어
-        ws.column_dimensions['G'].width = 15  # 위험등급
-        ws.column_dimensions['H'].width = 60  # 위험 카테고리/설명
-        
-        wb.save(filename)
-        self.gui.log(f"✅ xlsx 파일 저장 완료")
-    
-    def _save_csv(self, filename: str, data: list):
-        """csv 파일로 저장 (색상 없음)"""
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            # 헤더
-            headers = ['마켓 그룹', '불사자 ID', '판매자 상품코드', '기존 상품명', '새 상품명', '주의단어', '위험등급']
-            writer.writerow(headers)
-            
-            for item in data:
-                # 위험등급 결정
-                danger_level = ""
-                if item.get('is_dangerous'):
-                    categories = item.get('danger_categories', {})
-                    if categories.get('weapon') or categories.get('drug') or categories.get('illegal'):
-                        danger_level = "판매불가"
-                    else:
-                        danger_level = "위험"
-                elif item.get('is_suspicious') or item.get('suspicious'):
-                    danger_level = "브랜드주의"
-                
-                writer.writerow([
-                    item['group'],
-                    item.get('bulsaja_id', ''),
-                    item['code'],
-                    item['original'],
-                    item['new'],
-                    ', '.join(item['suspicious']) if item['suspicious'] else '',
-                    danger_level
-                ])
-        self.gui.log(f"✅ csv 파일 저장 완료 (색상 미지원)")
+            result_writer.discard()
+
+        elapsed = time.time() - started
+        cache_stats = {k: v - title_cache_before.get(k, 0) for k, v in get_title_cache_stats().items()}
+        self.gui.log(f"\n{'#'*60}")
+        self.gui.log(f"✅ 헤드리스 완료: 성공 {total_processed} / 실패 {total_failed} ({elapsed:.0f}초)")
+        if cache_stats['hit'] + cache_stats['miss']:
+            self.gui.log(f"♻️ 상품명 캐시: 적중 {cache_stats['hit']} / 신규 {cache_stats['miss']}")
+        image_stats = {k: v - image_cache_before.get(k, 0) for k, v in get_image_cache_stats().items()}
+        if image_stats['hit'] + image_stats['miss']:
+            self.gui.log(f"♻️ 이미지 캐시: 디스크 {image_stats['hit'] + image_stats['revalidated']} "
+                         f"/ 다운로드 {image_stats['miss'] + image_stats['changed']}")
+        if self.gemini_manager:
+            self.gui.log(f"🔑 {self.gemini_manager.scheduler.summary_text()}")
+        if result_writer.count:
+            self.gui.log(f"📄 결과 저장: {os.path.abspath(result_filename)}")
+        return {'processed': total_processed, 'failed': total_failed, 'elapsed': elapsed,
+                'result_file': result_filename if result_writer.count else None}
+
+    def _open_result_writer(self, filename: str) -> StreamingSheetWriter:
+        """결과 파일 스트리밍 저장 시작 (같은 그룹/태그 파일의 중단된 기록이 있으면 이어서)"""
+        writer = StreamingSheetWriter(filename, {
+            "결과": {
+                'headers': ['마켓 그룹', '불사자 ID', '판매자 상품코드', '기존 상품명', '새 상품명',
+                            '주의단어', '위험등급', '위험카테고리'],
+                'row': self._result_row_cells,
+                'widths': {'A': 15, 'B': 28, 'C': 20, 'D': 50, 'E': 50,
+                           'F': 30,   # 주의단어
+                           'G': 15,   # 위험등급
+                           'H': 60},  # 위험 카테고리/설명
+            },
+        }, RESULT_SHEET_STYLES, resume=True)
+        if writer.resumed_count:
+            self.gui.log(f"📄 이전 중단 결과 {writer.resumed_count}개에 이어서 기록")
+        return writer
+
+    def _close_result_writer(self, writer: StreamingSheetWriter) -> str:
+        """결과 파일 저장 (openpyxl 없으면 csv) → 저장된 파일명"""
+        filename = writer.close()
+        if filename.endswith('.xlsx'):
+            self.gui.log(f"✅ xlsx 파일 저장 완료 ({writer.count}행)")
+        else:
+            self.gui.log(f"✅ csv 파일 저장 완료 ({writer.count}행, 색상 미지원)")
+        return filename
+
+    @staticmethod
+    def _result_row_cells(item: dict) -> list:
+        """결과 행 1개 → 엑셀 셀 (값 또는 (값, 스타일명))"""
+        # 위험 등급 판정
+        is_dangerous = item.get('is_dangerous', False)
+        is_suspicious = item.get('is_suspicious', False) or bool(item.get('suspicious'))
+        categories = item.get('danger_categories') or {}
+        
+        new_title = item['new']
+        danger_level = None
+        if is_dangerous:
+            if categories.get('weapon') or categories.get('drug') or categories.get('illegal'):
+                danger_level = ("🚫 판매불가", 'danger_mark')
+            else:
+                danger_level = ("⚠️ 위험", 'danger_mark')
+            new_title = (new_title, 'danger')
+        elif is_suspicious:
+            danger_level = ("🔶 브랜드주의", 'brand_mark')
+            new_title = (new_title, 'suspect')
+        
+        # 주의단어 (빨간색 글씨 + 노란 배경)
+        suspicious = (', '.join(item['suspicious']), 'suspect_word') if item.get('suspicious') else None
+        
+        # 위험 카테고리
+        cat_texts = []
+        for cat, words in categories.items():
+            if words:
+                cat_texts.append(f"{get_danger_category_name(cat)}: {', '.join(words[:3])}")
+        category = ('\n'.join(cat_texts), 'red_text') if cat_texts else None
+        
+        return [item['group'], item.get('bulsaja_id', ''), item['code'], item['original'],
+                new_title, suspicious, danger_level, category]
+
+# ==================== 헤드리스 실행 (디스플레이 없는 서버용) ====================
+class _HeadlessVar:
+    """tk 변수 대신 쓰는 값 홀더 (.get()/.set()만 지원)"""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class HeadlessGUI:
+    """BulsajaAutoFiller가 참조하는 App 속성/메서드만 제공 - 로그는 표준출력"""
+
+    def __init__(self, config: dict, args):
+        self.model_var = _HeadlessVar(config.get('model') or "gemini-2.0-flash")
+        self.vision_model_var = _HeadlessVar(config.get('vision_model') or GEMINI_TEXT_MODEL)
+        self.temp_var = _HeadlessVar(config.get('temperature') or "0.7")
+        self.title_length_var = _HeadlessVar("35")
+        self.title_mode_var = _HeadlessVar(args.mode)
+        self.tag_var = _HeadlessVar(args.tag or f"작업완료_{datetime.now().strftime('%y%m%d_%H%M')}")
+        self.use_paid_api_var = _HeadlessVar(not args.free)
+        self.title_cache_refresh_var = _HeadlessVar(args.refresh_cache)
+        self.current_market_group = None
+        self.current_tag_filter = None
+        self._last_progress = 0.0
+
+    def log(self, msg: str):
+        print(f"{datetime.now().strftime('%H:%M:%S')} {msg}", flush=True)
+
+    def log_warning(self, msg: str):
+        self.log(msg)
+
+    def update_progress(self, current: int, total: int, success: int = 0, failed: int = 0):
+        self.log(f"진행: {current}/{total} (성공 {success} / 실패 {failed})")
+
+    def update_progress_detail(self, text: str):
+        # 동시 생성 중에는 상품마다 호출됨 → 5초에 한 번만 출력
+        if time.time() - self._last_progress >= 5:
+            self._last_progress = time.time()
+            self.log(f"⏳ {text}")
+
+    def reset_progress(self):
+        self._last_progress = 0.0
+
+    def update_suspect_list(self, words: list):
+        pass
+
+    def update_suspect_list_with_desc(self, words: list, descriptions: dict):
+        pass
+
+    def on_finished(self):
+        pass
+
+
+def run_headless(argv: List[str] = None) -> int:
+    """API 전용 상품명 변환 (브라우저는 토큰 추출에만 사용, --port 지정 시)
+
+    사용법:
+        python "5. bulsaja_title_maker_v3.5_gemini+one.py" --headless --groups "그룹1,그룹2" --count 1000
+        python "5. bulsaja_title_maker_v3.5_gemini+one.py" --headless --groups "그룹1" --mode vision --port 9222
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='불사자 상품명 변환 (헤드리스 API 모드)')
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--groups', default="", help='마켓 그룹명 (쉼표 구분, 생략 시 전체)')
+    parser.add_argument('--count', type=int, default=1000, help='그룹당 최대 상품 수')
+    parser.add_argument('--tag', help='작업 완료 태그 (생략 시 작업완료_날짜)')
+    parser.add_argument('--mode', default=TITLE_MODE_ORIGINAL_ONLY,
+                        choices=[TITLE_MODE_ORIGINAL_ONLY, TITLE_MODE_VISION], help='상품명 생성 방식')
+    parser.add_argument('--port', type=int, help='토큰 추출할 크롬 디버깅 포트 (생략 시 설정 파일 토큰)')
+    parser.add_argument('--free', action='store_true', help='Gemini 무료 등급 한도 적용')
+    parser.add_argument('--refresh-cache', action='store_true', help='상품명 캐시 무시하고 새로 생성')
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    gui = HeadlessGUI(config, args)
+    filler = BulsajaAutoFiller(gui)
+
+    access_token = config.get('access_token', '')
+    refresh_token = config.get('refresh_token', '')
+    if args.port:
+        ok, access_token, refresh_token = filler.extract_tokens_from_browser(args.port)
+        if not ok:
+            gui.log(f"❌ 포트 {args.port}에서 불사자 토큰을 찾을 수 없습니다")
+            return 1
+    if not access_token:
+        gui.log(f"❌ 토큰 없음 - {CONFIG_FILE}에 저장하거나 --port로 추출하세요")
+        return 1
+
+    success, msg, _ = filler.init_api_client(access_token, refresh_token)
+    gui.log(("✅ " if success else "❌ ") + msg)
+    if not success:
+        return 1
+
+    api_keys = config.get('gemini_api_keys') or [config.get('api_key', '')]
+    api_keys = [k for k in api_keys if k]
+    if not api_keys or not filler.setup_gemini_manager(api_keys):
+        gui.log(f"❌ Gemini API 키 없음 - {CONFIG_FILE}의 gemini_api_keys 확인")
+        return 1
+
+    groups = [g.strip() for g in args.groups.split(',') if g.strip()]
+    filler.is_running = True
+    try:
+        result = filler.process_products_headless(groups, args.count, args.mode)
+    except KeyboardInterrupt:
+        filler.is_running = False
+        gui.log("🛑 중지됨")
+        return 1
+    return 0 if result['failed'] == 0 else 2
+
 
 # ==================== GUI ====================
 class App(tk.Tk):
@@ -6820,13 +7152,16 @@ class App(tk.Tk):
         ttk.Label(model_row, text="모델:").pack(side="left")
         self.model_var = tk.StringVar(value="gemini-2.0-flash")
         ttk.Label(model_row, text="Gemini 2.0 Flash (빠름/안정)", foreground="blue").pack(side="left", padx=5)
+        # 이전에 생성한 상품명 재사용 안 함 (새로 생성해서 캐시 덮어씀)
+        self.title_cache_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(model_row, text="캐시 무시", variable=self.title_cache_refresh_var).pack(side="left", padx=5)
         
         # Vision 분석 모델 선택
         vision_model_row = ttk.Frame(right_frame)
         vision_model_row.pack(fill="x", pady=2)
         ttk.Label(vision_model_row, text="Vision:").pack(side="left")
-        self.vision_model_var = tk.StringVar(value="gemini-pro-vision")
-        ttk.Label(vision_model_row, text="Gemini Pro Vision (고정)", foreground="blue").pack(side="left", padx=5)
+        self.vision_model_var = tk.StringVar(value=GEMINI_TEXT_MODEL)
+        ttk.Label(vision_model_row, text="Gemini 2.0 Flash (고정)", foreground="blue").pack(side="left", padx=5)
         
         # Temperature
         temp_row = ttk.Frame(right_frame)
@@ -7025,6 +7360,11 @@ class App(tk.Tk):
         self.progress_stats = ttk.Label(progress_info, text="✅ 성공: 0  ❌ 실패: 0", font=("", 9))
         self.progress_stats.pack(side="right")
         
+        # Gemini 키별 사용 현황 (분당 사용/한도, 실행 중 요청, 휴식 중)
+        self.key_usage_label = ttk.Label(progress_frame, text="", font=("", 8), foreground="gray")
+        self.key_usage_label.pack(fill="x")
+        self.after(1000, self._poll_key_usage)
+        
         # ========== 로그 + 의심단어 (2:1 분할) ==========
         bottom_frame = ttk.Frame(main)
         bottom_frame.pack(fill="both", expand=True)
@@ -7896,6 +8236,13 @@ class App(tk.Tk):
             self.progress_stats.config(text=f"✅ 성공: {success}  ❌ 실패: {failed}")
         self.update_idletasks()
     
+    def _poll_key_usage(self):
+        """Gemini 키별 사용 현황 1초마다 갱신"""
+        manager = self.filler.gemini_manager
+        if manager:
+            self.key_usage_label.config(text=f"🔑 {manager.scheduler.summary_text()}")
+        self.after(1000, self._poll_key_usage)
+    
     def update_progress_detail(self, text: str):
         """진행 상세 정보 업데이트"""
         self.progress_detail.config(text=text)
@@ -8547,5 +8894,7 @@ class App(tk.Tk):
         ).start()
 
 if __name__ == "__main__":
+    if "--headless" in sys.argv:
+        sys.exit(run_headless())
     app = App()
     app.mainloop()
@@ -21,6 +21,7 @@ import time
 import threading
 import json
 import math
+import copy
 import requests
 import websocket
 from datetime import datetime
@@ -28,6 +29,7 @@ from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -43,7 +45,10 @@ from PyQt6.QtGui import QFont, QColor, QTextCharFormat, QTextCursor, QIcon
 from bulsaja_common import (
     filter_bait_options, DEFAULT_BAIT_KEYWORDS, STRONG_BAIT_KEYWORDS,
     select_main_option, BulsajaAPIClient as CommonAPIClient,
-    load_bait_keywords, KEYWORD_SAFE_CONTEXT_MAP, SAFE_CONTEXT_KEYWORDS
+    load_bait_keywords, KEYWORD_SAFE_CONTEXT_MAP, SAFE_CONTEXT_KEYWORDS,
+    resolve_category_cached, get_category_cache_stats, UploadJournal,
+    price_skus_batch, order_sku_indices, limit_sku_indices,
+    PRICE_ZERO, PRICE_BELOW_MIN, PRICE_ABOVE_MAX, BatchTagger
 )
 
 # ==================== 설정 ====================
@@ -459,9 +464,11 @@ class BulsajaAPIClient(CommonAPIClient):
             print(f"[TAG] 태그 생성 실패: {e}")
             return False
 
-    def apply_tag_to_products(self, product_ids: List[str], tag_name: str) -> Tuple[bool, int]:
+    def apply_tag_to_products(self, product_ids: List[str], tag_name: str, attempts: int = 3) -> Tuple[bool, int]:
         """
         상품들에 태그 적용
+        Args:
+            attempts: 서버 오류 시 시도 횟수 (BatchTagger처럼 호출측에서 재시도하면 1)
         Returns:
             (성공여부, 적용된 상품 수)
         """
@@ -478,8 +485,8 @@ class BulsajaAPIClient(CommonAPIClient):
                 self._created_tags_cache.add(tag_name)
 
         url = f"{self.BASE_URL}/sourcing/bulk-update-groups"
-        # 502/503 등 서버 오류 시 재시도 (최대 3회, 간격 2/4/8초)
-        for attempt in range(3):
+        # 502/503 등 서버 오류 시 재시도 (기본 최대 3회, 간격 2/4초)
+        for attempt in range(attempts):
             try:
                 response = self.session.post(url, json={
                     "productIds": product_ids,
@@ -490,24 +497,38 @@ class BulsajaAPIClient(CommonAPIClient):
                 return True, len(product_ids)
             except Exception as e:
                 is_server_error = "500" in str(e) or "502" in str(e) or "503" in str(e) or "504" in str(e)
-                if is_server_error and attempt < 2:
+                if is_server_error and attempt < attempts - 1:
                     wait = 2 ** (attempt + 1)  # 2, 4초
-                    print(f"[TAG] 서버 오류, {wait}초 후 재시도 ({attempt+1}/3): {e}")
+                    print(f"[TAG] 서버 오류, {wait}초 후 재시도 ({attempt+1}/{attempts}): {e}")
                     import time
                     time.sleep(wait)
                     continue
                 print(f"[TAG] 태그 적용 실패: {e}")
                 return False, 0
 
-    def search_category(self, keyword: str, market_type: str = "ss") -> Optional[Dict]:
+    def search_category(self, keyword: str, market_type: str = "ss", use_cache: bool = True) -> Optional[Dict]:
         """
         카테고리 검색 API
         Args:
             keyword: 검색 키워드 (상품명)
             market_type: 마켓 타입 (ss=스마트스토어, cp=쿠팡, esm=G마켓/옥션, est=11번가)
+            use_cache: 카테고리 캐시 사용 여부 (False면 항상 API 호출)
         Returns:
             첫 번째 매칭 카테고리 정보 또는 None
         """
+        if use_cache:
+            return resolve_category_cached(keyword, market_type, self.fetch_category_map)
+
+        category_map = self.fetch_category_map(keyword)
+        categories = (category_map or {}).get(market_type, [])
+        return categories[0] if categories else None  # 첫 번째 추천 카테고리
+
+    def fetch_category_map(self, keyword: str) -> Optional[Dict]:
+        """
+        카테고리 추천 API 호출 (전체 마켓 결과)
+        Returns:
+            {market_type: [카테고리, ...]} 또는 None (요청 실패)
+        """
         url = f"{self.BASE_URL}/manage/category/bulsaja_category"
         try:
             response = self.session.post(url, json={"keyword": keyword})
@@ -515,10 +536,7 @@ class BulsajaAPIClient(CommonAPIClient):
             result = response.json()
 
             if result.get('success'):
-                category_map = result.get('data', {}).get('categoryMap', {})
-                categories = category_map.get(market_type, [])
-                if categories:
-                    return categories[0]  # 첫 번째 추천 카테고리
+                return result.get('data', {}).get('categoryMap', {}) or {}
             return None
         except Exception as e:
             # print(f"[ERROR] 카테고리 검색 실패: {e}")
@@ -539,6 +557,11 @@ class BulsajaUploader:
         self.stats = {'success': 0, 'failed': 0, 'skipped': 0, 'duplicate_failed': 0, 'failed_ids': []}
         self._tagged_ids = set()
         self._tag_lock = threading.Lock()
+        # 실패 태그: 상품별 스레드 대신 태그별로 모아서 일괄 적용
+        # 재시도/백오프는 BatchTagger가 담당 → API는 1회만 요청, 적용 성공한 상품만 _tagged_ids에 기록
+        self.fail_tagger = BatchTagger(
+            lambda ids, tag: self.api_client.apply_tag_to_products(ids, tag, attempts=1),
+            on_applied=self._on_tags_applied)
 
         # 가격 설정
         self.price_settings = PriceSettings()
@@ -550,6 +573,11 @@ class BulsajaUploader:
         self._market_group_id_map: Dict[str, int] = {}
         # [v1.6 동일] 가격 필드명 캐시 (자동 감지용)
         self.origin_price_field = None
+        # 실행 단위 상세/전처리 캐시 (product_id → memo, 마켓 간 공유)
+        self._detail_memo: Dict[str, Dict] = {}
+        self._detail_memo_lock = threading.Lock()
+        # 상세 로그 파일 기록 락 (동시 업로드 시 로그 섞임 방지)
+        self._detail_log_lock = threading.Lock()
 
     def load_market_group_ids(self) -> Dict[str, int]:
         """마켓 그룹 목록 조회 후 name→id 매핑 생성"""
@@ -924,7 +952,16 @@ class BulsajaUploader:
             worker.log_signal.emit(f"🚀 업로드 시작: {len(group_names)}개 그룹, 마켓: {', '.join(target_markets)}")
 
             # 업로드 실행
+            cat_stats_before = get_category_cache_stats()
+            tag_stats_before = dict(self.fail_tagger.stats)
             self._run_upload(settings, worker, group_names, target_markets)
+            cat_stats = {k: v - cat_stats_before.get(k, 0) for k, v in get_category_cache_stats().items()}
+
+            # 남은 실패 태그 적용 대기
+            if self.fail_tagger.pending_count():
+                worker.log_signal.emit(f"🏷️ 실패 태그 적용 대기 중... ({self.fail_tagger.pending_count()}개)")
+                self.fail_tagger.flush()
+            tag_stats = {k: v - tag_stats_before.get(k, 0) for k, v in self.fail_tagger.stats.items()}
 
             # 완료 통계
             worker.log_signal.emit("")
@@ -934,6 +971,8 @@ class BulsajaUploader:
             worker.log_signal.emit(f"   ❌ 실패: {self.stats['failed']}개")
             worker.log_signal.emit(f"   🔁 중복실패: {self.stats['duplicate_failed']}개")
             worker.log_signal.emit(f"   ⏭️ 건너뜀: {self.stats['skipped']}개")
+            if cat_stats['hit'] or cat_stats['miss']:
+                worker.log_signal.emit(f"   🗂️ 카테고리 캐시: 적중 {cat_stats['hit']}회, API 검색 {cat_stats['miss']}회")
 
             if self.stats['failed_ids']:
                 worker.log_signal.emit("")
@@ -941,9 +980,11 @@ class BulsajaUploader:
                 for fail_id in self.stats['failed_ids']:
                     worker.log_signal.emit(f"   - {fail_id}")
 
-            if self._tagged_ids:
+            if tag_stats['queued']:
                 worker.log_signal.emit("")
-                worker.log_signal.emit(f"🏷️ 태그 적용됨: {len(self._tagged_ids)}개 상품")
+                worker.log_signal.emit(f"🏷️ 태그 적용됨: {tag_stats['applied']}개 상품 (요청 {tag_stats['requests']}회)")
+                if tag_stats['failed'] or self.fail_tagger.pending_count():
+                    worker.log_signal.emit(f"   ⚠️ 태그 미적용: {tag_stats['failed'] + self.fail_tagger.pending_count()}개")
 
             worker.log_signal.emit("=" * 50)
 
@@ -952,10 +993,14 @@ class BulsajaUploader:
             import traceback
             worker.log_signal.emit(traceback.format_exc())
         finally:
+            self.fail_tagger.flush()
             self.is_running = False
 
     def _run_upload(self, settings, worker, group_names, target_markets):
         """업로드 실행 (v2.0 독립 구현)"""
+        # 이전 실행의 상세 캐시 폐기 (설정/키워드가 바뀌었을 수 있음)
+        self.clear_detail_memo()
+
         # 가격 설정 적용
         self.price_settings.exchange_rate = settings.get('exchange_rate', 215)
         self.price_settings.card_fee_rate = settings.get('card_fee', 3.3)
@@ -1056,6 +1101,7 @@ class BulsajaUploader:
                         self.stats['failed'] += 1
                         worker.log_signal.emit(f"   ❌ [{m_name}] 실패: {result.get('message', '')[:100]}")
 
+                self.clear_detail_memo(test_id)
                 worker.log_signal.emit(f"\n🧪 [테스트 모드] 완료")
                 return  # 테스트 모드는 여기서 종료
 
@@ -1068,6 +1114,26 @@ class BulsajaUploader:
         # 마켓 한도 추적
         market_limit_reached = set()
 
+        # 체크포인트 저널 (같은 그룹/마켓 조합으로 재실행 시 이어하기)
+        mode_key = "update" if settings.get('update_upload_mode', False) else "upload"
+        journal = UploadJournal(f"v2_{mode_key}_{'+'.join(group_names)}_{'+'.join(target_markets)}")
+        if journal.resumed_count:
+            worker.log_signal.emit(f"♻️ 이어하기: 이전 실행에서 끝난 {journal.resumed_count}건은 건너뜀")
+        completed = False
+        try:
+            groups_ok = self._run_groups(settings, worker, group_names, target_markets, market_limit_reached, journal)
+            # 마켓 한도 도달 시 그 마켓 남은 상품은 건너뛴 것 → 미완료 (다음 날 이어하기)
+            completed = worker.is_running and groups_ok and not market_limit_reached
+        finally:
+            # 정상 완료만 저널 보관, 중지/오류/마켓 한도 시 남겨서 다음 실행에서 이어하기
+            if completed:
+                journal.finish()
+            else:
+                journal.close()
+
+    def _run_groups(self, settings, worker, group_names, target_markets, market_limit_reached, journal):
+        """그룹별 상품 로드 → 업로드 파이프라인 (그룹 처리 오류가 있었으면 False)"""
+        groups_ok = True
         total_groups = len(group_names)
         for g_idx, group_name in enumerate(group_names, 1):
             if not worker.is_running:
@@ -1105,52 +1171,261 @@ class BulsajaUploader:
 
                 worker.log_signal.emit(f"   📦 {len(products)}개 상품 로드됨")
 
-                option_count = settings.get('option_count', 10)
-                option_sort = settings.get('option_sort', 'price_asc')
-                title_mode = settings.get('title_mode', 'shuffle_skip3')
+                self._upload_products_pipelined(
+                    products, group_name, target_markets, settings, worker, market_limit_reached, journal
+                )
 
-                for p_idx, product in enumerate(products, 1):
+            except Exception as e:
+                groups_ok = False
+                worker.log_signal.emit(f"   ❌ 그룹 처리 오류: {e}")
+                import traceback
+                worker.log_signal.emit(traceback.format_exc())
+        return groups_ok
+
+    def _upload_products_pipelined(self, products: List[Dict], group_name: str, target_markets: List[str],
+                                   settings: Dict, worker, market_limit_reached: set,
+                                   journal: UploadJournal = None):
+        """
+        그룹 상품 업로드 파이프라인
+
+        [조회+검사] → [가공+업로드] → [실패태그(비동기)] 단계를 겹쳐서 실행
+        - 조회 단계: 금지키워드 검사 후 상세 조회/전처리 캐시 채우기 (앞서서 최대 workers*4개)
+        - 업로드 단계: 상품 단위 동시 실행 (동시세션 수), 같은 상품의 마켓은 순서대로
+          (uploadfields 저장 → 업로드가 상품 단위 서버 상태라 마켓 간 동시 실행 불가)
+        - 마켓별 동시 업로드 수 제한 (불사자 레이트리밋 대응)
+        - 결과/로그는 상품 순서대로 출력, 중지 시 진행 중인 마켓까지만 처리
+        - journal: 이전 실행에서 끝난 (상품, 마켓) 건너뛰기 + 결과 기록
+        """
+        if journal:
+            pending = journal.pending_products(products, target_markets)
+            if len(pending) < len(products):
+                worker.log_signal.emit(f"   ♻️ 이어하기: {len(products) - len(pending)}개 상품 완료됨 → 건너뜀")
+                products = pending
+
+        option_count = settings.get('option_count', 10)
+        option_sort = settings.get('option_sort', 'price_asc')
+        title_mode = settings.get('title_mode', 'shuffle_skip3')
+        upload_workers = max(1, int(settings.get('concurrent', 1) or 1))
+        market_inflight = max(1, int(settings.get('market_inflight', 2) or 1))
+        fetch_ahead = upload_workers * 4
+        total = len(products)
+
+        # 마켓 ID는 미리 조회해서 캐시 (워커 스레드 간 중복 조회 방지)
+        for market_name in target_markets:
+            self.get_market_id_in_group(group_name, market_name)
+
+        market_slots = {m: threading.BoundedSemaphore(market_inflight) for m in target_markets}
+        limit_lock = threading.Lock()
+
+        def prefetch(product):
+            # 금지키워드 상품은 상세 조회 불필요 (process_product에서 스킵됨)
+            found_banned, safe_context = self._match_banned_keyword(
+                product.get('uploadCommonProductName', ''), settings)
+            if found_banned and not safe_context:
+                return
+            try:
+                self._get_detail_memo(product.get('ID', ''), settings)
+            except Exception:
+                pass  # 업로드 단계에서 다시 조회 → 기존과 같은 실패 처리
+
+        def upload(p_idx, product):
+            # 동시세션 1개면 로그 바로 출력, 여러 개면 상품 단위로 모아서 순서대로 출력
+            lines = [] if upload_workers > 1 else None
+            log_fn = lines.append if lines is not None else (lambda msg: worker.log_signal.emit(msg))
+            results = []
+            product_id = product.get('ID', '')
+            try:
+                for market_name in target_markets:
+                    if market_name in market_limit_reached:
+                        continue
                     if not worker.is_running:
                         break
+                    if journal and journal.is_done(product_id, market_name):
+                        continue
 
-                    # 상품 진행률 업데이트
-                    worker.progress_signal.emit(p_idx, len(products))
-
-                    for market_name in target_markets:
-                        if market_name in market_limit_reached:
-                            continue
-
-                        if not worker.is_running:
-                            break
-
-                        # process_product 호출
+                    if journal:
+                        journal.record(product_id, market_name, 'upload', 'started')
+                    with market_slots[market_name]:
                         result = self.process_product(
                             product, group_name, option_count, option_sort,
-                            title_mode, market_name, p_idx, len(products),
-                            settings, lambda msg: worker.log_signal.emit(msg)
+                            title_mode, market_name, p_idx, total, settings, log_fn
                         )
-
-                        # 결과 처리
-                        status = result.get('status', 'failed')
-                        if status == 'success':
-                            self.stats['success'] += 1
-                        elif status == 'skipped':
-                            self.stats['skipped'] += 1
-                        elif status == 'duplicate_failed':
-                            self.stats['duplicate_failed'] += 1
-                        elif status in ['quota_limit', 'market_limit']:
+                    if journal:
+                        journal.record(product_id, market_name, 'upload',
+                                       result.get('status', 'failed'), result.get('message', ''))
+                    if result.get('status') in ['quota_limit', 'market_limit']:
+                        with limit_lock:
                             market_limit_reached.add(market_name)
-                            worker.log_signal.emit(f"   → {market_name} 한도 도달")
-                        else:
-                            self.stats['failed'] += 1
-                            product_id = product.get('sourcingProductId', '') or product.get('ID', '')
-                            product_name = product.get('uploadCommonProductName', '')[:20]
-                            self.stats['failed_ids'].append(f"{product_id} ({product_name})")
+                    results.append((market_name, result))
+            finally:
+                # 모든 마켓 처리 완료 → 해당 상품 캐시 해제 (메모리 유지 X)
+                self.clear_detail_memo(product_id)
+            return lines, results
+
+        fetch_queue = deque()    # (p_idx, product, future) - 조회 단계
+        upload_queue = deque()   # (p_idx, product, future) - 업로드 단계
+        product_iter = iter(enumerate(products, 1))
+        exhausted = False
+        done_count = 0
+
+        with ThreadPoolExecutor(max_workers=upload_workers) as fetch_pool, \
+                ThreadPoolExecutor(max_workers=upload_workers) as upload_pool:
+            while True:
+                # 1. 조회 단계 채우기 (앞서서 fetch_ahead개까지)
+                while not exhausted and worker.is_running and len(fetch_queue) < fetch_ahead:
+                    try:
+                        p_idx, product = next(product_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    fetch_queue.append((p_idx, product, fetch_pool.submit(prefetch, product)))
 
-            except Exception as e:
-                worker.log_signal.emit(f"   ❌ 그룹 처리 오류: {e}")
-                import traceback
-                worker.log_signal.emit(traceback.format_exc())
+                # 2. 조회 끝난 상품 → 업로드 단계 (순서 유지, 최대 workers*2개)
+                while fetch_queue and worker.is_running and len(upload_queue) < upload_workers * 2:
+                    p_idx, product, future = fetch_queue[0]
+                    if upload_queue and not future.done():
+                        break
+                    future.result()
+                    fetch_queue.popleft()
+                    upload_queue.append((p_idx, product, upload_pool.submit(upload, p_idx, product)))
+
+                if not upload_queue:
+                    break
+
+                # 3. 결과 처리 (상품 순서대로)
+                p_idx, product, future = upload_queue.popleft()
+                try:
+                    lines, results = future.result()
+                except Exception as e:
+                    lines, results = [f"   ❌ 상품 처리 오류: {e}"], []
+
+                for msg in lines or []:
+                    worker.log_signal.emit(msg)
+
+                for market_name, result in results:
+                    status = result.get('status', 'failed')
+                    if status == 'success':
+                        self.stats['success'] += 1
+                    elif status == 'skipped':
+                        self.stats['skipped'] += 1
+                    elif status == 'duplicate_failed':
+                        self.stats['duplicate_failed'] += 1
+                    elif status in ['quota_limit', 'market_limit']:
+                        worker.log_signal.emit(f"   → {market_name} 한도 도달")
+                    else:
+                        self.stats['failed'] += 1
+                        product_id = product.get('sourcingProductId', '') or product.get('ID', '')
+                        product_name = product.get('uploadCommonProductName', '')[:20]
+                        self.stats['failed_ids'].append(f"{product_id} ({product_name})")
+
+                # 상품 진행률 업데이트
+                done_count += 1
+                worker.progress_signal.emit(done_count, total)
+
+        # 중지로 업로드 단계에 못 들어간 상품 캐시 정리
+        for _, product, _ in fetch_queue:
+            self.clear_detail_memo(product.get('ID', ''))
+
+    def clear_detail_memo(self, product_id: str = None):
+        """실행 단위 상세 캐시 해제 (product_id 없으면 전체)"""
+        with self._detail_memo_lock:
+            if product_id is None:
+                self._detail_memo.clear()
+            else:
+                self._detail_memo.pop(product_id, None)
+
+    def _get_detail_memo(self, product_id: str, settings: Dict) -> Dict:
+        """
+        상품 상세 + 마켓 무관 전처리 결과를 1회만 계산하여 캐시
+
+        마켓별로 달라지지 않는 단계(상세 조회, 옵션 중복 제거, 미끼 키워드 분석)는
+        첫 마켓에서만 수행하고, 이후 마켓은 캐시를 재사용한다.
+        (5개 마켓 업로드 시 상세 조회 5회 → 1회)
+
+        Returns:
+            {
+                'detail': 원본 상세 (수정 금지 - 호출측에서 deepcopy),
+                'existing_tags': 기존 태그 목록,
+                'sku_total': 중복 제거 전 SKU 수,
+                'unique_idx': 중복 제거 후 남은 SKU 인덱스,
+                'common_keywords': 통과 처리된 공통 키워드 set,
+                'matched_kws': unique_idx 순서별 매칭된 미끼 키워드 (없으면 None)
+            }
+        """
+        with self._detail_memo_lock:
+            memo = self._detail_memo.get(product_id)
+        if memo is not None:
+            return memo
+
+        detail = self.api_client.get_product_detail(product_id)
+        existing_tags = detail.get('tags', []) or detail.get('groups', []) or []
+        upload_skus = detail.get('uploadSkus', []) or []
+
+        # [긴급 수정] 옵션 중복 제거 (데이터 뻥튀기 방지)
+        # ID 기준 + 값(prop_val_ids 또는 text) 기준 (Logical Duplication)
+        unique_idx = []
+        seen_ids = set()
+        seen_values = set()
+        for i, sku in enumerate(upload_skus):
+            sid = sku.get('id')
+            if sid in seen_ids:
+                continue
+            seen_ids.add(sid)
+
+            val_key = sku.get('prop_val_ids')
+            if not val_key:
+                val_key = sku.get('text', '') or sku.get('_text', '')
+            if isinstance(val_key, list):
+                val_key = tuple(val_key)
+            if val_key and val_key in seen_values:
+                continue
+            if val_key:
+                seen_values.add(val_key)
+            unique_idx.append(i)
+
+        unique_skus = [upload_skus[i] for i in unique_idx]
+
+        # [v1.4] 미끼 키워드 빈도+가격 분석 - [v1.6] ON/OFF 체크박스
+        # 키워드가 2개 이상 옵션에 포함되고, 해당 옵션들 가격이 미끼 가격이 아니면 → 상품 특성으로 간주
+        exclude_kw_enabled = settings.get('exclude_kw_enabled', True)
+        common_keywords = set()
+        matched_kws = [None] * len(unique_skus)
+        if exclude_kw_enabled:
+            texts = [sku.get('text', '') or sku.get('_text', '') for sku in unique_skus]
+            prices = [self.get_sku_origin_price(sku) for sku in unique_skus]
+            positive = [p for p in prices if p > 0]
+            avg_price = sum(positive) / len(positive) if positive else 0
+
+            for kw in self.exclude_keywords:
+                # 강력 미끼 키워드는 가격과 무관하게 절대 통과 불가
+                if kw in STRONG_BAIT_KEYWORDS:
+                    continue
+                kw_idx = [i for i, t in enumerate(texts) if kw in t]
+                if len(kw_idx) >= 2:  # 최소 2개 이상 옵션에 포함
+                    kw_prices = [prices[i] for i in kw_idx if prices[i] > 0]
+                    kw_avg = sum(kw_prices) / len(kw_prices) if kw_prices else 0
+                    # 전체 평균의 50% 이상이면 미끼 가격 아님 → 키워드 필터링 제외
+                    if avg_price > 0 and kw_avg >= avg_price * 0.5:
+                        common_keywords.add(kw)
+
+            effective = [kw for kw in self.exclude_keywords if kw not in common_keywords]
+            for i, text in enumerate(texts):
+                for kw in effective:
+                    if kw in text:
+                        matched_kws[i] = kw
+                        break
+
+        memo = {
+            'detail': detail,
+            'existing_tags': existing_tags,
+            'sku_total': len(upload_skus),
+            'unique_idx': unique_idx,
+            'common_keywords': common_keywords,
+            'matched_kws': matched_kws,
+        }
+        with self._detail_memo_lock:
+            self._detail_memo[product_id] = memo
+        return memo
 
     def write_detail_log(self, product_id: str, content: str):
         """상세 로그를 파일에 기록"""
@@ -1163,7 +1438,7 @@ class BulsajaUploader:
             filename = f"log/upload_detail_{today}.log"
             timestamp = datetime.now().strftime("%H:%M:%S")
 
-            with open(filename, "a", encoding="utf-8") as f:
+            with self._detail_log_lock, open(filename, "a", encoding="utf-8") as f:
                 f.write(f"\n[{timestamp}] [Product: {product_id}]\n")
                 f.write(content)
                 f.write("-" * 50 + "\n")
@@ -1172,7 +1447,7 @@ class BulsajaUploader:
 
     def _tag_failed_async(self, product_id: str, existing_tags: list = None, fail_tag: str = "업로드실패"):
         """
-        실패 상품에 태그를 비동기로 적용 (별도 스레드)
+        실패 상품에 태그를 비동기로 적용 (BatchTagger 대기열 → 태그별 일괄 요청)
 
         Args:
             product_id: 상품 ID
@@ -1189,21 +1464,17 @@ class BulsajaUploader:
                 print(f"[TAG] ⏭️ {product_id} 이미 '{fail_tag}' 태그 있음 - 스킵")
                 return
 
-        def _apply():
-            try:
-                with self._tag_lock:
-                    if product_id in self._tagged_ids:
-                        return  # 이미 태그됨 (현재 세션)
-                    self._tagged_ids.add(product_id)
-
-                success, _ = self.api_client.apply_tag_to_products([product_id], fail_tag)
-                if success:
-                    print(f"[TAG] 🏷️ {product_id} '{fail_tag}' 태그 적용 완료")
-            except Exception as e:
-                print(f"[TAG] 태그 적용 실패: {e}")
+        with self._tag_lock:
+            if product_id in self._tagged_ids:
+                return  # 이미 태그됨 (현재 세션)
 
-        # 별도 스레드에서 실행 (업로드 속도 영향 없음)
-        threading.Thread(target=_apply, daemon=True).start()
+        # 백그라운드에서 모아서 적용 (업로드 속도 영향 없음, 대기 중인 상품은 BatchTagger가 중복 제거)
+        self.fail_tagger.add(product_id, fail_tag)
+
+    def _on_tags_applied(self, product_ids: List[str], tag_name: str):
+        """실패 태그 적용 성공 → 현재 세션 태그 완료 기록"""
+        with self._tag_lock:
+            self._tagged_ids.update(product_ids)
 
     def detect_origin_price_field(self, sku: Dict) -> Tuple[str, float]:
         """
@@ -1288,21 +1559,11 @@ class BulsajaUploader:
 
     def sort_options(self, skus: List[Dict], sort_type: str, settings: PriceSettings) -> List[Dict]:
         """[v1.6 동일] 옵션 정렬"""
-        if sort_type == "price_asc":
-            return sorted(skus, key=lambda x: self.get_sku_origin_price(x))
-        elif sort_type == "price_desc":
-            return sorted(skus, key=lambda x: self.get_sku_origin_price(x), reverse=True)
-        elif sort_type == "price_main":
-            # 주요가격대: 평균가에 가까운 옵션 우선
-            if not skus:
-                return skus
-            # 전체 옵션의 평균 원가 계산
-            total_price = sum(self.get_sku_origin_price(sku) for sku in skus)
-            avg_price = total_price / len(skus)
-            def distance_from_avg(sku):
-                return abs(self.get_sku_origin_price(sku) - avg_price)
-            return sorted(skus, key=distance_from_avg)
-        return skus
+        # price_main: 주요가격대 (평균가에 가까운 옵션 우선)
+        if sort_type not in ("price_asc", "price_desc", "price_main"):
+            return skus
+        order = order_sku_indices([self.get_sku_origin_price(sku) for sku in skus], sort_type)
+        return [skus[i] for i in order]
 
     def limit_options(self, skus: List[Dict], max_count: int, main_sku_price: float = None) -> List[Dict]:
         """
@@ -1312,21 +1573,51 @@ class BulsajaUploader:
         """
         if max_count <= 0:
             return skus
-
-        if main_sku_price is not None:
-            # 대표옵션 가격 이상인 옵션만 필터링
-            eligible_skus = [
-                sku for sku in skus
-                if self.get_sku_origin_price(sku) >= main_sku_price
-            ]
-            # 가격 오름차순 정렬
-            eligible_skus.sort(key=lambda x: self.get_sku_origin_price(x))
-            return eligible_skus[:max_count]
-        else:
+        if main_sku_price is None:
             # 기존 방식: 앞에서부터 자르기
-            if len(skus) > max_count:
-                return skus[:max_count]
-            return skus
+            return skus[:max_count]
+        # 대표옵션 가격 이상인 옵션만 가격 오름차순으로
+        prices = [self.get_sku_origin_price(sku) for sku in skus]
+        return [skus[i] for i in limit_sku_indices(prices, max_count, main_sku_price)]
+
+    def _match_banned_keyword(self, full_product_name: str, settings: Dict) -> Tuple[Optional[str], List[str]]:
+        """
+        [v1.5] 상품명 금지 키워드 검사 - [v1.6] 안전 컨텍스트가 있으면 통과
+
+        Returns:
+            (발견된 금지 키워드 또는 None, 발견된 안전 컨텍스트 목록 - 비어있으면 스킵 대상)
+        """
+        banned_kw_enabled = settings.get('banned_kw_enabled', True)
+        banned_kw_text = settings.get('banned_keywords', '')
+        if not (banned_kw_enabled and banned_kw_text):
+            return None, []
+
+        banned_keywords = [kw.strip().lower() for kw in banned_kw_text.split(',') if kw.strip()]
+        product_name_lower = full_product_name.lower()
+        found_banned = None
+        for bkw in banned_keywords:
+            if bkw in product_name_lower:
+                found_banned = bkw
+                break
+        if not found_banned:
+            return None, []
+
+        safe_context_found = []
+        # 1. 키워드별 전용 안전 컨텍스트 확인
+        keyword_contexts = KEYWORD_SAFE_CONTEXT_MAP.get(found_banned, None)
+        if keyword_contexts is not None and len(keyword_contexts) > 0:
+            for ctx in keyword_contexts:
+                if ctx.lower() in product_name_lower:
+                    safe_context_found.append(ctx)
+
+        # 2. 일반 안전 컨텍스트 확인 (키워드별 정의 없을 때)
+        if not safe_context_found and keyword_contexts is None:
+            for safe_kw in SAFE_CONTEXT_KEYWORDS:
+                if safe_kw.lower() in product_name_lower:
+                    safe_context_found.append(safe_kw)
+                    break  # 하나만 찾으면 됨
+
+        return found_banned, safe_context_found
 
     def process_product(self, product: Dict, group_name: str, option_count: int,
                        option_sort: str, title_mode: str, market_name: str,
@@ -1348,58 +1639,29 @@ class BulsajaUploader:
             existing_tags = None  # 태그 중복 방지용 (detail 로드 후 설정)
 
             # [v1.5] 금지 키워드 체크 (상품명 기준) - [v1.6] ON/OFF 체크박스 + 안전 컨텍스트 추가
-            banned_kw_enabled = settings.get('banned_kw_enabled', True)
-            banned_kw_text = settings.get('banned_keywords', '')
-            if banned_kw_enabled and banned_kw_text:
-                banned_keywords = [kw.strip().lower() for kw in banned_kw_text.split(',') if kw.strip()]
-                product_name_lower = full_product_name.lower()
-                found_banned = None
-                for bkw in banned_keywords:
-                    if bkw in product_name_lower:
-                        found_banned = bkw
-                        break
-
-                # [v1.6] 안전 컨텍스트 체크 - 금지 키워드가 있어도 안전 컨텍스트가 있으면 통과
-                if found_banned:
-                    is_safe_context = False
-                    safe_context_found = []
-
-                    # 1. 키워드별 전용 안전 컨텍스트 확인
-                    keyword_contexts = KEYWORD_SAFE_CONTEXT_MAP.get(found_banned, None)
-                    if keyword_contexts is not None and len(keyword_contexts) > 0:
-                        for ctx in keyword_contexts:
-                            if ctx.lower() in product_name_lower:
-                                is_safe_context = True
-                                safe_context_found.append(ctx)
-
-                    # 2. 일반 안전 컨텍스트 확인 (키워드별 정의 없을 때)
-                    if not is_safe_context and keyword_contexts is None:
-                        for safe_kw in SAFE_CONTEXT_KEYWORDS:
-                            if safe_kw.lower() in product_name_lower:
-                                is_safe_context = True
-                                safe_context_found.append(safe_kw)
-                                break  # 하나만 찾으면 됨
-
-                    if is_safe_context:
-                        # 안전 컨텍스트 발견 → 통과 (로그만 남김)
-                        progress_str = f"[{current_idx}/{total_count}] " if total_count > 0 else ""
-                        market_short = MARKET_SHORT.get(market_name, market_name)
-                        log_func(f"✅ {progress_str}[{market_short}] 금지키워드 [{found_banned}] 안전컨텍스트 [{','.join(safe_context_found[:2])}] → 통과")
-                    else:
-                        # 안전 컨텍스트 없음 → 스킵
-                        progress_str = f"[{current_idx}/{total_count}] " if total_count > 0 else ""
-                        market_short = MARKET_SHORT.get(market_name, market_name)
-                        log_func("")
-                        log_func(f"⏭️ {progress_str}[{market_short}] {product_id} - 금지키워드 [{found_banned}]")
-                        log_func(f"   {product_name}")
-                        result['status'] = 'skipped'
-                        result['message'] = f'금지키워드: {found_banned}'
-                        return result
+            found_banned, safe_context_found = self._match_banned_keyword(full_product_name, settings)
+            if found_banned:
+                progress_str = f"[{current_idx}/{total_count}] " if total_count > 0 else ""
+                market_short = MARKET_SHORT.get(market_name, market_name)
+                if safe_context_found:
+                    # 안전 컨텍스트 발견 → 통과 (로그만 남김)
+                    log_func(f"✅ {progress_str}[{market_short}] 금지키워드 [{found_banned}] 안전컨텍스트 [{','.join(safe_context_found[:2])}] → 통과")
+                else:
+                    # 안전 컨텍스트 없음 → 스킵
+                    log_func("")
+                    log_func(f"⏭️ {progress_str}[{market_short}] {product_id} - 금지키워드 [{found_banned}]")
+                    log_func(f"   {product_name}")
+                    result['status'] = 'skipped'
+                    result['message'] = f'금지키워드: {found_banned}'
+                    return result
 
-            detail = self.api_client.get_product_detail(product_id)
+            # 상세 + 마켓 무관 전처리는 실행 단위 캐시에서 (마켓별 재조회 X)
+            memo = self._get_detail_memo(product_id, settings)
+            # 마켓별 단계가 detail/SKU를 수정하므로 원본은 복사해서 사용
+            detail = copy.deepcopy(memo['detail'])
 
             # [v1.6] 기존 태그 추출 (중복 태그 적용 방지용)
-            existing_tags = detail.get('tags', []) or detail.get('groups', []) or []
+            existing_tags = memo['existing_tags']
 
             # [v1.6] 수정 업로드 모드 확인
             update_mode = settings.get('update_upload_mode', False)
@@ -1431,45 +1693,10 @@ class BulsajaUploader:
                 result['message'] = 'SKU 없음'
                 return result
 
-            # [긴급 수정] 옵션 중복 제거 (데이터 뻥튀기 방지)
-            unique_skus = []
-            seen_ids = set()
-
-            # [추가] 값(텍스트) 기준 중복 제거 (Logical Duplication)
-            # SKU ID가 다르더라도 식별값(prop_val_ids 또는 text)이 같으면 중복으로 간주
-            seen_values = set()
-
-            for sku in upload_skus:
-                sid = sku.get('id')
-
-                # 1. ID 기준 중복 체크
-                if sid in seen_ids:
-                    continue
-                seen_ids.add(sid)
-
-                # 2. 값 기준 중복 체크
-                # prop_val_ids가 가장 정확 (예: "1:1:1")
-                # 없으면 text 사용
-                val_key = sku.get('prop_val_ids')
-                if not val_key:
-                    val_key = sku.get('text', '') or sku.get('_text', '')
-
-                # 키가 리스트인 경우 튜플로 변환
-                if isinstance(val_key, list):
-                    val_key = tuple(val_key)
-
-                if val_key and val_key in seen_values:
-                    # 로그는 너무 많을 수 있으므로 생략하거나 디버그 레벨로
-                    continue
-
-                if val_key:
-                    seen_values.add(val_key)
-
-                unique_skus.append(sku)
-
-            if len(unique_skus) < len(upload_skus):
-                log_func(f"   🧹 중복 옵션 제거(ID/값): {len(upload_skus)}개 → {len(unique_skus)}개")
-                upload_skus = unique_skus
+            # [긴급 수정] 옵션 중복 제거 (캐시된 인덱스 적용)
+            if len(memo['unique_idx']) < len(upload_skus):
+                log_func(f"   🧹 중복 옵션 제거(ID/값): {len(upload_skus)}개 → {len(memo['unique_idx'])}개")
+                upload_skus = [upload_skus[i] for i in memo['unique_idx']]
 
             # 해외배송비 가져오기 (상품별 설정값 사용)
             delivery_fee = detail.get('uploadOverseaDeliveryFee', 0) or 0
@@ -1496,98 +1723,58 @@ class BulsajaUploader:
             excluded_by_keyword = []  # (id, text, price, 매칭키워드)
             excluded_by_price = []    # (id, text, price, 이유)
 
-            # [v1.4] 미끼 키워드 빈도+가격 분석 - [v1.6] ON/OFF 체크박스 추가
-            # 키워드가 2개 이상 옵션에 포함되고, 해당 옵션들 가격이 미끼 가격이 아니면 → 상품 특성으로 간주
+            # [v1.4] 미끼 키워드 빈도+가격 분석 결과 (캐시) - [v1.6] ON/OFF 체크박스
             exclude_kw_enabled = settings.get('exclude_kw_enabled', True)
-            keyword_skus = {}  # 키워드별 매칭된 SKU 리스트
-            if exclude_kw_enabled:
-                for kw in self.exclude_keywords:
-                    matching = [sku for sku in upload_skus if kw in (sku.get('text', '') or sku.get('_text', ''))]
-                    if matching:
-                        keyword_skus[kw] = matching
-
-            # 전체 옵션 평균 가격 (위안)
-            all_prices = [self.get_sku_origin_price(sku) for sku in upload_skus if self.get_sku_origin_price(sku) > 0]
-            avg_price = sum(all_prices) / len(all_prices) if all_prices else 0
-
-            # 2개 이상 옵션에 포함된 키워드는 가격 검증 (단, 강력 미끼 키워드 제외)
-            excluded_common_keywords = set()
-            for kw, matching_skus in keyword_skus.items():
-                # 강력 미끼 키워드는 가격과 무관하게 절대 통과 불가
-                if kw in STRONG_BAIT_KEYWORDS:
-                    continue
-
-                if len(matching_skus) >= 2:  # 최소 2개 이상 옵션에 포함
-                    # 해당 키워드 포함 옵션들의 평균 가격
-                    kw_prices = [self.get_sku_origin_price(sku) for sku in matching_skus if self.get_sku_origin_price(sku) > 0]
-                    kw_avg = sum(kw_prices) / len(kw_prices) if kw_prices else 0
-
-                    # 전체 평균의 50% 이상이면 미끼 가격 아님 → 키워드 필터링 제외
-                    if avg_price > 0 and kw_avg >= avg_price * 0.5:
-                        excluded_common_keywords.add(kw)
-
-            # 실제 필터링에 사용할 키워드 (공통+정상가격 키워드 제외) - [v1.6] ON/OFF 체크박스 추가
-            if exclude_kw_enabled:
-                effective_exclude_keywords = [kw for kw in self.exclude_keywords if kw not in excluded_common_keywords]
-            else:
-                effective_exclude_keywords = []  # 비활성화 시 빈 리스트
+            excluded_common_keywords = memo['common_keywords']
+            matched_kws = memo['matched_kws']
 
             if excluded_common_keywords and exclude_kw_enabled:
                 log_func(f"   ℹ️ 공통키워드 통과: {', '.join(excluded_common_keywords)} (2개+ 옵션, 정상가격)")
 
-            for sku in upload_skus:
+            # [중요] SKU별 가격 일괄 계산 (불사자 공식, ADDITIVE):
+            #   기준판매가(sale_price) = 원화원가 × (1 + 카드수수료 + 마진율) + 정액마진 + 해외배송비
+            #   ※ 마켓수수료(uploadFake_pct)는 업로드 시 마켓에서 자동 적용됨
+            #
+            # SKU 필드 의미:
+            #   origin_price = 원화 원가 (CNY × 환율, 마진 미포함)
+            #   sale_price = 기준 판매가 (마진 포함된 실제 판매가)
+            #
+            # 할인 표시는 uploadBase_price.discount_rate로 마켓에서 처리
+            origin_cnys = [self.get_sku_origin_price(sku) for sku in upload_skus]
+            priced = price_skus_batch(
+                origin_cnys, self.price_settings.exchange_rate, self.price_settings.card_fee_rate,
+                margin_rate, self.price_settings.margin_fixed, delivery_fee, self.price_settings.round_unit,
+                min_price=self.price_settings.min_price, max_price=self.price_settings.max_price
+            )
+            origin_krws = [int(v) for v in priced['origin_krw']]
+            sale_prices = [int(v) for v in priced['sale_price']]
+            reasons = [int(v) for v in priced['reason']]
+
+            for i, (sku, matched_kw) in enumerate(zip(upload_skus, matched_kws)):
                 sku_id = sku.get('id', '?')
                 text = sku.get('text', '') or sku.get('_text', '')
-                origin_cny = self.get_sku_origin_price(sku)
+                origin_cny = origin_cnys[i]
 
                 # [중요] exclude 필드는 무시! 사용자 원칙: 미끼 아니고 가격 범위 맞으면 업로드
 
                 # 미끼 키워드 체크 (공통 키워드 제외된 목록 사용)
-                matched_kw = None
-                for kw in effective_exclude_keywords:
-                    if kw in text:
-                        matched_kw = kw
-                        break
                 if matched_kw:
                     excluded_by_keyword.append((sku_id, text[:20], origin_cny, matched_kw))
                     continue
 
                 # 가격 범위 체크
-                if origin_cny <= 0:
+                if reasons[i] == PRICE_ZERO:
                     excluded_by_price.append((sku_id, text[:20], origin_cny, "가격0"))
                     continue
 
-                # [중요] SKU별 가격 직접 계산 및 설정
-                # 불사자 공식 (ADDITIVE):
-                #   기준판매가(sale_price) = 원화원가 × (1 + 마진율/100) + 정액마진 + 해외배송비
-                #   ※ 마켓수수료(uploadFake_pct)는 업로드 시 마켓에서 자동 적용됨
-                #
-                # SKU 필드 의미:
-                #   origin_price = 원화 원가 (CNY × 환율, 마진 미포함)
-                #   sale_price = 기준 판매가 (마진 포함된 실제 판매가)
-                #
-                # 할인 표시는 uploadBase_price.discount_rate로 마켓에서 처리
-
-                # 1. 원화원가 = CNY × 환율
-                origin_krw = origin_cny * self.price_settings.exchange_rate
-
-                # 2. 기준 판매가 계산 (불사자 공식)
-                # 기준판매가 = 원화원가 × (1 + 카드수수료 + 마진율) + 정액마진 + 해외배송비
-                card_fee_decimal = self.price_settings.card_fee_rate / 100  # 3.3% → 0.033
-                margin_rate_decimal = margin_rate / 100  # 26% → 0.26
-                base_price = origin_krw * (1 + card_fee_decimal + margin_rate_decimal) + self.price_settings.margin_fixed + delivery_fee
-                sale_price_final = math.ceil(base_price / self.price_settings.round_unit) * self.price_settings.round_unit
-
-                # 3. SKU에 가격 설정
-                #    origin_price = 원화 원가 (환율만 적용)
-                #    sale_price = 기준 판매가 (마진 포함)
-                sku['origin_price'] = int(origin_krw)
-                sku['sale_price'] = int(sale_price_final)
-
-                if sale_price_final < self.price_settings.min_price:
+                sale_price_final = sale_prices[i]
+                sku['origin_price'] = origin_krws[i]
+                sku['sale_price'] = sale_price_final
+
+                if reasons[i] == PRICE_BELOW_MIN:
                     excluded_by_price.append((sku_id, text[:20], origin_cny, f"최소가미만({sale_price_final:,.0f}원)"))
                     continue
-                if sale_price_final > self.price_settings.max_price:
+                if reasons[i] == PRICE_ABOVE_MAX:
                     excluded_by_price.append((sku_id, text[:20], origin_cny, f"최대가초과({sale_price_final:,.0f}원)"))
                     continue
 
@@ -1664,12 +1851,10 @@ class BulsajaUploader:
                 return result
 
             # 4. 옵션 정렬
-            if option_sort == "price_asc":
-                valid_skus.sort(key=lambda x: self.get_sku_origin_price(x))
-                log_func(f"   📈 정렬: 가격낮은순")
-            elif option_sort == "price_desc":
-                valid_skus.sort(key=lambda x: self.get_sku_origin_price(x), reverse=True)
-                log_func(f"   📉 정렬: 가격높은순")
+            if option_sort in ("price_asc", "price_desc"):
+                order = order_sku_indices([self.get_sku_origin_price(sku) for sku in valid_skus], option_sort)
+                valid_skus = [valid_skus[i] for i in order]
+                log_func(f"   📈 정렬: 가격낮은순" if option_sort == "price_asc" else f"   📉 정렬: 가격높은순")
 
             # 5. 옵션 개수 제한
             if option_count > 0:
@@ -2293,8 +2478,17 @@ class MainWindow(QMainWindow):
         self.concurrent_combo = QComboBox()
         self.concurrent_combo.addItems(["1", "2", "3", "4", "5"])
         self.concurrent_combo.setFixedWidth(50)
+        self.concurrent_combo.setToolTip("동시에 처리할 상품 수 (같은 상품의 마켓은 순서대로 처리)")
         row1.addWidget(self.concurrent_combo)
 
+        row1.addWidget(QLabel("마켓당:"))
+        self.market_inflight_combo = QComboBox()
+        self.market_inflight_combo.addItems(["1", "2", "3", "4", "5"])
+        self.market_inflight_combo.setCurrentText("2")
+        self.market_inflight_combo.setFixedWidth(50)
+        self.market_inflight_combo.setToolTip("마켓별 동시 업로드 수 (불사자 요청 제한 대응)")
+        row1.addWidget(self.market_inflight_combo)
+
         row1.addWidget(QLabel("옵션수:"))
         self.option_count_input = QLineEdit("10")
         self.option_count_input.setFixedWidth(50)
@@ -2801,6 +2995,7 @@ class MainWindow(QMainWindow):
             # 업로드 설정
             'upload_count': int(self.upload_count_input.text() or 9000),
             'concurrent': int(self.concurrent_combo.currentText()),
+            'market_inflight': int(self.market_inflight_combo.currentText()),
             'option_count': int(self.option_count_input.text() or 10),
             'option_sort': OPTION_SORT_OPTIONS.get(self.option_sort_combo.currentText(), 'price_asc'),
             'title_mode': TITLE_OPTIONS.get(self.title_option_combo.currentText(), 'shuffle_skip3'),
@@ -2980,6 +3175,7 @@ class MainWindow(QMainWindow):
             'round_unit': self.round_unit_input.text(),
             'upload_count': self.upload_count_input.text(),
             'concurrent': self.concurrent_combo.currentText(),
+            'market_inflight': self.market_inflight_combo.currentText(),
             'option_count': self.option_count_input.text(),
             'option_sort': self.option_sort_combo.currentText(),
             'title_option': self.title_option_combo.currentText(),
@@ -3024,6 +3220,7 @@ class MainWindow(QMainWindow):
         if 'round_unit' in c: self.round_unit_input.setText(c['round_unit'])
         if 'upload_count' in c: self.upload_count_input.setText(c['upload_count'])
         if 'concurrent' in c: self.concurrent_combo.setCurrentText(c['concurrent'])
+        if 'market_inflight' in c: self.market_inflight_combo.setCurrentText(c['market_inflight'])
         if 'option_count' in c: self.option_count_input.setText(c['option_count'])
         if 'option_sort' in c: self.option_sort_combo.setCurrentText(c['option_sort'])
         if 'title_option' in c: self.title_option_combo.setCurrentText(c['title_option'])
@@ -3064,6 +3261,7 @@ class MainWindow(QMainWindow):
         if self.worker and self.worker.isRunning():
             self.worker.stop()
             self.worker.wait(3000)
+        self.uploader.fail_tagger.close()
         event.accept()
 
 
@@ -32,9 +32,11 @@ try:
         load_banned_words, load_excluded_words, load_bait_keywords, save_bait_keywords,
         check_product_safety, filter_bait_options, match_thumbnail_to_sku,
         select_main_option,  # 상품명 기반 대표옵션 선택
+        limit_sku_indices,  # 옵션 개수 제한 (업로더와 동일 로직)
         load_category_risk_settings, save_category_risk_settings,  # 카테고리 검수 설정
         DEFAULT_CATEGORY_RISK_SETTINGS,
-        MARKET_IDS, DEFAULT_BAIT_KEYWORDS
+        MARKET_IDS, DEFAULT_BAIT_KEYWORDS,
+        StreamingSheetWriter  # 대용량 결과 엑셀 스트리밍 저장
     )
 except ImportError:
     print("⚠️ bulsaja_common.py 모듈을 찾을 수 없습니다. 같은 폴더에 있는지 확인하세요.")
@@ -42,9 +44,7 @@ except ImportError:
 
 # 엑셀 라이브러리
 try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
+    import openpyxl  # noqa: F401
     EXCEL_AVAILABLE = True
 except ImportError:
     print("⚠️ openpyxl이 설치되지 않았습니다. pip install openpyxl")
@@ -54,6 +54,17 @@ except ImportError:
 CONFIG_FILE = "bulsaja_simulator_config.json"
 DEBUG_PORT = 9222
 
+# 결과 엑셀 셀 스타일 (StreamingSheetWriter)
+SIM_SHEET_STYLES = {
+    'header': {'fill': "4472C4", 'font_color': "FFFFFF", 'bold': True,
+               'h_align': 'center', 'v_align': 'center', 'wrap': True, 'border': True},
+    'border': {'border': True},
+    'safe': {'fill': "C8E6C9", 'h_align': 'center', 'v_align': 'center'},
+    'unsafe': {'fill': "FFCDD2", 'h_align': 'center', 'v_align': 'center'},
+    'select': {'fill': "FFFF99", 'h_align': 'center', 'v_align': 'center'},  # 사용자 입력용 (노란색)
+    'wrap': {'v_align': 'top', 'wrap': True},
+}
+
 
 def load_config():
     if os.path.exists(CONFIG_FILE):
@@ -96,9 +107,6 @@ class BulsajaSimulator:
             "new_bait_keywords": set(),
         }
 
-        # 결과 데이터
-        self.results = []
-
     def log(self, message):
         if self.gui:
             self.gui.log(message)
@@ -228,15 +236,9 @@ class BulsajaSimulator:
                     main_sku_price = main_sku.get('_origin_price', 0)
 
                     if option_count > 0:
-                        # 대표옵션 가격 이상인 옵션들만 필터링 후 가격순 정렬
-                        eligible_skus = [
-                            sku for sku in valid_skus
-                            if sku.get('_origin_price', 0) >= main_sku_price
-                        ]
-                        # 가격 오름차순 정렬
-                        eligible_skus.sort(key=lambda x: x.get('_origin_price', 0))
-                        # option_count 개수만큼 선택
-                        final_skus = eligible_skus[:option_count]
+                        # 대표옵션 가격 이상인 옵션들만 가격 오름차순으로 option_count 개수만큼 선택
+                        prices = [sku.get('_origin_price', 0) for sku in valid_skus]
+                        final_skus = [valid_skus[i] for i in limit_sku_indices(prices, option_count, main_sku_price)]
                     else:
                         final_skus = valid_skus
 
@@ -266,7 +268,6 @@ class BulsajaSimulator:
             risk_categories: 엄격 검수 적용할 카테고리 목록
         """
         self.is_running = True
-        self.results = []
         self.stats = {
             "total": 0,
             "safe": 0,
@@ -294,7 +295,11 @@ class BulsajaSimulator:
         self.log(f"   저장 경로: {save_path}")
         self.log("=" * 50)
 
+        writer = None
         try:
+            # 결과는 분석하는 대로 저널에 기록 → 종료 시 엑셀 변환 (상품 수와 관계없이 메모리 일정)
+            if EXCEL_AVAILABLE:
+                writer = self._open_excel_writer(save_path)
             total_products = 0
             for group_idx, group_name in enumerate(group_names):
                 if not self.is_running:
@@ -329,7 +334,8 @@ class BulsajaSimulator:
                     result = self.analyze_product(product, option_count, check_level=product_check_level)
                     result['group_name'] = group_name
                     result['category'] = product_category[:30]  # 카테고리 기록
-                    self.results.append(result)
+                    if writer:
+                        writer.append(result)
 
                     # 통계 업데이트
                     self.stats['total'] += 1
@@ -356,12 +362,16 @@ class BulsajaSimulator:
                 self.log(f"   ✅ {group_name} 완료")
 
             # 엑셀 저장
-            if self.results and EXCEL_AVAILABLE:
-                self.save_to_excel(save_path)
-                self.log(f"\n📊 엑셀 저장 완료: {save_path}")
+            if writer and writer.count:
+                writer.close(self._stats_sheet())
+                self.log(f"\n📊 엑셀 저장 완료: {save_path} ({writer.count}개 상품)")
+            elif writer:
+                writer.discard()
 
         except Exception as e:
             self.log(f"❌ 시뮬레이션 오류: {e}")
+            if writer and writer.count:
+                self.log(f"   분석된 {writer.count}개 결과는 {writer.journal_path}에 보관됨")
 
         finally:
             # 결과 요약
@@ -379,23 +389,15 @@ class BulsajaSimulator:
             if self.gui:
                 self.gui.on_finished()
 
-    def save_to_excel(self, filepath: str):
-        """결과를 엑셀로 저장 (깔끔한 형식 - 이미지 수식 포함)"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "분석결과"
-
-        # 헤더 스타일
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+    def save_to_excel(self, filepath: str, results: List[Dict]):
+        """결과 목록을 엑셀로 저장 (깔끔한 형식 - 이미지 수식 포함)"""
+        writer = self._open_excel_writer(filepath)
+        for result in results:
+            writer.append(result)
+        writer.close(self._stats_sheet())
 
+    def _open_excel_writer(self, filepath: str) -> StreamingSheetWriter:
+        """분석결과/상세정보 시트 정의 → 스트리밍 저장기"""
         # 헤더 (모든 데이터 포함) - 썸네일/옵션이미지 가깝게 배치
         headers = [
             "썸네일\n이미지", "옵션\n이미지", "상품명", "안전여부", "위험사유", "안전\n컨텍스트", "검수레벨",
@@ -403,245 +405,91 @@ class BulsajaSimulator:
             "탐지키워드", "대표옵션", "선택방식",
             "선택", "옵션명", "중국어\n옵션명", "그룹명"
         ]
-        # 선택 컬럼 스타일 (노란색 배경 - 사용자 입력용)
-        select_fill = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-            cell.border = border
-
-        # 데이터 스타일
-        unsafe_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
-        safe_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
-        wrap_align = Alignment(vertical="top", wrap_text=True)
-        center_align = Alignment(horizontal="center", vertical="center")
-
-        # 데이터 입력 - 썸네일/옵션이미지 가깝게 배치
-        for row_idx, result in enumerate(self.results, 2):
-            col = 1
-
-            # 1. 썸네일 이미지 (IMAGE 수식)
-            thumb_url = result.get('thumbnail_url', '')
-            if thumb_url:
-                ws.cell(row=row_idx, column=col, value=f'=IMAGE("{thumb_url}")')
-            else:
-                ws.cell(row=row_idx, column=col, value='')
-            col += 1
-
-            # 2. 옵션 이미지 (대표옵션 이미지) - 썸네일 바로 옆
-            option_img = result.get('main_option_image', '')
-            if option_img:
-                ws.cell(row=row_idx, column=col, value=f'=IMAGE("{option_img}")')
-            else:
-                ws.cell(row=row_idx, column=col, value='')
-            col += 1
-
-            # 3. 상품명
-            ws.cell(row=row_idx, column=col, value=result.get('name', '')[:50])
-            col += 1
-
-            # 4. 안전여부 (O/X)
-            is_safe = result.get('is_safe', True)
-            status_cell = ws.cell(row=row_idx, column=col, value='O' if is_safe else 'X')
-            status_cell.alignment = center_align
-            if is_safe:
-                status_cell.fill = safe_fill
-            else:
-                status_cell.fill = unsafe_fill
-            col += 1
-
-            # 5. 위험사유
-            ws.cell(row=row_idx, column=col, value=result.get('unsafe_reason', ''))
-            col += 1
-
-            # 6. 안전컨텍스트
-            ws.cell(row=row_idx, column=col, value=result.get('safe_context', ''))
-            col += 1
-
-            # 7. 검수레벨
-            ws.cell(row=row_idx, column=col, value=result.get('check_level', ''))
-            col += 1
-
-            # 8. AI판단
-            ws.cell(row=row_idx, column=col, value=result.get('ai_judgment', ''))
-            col += 1
-
-            # 9. 전체옵션
-            ws.cell(row=row_idx, column=col, value=result.get('total_options', 0))
-            col += 1
-
-            # 10. 유효옵션
-            ws.cell(row=row_idx, column=col, value=result.get('valid_options', 0))
-            col += 1
-
-            # 11. 최종옵션
-            ws.cell(row=row_idx, column=col, value=result.get('final_options', 0))
-            col += 1
-
-            # 12. 미끼옵션
-            ws.cell(row=row_idx, column=col, value=result.get('bait_options', 0))
-            col += 1
-
-            # 13. 미끼옵션목록
-            bait_cell = ws.cell(row=row_idx, column=col,
-                               value=self._format_options_abc(result.get('bait_option_list', [])[:5]))
-            bait_cell.alignment = wrap_align
-            col += 1
-
-            # 14. 탐지키워드
-            ws.cell(row=row_idx, column=col, value=result.get('detected_keywords', ''))
-            col += 1
-
-            # 15. 대표옵션
-            ws.cell(row=row_idx, column=col, value=result.get('main_option_name', ''))
-            col += 1
-
-            # 16. 선택방식 (main_option_method)
-            ws.cell(row=row_idx, column=col, value=result.get('main_option_method', ''))
-            col += 1
-
-            # 17. 선택 (프로그램 추천 기본값 A, 사용자가 수정 가능)
-            select_cell = ws.cell(row=row_idx, column=col, value='A')
-            select_cell.alignment = center_align
-            select_cell.fill = select_fill
-            col += 1
-
-            # 18. 옵션명 (A, B, C 형태로 정리)
-            final_options = result.get('final_option_list', [])
-            option_text = self._format_options_abc(final_options)
-            ws.cell(row=row_idx, column=col, value=option_text).alignment = wrap_align
-            col += 1
-
-            # 19. 중국어 옵션명
-            cn_options = result.get('cn_option_list', [])
-            cn_text = self._format_options_abc(cn_options) if cn_options else ''
-            ws.cell(row=row_idx, column=col, value=cn_text).alignment = wrap_align
-            col += 1
-
-            # 20. 그룹명
-            ws.cell(row=row_idx, column=col, value=result.get('group_name', ''))
-            col += 1
-
-            # 테두리 적용
-            for c in range(1, col):
-                ws.cell(row=row_idx, column=c).border = border
-
-        # 열 너비 조정 - 썸네일/옵션이미지 가깝게 배치된 순서
-        ws.column_dimensions['A'].width = 15  # 썸네일
-        ws.column_dimensions['B'].width = 15  # 옵션이미지 (썸네일 바로 옆)
-        ws.column_dimensions['C'].width = 40  # 상품명
-        ws.column_dimensions['D'].width = 8   # 안전여부
-        ws.column_dimensions['E'].width = 20  # 위험사유
-        ws.column_dimensions['F'].width = 12  # 안전컨텍스트
-        ws.column_dimensions['G'].width = 8   # 검수레벨
-        ws.column_dimensions['H'].width = 8   # AI판단
-        ws.column_dimensions['I'].width = 8   # 전체옵션
-        ws.column_dimensions['J'].width = 8   # 유효옵션
-        ws.column_dimensions['K'].width = 8   # 최종옵션
-        ws.column_dimensions['L'].width = 8   # 미끼옵션
-        ws.column_dimensions['M'].width = 30  # 미끼옵션목록
-        ws.column_dimensions['N'].width = 15  # 탐지키워드
-        ws.column_dimensions['O'].width = 25  # 대표옵션
-        ws.column_dimensions['P'].width = 12  # 선택방식
-        ws.column_dimensions['Q'].width = 6   # 선택
-        ws.column_dimensions['R'].width = 35  # 옵션명
-        ws.column_dimensions['S'].width = 35  # 중국어옵션명
-        ws.column_dimensions['T'].width = 12  # 그룹명
-
-        # 행 높이 조정 (이미지 표시용)
-        for row_idx in range(2, len(self.results) + 2):
-            ws.row_dimensions[row_idx].height = 80
-
-        # 헤더 행 높이
-        ws.row_dimensions[1].height = 40
-
-        # 필터 설정
-        ws.auto_filter.ref = ws.dimensions
-
-        # === 상세 시트 (기존 형식) ===
-        ws_detail = wb.create_sheet("상세정보")
         detail_headers = [
             "그룹", "불사자ID", "상품명", "안전여부", "위험사유", "안전컨텍스트",
             "전체옵션", "유효옵션", "최종옵션", "미끼옵션", "미끼옵션목록",
             "선택", "대표옵션", "최저가(CNY)", "최고가(CNY)", "최종옵션목록", "메인썸네일URL", "옵션이미지URL"
         ]
-        for col, header in enumerate(detail_headers, 1):
-            cell = ws_detail.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-            cell.border = border
-
-        for row_idx, result in enumerate(self.results, 2):
-            ws_detail.cell(row=row_idx, column=1, value=result.get('group_name', '')).border = border
-            ws_detail.cell(row=row_idx, column=2, value=result.get('id', '')).border = border
-            ws_detail.cell(row=row_idx, column=3, value=result.get('name', '')[:50]).border = border
-
-            # 안전여부 색상 적용
-            safe_cell = ws_detail.cell(row=row_idx, column=4, value='안전' if result.get('is_safe') else '위험')
-            safe_cell.border = border
-            safe_cell.alignment = center_align
-            if result.get('is_safe'):
-                safe_cell.fill = safe_fill
-            else:
-                safe_cell.fill = unsafe_fill
-
-            ws_detail.cell(row=row_idx, column=5, value=result.get('unsafe_reason', '')).border = border
-            ws_detail.cell(row=row_idx, column=6, value=result.get('safe_context', '')).border = border
-            ws_detail.cell(row=row_idx, column=7, value=result.get('total_options', 0)).border = border
-            ws_detail.cell(row=row_idx, column=8, value=result.get('valid_options', 0)).border = border
-            ws_detail.cell(row=row_idx, column=9, value=result.get('final_options', 0)).border = border
-            ws_detail.cell(row=row_idx, column=10, value=result.get('bait_options', 0)).border = border
-
-            # 미끼옵션목록: A, B, C 형식으로 줄바꿈
-            bait_cell = ws_detail.cell(row=row_idx, column=11,
-                                       value=self._format_options_abc(result.get('bait_option_list', [])[:5]))
-            bait_cell.alignment = wrap_align
-            bait_cell.border = border
-
-            # 선택 (프로그램 추천 기본값 A, 사용자가 수정 가능)
-            select_cell2 = ws_detail.cell(row=row_idx, column=12, value='A')
-            select_cell2.alignment = center_align
-            select_cell2.fill = select_fill
-            select_cell2.border = border
-
-            ws_detail.cell(row=row_idx, column=13, value=result.get('main_option_name', '')).border = border
-            ws_detail.cell(row=row_idx, column=14, value=result.get('min_price_cny', 0)).border = border
-            ws_detail.cell(row=row_idx, column=15, value=result.get('max_price_cny', 0)).border = border
-
-            # 최종옵션목록: A, B, C 형식으로 줄바꿈
-            final_opt_cell = ws_detail.cell(row=row_idx, column=16,
-                                            value=self._format_options_abc(result.get('final_option_list', [])))
-            final_opt_cell.alignment = wrap_align
-            final_opt_cell.border = border
-
-            ws_detail.cell(row=row_idx, column=17, value=result.get('thumbnail_url', '')).border = border
-            ws_detail.cell(row=row_idx, column=18, value=result.get('main_option_image', '')).border = border
-
-        # 상세시트 열 너비 조정
-        ws_detail.column_dimensions['A'].width = 12  # 그룹
-        ws_detail.column_dimensions['B'].width = 12  # 불사자ID
-        ws_detail.column_dimensions['C'].width = 40  # 상품명
-        ws_detail.column_dimensions['D'].width = 8   # 안전여부
-        ws_detail.column_dimensions['E'].width = 25  # 위험사유
-        ws_detail.column_dimensions['F'].width = 15  # 안전컨텍스트
-        ws_detail.column_dimensions['K'].width = 35  # 미끼옵션목록
-        ws_detail.column_dimensions['L'].width = 6   # 선택
-        ws_detail.column_dimensions['M'].width = 25  # 대표옵션
-        ws_detail.column_dimensions['P'].width = 40  # 최종옵션목록
-        ws_detail.column_dimensions['Q'].width = 45  # 썸네일URL
-        ws_detail.column_dimensions['R'].width = 45  # 옵션이미지URL
-
-        # 상세시트 행 높이 (옵션목록 줄바꿈용)
-        for row_idx in range(2, len(self.results) + 2):
-            ws_detail.row_dimensions[row_idx].height = 60
-
-        # === 통계 시트 ===
-        ws_stats = wb.create_sheet("통계")
-        stats_data = [
+        sheets = {
+            "분석결과": {
+                'headers': headers,
+                'row': self._analysis_row,
+                # 열 너비 - 썸네일/옵션이미지 가깝게 배치된 순서
+                'widths': {'A': 15, 'B': 15, 'C': 40, 'D': 8, 'E': 20, 'F': 12, 'G': 8, 'H': 8,
+                           'I': 8, 'J': 8, 'K': 8, 'L': 8, 'M': 30, 'N': 15, 'O': 25, 'P': 12,
+                           'Q': 6, 'R': 35, 'S': 35, 'T': 12},
+                'row_height': 80,      # 이미지 표시용
+                'header_height': 40,
+                'style': 'border',
+                'auto_filter': True,
+            },
+            "상세정보": {
+                'headers': detail_headers,
+                'row': self._detail_row,
+                'widths': {'A': 12, 'B': 12, 'C': 40, 'D': 8, 'E': 25, 'F': 15, 'K': 35, 'L': 6,
+                           'M': 25, 'P': 40, 'Q': 45, 'R': 45},
+                'row_height': 60,      # 옵션목록 줄바꿈용
+                'style': 'border',
+            },
+        }
+        return StreamingSheetWriter(filepath, sheets, SIM_SHEET_STYLES)
+
+    def _analysis_row(self, result: Dict) -> list:
+        """분석결과 시트 1행"""
+        thumb_url = result.get('thumbnail_url', '')
+        option_img = result.get('main_option_image', '')
+        is_safe = result.get('is_safe', True)
+        cn_options = result.get('cn_option_list', [])
+        return [
+            f'=IMAGE("{thumb_url}")' if thumb_url else '',           # 썸네일 이미지
+            f'=IMAGE("{option_img}")' if option_img else '',         # 옵션 이미지 - 썸네일 바로 옆
+            result.get('name', '')[:50],
+            ('O' if is_safe else 'X', 'safe' if is_safe else 'unsafe'),
+            result.get('unsafe_reason', ''),
+            result.get('safe_context', ''),
+            result.get('check_level', ''),
+            result.get('ai_judgment', ''),
+            result.get('total_options', 0),
+            result.get('valid_options', 0),
+            result.get('final_options', 0),
+            result.get('bait_options', 0),
+            (self._format_options_abc(result.get('bait_option_list', [])[:5]), 'wrap'),
+            result.get('detected_keywords', ''),
+            result.get('main_option_name', ''),
+            result.get('main_option_method', ''),
+            ('A', 'select'),                                         # 프로그램 추천 기본값 A, 사용자가 수정 가능
+            (self._format_options_abc(result.get('final_option_list', [])), 'wrap'),
+            (self._format_options_abc(cn_options) if cn_options else '', 'wrap'),
+            result.get('group_name', ''),
+        ]
+
+    def _detail_row(self, result: Dict) -> list:
+        """상세정보 시트 1행 (기존 형식)"""
+        is_safe = result.get('is_safe')
+        return [
+            result.get('group_name', ''),
+            result.get('id', ''),
+            result.get('name', '')[:50],
+            ('안전' if is_safe else '위험', 'safe' if is_safe else 'unsafe'),
+            result.get('unsafe_reason', ''),
+            result.get('safe_context', ''),
+            result.get('total_options', 0),
+            result.get('valid_options', 0),
+            result.get('final_options', 0),
+            result.get('bait_options', 0),
+            (self._format_options_abc(result.get('bait_option_list', [])[:5]), 'wrap'),
+            ('A', 'select'),
+            result.get('main_option_name', ''),
+            result.get('min_price_cny', 0),
+            result.get('max_price_cny', 0),
+            (self._format_options_abc(result.get('final_option_list', [])), 'wrap'),
+            result.get('thumbnail_url', ''),
+            result.get('main_option_image', ''),
+        ]
+
+    def _stats_sheet(self) -> Dict[str, list]:
+        """통계 시트"""
+        return {"통계": [
             ["항목", "값"],
             ["전체 상품", self.stats['total']],
             ["안전 상품", self.stats['safe']],
@@ -650,13 +498,7 @@ class BulsajaSimulator:
             ["미끼옵션 발견 상품", self.stats['bait_found']],
             ["썸네일 매칭 성공", self.stats['thumbnail_matched']],
             ["분석 일시", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-        ]
-        for row_idx, row_data in enumerate(stats_data, 1):
-            for col_idx, value in enumerate(row_data, 1):
-                ws_stats.cell(row=row_idx, column=col_idx, value=value)
-
-        # 저장
-        wb.save(filepath)
+        ]}
 
     def _format_options_abc(self, options: list, max_count: int = 10) -> str:
         """옵션 목록을 A, B, C 형태로 포맷팅"""
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+업로더/동기화 처리량 벤치마크 (오프라인, mock_market_server 사용)
+네트워크 없이 같은 조건으로 반복 측정 → 동시성 변경 전후 비교용
+
+대상:
+    uploader    불사자 업로더 v2.0 (BulsajaUploader.run_upload_thread) - 상세조회/uploadfields 저장/마켓 업로드
+    smartstore  smartstore_allinone - 토큰 발급 → 상품 검색 → 혜택설정 bulk-update
+    elevenst    elevenst.run_task("판매중지") - XML 다중상품조회 → 상품별 전시중지
+
+결과: 대상별 처리 상품 수, 상품/초, 작업 단위 p50/p95 지연 + 목 서버 경로별 통계
+
+사용법:
+    python benchmark_throughput.py
+    python benchmark_throughput.py --targets uploader --products 300 --concurrent 4 --latency 80
+    python benchmark_throughput.py --error-rate 0.02 --rate-limit 30 --json bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import threading
+import importlib.util
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "web_system" / "modules"))
+
+from mock_market_server import MockConfig, MockMarketServer, percentile
+
+TARGETS = ["uploader", "smartstore", "elevenst"]
+
+
+class _LatencyRecorder:
+    """작업 단위 지연 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self.times: List[float] = []
+        self._lock = threading.Lock()
+
+    def wrap(self, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.times.append(time.perf_counter() - started)
+        return timed
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.times.append(seconds)
+
+    def summary(self) -> Dict:
+        times = sorted(self.times)
+        return {
+            'ops': len(times),
+            'p50_ms': round(percentile(times, 50) * 1000, 1),
+            'p95_ms': round(percentile(times, 95) * 1000, 1),
+        }
+
+
+class _Signal:
+    def __init__(self, sink: List = None):
+        self.sink = sink
+
+    def emit(self, *args):
+        if self.sink is not None:
+            self.sink.append(args)
+
+
+class _BenchWorker:
+    """UploadWorker(QThread) 대신 run_upload_thread에 넘기는 신호 객체 (로그 수집만)"""
+
+    def __init__(self):
+        self.is_running = True
+        self.logs: List = []
+        self.log_signal = _Signal(self.logs)
+        self.progress_signal = _Signal()
+        self.group_signal = _Signal()
+
+
+def bench_uploader(server: MockMarketServer, args) -> Dict:
+    """불사자 업로더 v2.0 - 그룹 1개 전체 업로드"""
+    spec = importlib.util.spec_from_file_location("bulsaja_uploader_v2", BASE_DIR / "7. bulsaja_uploader_v2.0.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    uploader = module.BulsajaUploader(None)
+    uploader.api_client.set_tokens("mock-access", "mock-refresh")
+    recorder = _LatencyRecorder()
+    uploader.process_product = recorder.wrap(uploader.process_product)
+
+    markets = [m.strip() for m in args.markets.split(',') if m.strip()]
+    settings = {
+        'exchange_rate': 215, 'card_fee': 3.3, 'margin_rate': "25,30", 'margin_fixed': 15000,
+        'discount_rate': "20,30", 'round_unit': 100,
+        'upload_count': args.products, 'concurrent': args.concurrent, 'market_inflight': args.market_inflight,
+        'option_count': 10, 'option_sort': 'price_asc', 'title_mode': 'shuffle_skip3',
+        'status_filters': None, 'target_markets': markets, 'group_names': [server.data.group_names[0]],
+        'skip_already_uploaded': True, 'update_upload_mode': False, 'prevent_duplicate': True,
+        'skip_failed_tag': False, 'esm_discount_3': True, 'esm_option_normalize': True,
+        'ss_category_search': True, 'fail_tag': "업로드실패", 'test_id': "",
+        'min_price': 0, 'max_price': 100000000,
+        'exclude_categories': "", 'banned_kw_enabled': False, 'banned_keywords': "",
+        'exclude_kw_enabled': True, 'exclude_keywords': "",
+    }
+    worker = _BenchWorker()
+    started = time.perf_counter()
+    uploader.run_upload_thread(settings, worker)
+    elapsed = time.perf_counter() - started
+
+    stats = uploader.stats
+    done = stats['success'] + stats['failed'] + stats['skipped'] + stats['duplicate_failed']
+    errors = [args_[0] for args_ in worker.logs if args_ and '❌ Error' in str(args_[0])]
+    return {
+        'items': done,
+        'unit': f"상품×마켓 ({', '.join(markets)})",
+        'success': stats['success'], 'failed': stats['failed'], 'skipped': stats['skipped'],
+        'elapsed': elapsed,
+        'latency': recorder.summary(),
+        'errors': errors[:3],
+    }
+
+
+def bench_smartstore(server: MockMarketServer, args) -> Dict:
+    """스마트스토어 올인원 - 토큰 → 검색 → 혜택설정 bulk-update"""
+    import bcrypt
+    import smartstore_allinone as aio
+
+    recorder = _LatencyRecorder()
+    aio.HTTP_SESSION.hooks['response'].append(lambda r, *a, **k: recorder.add(r.elapsed.total_seconds()))
+    aio.log = aio.plog = lambda msg: None   # 벤치마크 출력 정리
+
+    started = time.perf_counter()
+    token = aio.get_access_token("mock-client", bcrypt.gensalt(4).decode())
+    nos = aio.list_origin_product_nos(token, {'status_type': "SALE"})
+    result = aio.bulk_update_benefit_for_store(token, {'pointPolicy': {'value': 1}}, nos)
+    elapsed = time.perf_counter() - started
+    return {
+        'items': len(nos),
+        'unit': "상품 (검색+혜택설정)",
+        'success': result.get('updated', 0), 'failed': result.get('fail', 0), 'skipped': 0,
+        'elapsed': elapsed,
+        'latency': recorder.summary(),
+    }
+
+
+def bench_elevenst(server: MockMarketServer, args) -> Dict:
+    """11번가 - 다중상품조회 → 상품별 전시중지 (PRODUCT_WORKERS 병렬)"""
+    import elevenst
+
+    recorder = _LatencyRecorder()
+    elevenst.stop_display = recorder.wrap(elevenst.stop_display)
+    elevenst.plog = lambda msg: None
+
+    started = time.perf_counter()
+    result = elevenst.run_task("판매중지", "목스토어", "mock-key", log_callback=lambda msg: None)
+    elapsed = time.perf_counter() - started
+    return {
+        'items': result.get('total', 0),
+        'unit': "상품 (전시중지)",
+        'success': result.get('success_count', 0), 'failed': result.get('fail_count', 0), 'skipped': 0,
+        'elapsed': elapsed,
+        'latency': recorder.summary(),
+    }
+
+
+BENCHES = {
+    'uploader': bench_uploader,
+    'smartstore': bench_smartstore,
+    'elevenst': bench_elevenst,
+}
+
+
+def run_benchmark(args) -> Dict:
+    config = MockConfig(latency_ms=args.latency, jitter_ms=args.jitter, upload_latency_ms=args.upload_latency,
+                        error_rate=args.error_rate, rate_limit=args.rate_limit,
+                        products=args.products, seed=args.seed)
+    server = MockMarketServer(config)
+    server.start()
+    # 모듈 import 전에 설정해야 API 주소가 목 서버로 잡힘
+    os.environ.update(server.env())
+
+    # 업로더가 만드는 캐시/저널 파일은 임시 폴더에 (실제 작업 폴더 오염 방지 + 매번 같은 조건)
+    work_dir = tempfile.mkdtemp(prefix="bench_")
+    prev_dir = os.getcwd()
+    os.chdir(work_dir)
+
+    report = {'config': vars(config), 'targets': {}}
+    try:
+        for name in args.targets:
+            server.reset_stats()
+            try:
+                result = BENCHES[name](server, args)
+            except ImportError as e:
+                report['targets'][name] = {'unavailable': f"모듈 없음: {e}"}
+                continue
+            elapsed = result['elapsed']
+            result['elapsed'] = round(elapsed, 2)
+            result['items_per_sec'] = round(result['items'] / elapsed, 2) if elapsed > 0 else 0
+            result['server'] = server.stats()
+            report['targets'][name] = result
+    finally:
+        os.chdir(prev_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        server.stop()
+    return report
+
+
+def print_report(report: Dict):
+    config = report['config']
+    print()
+    print("=" * 70)
+    print(f"  목 서버: 지연 {config['latency_ms']}±{config['jitter_ms']}ms, 오류율 {config['error_rate']}, "
+          f"레이트리밋 {config['rate_limit'] or '없음'}, 상품 {config['products']}개")
+    print("=" * 70)
+    for name, result in report['targets'].items():
+        if 'unavailable' in result:
+            print(f"\n[{name}] 건너뜀 - {result['unavailable']}")
+            continue
+        latency = result['latency']
+        print(f"\n[{name}] {result['items']} {result['unit']} / {result['elapsed']}s "
+              f"→ {result['items_per_sec']}/s")
+        print(f"   성공 {result['success']}, 실패 {result['failed']}, 건너뜀 {result['skipped']}")
+        print(f"   작업 지연: p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms ({latency['ops']}회)")
+        for error in result.get('errors', []):
+            print(f"   ⚠️ {error[:120]}")
+        for route, st in result['server'].items():
+            extra = f", 503 {st['errors']}" if st['errors'] else ""
+            extra += f", 429 {st['throttled']}" if st['throttled'] else ""
+            print(f"     {route:<28} {st['count']:>6}회  p95 {st['p95_ms']}ms{extra}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='업로더/동기화 처리량 벤치마크 (오프라인 목 서버)')
+    parser.add_argument('--targets', default=",".join(TARGETS), help=f"측정 대상 ({', '.join(TARGETS)})")
+    parser.add_argument('--products', type=int, default=200, help='상품 수')
+    parser.add_argument('--markets', default="스마트스토어,11번가", help='업로더 대상 마켓')
+    parser.add_argument('--concurrent', type=int, default=1, help='업로더 동시 상품 수')
+    parser.add_argument('--market-inflight', type=int, default=2, help='업로더 마켓당 동시 업로드 수')
+    parser.add_argument('--latency', type=float, default=50, help='평균 지연 (ms)')
+    parser.add_argument('--jitter', type=float, default=20, help='지연 표준편차 (ms)')
+    parser.add_argument('--upload-latency', type=float, default=0, help='마켓 업로드 평균 지연 (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503 응답 비율 (0~1)')
+    parser.add_argument('--rate-limit', type=float, default=0, help='서비스별 초당 요청 수 (0=제한 없음)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='결과 JSON 저장 경로 (CI 비교용)')
+    args = parser.parse_args()
+    args.targets = [t.strip() for t in args.targets.split(',') if t.strip() in BENCHES]
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
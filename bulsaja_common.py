@@ -16,9 +16,14 @@ by 프코노미
 import os
 import re
 import json
+import math
+import time
+import threading
 import requests
 import websocket
-from typing import List, Dict, Tuple, Optional, Set
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import List, Dict, Tuple, Optional, Set, Iterator
 from urllib.parse import urlparse
 
 # ==================== 파일 경로 ====================
@@ -956,16 +961,28 @@ def save_remove_words(words: Set[str]) -> bool:
         return False
 
 
+_bait_keywords_state = {'mtime': None, 'keywords': None}   # 파일이 바뀔 때만 다시 읽음 (세션 간 공유)
+
+
 def load_bait_keywords() -> List[str]:
     """미끼옵션 키워드 로드"""
-    if os.path.exists(BAIT_KEYWORDS_FILE):
+    try:
+        st = os.stat(BAIT_KEYWORDS_FILE)
+        mtime = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return DEFAULT_BAIT_KEYWORDS[:]
+
+    state = _bait_keywords_state
+    if state['keywords'] is None or state['mtime'] != mtime:
         try:
             with open(BAIT_KEYWORDS_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                return data.get('keywords', DEFAULT_BAIT_KEYWORDS[:])
+            state['keywords'] = data.get('keywords', DEFAULT_BAIT_KEYWORDS[:])
+            state['mtime'] = mtime
         except Exception as e:
             print(f"미끼키워드 로드 실패: {e}")
-    return DEFAULT_BAIT_KEYWORDS[:]
+            return DEFAULT_BAIT_KEYWORDS[:]
+    return state['keywords'][:]
 
 
 def save_bait_keywords(keywords: List[str]) -> bool:
@@ -974,6 +991,7 @@ def save_bait_keywords(keywords: List[str]) -> bool:
         data = {'keywords': keywords}
         with open(BAIT_KEYWORDS_FILE, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        _bait_keywords_state['keywords'] = None
         return True
     except Exception as e:
         print(f"미끼키워드 저장 실패: {e}")
@@ -1112,13 +1130,14 @@ def extract_image_id(url: str) -> str:
         return url
 
 
-def match_thumbnail_to_sku(thumbnails: List[str], skus: List[Dict]) -> Optional[int]:
+def match_thumbnail_to_sku(thumbnails: List[str], skus: List[Dict], use_image_hash: bool = False) -> Optional[int]:
     """
     대표 썸네일과 매칭되는 SKU 인덱스 찾기
 
     Args:
         thumbnails: uploadThumbnails 배열 (첫 번째가 대표 이미지)
         skus: uploadSkus 배열
+        use_image_hash: URL로 못 찾으면 이미지 해시로 비교 (다운로드 필요)
 
     Returns:
         매칭되는 SKU 인덱스 또는 None
@@ -1173,9 +1192,860 @@ def match_thumbnail_to_sku(thumbnails: List[str], skus: List[Dict]) -> Optional[
                 if main_product_id in sku_url:
                     return idx
 
+    # 4차 시도: 이미지 해시 비교 (재호스팅/번역으로 URL이 달라진 경우)
+    if use_image_hash:
+        return match_thumbnail_to_sku_by_image(thumbnails, skus)
+
     return None
 
 
+# ==================== 이미지 해시 매칭 (pHash/dHash) ====================
+# URL 파일명이 달라도 (불사자 재호스팅/번역 이미지) 그림이 같으면 매칭
+# 해시는 SQLite에 저장 → 같은 이미지는 실행이 바뀌어도 한 번만 다운로드/계산
+
+IMAGE_HASH_CACHE_FILE = "image_hash_cache.db"
+IMAGE_HASH_MAX_DISTANCE = 10      # 64비트 해시 해밍거리 허용치 (dHash/pHash 평균)
+IMAGE_HASH_WORKERS = 16           # 다운로드/해시 계산 스레드 수
+IMAGE_HASH_FAILURE_TTL = 300      # 다운로드/디코딩 실패 기억 시간 (초) - 일시적 CDN 오류는 이후 다시 시도
+
+_image_hash_memory = {}           # {url: (dhash, phash)} - 이번 실행 중 메모리 캐시 (성공만)
+_image_hash_failed = {}           # {url: 실패 시각} - 실패는 디스크에 저장하지 않고 TTL 동안만 기억
+_image_hash_lock = threading.Lock()
+_dct_matrix = None
+
+
+def _small_image_url(url: str) -> str:
+    """해시용 작은 이미지 URL (alicdn은 썸네일 크기 접미사 사용)"""
+    if 'alicdn.com' in url and not re.search(r'_\d+x\d+\w*\.(jpg|png|webp)$', url):
+        return url + '_120x120.jpg'
+    return url
+
+
+def _image_hash_db():
+    """해시 캐시 DB 연결 (호출마다 새 연결 → 스레드/프로세스 안전)"""
+    import sqlite3
+    conn = sqlite3.connect(IMAGE_HASH_CACHE_FILE, timeout=30)
+    conn.execute("""CREATE TABLE IF NOT EXISTS url_content (
+        url TEXT PRIMARY KEY, content_sha1 TEXT NOT NULL)""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS content_hash (
+        content_sha1 TEXT PRIMARY KEY, dhash INTEGER NOT NULL, phash INTEGER NOT NULL,
+        created_at REAL NOT NULL)""")
+    return conn
+
+
+def _hash_image_bytes(data: bytes) -> Optional[Tuple[int, int]]:
+    """이미지 바이트 → (dHash, pHash) 64비트 정수"""
+    global _dct_matrix
+    try:
+        import io
+        import numpy as np
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        img = Image.open(io.BytesIO(data)).convert('L')
+    except Exception:
+        return None
+
+    # dHash: 9x8로 줄여서 가로 인접 픽셀 밝기 비교
+    small = np.asarray(img.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    dhash_bits = (small[:, 1:] > small[:, :-1]).flatten()
+
+    # pHash: 32x32 DCT의 저주파 8x8 성분을 중앙값과 비교
+    if _dct_matrix is None:
+        n = 32
+        k = np.arange(n)
+        m = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+        m[0] *= 1 / np.sqrt(2)
+        _dct_matrix = m * np.sqrt(2 / n)
+    pixels = np.asarray(img.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    dct = (_dct_matrix @ pixels @ _dct_matrix.T)[:8, :8].flatten()
+    phash_bits = dct > np.median(dct[1:])
+
+    def to_int(bits):
+        value = 0
+        for bit in bits:
+            value = (value << 1) | int(bit)
+        return value
+
+    return to_int(dhash_bits), to_int(phash_bits)
+
+
+def _fetch_image_hash(url: str) -> Tuple[str, Optional[str], Optional[Tuple[int, int]]]:
+    """이미지 1개 다운로드 + 해시 (url, 내용 sha1, 해시)"""
+    import hashlib
+    try:
+        resp = requests.get(_small_image_url(url), timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        if resp.status_code != 200 and _small_image_url(url) != url:
+            resp = requests.get(url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        if resp.status_code != 200 or not resp.content:
+            return url, None, None
+    except Exception:
+        return url, None, None
+
+    content_sha1 = hashlib.sha1(resp.content).hexdigest()
+    return url, content_sha1, _hash_image_bytes(resp.content)
+
+
+def prefetch_image_hashes(urls: List[str], max_workers: int = IMAGE_HASH_WORKERS,
+                          log_callback=None) -> Dict[str, Optional[Tuple[int, int]]]:
+    """
+    여러 이미지 해시를 한 번에 준비 (캐시 → 없으면 스레드풀로 다운로드/계산)
+
+    그룹 단위로 썸네일 + SKU 이미지를 미리 넘겨두면 이후 매칭은 메모리에서 바로 처리됨
+
+    Returns:
+        {url: (dhash, phash) 또는 None(다운로드/디코딩 실패)}
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    result = {}
+
+    with _image_hash_lock:
+        now = time.time()
+        missing = []
+        for url in urls:
+            if url in _image_hash_memory:
+                result[url] = _image_hash_memory[url]
+            elif now - _image_hash_failed.get(url, 0) < IMAGE_HASH_FAILURE_TTL:
+                result[url] = None
+            else:
+                missing.append(url)
+    if not missing:
+        return result
+
+    # 1. 디스크 캐시 조회
+    try:
+        conn = _image_hash_db()
+        try:
+            still_missing = []
+            for url in missing:
+                row = conn.execute(
+                    "SELECT h.dhash, h.phash FROM url_content u JOIN content_hash h "
+                    "ON u.content_sha1 = h.content_sha1 WHERE u.url = ?", (url,)).fetchone()
+                if row:
+                    result[url] = (row[0] & 0xFFFFFFFFFFFFFFFF, row[1] & 0xFFFFFFFFFFFFFFFF)
+                else:
+                    still_missing.append(url)
+            missing = still_missing
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[WARNING] 이미지 해시 캐시 조회 실패: {e}")
+
+    # 2. 없는 것만 다운로드 + 해시 (병렬)
+    fetched = []
+    if missing:
+        from concurrent.futures import ThreadPoolExecutor
+        if log_callback:
+            log_callback(f"   🖼️ 이미지 해시 계산: {len(missing)}개 (캐시 {len(urls) - len(missing)}개)")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for url, content_sha1, hashes in executor.map(_fetch_image_hash, missing):
+                result[url] = hashes
+                if content_sha1 and hashes:
+                    fetched.append((url, content_sha1, hashes))
+
+    # 3. 새 해시 저장 (같은 내용이면 content_sha1 하나로 공유, 실패는 저장 안 함)
+    if fetched:
+        try:
+            conn = _image_hash_db()
+            try:
+                with conn:
+                    for url, content_sha1, (dhash, phash) in fetched:
+                        # SQLite INTEGER는 부호 있는 64비트 → 음수로 변환해서 저장
+                        conn.execute("INSERT OR IGNORE INTO content_hash VALUES (?, ?, ?, ?)",
+                                     (content_sha1, dhash - (1 << 64) if dhash >= (1 << 63) else dhash,
+                                      phash - (1 << 64) if phash >= (1 << 63) else phash, time.time()))
+                        conn.execute("INSERT OR REPLACE INTO url_content VALUES (?, ?)", (url, content_sha1))
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[WARNING] 이미지 해시 캐시 저장 실패: {e}")
+
+    with _image_hash_lock:
+        now = time.time()
+        for url, hashes in result.items():
+            if hashes is not None:
+                _image_hash_memory[url] = hashes
+                _image_hash_failed.pop(url, None)
+        for url in missing:
+            if result.get(url) is None:
+                _image_hash_failed[url] = now   # 이번에 받아봤는데 실패 → TTL 뒤 다시 시도
+
+    return result
+
+
+def image_hash_distance(a: Tuple[int, int], b: Tuple[int, int]) -> float:
+    """두 이미지 해시의 해밍거리 (dHash/pHash 평균, 0=동일 ~ 64)"""
+    return (bin(a[0] ^ b[0]).count('1') + bin(a[1] ^ b[1]).count('1')) / 2
+
+
+def match_thumbnail_to_sku_by_image(thumbnails: List[str], skus: List[Dict],
+                                    max_distance: float = IMAGE_HASH_MAX_DISTANCE) -> Optional[int]:
+    """
+    대표 썸네일과 그림이 가장 비슷한 SKU 인덱스 찾기 (이미지 해시 비교)
+
+    Returns:
+        해밍거리가 max_distance 이하인 가장 가까운 SKU 인덱스 또는 None
+    """
+    if not thumbnails or not skus:
+        return None
+
+    sku_urls = [sku.get('urlRef') or sku.get('image') or '' for sku in skus]
+    hashes = prefetch_image_hashes([thumbnails[0]] + sku_urls)
+
+    main_hash = hashes.get(thumbnails[0])
+    if not main_hash:
+        return None
+
+    best_idx = None
+    best_distance = max_distance + 1
+    for idx, url in enumerate(sku_urls):
+        sku_hash = hashes.get(url) if url else None
+        if not sku_hash:
+            continue
+        distance = image_hash_distance(main_hash, sku_hash)
+        if distance < best_distance:
+            best_idx = idx
+            best_distance = distance
+
+    return best_idx
+
+
+# ==================== 이미지 유사상품 검색 캐시 ====================
+# 옵션 분리 상품/재소싱 상품은 대표 이미지가 같음 → AliPrice 이미지 검색 결과를 pHash 기준으로 재사용
+# 재호스팅으로 URL/압축이 달라도 해시 거리가 가까우면 같은 이미지로 취급
+
+SIMILAR_SEARCH_CACHE_FILE = "similar_search_cache.db"
+SIMILAR_SEARCH_TTL = 14 * 24 * 3600      # 검색 결과 유효기간 (초)
+SIMILAR_SEARCH_MAX_DISTANCE = 4          # 같은 이미지로 볼 해밍거리 (매칭용 IMAGE_HASH_MAX_DISTANCE보다 엄격)
+
+_similar_index = None                    # {phash_key: ((dhash, phash), results, created_at)} - 첫 조회 시 DB에서 로드
+_similar_inflight = {}                   # {phash_key: threading.Event} - 같은 이미지 동시 검색 방지
+_similar_lock = threading.Lock()
+_similar_stats = {'hit': 0, 'near': 0, 'miss': 0, 'nohash': 0}
+
+
+def _similar_search_db():
+    """유사상품 검색 캐시 DB 연결 (호출마다 새 연결 → 스레드/프로세스 안전)"""
+    import sqlite3
+    conn = sqlite3.connect(SIMILAR_SEARCH_CACHE_FILE, timeout=30)
+    conn.execute("""CREATE TABLE IF NOT EXISTS similar_search (
+        phash_key TEXT PRIMARY KEY, dhash TEXT NOT NULL, phash TEXT NOT NULL,
+        results TEXT NOT NULL, image_url TEXT, created_at REAL NOT NULL)""")
+    return conn
+
+
+def _load_similar_index(ttl: float) -> Dict:
+    """만료 안 된 캐시 전체를 메모리 인덱스로 (근접 해시 비교용, 프로세스당 1회)"""
+    global _similar_index
+    with _similar_lock:
+        if _similar_index is not None:
+            return _similar_index
+    index = {}
+    try:
+        conn = _similar_search_db()
+        try:
+            rows = conn.execute("SELECT phash_key, dhash, phash, results, created_at FROM similar_search "
+                                "WHERE created_at > ?", (time.time() - ttl,)).fetchall()
+        finally:
+            conn.close()
+        for key, dhash, phash, results, created_at in rows:
+            index[key] = ((int(dhash, 16), int(phash, 16)), json.loads(results), created_at)
+    except Exception as e:
+        print(f"[WARNING] 유사상품 검색 캐시 로드 실패: {e}")
+    with _similar_lock:
+        if _similar_index is None:
+            _similar_index = index
+        return _similar_index
+
+
+def _lookup_similar(key: str, hashes: Tuple[int, int], ttl: float) -> Tuple[Optional[List[str]], str]:
+    """캐시 조회 → (검색 결과 또는 None, 'hit'/'near'/'')"""
+    index = _load_similar_index(ttl)
+    now = time.time()
+    with _similar_lock:
+        entry = index.get(key)
+        if entry and now - entry[2] < ttl:
+            return entry[1], 'hit'
+        best = None
+        best_distance = SIMILAR_SEARCH_MAX_DISTANCE + 1
+        for other_hashes, results, created_at in index.values():
+            if now - created_at >= ttl:
+                continue
+            distance = image_hash_distance(hashes, other_hashes)
+            if distance < best_distance:
+                best, best_distance = results, distance
+    return (best, 'near') if best is not None else (None, '')
+
+
+def _store_similar(key: str, hashes: Tuple[int, int], results: List[str], image_url: str) -> None:
+    now = time.time()
+    with _similar_lock:
+        if _similar_index is not None:
+            _similar_index[key] = (hashes, list(results), now)
+    try:
+        conn = _similar_search_db()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO similar_search VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, f"{hashes[0]:016x}", f"{hashes[1]:016x}",
+                              json.dumps(results, ensure_ascii=False), image_url, now))
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[WARNING] 유사상품 검색 캐시 저장 실패: {e}")
+
+
+def search_similar_cached(image_url: str, search_func, ttl: float = SIMILAR_SEARCH_TTL,
+                          force_refresh: bool = False) -> List[str]:
+    """
+    대표 이미지 pHash 기준 캐시를 거쳐 유사상품 검색
+
+    Args:
+        image_url: 대표 이미지 URL
+        search_func: image_url → 유사상품명 리스트 (실제 이미지 검색, 실패 시 빈 리스트)
+        ttl: 검색 결과 유효기간 (초)
+        force_refresh: True면 캐시 무시하고 새로 검색 (결과는 다시 저장)
+
+    Returns:
+        유사상품명 리스트
+    """
+    if not image_url:
+        return []
+    hashes = prefetch_image_hashes([image_url]).get(image_url)
+    if not hashes:
+        # 다운로드/디코딩 실패 → 캐시 없이 바로 검색
+        with _similar_lock:
+            _similar_stats['nohash'] += 1
+        return search_func(image_url)
+    key = f"{hashes[1]:016x}"
+
+    while True:
+        if not force_refresh:
+            results, kind = _lookup_similar(key, hashes, ttl)
+            if results is not None:
+                with _similar_lock:
+                    _similar_stats[kind] += 1
+                return list(results)
+
+        # 같은 이미지를 다른 워커가 검색 중이면 끝날 때까지 대기 후 캐시 재조회
+        with _similar_lock:
+            event = _similar_inflight.get(key)
+            if event is None:
+                event = threading.Event()
+                _similar_inflight[key] = event
+                owner = True
+            else:
+                owner = False
+        if owner:
+            break
+        event.wait(120)
+        force_refresh = False
+
+    try:
+        with _similar_lock:
+            _similar_stats['miss'] += 1
+        results = search_func(image_url) or []
+        if results:
+            _store_similar(key, hashes, results, image_url)   # 빈 결과(버튼 못 찾음 등)는 캐시 안 함
+        return results
+    finally:
+        with _similar_lock:
+            _similar_inflight.pop(key, None)
+        event.set()
+
+
+def clear_similar_search_cache() -> int:
+    """유사상품 검색 캐시 삭제. Returns: 삭제된 행 수"""
+    global _similar_index
+    try:
+        conn = _similar_search_db()
+        try:
+            with conn:
+                deleted = conn.execute("DELETE FROM similar_search").rowcount
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[ERROR] 유사상품 검색 캐시 삭제 실패: {e}")
+        return 0
+    with _similar_lock:
+        _similar_index = None
+    return deleted
+
+
+def get_similar_search_stats() -> Dict[str, int]:
+    """유사상품 검색 캐시 통계 (hit, near, miss, nohash)"""
+    with _similar_lock:
+        return dict(_similar_stats)
+
+
+# ==================== 이미지 디스크 캐시 ====================
+# 썸네일 분석 / 이미지 뷰어 / 상품명 생성 / SMS 서버가 같은 alicdn·불사자 이미지를 각자 받던 것을 한 곳에 저장
+# - 원본은 내용 sha1 이름으로 저장 (URL이 달라도 같은 그림이면 파일 1개), URL → sha1은 SQLite 인덱스
+# - 저장할 때 작은 렌디션(JPEG)도 만들어 둠 → 미리보기는 큰 원본 디코딩 없이 바로 표시
+# - 총 용량을 넘으면 오래 안 쓴 이미지부터 삭제 (LRU)
+# - 오래된 항목은 ETag/Last-Modified로 재검증 (304면 다시 받지 않음, 실패하면 기존 파일 사용)
+# - 여러 프로그램이 같은 폴더를 동시에 써도 안전: SQLite WAL + 쓰기 트랜잭션 직렬화, 파일은 임시파일 → os.replace
+
+IMAGE_CACHE_DIR = "image_cache"
+IMAGE_CACHE_MAX_BYTES = 2 * 1024 ** 3            # 원본 + 렌디션 총 용량 (초과 시 90%까지 LRU 삭제)
+IMAGE_CACHE_REVALIDATE_AFTER = 7 * 24 * 3600     # 이 시간이 지난 항목은 조건부 요청으로 재검증 (초)
+IMAGE_CACHE_TOUCH_INTERVAL = 300                 # 접근 시각 갱신 간격 (초) - 읽을 때마다 쓰기 잠금 잡지 않도록
+IMAGE_CACHE_FAILURE_TTL = 10                     # 다운로드 실패 기억 시간 (초) - 대기하던 스레드가 같은 URL을 다시 받지 않도록
+IMAGE_CACHE_RENDITIONS = {'thumb': 160, 'preview': 640}   # {이름: 긴 변 px}
+IMAGE_CACHE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Referer': 'https://www.bulsaja.com/',
+}
+
+_image_cache = None
+_image_cache_lock = threading.Lock()
+
+
+class ImageDiskCache:
+    """
+    URL/내용 해시 기반 이미지 디스크 캐시 (스레드/프로세스 안전)
+
+    사용법:
+        cache = get_image_cache()
+        data = cache.get_bytes(url)              # 원본 바이트 (없으면 다운로드)
+        path = cache.get_file(url, min_side=60)  # 60px 이상인 가장 작은 렌디션 파일 (없으면 원본)
+    """
+
+    def __init__(self, cache_dir: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+                 revalidate_after: float = IMAGE_CACHE_REVALIDATE_AFTER, renditions: Dict[str, int] = None,
+                 timeout: float = 15):
+        self.cache_dir = cache_dir
+        self.db_file = os.path.join(cache_dir, "index.db")
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.renditions = dict(IMAGE_CACHE_RENDITIONS if renditions is None else renditions)
+        self.timeout = timeout
+        self.stats = {'hit': 0, 'miss': 0, 'revalidated': 0, 'changed': 0, 'stale': 0, 'error': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._inflight = {}        # {url: threading.Event} - 같은 URL 동시 다운로드 방지
+        self._failed = {}          # {url: 실패 시각} - IMAGE_CACHE_FAILURE_TTL 동안은 다시 받지 않고 None
+        self._session = None
+
+        os.makedirs(cache_dir, exist_ok=True)
+        conn = self._db()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")    # 읽기와 쓰기가 서로 막지 않음 (DB 파일에 유지됨)
+            conn.execute("""CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY, sha1 TEXT NOT NULL, etag TEXT, last_modified TEXT,
+                validated_at REAL NOT NULL)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS blobs (
+                sha1 TEXT PRIMARY KEY, size INTEGER NOT NULL, width INTEGER NOT NULL, height INTEGER NOT NULL,
+                created_at REAL NOT NULL, last_access REAL NOT NULL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('total_bytes', 0)")
+        finally:
+            conn.close()
+
+    # ---------- 조회 ----------
+
+    def get_bytes(self, url: str, refresh: bool = False) -> Optional[bytes]:
+        """원본 이미지 바이트 (캐시 → 없거나 재검증 시기면 다운로드). 실패 시 None"""
+        for attempt in range(2):
+            entry = self._resolve(url, refresh=refresh or attempt > 0)
+            if entry is None:
+                return None
+            try:
+                with open(self._blob_path(entry['sha1']), 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                continue    # 다른 프로세스가 방금 삭제(LRU) → 다시 받기
+        return None
+
+    def get_file(self, url: str, min_side: int = 0, refresh: bool = False) -> Optional[str]:
+        """
+        이미지 파일 경로 (다른 프로세스의 LRU 삭제와 겹치면 파일이 사라질 수 있으니 바로 읽어서 사용)
+
+        Args:
+            min_side: 필요한 긴 변(px) - 이 이상인 가장 작은 렌디션을 돌려줌 (0 또는 렌디션보다 크면 원본)
+        """
+        for attempt in range(2):
+            entry = self._resolve(url, refresh=refresh or attempt > 0)
+            if entry is None:
+                return None
+            original = self._blob_path(entry['sha1'])
+            name = self._pick_rendition(entry, min_side)
+            if name:
+                path = self._blob_path(entry['sha1'], name)
+                if os.path.exists(path):
+                    return path
+                # 렌디션 설정이 바뀌었거나 PIL 없이 저장된 항목 → 원본에서 지금 생성
+                try:
+                    with open(original, 'rb') as f:
+                        self._make_renditions(entry['sha1'], f.read())
+                except FileNotFoundError:
+                    continue
+                if os.path.exists(path):
+                    return path
+            if os.path.exists(original):
+                return original
+        return None
+
+    def _pick_rendition(self, entry: Dict, min_side: int) -> Optional[str]:
+        """min_side 이상인 가장 작은 렌디션 이름 (원본이 더 작거나 맞는 렌디션이 없으면 None)"""
+        long_side = max(entry['width'], entry['height'])
+        if not min_side or not long_side:
+            return None
+        fits = [(side, name) for name, side in self.renditions.items() if min_side <= side < long_side]
+        return min(fits)[1] if fits else None
+
+    def _resolve(self, url: str, refresh: bool = False) -> Optional[Dict]:
+        """URL → 캐시 항목 {'sha1', 'width', 'height'} (필요하면 다운로드/재검증)"""
+        url = url.strip()
+        if url.startswith('//'):
+            url = 'https:' + url
+        if not url.startswith('http'):
+            return None
+
+        while True:
+            entry = self._lookup(url)
+            if entry and not os.path.exists(self._blob_path(entry['sha1'])):
+                entry = None    # 인덱스만 남고 파일이 지워진 항목 → 새로 받기
+            if entry and not refresh and time.time() - entry['validated_at'] < self.revalidate_after:
+                self._touch(entry)
+                with self._lock:
+                    self.stats['hit'] += 1
+                return entry
+
+            # 같은 URL을 다른 스레드가 받는 중이면 끝날 때까지 대기 후 캐시 재조회
+            with self._lock:
+                failed_at = self._failed.get(url)
+                if not entry and failed_at and time.time() - failed_at < IMAGE_CACHE_FAILURE_TTL:
+                    return None     # 방금 실패한 URL (대기하던 스레드 포함) → 다시 요청하지 않음
+                event = self._inflight.get(url)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[url] = event
+                    owner = True
+                else:
+                    owner = False
+            if owner:
+                break
+            event.wait(self.timeout * 2)
+            refresh = False
+
+        result = None
+        try:
+            result = self._download(url, entry)
+            return result
+        finally:
+            with self._lock:
+                now = time.time()
+                if result is None:
+                    self._failed[url] = now
+                    if len(self._failed) > 1000:
+                        self._failed = {u: t for u, t in self._failed.items()
+                                        if now - t < IMAGE_CACHE_FAILURE_TTL}
+                else:
+                    self._failed.pop(url, None)
+                self._inflight.pop(url, None)
+            event.set()
+
+    def _download(self, url: str, entry: Optional[Dict]) -> Optional[Dict]:
+        """다운로드 (기존 항목이 있으면 조건부 요청) → 저장"""
+        headers = dict(IMAGE_CACHE_HEADERS)
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            resp = self._http().get(url, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            resp = None
+            error = str(e)[:80]
+        else:
+            error = f"HTTP {resp.status_code}"
+
+        if resp is not None and resp.status_code == 304 and entry:
+            self._mark_validated(url)
+            self._touch(entry, force=True)
+            with self._lock:
+                self.stats['revalidated'] += 1
+            return entry
+        if resp is None or resp.status_code != 200 or not resp.content:
+            with self._lock:
+                self.stats['stale' if entry else 'error'] += 1
+            if not entry:
+                print(f"[WARNING] 이미지 다운로드 실패: {error} ({url[:60]})")
+                return None
+            # 재검증 실패 (오프라인 등) → 기존 파일 사용, 재검증 주기의 절반 뒤에 다시 시도
+            self._mark_validated(url, time.time() - self.revalidate_after / 2)
+            return entry
+
+        sha1 = self.put(url, resp.content, etag=resp.headers.get('ETag'),
+                        last_modified=resp.headers.get('Last-Modified'))
+        with self._lock:
+            if not entry:
+                self.stats['miss'] += 1
+            else:
+                self.stats['revalidated' if sha1 == entry['sha1'] else 'changed'] += 1
+        return self._lookup(url) if sha1 else None
+
+    def _http(self):
+        """공유 세션 (연결 재사용)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+                    session.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+                    self._session = session
+        return self._session
+
+    # ---------- 저장 ----------
+
+    def put(self, url: str, data: bytes, etag: str = None, last_modified: str = None) -> Optional[str]:
+        """
+        이미지 바이트 저장 (다운로드를 직접 한 호출측도 사용 가능)
+
+        Returns:
+            내용 sha1 (저장 실패 시 None)
+        """
+        import hashlib
+        sha1 = hashlib.sha1(data).hexdigest()
+        now = time.time()
+        width = height = extra = 0
+        try:
+            conn = self._db()
+            try:
+                known = conn.execute("SELECT 1 FROM blobs WHERE sha1 = ?", (sha1,)).fetchone()
+                if not (known and os.path.exists(self._blob_path(sha1))):
+                    # 파일 먼저 쓰고 인덱스 등록 (인덱스에 있으면 파일도 있음)
+                    self._write_file(self._blob_path(sha1), data)
+                    width, height, extra = self._make_renditions(sha1, data)
+                with self._transaction(conn):
+                    if not known:
+                        inserted = conn.execute(
+                            "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                            (sha1, len(data) + extra, width, height, now, now)).rowcount
+                        if inserted:
+                            conn.execute("UPDATE meta SET value = value + ? WHERE key = 'total_bytes'",
+                                         (len(data) + extra,))
+                    conn.execute("INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?)",
+                                 (url, sha1, etag, last_modified, now))
+                self._evict(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[WARNING] 이미지 캐시 저장 실패: {e}")
+            return None
+        return sha1
+
+    def _make_renditions(self, sha1: str, data: bytes) -> Tuple[int, int, int]:
+        """작은 렌디션(JPEG) 생성 → (원본 너비, 높이, 렌디션 총 바이트). PIL 없거나 디코딩 실패면 (0, 0, 0)"""
+        try:
+            import io
+            from PIL import Image
+        except ImportError:
+            return 0, 0, 0
+        try:
+            img = Image.open(io.BytesIO(data))
+            width, height = img.size
+            sides = sorted(((side, name) for name, side in self.renditions.items()
+                            if side < max(width, height)), reverse=True)
+            if not sides:
+                return width, height, 0
+            img.draft('RGB', (sides[0][0], sides[0][0]))    # JPEG은 축소 디코딩 (큰 원본 전체를 풀지 않음)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # 누끼(투명 배경) 이미지는 흰 배경으로 합성
+                rgba = img.convert('RGBA')
+                img = Image.new('RGB', rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel('A'))
+            else:
+                img = img.convert('RGB')
+            written = 0
+            for side, name in sides:     # 큰 것부터 → 직전 결과를 다시 줄여서 사용
+                img = img.copy()
+                img.thumbnail((side, side), Image.LANCZOS)
+                buf = io.BytesIO()
+                img.save(buf, 'JPEG', quality=85)
+                self._write_file(self._blob_path(sha1, name), buf.getvalue())
+                written += buf.tell()
+            return width, height, written
+        except Exception:
+            return 0, 0, 0
+
+    def _write_file(self, path: str, data: bytes):
+        """임시 파일에 쓰고 교체 (읽는 쪽은 완성된 파일만 보게 됨)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            # Windows: 다른 프로세스가 같은 파일을 열고 있음 → 같은 내용이 이미 있으므로 버림
+            os.remove(tmp)
+            if not os.path.exists(path):
+                raise
+
+    def _evict(self, conn):
+        """총 용량 초과 → 접근이 가장 오래된 이미지부터 90%까지 삭제"""
+        total = conn.execute("SELECT value FROM meta WHERE key = 'total_bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        removed = []
+        with self._transaction(conn):
+            total = conn.execute("SELECT value FROM meta WHERE key = 'total_bytes'").fetchone()[0]
+            freed = 0
+            while total - freed > target:
+                rows = conn.execute("SELECT sha1, size FROM blobs ORDER BY last_access LIMIT 200").fetchall()
+                if not rows:
+                    break
+                batch = []
+                for sha1, size in rows:
+                    batch.append(sha1)
+                    freed += size
+                    if total - freed <= target:
+                        break
+                placeholders = ",".join("?" * len(batch))
+                conn.execute(f"DELETE FROM blobs WHERE sha1 IN ({placeholders})", batch)
+                conn.execute(f"DELETE FROM urls WHERE sha1 IN ({placeholders})", batch)
+                removed.extend(batch)
+            conn.execute("UPDATE meta SET value = MAX(0, value - ?) WHERE key = 'total_bytes'", (freed,))
+
+        # 인덱스에서 빠진 뒤 파일 삭제 (열려 있어서 못 지운 파일은 다음 저장 때 덮어씀)
+        for sha1 in removed:
+            for name in [None] + list(self.renditions):
+                try:
+                    os.remove(self._blob_path(sha1, name))
+                except OSError:
+                    pass
+        with self._lock:
+            self.stats['evicted'] += len(removed)
+
+    # ---------- 인덱스 ----------
+
+    def _db(self):
+        """인덱스 DB 연결 (호출마다 새 연결 → 스레드/프로세스 안전, 트랜잭션은 _transaction으로 직접 관리)"""
+        import sqlite3
+        return sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE → 여러 프로세스의 쓰기를 처음부터 직렬화)"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _lookup(self, url: str) -> Optional[Dict]:
+        try:
+            conn = self._db()
+            try:
+                row = conn.execute(
+                    "SELECT u.sha1, u.etag, u.last_modified, u.validated_at, b.width, b.height, b.last_access "
+                    "FROM urls u JOIN blobs b ON u.sha1 = b.sha1 WHERE u.url = ?", (url,)).fetchone()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[WARNING] 이미지 캐시 조회 실패: {e}")
+            return None
+        if not row:
+            return None
+        keys = ('sha1', 'etag', 'last_modified', 'validated_at', 'width', 'height', 'last_access')
+        return dict(zip(keys, row))
+
+    def _touch(self, entry: Dict, force: bool = False):
+        """LRU 접근 시각 갱신 (IMAGE_CACHE_TOUCH_INTERVAL마다 한 번만)"""
+        now = time.time()
+        if not force and now - entry['last_access'] < IMAGE_CACHE_TOUCH_INTERVAL:
+            return
+        entry['last_access'] = now
+        try:
+            conn = self._db()
+            try:
+                conn.execute("UPDATE blobs SET last_access = ? WHERE sha1 = ?", (now, entry['sha1']))
+            finally:
+                conn.close()
+        except Exception:
+            pass
+
+    def _mark_validated(self, url: str, validated_at: float = None):
+        try:
+            conn = self._db()
+            try:
+                conn.execute("UPDATE urls SET validated_at = ? WHERE url = ?", (validated_at or time.time(), url))
+            finally:
+                conn.close()
+        except Exception:
+            pass
+
+    def _blob_path(self, sha1: str, rendition: str = None) -> str:
+        """원본: <sha1 앞 2자리>/<sha1>, 렌디션: <sha1 앞 2자리>/<sha1>_<이름>.jpg"""
+        name = f"{sha1}_{rendition}.jpg" if rendition else sha1
+        return os.path.join(self.cache_dir, sha1[:2], name)
+
+    # ---------- 관리 ----------
+
+    def usage(self) -> Dict[str, int]:
+        """현재 저장량 {'images', 'urls', 'bytes'}"""
+        conn = self._db()
+        try:
+            return {
+                'images': conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0],
+                'urls': conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0],
+                'bytes': conn.execute("SELECT value FROM meta WHERE key = 'total_bytes'").fetchone()[0],
+            }
+        finally:
+            conn.close()
+
+    def clear(self) -> int:
+        """캐시 전체 삭제. Returns: 삭제된 이미지 수"""
+        try:
+            conn = self._db()
+            try:
+                with self._transaction(conn):
+                    removed = [row[0] for row in conn.execute("SELECT sha1 FROM blobs")]
+                    conn.execute("DELETE FROM blobs")
+                    conn.execute("DELETE FROM urls")
+                    conn.execute("UPDATE meta SET value = 0 WHERE key = 'total_bytes'")
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[ERROR] 이미지 캐시 삭제 실패: {e}")
+            return 0
+        for sha1 in removed:
+            for name in [None] + list(self.renditions):
+                try:
+                    os.remove(self._blob_path(sha1, name))
+                except OSError:
+                    pass
+        return len(removed)
+
+
+def get_image_cache() -> ImageDiskCache:
+    """프로세스 공유 이미지 캐시 (IMAGE_CACHE_DIR)"""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImageDiskCache()
+    return _image_cache
+
+
+def get_image_cache_stats() -> Dict[str, int]:
+    """이미지 캐시 통계 (hit, miss, revalidated, changed, stale, error, evicted)"""
+    cache = get_image_cache()
+    with cache._lock:
+        return dict(cache.stats)
+
+
 # ==================== 상품명 기반 대표옵션 매칭 ====================
 
 def match_option_by_product_name(product_name: str, skus: List[Dict]) -> Tuple[Optional[int], float, str]:
@@ -1288,11 +2158,13 @@ def match_option_by_product_name(product_name: str, skus: List[Dict]) -> Tuple[O
     return None, 0.0, ''
 
 
-def select_main_option(product_name: str, skus: List[Dict]) -> Tuple[int, str]:
+def select_main_option(product_name: str, skus: List[Dict], thumbnails: List[str] = None,
+                       use_image_hash: bool = False) -> Tuple[int, str]:
     """
     대표옵션 선택 (이미지 우선 → 상품명 매칭 → 첫 번째 옵션)
 
     우선순위:
+    0. 대표 썸네일 매칭 (thumbnails를 넘긴 경우만, use_image_hash면 이미지 해시까지)
     1. 상품명 기반 매칭 (이미지 있는 옵션 우선)
     2. 이미지가 있는 첫 번째 옵션
     3. 첫 번째 옵션
@@ -1300,6 +2172,8 @@ def select_main_option(product_name: str, skus: List[Dict]) -> Tuple[int, str]:
     Args:
         product_name: 상품명
         skus: 미끼 필터링된 SKU 배열
+        thumbnails: uploadThumbnails 배열 (선택)
+        use_image_hash: 썸네일 매칭에 이미지 해시 사용
 
     Returns:
         (선택된 SKU 인덱스, 선택 방법)
@@ -1307,6 +2181,12 @@ def select_main_option(product_name: str, skus: List[Dict]) -> Tuple[int, str]:
     if not skus:
         return 0, '옵션없음'
 
+    # 0. 대표 썸네일과 같은 이미지의 옵션
+    if thumbnails:
+        thumb_idx = match_thumbnail_to_sku(thumbnails, skus, use_image_hash=use_image_hash)
+        if thumb_idx is not None:
+            return thumb_idx, '썸네일매칭'
+
     def has_image(sku: Dict) -> bool:
         """SKU에 이미지가 있는지 확인"""
         return bool(sku.get('urlRef') or sku.get('image') or sku.get('img'))
@@ -1738,6 +2618,476 @@ def filter_bait_options(skus: List[Dict], bait_keywords: List[str],
     return valid_skus, bait_skus
 
 
+# ==================== SKU 가격 일괄 계산 ====================
+# 업로더(process_product/옵션 정렬·제한)와 시뮬레이터(analyze_product) 공용
+# SKU 원가 배열을 한 번에 계산 (numpy 없으면 같은 결과의 순수 파이썬 경로)
+# 연산 순서를 기존 SKU별 계산과 똑같이 유지 → 올림 결과 비트 단위 동일
+
+PRICE_KEEP = 0          # 통과
+PRICE_ZERO = 1          # 원가 0 이하
+PRICE_BELOW_MIN = 2     # 최소가 미만
+PRICE_ABOVE_MAX = 3     # 최대가 초과
+
+
+def price_skus_batch(origin_cny, exchange_rate: float, card_fee_rate: float, margin_rate: float,
+                     margin_fixed: int, delivery_fee=0, round_unit: int = 100, discount_rate: float = 0,
+                     min_price: float = None, max_price: float = None) -> Dict:
+    """
+    SKU 원가 → 원화원가/기준판매가/할인가/통과 여부 일괄 계산 (불사자 공식)
+
+    원화원가 = 위안원가 × 환율 (소수점 버림)
+    기준판매가 = 올림(원화원가 × (1 + 카드수수료% + 마진율%) + 정액마진 + 해외배송비, 올림단위)
+    할인가 = 올림(기준판매가 × (1 - 할인율%), 올림단위)
+
+    Args:
+        origin_cny: SKU 위안 원가 목록/배열
+        delivery_fee: 해외배송비 (상품 공통 값 또는 SKU별 목록 - 무게별 배송비 등)
+        min_price/max_price: 기준판매가 허용 범위 (None이면 검사 안 함)
+
+    Returns:
+        {'origin_krw', 'sale_price', 'discount_price': 정수 배열,
+         'keep': 통과 여부, 'reason': PRICE_* 코드}
+        (numpy 없으면 같은 값의 리스트)
+    """
+    factor = 1 + card_fee_rate / 100 + margin_rate / 100
+    discount_factor = 1 - discount_rate / 100
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is None:
+        n = len(origin_cny)
+        fees = delivery_fee if isinstance(delivery_fee, (list, tuple)) else [delivery_fee] * n
+        result = {'origin_krw': [], 'sale_price': [], 'discount_price': [], 'keep': [], 'reason': []}
+        for cny, fee in zip(origin_cny, fees):
+            krw = cny * exchange_rate
+            sale = math.ceil((krw * factor + margin_fixed + fee) / round_unit) * round_unit
+            discount = math.ceil(sale * discount_factor / round_unit) * round_unit
+            if cny <= 0:
+                reason = PRICE_ZERO
+            elif min_price is not None and sale < min_price:
+                reason = PRICE_BELOW_MIN
+            elif max_price is not None and sale > max_price:
+                reason = PRICE_ABOVE_MAX
+            else:
+                reason = PRICE_KEEP
+            result['origin_krw'].append(int(krw))
+            result['sale_price'].append(int(sale))
+            result['discount_price'].append(int(discount))
+            result['keep'].append(reason == PRICE_KEEP)
+            result['reason'].append(reason)
+        return result
+
+    cny = np.asarray(origin_cny, dtype=np.float64)
+    krw = cny * exchange_rate
+    sale = np.ceil((krw * factor + margin_fixed + np.asarray(delivery_fee, dtype=np.float64)) / round_unit) * round_unit
+    discount = np.ceil(sale * discount_factor / round_unit) * round_unit
+
+    reason = np.full(cny.shape, PRICE_KEEP, dtype=np.int8)
+    if max_price is not None:
+        reason[sale > max_price] = PRICE_ABOVE_MAX
+    if min_price is not None:
+        reason[sale < min_price] = PRICE_BELOW_MIN
+    reason[cny <= 0] = PRICE_ZERO
+    return {
+        'origin_krw': krw.astype(np.int64),
+        'sale_price': sale.astype(np.int64),
+        'discount_price': discount.astype(np.int64),
+        'keep': reason == PRICE_KEEP,
+        'reason': reason,
+    }
+
+
+def order_sku_indices(origin_cny, sort_type: str) -> List[int]:
+    """
+    옵션 정렬 순서 (인덱스 목록) - sorted(key=원가)와 같은 안정 정렬
+
+    sort_type: price_asc / price_desc / price_main(평균가에 가까운 순) / 그 외는 원래 순서
+    """
+    n = len(origin_cny)
+    if sort_type not in ('price_asc', 'price_desc', 'price_main') or n == 0:
+        return list(range(n))
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if sort_type == 'price_main':
+        # 평균은 파이썬 sum과 같은 순서로 더함 (numpy 합계는 더하는 순서가 달라 끝자리가 다를 수 있음)
+        avg = sum(float(p) for p in origin_cny) / n
+        keys = [abs(p - avg) for p in origin_cny] if np is None else np.abs(np.asarray(origin_cny, dtype=np.float64) - avg)
+        reverse = False
+    else:
+        keys = origin_cny
+        reverse = sort_type == 'price_desc'
+
+    if np is None:
+        return sorted(range(n), key=lambda i: keys[i], reverse=reverse)
+    keys = np.asarray(keys, dtype=np.float64)
+    # sorted(reverse=True)도 같은 값은 원래 순서 유지 → 부호 반전 후 안정 정렬
+    return np.argsort(-keys if reverse else keys, kind='stable').tolist()
+
+
+def limit_sku_indices(origin_cny, max_count: int, main_price: float = None) -> List[int]:
+    """
+    옵션 개수 제한 (인덱스 목록)
+    - main_price 있으면: 대표옵션 가격 이상인 옵션만 가격 오름차순으로 max_count개
+    - 없으면: 앞에서부터 max_count개
+    """
+    n = len(origin_cny)
+    if max_count <= 0:
+        return list(range(n))
+    if main_price is None:
+        return list(range(min(n, max_count)))
+    try:
+        import numpy as np
+    except ImportError:
+        eligible = [i for i in range(n) if origin_cny[i] >= main_price]
+        eligible.sort(key=lambda i: origin_cny[i])
+        return eligible[:max_count]
+    prices = np.asarray(origin_cny, dtype=np.float64)
+    eligible = np.flatnonzero(prices >= main_price)
+    return eligible[np.argsort(prices[eligible], kind='stable')][:max_count].tolist()
+
+
+# ==================== 카테고리 검색 캐시 ====================
+# 불사자 카테고리 추천 API는 키워드 1번 호출로 모든 마켓(ss/esm/est/cp) 결과를 돌려줌
+# → 응답 전체를 (마켓, 정규화 키워드) 단위로 SQLite에 저장해서 재사용
+# 수동 보정(override)은 TTL 없이 항상 우선 적용
+
+CATEGORY_CACHE_FILE = "category_cache.db"
+CATEGORY_CACHE_TTL = 30 * 24 * 3600      # 자동 검색 결과 유효기간 (초)
+
+_category_memory = {}                    # {(market, query): (category 또는 None, created_at)}
+_category_inflight = {}                  # {query: threading.Event} - 같은 키워드 동시 검색 방지
+_category_lock = threading.Lock()
+_category_stats = {'hit': 0, 'miss': 0, 'override': 0}
+
+
+def normalize_category_query(keyword: str) -> str:
+    """
+    카테고리 검색 키워드 정규화 (캐시 키)
+
+    소문자 + 특수문자 제거 + 단어 중복 제거/정렬
+    → 셔플된 상품명(단어 순서만 다름)도 같은 키로 묶임
+    """
+    words = re.findall(r'[0-9a-z가-힣\u4e00-\u9fff]+', (keyword or '').lower())
+    return ' '.join(sorted(set(words)))
+
+
+def _category_db():
+    """카테고리 캐시 DB 연결 (호출마다 새 연결 → 스레드/프로세스 안전)"""
+    import sqlite3
+    conn = sqlite3.connect(CATEGORY_CACHE_FILE, timeout=30)
+    conn.execute("""CREATE TABLE IF NOT EXISTS category_cache (
+        market TEXT NOT NULL, query TEXT NOT NULL, category TEXT,
+        created_at REAL NOT NULL, PRIMARY KEY (market, query))""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS category_override (
+        market TEXT NOT NULL, query TEXT NOT NULL, category TEXT NOT NULL,
+        updated_at REAL NOT NULL, PRIMARY KEY (market, query))""")
+    return conn
+
+
+def _lookup_category(market_type: str, query: str, ttl: float) -> Tuple[bool, Optional[Dict]]:
+    """
+    캐시 조회 (수동 보정 → 메모리 → DB 순)
+
+    Returns:
+        (캐시 존재 여부, 카테고리 또는 None(검색 결과 없음으로 캐시됨))
+    """
+    now = time.time()
+    key = (market_type, query)
+    with _category_lock:
+        cached = _category_memory.get(key)
+    if cached is not None and (cached[1] is None or now - cached[1] < ttl):
+        return True, cached[0]
+
+    try:
+        conn = _category_db()
+        try:
+            row = conn.execute("SELECT category FROM category_override WHERE market = ? AND query = ?",
+                               key).fetchone()
+            if row:
+                category = json.loads(row[0])
+                with _category_lock:
+                    _category_memory[key] = (category, None)   # 수동 보정은 만료 없음
+                    _category_stats['override'] += 1
+                return True, category
+
+            row = conn.execute("SELECT category, created_at FROM category_cache WHERE market = ? AND query = ?",
+                               key).fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[WARNING] 카테고리 캐시 조회 실패: {e}")
+        return False, None
+
+    if row and now - row[1] < ttl:
+        category = json.loads(row[0]) if row[0] else None
+        with _category_lock:
+            _category_memory[key] = (category, row[1])
+        return True, category
+    return False, None
+
+
+def _store_category_map(query: str, category_map: Dict) -> None:
+    """검색 응답의 모든 마켓 결과를 한 번에 저장 (결과 없는 마켓은 None으로 저장)"""
+    now = time.time()
+    rows = []
+    for market_type, categories in category_map.items():
+        category = categories[0] if categories else None
+        rows.append((market_type, query, json.dumps(category, ensure_ascii=False) if category else None, now))
+
+    with _category_lock:
+        for market_type, _, _, _ in rows:
+            _category_memory.pop((market_type, query), None)
+    try:
+        conn = _category_db()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO category_cache VALUES (?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[WARNING] 카테고리 캐시 저장 실패: {e}")
+
+
+def resolve_category_cached(keyword: str, market_type: str, fetch_category_map,
+                            ttl: float = CATEGORY_CACHE_TTL) -> Optional[Dict]:
+    """
+    캐시를 거쳐 카테고리 조회
+
+    Args:
+        keyword: 검색 키워드 (상품명)
+        market_type: 마켓 타입 (ss, esm, est, cp)
+        fetch_category_map: keyword → categoryMap dict (실패 시 None) 를 반환하는 함수
+        ttl: 자동 검색 결과 유효기간 (초)
+
+    Returns:
+        첫 번째 추천 카테고리 또는 None
+    """
+    query = normalize_category_query(keyword)
+    if not query:
+        return None
+
+    while True:
+        found, category = _lookup_category(market_type, query, ttl)
+        if found:
+            with _category_lock:
+                _category_stats['hit'] += 1
+            return category
+
+        # 같은 키워드를 다른 워커가 검색 중이면 끝날 때까지 대기 후 캐시 재조회
+        with _category_lock:
+            event = _category_inflight.get(query)
+            if event is None:
+                event = threading.Event()
+                _category_inflight[query] = event
+                owner = True
+            else:
+                owner = False
+        if owner:
+            break
+        event.wait(30)
+        if query not in _category_inflight:
+            found, category = _lookup_category(market_type, query, ttl)
+            if found:
+                with _category_lock:
+                    _category_stats['hit'] += 1
+                return category
+            # 검색 실패(네트워크 오류 등)로 캐시 안 됨 → 직접 검색
+            continue
+
+    try:
+        with _category_lock:
+            _category_stats['miss'] += 1
+        category_map = fetch_category_map(keyword)
+        if category_map is None:
+            return None   # 오류는 캐시하지 않음
+        _store_category_map(query, category_map)
+        categories = category_map.get(market_type, [])
+        return categories[0] if categories else None
+    finally:
+        with _category_lock:
+            _category_inflight.pop(query, None)
+        event.set()
+
+
+def set_category_override(keyword: str, market_type: str, category: Optional[Dict]) -> bool:
+    """
+    카테고리 수동 보정 (잘못 추천된 카테고리 고정)
+
+    Args:
+        keyword: 상품명 또는 검색 키워드 (정규화되어 저장)
+        market_type: 마켓 타입 (ss, esm, est, cp)
+        category: 고정할 카테고리 dict ({'name', 'code', ...}), None이면 보정 해제
+    """
+    query = normalize_category_query(keyword)
+    if not query:
+        return False
+    try:
+        conn = _category_db()
+        try:
+            with conn:
+                if category is None:
+                    conn.execute("DELETE FROM category_override WHERE market = ? AND query = ?",
+                                 (market_type, query))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO category_override VALUES (?, ?, ?, ?)",
+                                 (market_type, query, json.dumps(category, ensure_ascii=False), time.time()))
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[ERROR] 카테고리 보정 저장 실패: {e}")
+        return False
+
+    with _category_lock:
+        _category_memory.pop((market_type, query), None)
+    return True
+
+
+def clear_category_cache(market_type: str = None) -> int:
+    """자동 검색 캐시 삭제 (수동 보정은 유지). Returns: 삭제된 행 수"""
+    try:
+        conn = _category_db()
+        try:
+            with conn:
+                if market_type:
+                    cur = conn.execute("DELETE FROM category_cache WHERE market = ?", (market_type,))
+                else:
+                    cur = conn.execute("DELETE FROM category_cache")
+                deleted = cur.rowcount
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[ERROR] 카테고리 캐시 삭제 실패: {e}")
+        return 0
+
+    with _category_lock:
+        for key in [k for k, v in _category_memory.items()
+                    if v[1] is not None and (not market_type or k[0] == market_type)]:
+            del _category_memory[key]
+    return deleted
+
+
+def get_category_cache_stats() -> Dict[str, int]:
+    """카테고리 캐시 적중 통계 (hit, miss, override)"""
+    with _category_lock:
+        return dict(_category_stats)
+
+
+# ==================== 상품명 생성 캐시 ====================
+# 같은 그룹 재실행/복사/다른 마켓 전송 시 이미 만든 상품명을 Gemini로 다시 생성하지 않도록
+# (원본 상품명, 대표 이미지 URL, 프롬프트 버전, 모델) 해시 → 생성 결과를 SQLite에 저장
+# 프롬프트/모델이 바뀌면 키가 달라져서 자동으로 새로 생성됨
+
+TITLE_CACHE_FILE = "title_cache.db"
+
+_title_cache_lock = threading.Lock()
+_title_cache_stats = {'hit': 0, 'miss': 0, 'refresh': 0}
+
+
+def banned_words_digest(banned_words) -> str:
+    """금지단어 목록 해시 (순서 무관) - 목록이 바뀌면 달라짐"""
+    import hashlib
+    payload = "\n".join(sorted(list(banned_words or ())))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def title_cache_key(source_title: str, image_url: str, prompt_version: str, model: str,
+                    banned_digest: str = '') -> str:
+    """상품명 캐시 키 (입력 내용 해시)
+
+    캐시되는 상품명은 금지단어 필터를 거친 결과 → banned_digest(banned_words_digest)를 넣으면
+    금지단어가 추가/삭제됐을 때 예전 결과를 쓰지 않고 새로 생성
+    """
+    import hashlib
+    fields = [(source_title or '').strip(), (image_url or '').strip(), prompt_version, model]
+    if banned_digest:
+        fields.append(banned_digest)
+    payload = json.dumps(fields, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _title_cache_db():
+    """상품명 캐시 DB 연결 (호출마다 새 연결 → 스레드 안전)"""
+    import sqlite3
+    conn = sqlite3.connect(TITLE_CACHE_FILE, timeout=30)
+    conn.execute("""CREATE TABLE IF NOT EXISTS title_cache (
+        key TEXT PRIMARY KEY, result TEXT NOT NULL, source_title TEXT,
+        prompt_version TEXT, model TEXT, created_at REAL NOT NULL)""")
+    return conn
+
+
+def get_cached_title(key: str, force_refresh: bool = False) -> Optional[Dict]:
+    """
+    캐시된 생성 결과 조회 (적중/미적중 통계 기록)
+
+    Args:
+        force_refresh: True면 캐시 무시 (새로 생성 → store_cached_title로 덮어씀)
+
+    Returns:
+        저장된 결과 dict 또는 None
+    """
+    if force_refresh:
+        with _title_cache_lock:
+            _title_cache_stats['refresh'] += 1
+        return None
+    try:
+        conn = _title_cache_db()
+        try:
+            row = conn.execute("SELECT result FROM title_cache WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[WARNING] 상품명 캐시 조회 실패: {e}")
+        row = None
+    with _title_cache_lock:
+        _title_cache_stats['hit' if row else 'miss'] += 1
+    return json.loads(row[0]) if row else None
+
+
+def store_cached_title(key: str, result: Dict, source_title: str = '', prompt_version: str = '',
+                       model: str = '') -> None:
+    """생성 결과 저장 (같은 키는 덮어씀)"""
+    try:
+        conn = _title_cache_db()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO title_cache VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, json.dumps(result, ensure_ascii=False), source_title,
+                              prompt_version, model, time.time()))
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[WARNING] 상품명 캐시 저장 실패: {e}")
+
+
+def clear_title_cache(prompt_version: str = None) -> int:
+    """상품명 캐시 삭제 (prompt_version 지정 시 해당 버전만). Returns: 삭제된 행 수"""
+    try:
+        conn = _title_cache_db()
+        try:
+            with conn:
+                if prompt_version:
+                    cur = conn.execute("DELETE FROM title_cache WHERE prompt_version = ?", (prompt_version,))
+                else:
+                    cur = conn.execute("DELETE FROM title_cache")
+                return cur.rowcount
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[ERROR] 상품명 캐시 삭제 실패: {e}")
+        return 0
+
+
+def get_title_cache_stats() -> Dict[str, int]:
+    """상품명 캐시 적중 통계 (hit, miss, refresh)"""
+    with _title_cache_lock:
+        return dict(_title_cache_stats)
+
+
 # ==================== 불사자 API 클라이언트 ====================
 
 # 마켓 ID 매핑
@@ -1757,14 +3107,76 @@ MARKET_TYPES = {
 }
 
 
+class AdaptiveConcurrencyLimiter:
+    """
+    동시 요청 수 자동 조절기 (AIMD)
+
+    - 성공이 이어지면 동시 요청 수를 1씩 늘림 (max_limit까지)
+    - 429(요청 과다)/5xx 응답이 오면 절반으로 줄임 (Retry-After 동안은 전체 대기)
+
+    사용:
+        limiter = AdaptiveConcurrencyLimiter(8)
+        with limiter:
+            response = session.get(url)
+        limiter.on_success() / limiter.on_throttle()
+    """
+
+    def __init__(self, max_limit: int = 8, min_limit: int = 1, initial_limit: int = None):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = initial_limit or self.max_limit
+        self.in_flight = 0
+        self._success_streak = 0
+        self._pause_until = 0.0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while True:
+                wait = self._pause_until - time.time()
+                if wait <= 0 and self.in_flight < self.limit:
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+    def on_success(self):
+        with self._cond:
+            self._success_streak += 1
+            # 현재 한도만큼 연속 성공하면 한도 +1
+            if self._success_streak >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._success_streak = 0
+                self._cond.notify_all()
+
+    def on_throttle(self, retry_after: float = None):
+        """요청 과다 응답 → 한도 절반 (Retry-After가 있으면 그동안 전체 대기)"""
+        with self._cond:
+            self._success_streak = 0
+            self.limit = max(self.min_limit, self.limit // 2)
+            if retry_after:
+                self._pause_until = max(self._pause_until, time.time() + retry_after)
+
+
 class BulsajaAPIClient:
     """불사자 API 클라이언트"""
-    BASE_URL = "https://api.bulsaja.com/api"
+    BASE_URL = os.environ.get("BULSAJA_API_BASE", "https://api.bulsaja.com/api")   # 목 서버 벤치마크 시 교체
+    POOL_SIZE = 32          # keep-alive 연결 풀 크기 (대량 조회/수정 동시 요청용)
+    BULK_MAX_RETRIES = 3    # 429/5xx 재시도 횟수
 
     def __init__(self, access_token: str = "", refresh_token: str = ""):
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         # 사용자의 실제 마켓 ID 캐시 (동적으로 로드)
         self._user_market_ids: Dict[str, int] = {}
         if access_token:
@@ -1796,7 +3208,7 @@ class BulsajaAPIClient:
             return False, str(e), 0
 
     def get_products(self, start_row: int = 0, end_row: int = 100, filter_model: Dict = None) -> Tuple[List[Dict], int]:
-        """상품 목록 조회"""
+        """상품 목록 조회 (범위 전체를 한 번에 요청 - 대량이면 iter_products 사용)"""
         url = f"{self.BASE_URL}/manage/list/serverside"
         payload = {
             "request": {
@@ -1813,16 +3225,71 @@ class BulsajaAPIClient:
         total_count = data.get('lastRow', len(products))
         return products, total_count
 
-    def get_products_by_group(self, group_name: str, start: int = 0, limit: int = 1000,
-                              status_filters: List[str] = None,
-                              exclude_tag: str = None) -> Tuple[List[Dict], int]:
-        """그룹별 상품 조회
-
-        status_filters: 상품 상태 필터 (예: ["0", "1", "2"])
-            - API에서 그룹 필터만 적용하고, 상태 필터는 결과에서 직접 필터링
-        exclude_tag: 제외할 태그명 (예: "업로드실패")
-            - 해당 태그가 있는 상품 제외
+    def iter_products(self, filter_model: Dict = None, page_size: int = 500, start_row: int = 0,
+                      max_rows: int = None, fields: List[str] = None,
+                      prefetch: bool = True) -> Iterator[Tuple[List[Dict], int]]:
         """
+        상품 목록을 페이지 단위로 조회 (제너레이터)
+
+        현재 페이지를 처리하는 동안 다음 페이지를 백그라운드로 미리 받아둠
+        → 첫 페이지부터 바로 검수/업로드 시작, 메모리는 페이지 몇 개 분량만 사용
+
+        Args:
+            filter_model: 필터 모델 (get_products와 동일)
+            page_size: 페이지 크기
+            start_row: 시작 위치
+            max_rows: 최대 조회 개수 (None이면 전체)
+            fields: 남길 필드 목록 (None이면 전체). 목록 API에 필드 선택 옵션이 없어서
+                    받은 직후 잘라냄 → 대량 조회 시 메모리 절약
+            prefetch: 다음 페이지 미리 받기
+
+        Yields:
+            (페이지 상품 리스트, 전체 개수)
+
+        사용:
+            for page, total in client.iter_products(filter_model, page_size=500):
+                for product in page:
+                    ...
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        end_limit = start_row + max_rows if max_rows else None
+
+        def fetch(row: int):
+            end_row = row + page_size
+            if end_limit is not None:
+                end_row = min(end_row, end_limit)
+            products, total = self.get_products(row, end_row, filter_model)
+            if fields:
+                products = [{k: p[k] for k in fields if k in p} for p in products]
+            return row, end_row - row, products, total
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            row, requested, products, total = fetch(start_row)
+            while products:
+                next_row = row + len(products)
+                # 요청한 만큼 꽉 찼고, 전체 개수(모르면 -1)와 max_rows에 아직 못 미치면 다음 페이지
+                has_more = len(products) >= requested \
+                    and (total is None or total < 0 or next_row < total) \
+                    and (end_limit is None or next_row < end_limit)
+
+                # 다음 페이지 미리 요청
+                future = executor.submit(fetch, next_row) if (has_more and executor) else None
+
+                yield products, total
+
+                if not has_more:
+                    break
+                row, requested, products, total = future.result() if future else fetch(next_row)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    @staticmethod
+    def build_group_filter(group_name: str, status_filters: List[str] = None,
+                           exclude_tag: str = None) -> Dict:
+        """그룹/상태/제외태그 조건으로 필터 모델 구성 (get_products_by_group, iter_products_by_group 공용)"""
         # 기본 필터 모델 구성
         base_filter = {}
         if group_name:
@@ -1867,13 +3334,38 @@ class BulsajaAPIClient:
                 "filter": exclude_tag
             }
 
+        return base_filter
+
+    def get_products_by_group(self, group_name: str, start: int = 0, limit: int = 1000,
+                              status_filters: List[str] = None,
+                              exclude_tag: str = None) -> Tuple[List[Dict], int]:
+        """그룹별 상품 조회
+
+        status_filters: 상품 상태 필터 (예: ["0", "1", "2"])
+            - API에서 그룹 필터만 적용하고, 상태 필터는 결과에서 직접 필터링
+        exclude_tag: 제외할 태그명 (예: "업로드실패")
+            - 해당 태그가 있는 상품 제외
+        """
+        base_filter = self.build_group_filter(group_name, status_filters, exclude_tag)
         products, total = self.get_products(start, start + limit, base_filter)
         return products, total
 
+    def iter_products_by_group(self, group_name: str, page_size: int = 500, start: int = 0,
+                               max_rows: int = None, status_filters: List[str] = None,
+                               exclude_tag: str = None, fields: List[str] = None) -> Iterator[Tuple[List[Dict], int]]:
+        """그룹별 상품 페이지 단위 조회 (iter_products + 그룹 필터)"""
+        base_filter = self.build_group_filter(group_name, status_filters, exclude_tag)
+        return self.iter_products(base_filter, page_size=page_size, start_row=start,
+                                  max_rows=max_rows, fields=fields)
+
     def get_product_detail(self, product_id: str) -> Dict:
         """상품 상세 정보 조회"""
         url = f"{self.BASE_URL}/manage/sourcing-product/{product_id}"
         response = self.session.get(url)
+        return self._parse_detail_response(response)
+
+    @staticmethod
+    def _parse_detail_response(response) -> Dict:
         response.raise_for_status()
         result = response.json()
         if 'data' in result:
@@ -1885,36 +3377,33 @@ class BulsajaAPIClient:
         url = f"{self.BASE_URL}/sourcing/uploadfields/{product_id}"
         try:
             response = self.session.get(url)
-            response.raise_for_status()
-            result = response.json()
-            # payload 안에 실제 데이터가 있는 경우
-            if 'payload' in result:
-                return result['payload']
-            return result
+            return self._parse_upload_fields_response(response)
         except Exception as e:
             # fallback: get_product_detail 사용
             return {}
 
+    @staticmethod
+    def _parse_upload_fields_response(response) -> Dict:
+        response.raise_for_status()
+        result = response.json()
+        # payload 안에 실제 데이터가 있는 경우
+        if 'payload' in result:
+            return result['payload']
+        return result
+
     def update_product_fields(self, product_id: str, product_data: Dict) -> Tuple[bool, str]:
         """상품 정보 업데이트"""
         url = f"{self.BASE_URL}/sourcing/uploadfields/{product_id}"
         try:
             response = self.session.put(url, json=product_data)
-            response.raise_for_status()
-
-            # 응답 내용 확인
-            try:
-                result = response.json()
-                if isinstance(result, dict):
-                    if result.get('error') or result.get('errors'):
-                        error_msg = result.get('error') or result.get('errors') or result.get('message', '')
-                        return False, f"API 오류: {str(error_msg)[:100]}"
-                    if result.get('success') == False:
-                        return False, f"업데이트 실패: {result.get('message', '알 수 없는 오류')[:100]}"
-                return True, "성공"
-            except:
-                return True, "성공 (응답 파싱 불가)"
+            return self._parse_update_response(response)
+        except Exception as e:
+            return False, f"예외: {str(e)}"
 
+    @staticmethod
+    def _parse_update_response(response) -> Tuple[bool, str]:
+        try:
+            response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             error_detail = ""
             try:
@@ -1922,8 +3411,111 @@ class BulsajaAPIClient:
             except:
                 pass
             return False, f"HTTP 오류: {e.response.status_code} - {error_detail}"
-        except Exception as e:
-            return False, f"예외: {str(e)}"
+
+        # 응답 내용 확인
+        try:
+            result = response.json()
+            if isinstance(result, dict):
+                if result.get('error') or result.get('errors'):
+                    error_msg = result.get('error') or result.get('errors') or result.get('message', '')
+                    return False, f"API 오류: {str(error_msg)[:100]}"
+                if result.get('success') == False:
+                    return False, f"업데이트 실패: {result.get('message', '알 수 없는 오류')[:100]}"
+            return True, "성공"
+        except:
+            return True, "성공 (응답 파싱 불가)"
+
+    # ---------- 대량 동시 처리 ----------
+
+    def _bulk_request(self, limiter: AdaptiveConcurrencyLimiter, method: str, url: str, **kwargs):
+        """동시 요청용 1건 호출 (429/5xx면 한도 줄이고 백오프 재시도)"""
+        kwargs.setdefault('timeout', 30)
+        response = None
+        for attempt in range(self.BULK_MAX_RETRIES + 1):
+            with limiter:
+                response = self.session.request(method, url, **kwargs)
+            if response.status_code == 429 or response.status_code >= 500:
+                retry_after = None
+                try:
+                    retry_after = float(response.headers.get('Retry-After', ''))
+                except ValueError:
+                    pass
+                limiter.on_throttle(retry_after)
+                if attempt < self.BULK_MAX_RETRIES and not retry_after:
+                    time.sleep(min(0.5 * 2 ** attempt, 10))
+                continue
+            limiter.on_success()
+            return response
+        return response
+
+    def _run_bulk(self, items: List, worker, concurrency: int) -> Iterator:
+        """items를 worker로 동시 처리, 끝나는 순서대로 결과 반환"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        items = list(items)
+        if not items:
+            return
+        limiter = AdaptiveConcurrencyLimiter(max(1, concurrency))
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items)))) as executor:
+            futures = [executor.submit(worker, limiter, item) for item in items]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def get_product_details_bulk(self, product_ids: List[str], concurrency: int = 8) -> Iterator[Tuple[str, Optional[Dict], str]]:
+        """
+        상품 상세 여러 개 동시 조회
+
+        429/5xx가 오면 동시 요청 수를 자동으로 줄이고 재시도함
+
+        Yields (완료 순서대로):
+            (product_id, 상세 dict 또는 None, 오류 메시지 - 성공이면 '')
+        """
+        def worker(limiter, product_id):
+            try:
+                response = self._bulk_request(limiter, 'GET', f"{self.BASE_URL}/manage/sourcing-product/{product_id}")
+                return product_id, self._parse_detail_response(response), ''
+            except Exception as e:
+                return product_id, None, str(e)
+
+        return self._run_bulk(product_ids, worker, concurrency)
+
+    def get_upload_fields_bulk(self, product_ids: List[str], concurrency: int = 8) -> Iterator[Tuple[str, Optional[Dict], str]]:
+        """
+        업로드 필드 여러 개 동시 조회
+
+        Yields (완료 순서대로):
+            (product_id, 업로드 필드 dict 또는 None, 오류 메시지 - 성공이면 '')
+        """
+        def worker(limiter, product_id):
+            try:
+                response = self._bulk_request(limiter, 'GET', f"{self.BASE_URL}/sourcing/uploadfields/{product_id}")
+                return product_id, self._parse_upload_fields_response(response), ''
+            except Exception as e:
+                return product_id, None, str(e)
+
+        return self._run_bulk(product_ids, worker, concurrency)
+
+    def update_product_fields_bulk(self, updates: List[Tuple[str, Dict]], concurrency: int = 8) -> Iterator[Tuple[str, bool, str]]:
+        """
+        상품 정보 여러 개 동시 업데이트
+
+        Args:
+            updates: [(product_id, product_data), ...]
+
+        Yields (완료 순서대로):
+            (product_id, 성공 여부, 메시지)
+        """
+        def worker(limiter, item):
+            product_id, product_data = item
+            try:
+                response = self._bulk_request(limiter, 'PUT', f"{self.BASE_URL}/sourcing/uploadfields/{product_id}",
+                                              json=product_data)
+                success, message = self._parse_update_response(response)
+                return product_id, success, message
+            except Exception as e:
+                return product_id, False, f"예외: {str(e)}"
+
+        return self._run_bulk(updates, worker, concurrency)
 
     def get_market_id(self, market_name: str) -> int:
         """사용자의 실제 마켓 ID 가져오기 (캐시 사용)"""
@@ -2083,52 +3675,732 @@ def extract_tokens_from_browser(port: int = 9222) -> Tuple[bool, str, str, str]:
                 bulsaja_tab = tab
                 break
 
-        if not bulsaja_tab:
-            return False, "", "", "불사자 탭 없음"
+        if not bulsaja_tab:
+            return False, "", "", "불사자 탭 없음"
+
+        ws_url = bulsaja_tab.get('webSocketDebuggerUrl')
+        if not ws_url:
+            return False, "", "", "WebSocket URL 없음"
+
+        ws = websocket.create_connection(ws_url, timeout=5)
+        cmd = {
+            "id": 1,
+            "method": "Runtime.evaluate",
+            "params": {
+                "expression": """
+                    (function() {
+                        var tokenStr = localStorage.getItem('token');
+                        if (tokenStr) {
+                            try {
+                                var tokenObj = JSON.parse(tokenStr);
+                                if (tokenObj.state) {
+                                    return JSON.stringify({
+                                        accessToken: tokenObj.state.accessToken || '',
+                                        refreshToken: tokenObj.state.refreshToken || ''
+                                    });
+                                }
+                            } catch(e) {}
+                        }
+                        return JSON.stringify({accessToken: '', refreshToken: ''});
+                    })()
+                """,
+                "returnByValue": True
+            }
+        }
+        ws.send(json.dumps(cmd))
+        result = json.loads(ws.recv())
+        ws.close()
+
+        if 'result' in result and 'result' in result['result']:
+            token_data = json.loads(result['result']['result'].get('value', '{}'))
+            access_token = token_data.get('accessToken', '')
+            refresh_token = token_data.get('refreshToken', '')
+            if access_token and refresh_token:
+                return True, access_token, refresh_token, ""
+
+        return False, "", "", "토큰 파싱 실패"
+    except Exception as e:
+        return False, "", "", f"예외: {e}"
+
+
+# ==================== 업로드 체크포인트 저널 ====================
+# 중지/비정상 종료 후 재실행 시 이미 끝난 (상품, 마켓)은 건너뛰고 이어서 진행
+# 한 줄 = 한 이벤트 (JSONL, 추가 전용) → 마지막 줄이 잘려도 나머지는 유효
+
+UPLOAD_JOURNAL_DIR = "upload_journal"
+JOURNAL_DONE_OUTCOMES = {'success', 'skipped', 'failed', 'duplicate_failed'}   # 재시도 안 함
+# quota_limit/market_limit 및 'started'만 남은 항목(진행 중 종료)은 다음 실행에서 재시도
+
+
+class UploadJournal:
+    """
+    업로드 실행 체크포인트 저널 (실행 키 단위 파일)
+
+    - record(): 버퍼에 쌓았다가 batch_size개 또는 flush_interval초마다 fsync
+    - is_done() / pending_products(): 재실행 시 완료 항목 건너뛰기
+    - finish(): 정상 완료 시 저널 보관(.done) → 다음 실행은 처음부터
+      (중지/오류 시 close()만 호출 → 파일이 남아서 다음 실행에서 이어하기)
+    """
+
+    def __init__(self, run_key: str, directory: str = UPLOAD_JOURNAL_DIR,
+                 batch_size: int = 20, flush_interval: float = 1.0):
+        safe_key = re.sub(r'[^0-9A-Za-z가-힣_.-]+', '_', run_key).strip('_') or 'run'
+        if len(safe_key) > 100:
+            import hashlib
+            safe_key = f"{safe_key[:100]}_{hashlib.md5(run_key.encode('utf-8')).hexdigest()[:8]}"
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{safe_key}.jsonl")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.time()
+        self._state = {}   # {(product_id, market): 마지막 outcome}
+        self.resumed_count = self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self) -> int:
+        """기존 저널 읽기 → 완료 항목 수 반환"""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue   # 비정상 종료로 잘린 줄
+                self._state[(entry.get('id', ''), entry.get('market', ''))] = entry.get('outcome', '')
+        return sum(1 for outcome in self._state.values() if outcome in JOURNAL_DONE_OUTCOMES)
+
+    def is_done(self, product_id: str, market: str = '') -> bool:
+        """이전 실행에서 끝난 (상품, 마켓)인지"""
+        return self._state.get((product_id, market)) in JOURNAL_DONE_OUTCOMES
+
+    def pending_products(self, products: List[Dict], markets: List[str]) -> List[Dict]:
+        """모든 마켓이 끝난 상품 제외 (조회/검사 단계부터 건너뜀)"""
+        if not self._state:
+            return products
+        markets = markets or ['']
+        return [p for p in products
+                if not all(self.is_done(p.get('ID', p.get('id', '')), m) for m in markets)]
+
+    def record(self, product_id: str, market: str, stage: str, outcome: str, message: str = ''):
+        """이벤트 기록 (stage: upload 등, outcome: started/success/failed/...)"""
+        entry = {'id': product_id, 'market': market, 'stage': stage,
+                 'outcome': outcome, 'ts': round(time.time(), 3)}
+        if message:
+            entry['msg'] = message[:200]
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._state[(product_id, market)] = outcome
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size or time.time() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer and self._file:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer = []
+        self._last_flush = time.time()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """버퍼 기록 후 닫기 (저널 유지 → 다음 실행에서 이어하기)"""
+        with self._lock:
+            if self._file:
+                self._flush_locked()
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """정상 완료 → 저널을 .done으로 보관 (다음 실행은 처음부터)"""
+        self.close()
+        try:
+            os.replace(self.path, f"{self.path}.{time.strftime('%Y%m%d_%H%M%S')}.done")
+        except OSError as e:
+            print(f"[WARNING] 저널 보관 실패: {e}")
+
+
+# ==================== 결과 엑셀 스트리밍 저장 ====================
+# 결과 행을 만들 때마다 JSONL 저널(.partial.jsonl)에 추가 → 중간에 죽어도 그때까지 결과는 남음
+# close() 때 저널을 한 줄씩 읽어서 openpyxl write-only 모드로 변환 (행 수와 관계없이 메모리 일정)
+# openpyxl이 없으면 첫 번째 시트를 CSV로 저장
+
+def _sheet_cell_value(value):
+    """셀 값 정리 - 저널(JSON)에서 읽은 목록/dict 값은 ', '로 연결 (xlsx/csv 공통)"""
+    if isinstance(value, (list, dict)):
+        return ', '.join(map(str, value))
+    return value
+
+
+def _sheet_cell_style(style: Dict):
+    """스타일 dict → openpyxl 객체 (fill, font_color, bold, wrap, h_align, v_align, border)"""
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    result = {}
+    if style.get('fill'):
+        result['fill'] = PatternFill(start_color=style['fill'], end_color=style['fill'], fill_type="solid")
+    if style.get('font_color') or style.get('bold'):
+        result['font'] = Font(color=style.get('font_color'), bold=style.get('bold', False))
+    if style.get('wrap') or style.get('h_align') or style.get('v_align'):
+        result['alignment'] = Alignment(horizontal=style.get('h_align'), vertical=style.get('v_align'),
+                                        wrap_text=style.get('wrap', False))
+    if style.get('border'):
+        side = Side(style='thin')
+        result['border'] = Border(left=side, right=side, top=side, bottom=side)
+    return result
+
+
+class StreamingSheetWriter:
+    """
+    대용량 결과 엑셀 저장 (행 단위 저널 → 종료 시 변환)
+
+    sheets: {시트명: {
+        'headers': [...],
+        'row': record → [값 또는 (값, 스타일명), ...],
+        'widths': {'A': 15, ...}, 'row_height': 80, 'header_height': 40,
+        'style': 시트 기본 스타일명 (모든 데이터 셀에 적용, 예: 테두리), 'auto_filter': True}}
+    styles: {스타일명: {'fill': "FFFF00", 'font_color': "FF0000", 'bold': True,
+                       'wrap': True, 'h_align': 'center', 'v_align': 'top', 'border': True}}
+            ('header' 스타일이 있으면 헤더 행에 사용, 없으면 파란 배경/흰 글씨)
+
+    - append(record): 레코드 1개 (모든 시트에 한 행씩) - batch_size개/flush_interval초마다 fsync
+    - patch(index, **changes): 이미 추가한 레코드 수정 (변환 시 반영, 수정분만 메모리 보관)
+    - records(start): 저널에서 레코드 다시 읽기 (메모리에 전체 결과를 들고 있지 않고 요약/분석)
+    - close(extra_sheets): 변환 후 저널 삭제. 변환 실패 시 저널 유지 → recover()로 다시 변환
+    - resume=True: 같은 파일의 이전 중단 저널이 있으면 이어서 추가
+    """
+
+    def __init__(self, filename: str, sheets: Dict[str, Dict], styles: Dict[str, Dict] = None,
+                 resume: bool = False, batch_size: int = 50, flush_interval: float = 5.0):
+        self.filename = filename
+        self.sheets = sheets
+        self.styles = styles or {}
+        self.journal_path = f"{filename}.partial.jsonl"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.time()
+        self._patches = {}
+        self.count = 0
+        if resume and os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                self.count = sum(1 for line in f if line.strip())
+        self.resumed_count = self.count
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self._file = open(self.journal_path, 'a' if resume else 'w', encoding='utf-8')
+
+    def append(self, record: Dict) -> int:
+        """레코드 추가 → 레코드 번호 (patch용)"""
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            index = self.count
+            self.count += 1
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size or time.time() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+        return index
+
+    def patch(self, index: int, **changes):
+        with self._lock:
+            self._patches.setdefault(index, {}).update(changes)
+
+    def _flush_locked(self):
+        if self._buffer and self._file:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer = []
+        self._last_flush = time.time()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def records(self, start: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """기록된 레코드 다시 읽기 → (레코드 번호, 레코드) (start번부터, patch 반영) - 결과 요약/후처리용"""
+        self.flush()
+        for index, record in enumerate(self._records()):
+            if index >= start:
+                yield index, record
+
+    def _records(self) -> Iterator[Dict]:
+        """저널 레코드 순서대로 (patch 반영, 비정상 종료로 잘린 줄은 건너뜀)"""
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            index = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if index in self._patches:
+                    record.update(self._patches[index])
+                index += 1
+                yield record
+
+    def close(self, extra_sheets: Dict[str, List[List]] = None) -> str:
+        """
+        저널 → 결과 파일 변환 후 저널 삭제
+
+        Args:
+            extra_sheets: 작은 요약 시트 {시트명: [[값, ...], ...]} (통계 등)
+
+        Returns:
+            저장된 파일 경로 (openpyxl 없으면 .csv)
+        """
+        with self._lock:
+            if self._file:
+                self._flush_locked()
+                self._file.close()
+                self._file = None
+        try:
+            import openpyxl  # noqa: F401
+            saved = self._write_xlsx(extra_sheets or {})
+        except ImportError:
+            saved = self._write_csv()
+        os.remove(self.journal_path)
+        return saved
+
+    def recover(self) -> str:
+        """이전 실행에서 변환 못 한 저널 → 결과 파일 (close와 같음)"""
+        return self.close()
+
+    def discard(self):
+        """결과 없이 끝난 경우 - 저널만 삭제"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def _write_xlsx(self, extra_sheets: Dict[str, List[List]]) -> str:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        wb = Workbook(write_only=True)
+        styles = {name: _sheet_cell_style(style) for name, style in self.styles.items()}
+        header_style = styles.get('header') or _sheet_cell_style({'fill': "4472C4", 'font_color': "FFFFFF", 'bold': True})
+
+        def make_cell(ws, value, *style_names):
+            cell = WriteOnlyCell(ws, value=_sheet_cell_value(value))
+            for name in style_names:
+                for attr, obj in styles.get(name, {}).items():
+                    setattr(cell, attr, obj)
+            return cell
+
+        worksheets = []
+        for name, spec in self.sheets.items():
+            ws = wb.create_sheet(name)
+            # write-only 시트는 첫 행 쓰기 전에 열 너비/행 높이를 정해야 함
+            for column, width in spec.get('widths', {}).items():
+                ws.column_dimensions[column].width = width
+            if spec.get('row_height'):
+                # 행마다 row_dimensions를 만들면 행 수만큼 메모리 증가 → 시트 기본 높이로 지정
+                ws.sheet_format.defaultRowHeight = spec['row_height']
+                ws.sheet_format.customHeight = True
+            if spec.get('header_height'):
+                ws.row_dimensions[1].height = spec['header_height']
+            header = []
+            for value in spec['headers']:
+                cell = WriteOnlyCell(ws, value=value)
+                for attr, obj in header_style.items():
+                    setattr(cell, attr, obj)
+                header.append(cell)
+            ws.append(header)
+            worksheets.append((ws, spec))
+
+        row_count = 1
+        for record in self._records():
+            row_count += 1
+            for ws, spec in worksheets:
+                row = []
+                for value in spec['row'](record):
+                    value, style_name = value if isinstance(value, tuple) else (value, None)
+                    row.append(make_cell(ws, value, spec.get('style'), style_name))
+                ws.append(row)
+
+        for ws, spec in worksheets:
+            if spec.get('auto_filter'):
+                ws.auto_filter.ref = f"A1:{get_column_letter(len(spec['headers']))}{row_count}"
+        for name, rows in extra_sheets.items():
+            ws = wb.create_sheet(name)
+            for row in rows:
+                ws.append(row)
+
+        wb.save(self.filename)
+        return self.filename
+
+    def _write_csv(self) -> str:
+        import csv
+        name, spec = next(iter(self.sheets.items()))
+        filename = os.path.splitext(self.filename)[0] + '.csv'
+        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(spec['headers'])
+            for record in self._records():
+                writer.writerow([_sheet_cell_value(v[0] if isinstance(v, tuple) else v)
+                                 for v in spec['row'](record)])
+        return filename
+
+
+# ==================== 실패 태그 일괄 적용 ====================
+# 실패 상품마다 스레드 + 태그 API 1회 호출 → 대량 실패 시 스레드/요청 폭증
+# 백그라운드 스레드 1개가 태그별로 상품 ID를 모아서 짧은 주기로 한 번에 적용
+
+TAG_FLUSH_INTERVAL = 2.0      # 모아서 보내는 주기 (초)
+TAG_BATCH_MAX = 500           # 요청 1회당 최대 상품 수
+TAG_MAX_RETRIES = 4           # 실패 시 재시도 횟수 (간격 2/4/8/16초)
+TAG_RETRY_BASE = 2.0
+
+
+class BatchTagger:
+    """
+    상품 태그 일괄 적용기 (백그라운드 스레드 1개, 필요할 때 시작)
+
+    - add(): 대기열에만 추가 (즉시 반환) - 대기/전송/재시도 중인 (태그, 상품)은 다시 추가해도 무시
+    - flush_interval초마다 또는 TAG_BATCH_MAX개가 모이면 태그별로 apply_func(ids, tag) 호출
+    - 실패한 묶음은 지수 백오프로 재시도, max_retries 초과 시 포기 (포기한 상품은 다시 add 가능)
+    - 적용 성공한 묶음만 on_applied(ids, tag) 호출
+    - flush(): 대기 중인 태그 모두 적용될 때까지 대기 (실행 종료 시)
+    - 프로그램 종료 시 close() 자동 호출 (atexit)
+
+    Args:
+        apply_func: (product_ids, tag_name) → (성공여부, 적용 수)
+                    재시도는 여기서 하므로 자체 재시도 없는 요청 1회짜리 함수를 넘길 것
+        on_applied: (product_ids, tag_name) → None (선택)
+    """
+
+    def __init__(self, apply_func, flush_interval: float = TAG_FLUSH_INTERVAL,
+                 max_batch: int = TAG_BATCH_MAX, max_retries: int = TAG_MAX_RETRIES,
+                 retry_base: float = TAG_RETRY_BASE, log_func=print, on_applied=None):
+        self.apply_func = apply_func
+        self.on_applied = on_applied
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.log = log_func
+        self.stats = {'queued': 0, 'applied': 0, 'failed': 0, 'requests': 0}
+        self._pending = {}        # {tag: {product_id: None}} - 순서 유지 + 중복 제거
+        self._pending_count = 0
+        self._queued = set()      # {(tag, product_id)} - 대기/전송/재시도 중 (결과 나오면 제거)
+        self._retry = []          # [(재시도 시각, tag, ids, 시도 횟수)]
+        self._busy = False        # 요청 전송 중
+        self._next_flush = 0
+        self._flush_waiters = 0
+        self._thread = None
+        self._cond = threading.Condition()
+        import atexit
+        atexit.register(self.close)
+
+    def add(self, product_id: str, tag_name: str):
+        """태그 적용 대기열에 추가"""
+        if not product_id or not tag_name:
+            return
+        with self._cond:
+            if (tag_name, product_id) in self._queued:
+                return
+            self._queued.add((tag_name, product_id))
+            ids = self._pending.setdefault(tag_name, {})
+            if not self._pending_count:
+                self._next_flush = time.time() + self.flush_interval
+            ids[product_id] = None
+            self._pending_count += 1
+            self.stats['queued'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="batch-tagger", daemon=True)
+                self._thread.start()
+            if self._pending_count == 1 or self._pending_count >= self.max_batch:
+                self._cond.notify_all()   # 대기 시간 다시 계산 / 즉시 전송
+
+    def _take_due(self, now: float) -> List[Tuple[str, List[str], int]]:
+        """지금 보낼 묶음 꺼내기 (락 안에서 호출)"""
+        batches = []
+        force = self._flush_waiters > 0
+        if self._pending_count and (force or now >= self._next_flush or self._pending_count >= self.max_batch):
+            for tag_name, ids in self._pending.items():
+                ids = list(ids)
+                for i in range(0, len(ids), self.max_batch):
+                    batches.append((tag_name, ids[i:i + self.max_batch], 0))
+            self._pending = {}
+            self._pending_count = 0
+        # 재시도는 flush 중에도 백오프 간격 유지 (서버 오류 중 연타 방지)
+        due = [r for r in self._retry if r[0] <= now]
+        if due:
+            self._retry = [r for r in self._retry if r[0] > now]
+            batches.extend(r[1:] for r in due)
+        return batches
+
+    def _wait_timeout(self, now: float) -> Optional[float]:
+        times = [r[0] for r in self._retry]
+        if self._pending_count:
+            times.append(self._next_flush)
+        return max(0.0, min(times) - now) if times else None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.time()
+                    batches = self._take_due(now)
+                    if batches:
+                        self._busy = True
+                        break
+                    self._cond.wait(self._wait_timeout(now))
+            try:
+                for tag_name, ids, attempt in batches:
+                    self._send(tag_name, ids, attempt)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _send(self, tag_name: str, ids: List[str], attempt: int):
+        try:
+            success, _ = self.apply_func(ids, tag_name)
+        except Exception as e:
+            self.log(f"[TAG] 태그 적용 오류: {e}")
+            success = False
+        with self._cond:
+            self.stats['requests'] += 1
+            if success:
+                self.stats['applied'] += len(ids)
+            elif attempt < self.max_retries:
+                delay = self.retry_base * (2 ** attempt)
+                self._retry.append((time.time() + delay, tag_name, ids, attempt + 1))
+                self.log(f"[TAG] '{tag_name}' {len(ids)}개 적용 실패 - {delay:.0f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                return
+            else:
+                self.stats['failed'] += len(ids)
+                self.log(f"[TAG] '{tag_name}' {len(ids)}개 적용 포기 (재시도 {self.max_retries}회 초과)")
+            # 결과 확정 (성공/포기) → 다시 추가 가능
+            self._queued.difference_update((tag_name, pid) for pid in ids)
+        if success and self.on_applied:
+            try:
+                self.on_applied(ids, tag_name)
+            except Exception as e:
+                self.log(f"[TAG] on_applied 오류: {e}")
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return self._pending_count + sum(len(r[2]) for r in self._retry)
+
+    def flush(self, timeout: float = 60) -> bool:
+        """대기 중인 태그 모두 적용 (재시도 포함) → 시간 내 완료 여부"""
+        deadline = time.time() + timeout
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._pending_count or self._retry or self._busy:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self, timeout: float = 30) -> bool:
+        """종료 전 남은 태그 적용 (스레드는 데몬이라 프로세스와 함께 종료)"""
+        if self._thread is None:
+            return True
+        return self.flush(timeout)
+
+
+# ==================== Gemini 다중 키 스케줄러 ====================
+# 키마다 분당 요청(RPM)/분당 토큰(TPM)/일일 요청(RPD) 예산을 따로 관리
+# 한도에 걸린 키는 창이 리셋될 때까지 쉬게 두고 나머지 키로 계속 요청 → 키 수만큼 동시 처리
+
+GEMINI_FREE_LIMITS = {'rpm': 14, 'tpm': 1000000, 'rpd': 1450}
+GEMINI_PAID_LIMITS = {'rpm': 1000, 'tpm': 4000000, 'rpd': 9999999}
+GEMINI_KEY_MAX_INFLIGHT = 4      # 키당 동시 요청 수
+GEMINI_RATE_WINDOW = 60          # 분당 한도 창 (초)
+
+
+def is_gemini_rate_limit_error(error) -> bool:
+    """429/쿼터 초과 오류인지"""
+    msg = str(error).lower()
+    return any(k in msg for k in ("429", "quota", "resource", "rate limit", "limit exceeded"))
+
+
+def is_gemini_daily_limit_error(error) -> bool:
+    """일일 쿼터 소진 오류인지 (분당 한도와 구분)"""
+    msg = str(error).lower().replace(' ', '')
+    return "perday" in msg or "daily" in msg
+
 
-        ws_url = bulsaja_tab.get('webSocketDebuggerUrl')
-        if not ws_url:
-            return False, "", "", "WebSocket URL 없음"
+class GeminiKeyScheduler:
+    """
+    Gemini API 키 스케줄러 (스레드 안전)
 
-        ws = websocket.create_connection(ws_url, timeout=5)
-        cmd = {
-            "id": 1,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": """
-                    (function() {
-                        var tokenStr = localStorage.getItem('token');
-                        if (tokenStr) {
-                            try {
-                                var tokenObj = JSON.parse(tokenStr);
-                                if (tokenObj.state) {
-                                    return JSON.stringify({
-                                        accessToken: tokenObj.state.accessToken || '',
-                                        refreshToken: tokenObj.state.refreshToken || ''
-                                    });
-                                }
-                            } catch(e) {}
-                        }
-                        return JSON.stringify({accessToken: '', refreshToken: ''});
-                    })()
-                """,
-                "returnByValue": True
-            }
-        }
-        ws.send(json.dumps(cmd))
-        result = json.loads(ws.recv())
-        ws.close()
+    - acquire(): 여유가 가장 많은 키 번호 반환 (전부 한도면 가장 빨리 풀리는 시점까지 대기)
+    - release(): 호출 끝 → 실제 토큰 사용량 기록
+    - park(): 429 받은 키는 분당 창(또는 일일 한도면 자정)까지 제외
+    - utilization(): 키별 사용 현황 (UI 표시용)
+    """
 
-        if 'result' in result and 'result' in result['result']:
-            token_data = json.loads(result['result']['result'].get('value', '{}'))
-            access_token = token_data.get('accessToken', '')
-            refresh_token = token_data.get('refreshToken', '')
-            if access_token and refresh_token:
-                return True, access_token, refresh_token, ""
+    def __init__(self, api_keys: List[str], rpm: int = GEMINI_FREE_LIMITS['rpm'],
+                 tpm: int = GEMINI_FREE_LIMITS['tpm'], rpd: int = GEMINI_FREE_LIMITS['rpd'],
+                 max_inflight: int = GEMINI_KEY_MAX_INFLIGHT, log_func=print):
+        self.log = log_func
+        self.max_inflight = max_inflight
+        self.keys = []
+        for i, key in enumerate(api_keys, 1):
+            self.keys.append({
+                'key': key,
+                'index': i,
+                'rpm': rpm, 'tpm': tpm, 'rpd': rpd,
+                'requests': deque(),      # 최근 창 안의 요청 시각
+                'tokens': deque(),        # 최근 창 안의 (시각, 토큰 수)
+                'reserved': 0,            # 실행 중 요청의 예상 토큰
+                'inflight': 0,
+                'daily_used': 0,
+                'day': time.strftime('%Y%m%d'),
+                'parked_until': 0,
+                'calls': 0,
+                'rate_limited': 0,
+            })
+        self._cond = threading.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        """모든 키를 동시에 쓸 때의 최대 동시 요청 수 (워커 수 결정용)"""
+        return max(1, len(self.keys) * self.max_inflight)
+
+    def _refresh(self, k: Dict, now: float):
+        """지난 창 기록 정리 + 날짜 바뀌면 일일 카운터 리셋 (락 안에서 호출)"""
+        cutoff = now - GEMINI_RATE_WINDOW
+        while k['requests'] and k['requests'][0] <= cutoff:
+            k['requests'].popleft()
+        while k['tokens'] and k['tokens'][0][0] <= cutoff:
+            k['tokens'].popleft()
+        today = time.strftime('%Y%m%d', time.localtime(now))
+        if today != k['day']:
+            k['day'] = today
+            k['daily_used'] = 0
+
+    def _free_at(self, k: Dict, now: float, est_tokens: int) -> Optional[float]:
+        """이 키를 쓸 수 있는 시각 (now 이하 = 지금 가능, None = 오늘은 불가)"""
+        if k['daily_used'] >= k['rpd']:
+            return None
+        at = max(now, k['parked_until'])
+        if k['inflight'] >= self.max_inflight:
+            at = max(at, now + 0.05)   # 실행 중 요청이 끝나면 release()가 깨움
+        if len(k['requests']) >= k['rpm']:
+            at = max(at, k['requests'][len(k['requests']) - k['rpm']] + GEMINI_RATE_WINDOW)
+        used = sum(t for _, t in k['tokens']) + k['reserved']
+        if used and used + est_tokens > k['tpm'] and k['tokens']:
+            at = max(at, k['tokens'][0][0] + GEMINI_RATE_WINDOW)
+        return at
+
+    def acquire(self, est_tokens: int = 500, timeout: float = None, stop_event=None) -> Optional[int]:
+        """
+        사용할 키 번호(0부터) 예약
 
-        return False, "", "", "토큰 파싱 실패"
-    except Exception as e:
-        return False, "", "", f"예외: {e}"
+        Returns:
+            키 번호 / 모든 키 일일 한도 소진, 시간 초과, 중지 시 None
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                now = time.time()
+                best, best_score, next_free = None, None, None
+                for i, k in enumerate(self.keys):
+                    self._refresh(k, now)
+                    at = self._free_at(k, now, est_tokens)
+                    if at is None:
+                        continue
+                    if at <= now:
+                        # 분당 사용률 + 동시 요청 비율이 낮은 키 우선
+                        score = len(k['requests']) / k['rpm'] + k['inflight'] / self.max_inflight
+                        if best_score is None or score < best_score:
+                            best, best_score = i, score
+                    elif next_free is None or at < next_free:
+                        next_free = at
+
+                if best is not None:
+                    k = self.keys[best]
+                    k['requests'].append(now)
+                    k['reserved'] += est_tokens
+                    k['inflight'] += 1
+                    k['daily_used'] += 1
+                    k['calls'] += 1
+                    return best
+                if next_free is None:
+                    return None   # 모든 키 일일 한도 소진
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                wait = min(next_free - now, 1.0)   # 중지 확인을 위해 최대 1초씩
+                if deadline is not None:
+                    if now >= deadline:
+                        return None
+                    wait = min(wait, deadline - now)
+                self._cond.wait(max(wait, 0.01))
+
+    def release(self, index: int, tokens: int = None, est_tokens: int = 500):
+        """호출 완료 → 예약 해제 + 실제 토큰 기록 (tokens 모르면 예상치 사용)"""
+        with self._cond:
+            k = self.keys[index]
+            k['inflight'] = max(0, k['inflight'] - 1)
+            k['reserved'] = max(0, k['reserved'] - est_tokens)
+            k['tokens'].append((time.time(), tokens if tokens is not None else est_tokens))
+            self._cond.notify_all()
+
+    def park(self, index: int, daily: bool = False, seconds: float = None):
+        """한도 초과 키를 잠시 제외 (기본: 분당 창 1개, daily면 자정까지)"""
+        now = time.time()
+        if daily:
+            tomorrow = time.localtime(now + 86400)
+            seconds = time.mktime((tomorrow.tm_year, tomorrow.tm_mon, tomorrow.tm_mday, 0, 0, 0, 0, 0, -1)) - now
+        elif seconds is None:
+            seconds = GEMINI_RATE_WINDOW
+        with self._cond:
+            k = self.keys[index]
+            k['parked_until'] = max(k['parked_until'], now + seconds)
+            k['rate_limited'] += 1
+            self._cond.notify_all()
+        self.log(f"⏸️ 키 {index + 1} 한도 초과 → {seconds:.0f}초 휴식, 다른 키로 계속")
+
+    def utilization(self) -> List[Dict]:
+        """키별 사용 현황"""
+        now = time.time()
+        result = []
+        with self._cond:
+            for k in self.keys:
+                self._refresh(k, now)
+                result.append({
+                    'index': k['index'],
+                    'rpm_used': len(k['requests']), 'rpm': k['rpm'],
+                    'tpm_used': sum(t for _, t in k['tokens']) + k['reserved'], 'tpm': k['tpm'],
+                    'daily_used': k['daily_used'], 'rpd': k['rpd'],
+                    'inflight': k['inflight'],
+                    'parked': max(0, int(k['parked_until'] - now)),
+                    'calls': k['calls'],
+                    'rate_limited': k['rate_limited'],
+                })
+        return result
+
+    def summary_text(self) -> str:
+        """한 줄 요약 (예: 키1 9/14 ▶2 | 키2 ⏸35s)"""
+        parts = []
+        for u in self.utilization():
+            if u['daily_used'] >= u['rpd']:
+                parts.append(f"키{u['index']} 소진")
+            elif u['parked']:
+                parts.append(f"키{u['index']} ⏸{u['parked']}s")
+            else:
+                parts.append(f"키{u['index']} {u['rpm_used']}/{u['rpm']} ▶{u['inflight']}")
+        return " | ".join(parts)
 
 
 # ==================== 다중 AI API 지원 모듈 ====================
@@ -2939,113 +5211,199 @@ if __name__ == "__main__":
 
 # ==================== 형태소 분석 (지재권 의심 단어 추출) ====================
 
-# 형태소 분석기 초기화 (lazy loading)
+# 형태소 분석기 초기화 (lazy loading / 백그라운드 미리 로드)
 _morpheme_analyzer = None
+_morpheme_analyzer_lock = threading.Lock()
+
+# Kiwi 내부 병렬 분석 스레드 수
+MORPHEME_NUM_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+# 상품명 → 형태소 결과 캐시 (LRU, 같은 상품명/조각 반복 분석 방지)
+MORPHEME_CACHE_SIZE = 50000
+_morpheme_token_cache = OrderedDict()
+_morpheme_token_cache_lock = threading.Lock()
+
 
 def _get_morpheme_analyzer():
     """형태소 분석기 가져오기 (lazy loading) - Kiwi 사용"""
     global _morpheme_analyzer
     if _morpheme_analyzer is None:
-        try:
-            from kiwipiepy import Kiwi
-            kiwi = Kiwi()
-            _morpheme_analyzer = ('kiwi', kiwi)
-            print("[INFO] Kiwi 형태소 분석기 로드됨")
-        except ImportError:
-            print("[WARNING] Kiwi 설치 필요: pip install kiwipiepy")
-            _morpheme_analyzer = (None, None)
+        # 백그라운드 로드 중이면 끝날 때까지 대기
+        with _morpheme_analyzer_lock:
+            if _morpheme_analyzer is None:
+                try:
+                    from kiwipiepy import Kiwi
+                    kiwi = Kiwi(num_workers=MORPHEME_NUM_WORKERS)
+                    _morpheme_analyzer = ('kiwi', kiwi)
+                    print("[INFO] Kiwi 형태소 분석기 로드됨")
+                except ImportError:
+                    print("[WARNING] Kiwi 설치 필요: pip install kiwipiepy")
+                    _morpheme_analyzer = (None, None)
     return _morpheme_analyzer
 
 
-def extract_suspicious_words(text: str) -> List[Dict]:
+def preload_morpheme_analyzer() -> threading.Thread:
     """
-    상품명에서 지재권 의심 단어 추출
+    형태소 분석기를 백그라운드에서 미리 로드
 
-    형태소 분석으로 일반명사 제외, 의심 단어만 추출
-    - 고유명사 (NNP)
-    - 미등록어/외래어
-    - 영어 단어
+    프로그램 시작 시 호출해두면 첫 검수 때 Kiwi 로딩(수 초)을 기다리지 않음
+    """
+    thread = threading.Thread(target=_get_morpheme_analyzer, daemon=True)
+    thread.start()
+    return thread
 
-    Args:
-        text: 상품명
+
+def _tokenize_titles(texts: List[str]) -> List[List[Tuple[str, str]]]:
+    """
+    여러 상품명을 한 번에 형태소 분석 (캐시 + Kiwi 멀티스레드 일괄 분석)
 
     Returns:
-        [{'word': '나이키', 'type': 'foreign', 'reason': '외래어/미등록어'}, ...]
+        texts와 같은 순서의 [(형태, 품사), ...] 리스트 (분석기 없으면 빈 리스트)
     """
+    analyzer_type, analyzer = _get_morpheme_analyzer()
+    if not analyzer or analyzer_type != 'kiwi':
+        return [[] for _ in texts]
+
+    results = {}
+    missing = []
+    with _morpheme_token_cache_lock:
+        for text in texts:
+            if text in results:
+                continue
+            cached = _morpheme_token_cache.get(text)
+            if cached is not None:
+                _morpheme_token_cache.move_to_end(text)
+                results[text] = cached
+            else:
+                results[text] = None
+                missing.append(text)
+
+    if missing:
+        analyzed = {}
+        try:
+            # 리스트로 넘기면 Kiwi가 num_workers 스레드로 병렬 분석 (입력 순서대로 반환)
+            for text, tokens in zip(missing, analyzer.tokenize(missing)):
+                analyzed[text] = [(t.form, t.tag) for t in tokens]
+        except Exception as e:
+            print(f"[WARNING] 형태소 분석 오류: {e}")
+
+        with _morpheme_token_cache_lock:
+            for text in missing:
+                tokens = analyzed.get(text)
+                if tokens is None:
+                    results[text] = []
+                    continue
+                results[text] = tokens
+                _morpheme_token_cache[text] = tokens
+            while len(_morpheme_token_cache) > MORPHEME_CACHE_SIZE:
+                _morpheme_token_cache.popitem(last=False)
+
+    return [results[text] for text in texts]
+
+
+# 일반적인 영어 단어 (size, color 등) - 의심 단어에서 제외
+_COMMON_ENGLISH_WORDS = {'size', 'color', 'free', 'one', 'new', 'hot', 'best', 'top',
+                         'big', 'small', 'large', 'medium', 'mini', 'max', 'pro', 'plus',
+                         'set', 'box', 'pack', 'cm', 'mm', 'kg', 'ml', 'pcs', 'ea'}
+
+
+def _suspicious_words_from_tokens(text: str, tokens: List[Tuple[str, str]]) -> List[Dict]:
+    """영어 단어 + 형태소 결과 + 모델명 패턴으로 의심 단어 목록 생성"""
     suspicious = []
+    seen = set()
 
     # 1. 영어 단어 추출 (정규식)
-    import re
     english_words = re.findall(r'[A-Za-z]{2,}', text)
     for word in english_words:
-        # 일반적인 영어 단어 제외 (size, color 등)
-        common_english = {'size', 'color', 'free', 'one', 'new', 'hot', 'best', 'top',
-                         'big', 'small', 'large', 'medium', 'mini', 'max', 'pro', 'plus',
-                         'set', 'box', 'pack', 'cm', 'mm', 'kg', 'ml', 'pcs', 'ea'}
-        if word.lower() not in common_english:
+        if word.lower() not in _COMMON_ENGLISH_WORDS:
             suspicious.append({
                 'word': word,
                 'type': 'english',
                 'reason': '영어 단어 (브랜드 가능성)'
             })
+            seen.add(word)
 
-    # 2. 형태소 분석 (Kiwi)
-    analyzer_type, analyzer = _get_morpheme_analyzer()
-
-    if analyzer and analyzer_type == 'kiwi':
-        try:
-            # Kiwi 형태소 분석
-            result = analyzer.tokenize(text)
-            for token in result:
-                word = token.form
-                pos = token.tag  # NNP: 고유명사, SL: 외국어, NNG: 일반명사
-
-                if len(word) < 2:
-                    continue
-
-                # 고유명사 (NNP) - 브랜드/지재권 가능성 높음
-                if pos == 'NNP':
-                    if not any(s['word'] == word for s in suspicious):
-                        suspicious.append({
-                            'word': word,
-                            'type': 'proper_noun',
-                            'reason': '고유명사 (지재권 가능성)'
-                        })
+    # 2. 형태소 분석 결과 (Kiwi)
+    for word, pos in tokens:  # NNP: 고유명사, SL: 외국어, NNG: 일반명사
+        if len(word) < 2 or word in seen:
+            continue
 
-                # 외국어 (SL) - 브랜드 가능성
-                elif pos == 'SL':
-                    if not any(s['word'] == word for s in suspicious):
-                        suspicious.append({
-                            'word': word,
-                            'type': 'foreign',
-                            'reason': '외래어 (지재권 가능성)'
-                        })
+        # 고유명사 (NNP) - 브랜드/지재권 가능성 높음
+        if pos == 'NNP':
+            suspicious.append({
+                'word': word,
+                'type': 'proper_noun',
+                'reason': '고유명사 (지재권 가능성)'
+            })
+            seen.add(word)
 
-                # 일반명사지만 외래어 느낌 (NNG)
-                elif pos == 'NNG' and _is_likely_foreign_word(word):
-                    if not any(s['word'] == word for s in suspicious):
-                        suspicious.append({
-                            'word': word,
-                            'type': 'foreign',
-                            'reason': '외래어/미등록어 (지재권 가능성)'
-                        })
+        # 외국어 (SL) - 브랜드 가능성
+        elif pos == 'SL':
+            suspicious.append({
+                'word': word,
+                'type': 'foreign',
+                'reason': '외래어 (지재권 가능성)'
+            })
+            seen.add(word)
 
-        except Exception as e:
-            print(f"[WARNING] 형태소 분석 오류: {e}")
+        # 일반명사지만 외래어 느낌 (NNG)
+        elif pos == 'NNG' and _is_likely_foreign_word(word):
+            suspicious.append({
+                'word': word,
+                'type': 'foreign',
+                'reason': '외래어/미등록어 (지재권 가능성)'
+            })
+            seen.add(word)
 
     # 3. 숫자+영어 조합 (모델명 가능성)
     model_patterns = re.findall(r'[A-Za-z]+\d+|\d+[A-Za-z]+', text)
     for pattern in model_patterns:
-        if len(pattern) >= 3 and not any(s['word'] == pattern for s in suspicious):
+        if len(pattern) >= 3 and pattern not in seen:
             suspicious.append({
                 'word': pattern,
                 'type': 'model_number',
                 'reason': '모델명 패턴 (브랜드 제품 가능성)'
             })
+            seen.add(pattern)
 
     return suspicious
 
 
+def extract_suspicious_words(text: str) -> List[Dict]:
+    """
+    상품명에서 지재권 의심 단어 추출
+
+    형태소 분석으로 일반명사 제외, 의심 단어만 추출
+    - 고유명사 (NNP)
+    - 미등록어/외래어
+    - 영어 단어
+
+    Args:
+        text: 상품명
+
+    Returns:
+        [{'word': '나이키', 'type': 'foreign', 'reason': '외래어/미등록어'}, ...]
+    """
+    return extract_suspicious_words_batch([text])[0]
+
+
+def extract_suspicious_words_batch(texts: List[str]) -> List[List[Dict]]:
+    """
+    여러 상품명에서 지재권 의심 단어 일괄 추출
+
+    형태소 분석은 Kiwi 멀티스레드 일괄 분석 + LRU 캐시 사용
+    (대량 상품 지재권 분석용)
+
+    Args:
+        texts: 상품명 리스트
+
+    Returns:
+        texts와 같은 순서의 의심 단어 리스트 (extract_suspicious_words 결과 형식)
+    """
+    token_lists = _tokenize_titles(texts)
+    return [_suspicious_words_from_tokens(text, tokens) for text, tokens in zip(texts, token_lists)]
+
+
 def _is_likely_foreign_word(word: str) -> bool:
     """외래어일 가능성이 높은 단어인지 판별"""
     # 일반적인 한국어 명사는 제외
@@ -3113,33 +5471,36 @@ def analyze_products_for_ip(products: List[Dict], log_callback=None) -> Dict:
 
     log(f"📋 지재권 분석 시작: {len(products)}개 상품")
 
-    for i, product in enumerate(products):
+    # 상품명 있는 상품만 추림
+    named_products = []
+    for product in products:
         product_name = product.get('product_name', '') or product.get('name', '') or product.get('uploadCommonProductName', '')
+        if product_name:
+            named_products.append((product, product_name))
+
+    # 일정 단위로 묶어서 형태소 일괄 분석 (단위마다 진행 로그)
+    chunk_size = 1000
+    for chunk_start in range(0, len(named_products), chunk_size):
+        chunk = named_products[chunk_start:chunk_start + chunk_size]
+        chunk_suspicious = extract_suspicious_words_batch([name for _, name in chunk])
+
+        for (product, product_name), suspicious in zip(chunk, chunk_suspicious):
+            result['total_analyzed'] += 1
+
+            if suspicious:
+                result['products_with_issues'] += 1
+                result['products_with_ip'].append({
+                    'product_name': product_name,
+                    'product_id': product.get('product_id', '') or product.get('id', '') or product.get('ID', ''),
+                    'suspicious': suspicious
+                })
 
-        if not product_name:
-            continue
-
-        result['total_analyzed'] += 1
-
-        # 의심 단어 추출
-        suspicious = extract_suspicious_words(product_name)
-
-        if suspicious:
-            result['products_with_issues'] += 1
-            result['products_with_ip'].append({
-                'product_name': product_name,
-                'product_id': product.get('product_id', '') or product.get('id', '') or product.get('ID', ''),
-                'suspicious': suspicious
-            })
-
-            # 단어별 카운트
-            for s in suspicious:
-                word = s['word']
-                result['suspicious_words'][word] = result['suspicious_words'].get(word, 0) + 1
+                # 단어별 카운트
+                for s in suspicious:
+                    word = s['word']
+                    result['suspicious_words'][word] = result['suspicious_words'].get(word, 0) + 1
 
-        # 진행 로그 (100개마다)
-        if (i + 1) % 100 == 0:
-            log(f"  진행: {i + 1}/{len(products)}")
+        log(f"  진행: {chunk_start + len(chunk)}/{len(named_products)}")
 
     # 정렬 (출현 횟수 기준)
     result['suspicious_words'] = dict(
@@ -3254,11 +5615,27 @@ def load_ip_words() -> Dict:
     }
 
 
+def _atomic_write_json(path: str, data) -> None:
+    """JSON 파일 원자적 저장 (임시파일에 쓴 뒤 교체 → 저장 중 중단돼도 파일 안 깨짐)"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# 단어 DB 파일 읽기-추가-저장 구간 보호용 락
+_word_db_lock = threading.RLock()
+
+
 def save_ip_words(data: Dict) -> bool:
     """지재권 단어 DB 저장"""
     try:
-        with open(IP_WORDS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with _word_db_lock:
+            _atomic_write_json(IP_WORDS_FILE, data)
         return True
     except Exception as e:
         print(f"지재권 DB 저장 실패: {e}")
@@ -3266,20 +5643,22 @@ def save_ip_words(data: Dict) -> bool:
 
 
 def add_ip_words(words: List[str], category: str = 'brands') -> bool:
-    """지재권 단어 추가"""
-    data = load_ip_words()
-    if category not in data:
-        data[category] = []
-
-    added = 0
-    for word in words:
-        if word and word not in data[category]:
-            data[category].append(word)
-            added += 1
-
-    if added > 0:
-        save_ip_words(data)
-        print(f"✅ {added}개 단어 추가됨 ({category})")
+    """지재권 단어 추가 (저장 직전 파일을 다시 읽어 병합 → 다른 창/프로그램 추가분 보존)"""
+    with _word_db_lock:
+        data = load_ip_words()
+        existing = data.setdefault(category, [])
+        existing_set = set(existing)
+
+        added = 0
+        for word in words:
+            if word and word not in existing_set:
+                existing.append(word)
+                existing_set.add(word)
+                added += 1
+
+        if added > 0:
+            save_ip_words(data)
+            print(f"✅ {added}개 단어 추가됨 ({category})")
 
     return added > 0
 
@@ -3494,14 +5873,98 @@ def load_product_name_check_cache() -> Dict:
 def save_product_name_check_cache(cache: Dict) -> bool:
     """상품명 검수 결과 캐시 저장"""
     try:
-        with open(PRODUCT_NAME_CHECK_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        with _word_db_lock:
+            _atomic_write_json(PRODUCT_NAME_CHECK_CACHE_FILE, cache)
+            _name_check_index_state['mtime'] = None  # 다음 검수 때 인덱스 재생성
         return True
     except:
         return False
 
 
-def check_product_name_suspicious(product_name: str, use_ai: bool = False, log_callback=None) -> Dict:
+def add_product_name_check_words(words: List[str], key: str = 'confirmed_ip') -> int:
+    """
+    상품명 검수 캐시에 단어 추가 (중복 제외)
+
+    저장 직전에 파일을 다시 읽어서 병합하므로 여러 창/프로그램이
+    동시에 추가해도 서로의 단어를 덮어쓰지 않음
+
+    Args:
+        words: 추가할 단어 목록
+        key: 'confirmed_ip' / 'confirmed_safe' / 'user_ip' / 'user_safe'
+
+    Returns:
+        실제로 추가된 단어 수
+    """
+    with _word_db_lock:
+        cache = load_product_name_check_cache()
+        existing = cache.setdefault(key, [])
+        existing_set = set(existing)
+
+        added = 0
+        for word in words:
+            if word and word not in existing_set:
+                existing.append(word)
+                existing_set.add(word)
+                added += 1
+
+        if added > 0:
+            save_product_name_check_cache(cache)
+
+    return added
+
+
+# 상품명 검수용 단어 인덱스 (한 번 만들어 두고 파일 수정시각이 바뀔 때만 재생성)
+_name_check_index_state = {'mtime': None, 'index': None}
+
+
+def _build_name_check_index(cache: Dict) -> Dict:
+    """패턴 DB + 캐시 단어로 검수 인덱스 생성"""
+    # 기본 패턴: (소문자 패턴, 원본 패턴 정규식, 카테고리) - 원래 순서 유지
+    patterns = []
+    for category, words in DEFAULT_SUSPICIOUS_PATTERNS.items():
+        for word in words:
+            patterns.append((word.lower(), re.compile(re.escape(word), re.IGNORECASE), category))
+
+    ip_words = []
+    for word in cache.get('confirmed_ip', []) + cache.get('user_ip', []):
+        if word:
+            ip_words.append((word.lower(), re.compile(re.escape(word), re.IGNORECASE)))
+
+    safe_words = [w for w in cache.get('confirmed_safe', []) + cache.get('user_safe', []) if w]
+
+    # 전체 단어(소문자)를 하나의 정규식으로 묶어서 1차 필터 (대부분 상품명은 여기서 바로 통과)
+    all_words = sorted({p[0] for p in patterns} | {w[0] for w in ip_words} | {w.lower() for w in safe_words},
+                       key=len, reverse=True)
+    prefilter = re.compile('|'.join(re.escape(w) for w in all_words)) if all_words else None
+
+    return {
+        'patterns': patterns,
+        'ip_words': ip_words,
+        'safe_words': [(w.lower(), w) for w in safe_words],
+        'safe_lower': {w.lower() for w in safe_words},
+        'prefilter': prefilter,
+    }
+
+
+def _get_name_check_index() -> Dict:
+    """검수 인덱스 가져오기 (캐시 파일이 바뀌었으면 다시 로드)"""
+    try:
+        st = os.stat(PRODUCT_NAME_CHECK_CACHE_FILE)
+        mtime = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        mtime = 0
+
+    state = _name_check_index_state
+    if state['index'] is None or state['mtime'] != mtime:
+        with _word_db_lock:
+            if state['index'] is None or state['mtime'] != mtime:
+                state['index'] = _build_name_check_index(load_product_name_check_cache())
+                state['mtime'] = mtime
+    return state['index']
+
+
+def check_product_name_suspicious(product_name: str, use_ai: bool = False, log_callback=None,
+                                  morpheme_words: List[Dict] = None) -> Dict:
     """
     상품명에서 의심 단어 검수
 
@@ -3512,6 +5975,7 @@ def check_product_name_suspicious(product_name: str, use_ai: bool = False, log_c
         product_name: 상품명
         use_ai: AI 검증 사용 여부
         log_callback: 로그 함수
+        morpheme_words: 미리 추출한 의심 단어 (extract_suspicious_words_batch 결과, 없으면 직접 분석)
 
     Returns:
         {
@@ -3538,24 +6002,26 @@ def check_product_name_suspicious(product_name: str, use_ai: bool = False, log_c
     if not product_name:
         return result
 
-    cache = load_product_name_check_cache()
+    index = _get_name_check_index()
     product_name_lower = product_name.lower()
 
     found_suspicious = []
+    found_suspicious_lower = set()
     found_safe = []
+    found_safe_lower = set()
     needs_check = []
 
-    # 1. 패턴 DB 매칭 (브랜드, 캐릭터)
-    for category, patterns in DEFAULT_SUSPICIOUS_PATTERNS.items():
-        for pattern in patterns:
-            pattern_lower = pattern.lower()
+    # 1차 필터: 등록된 단어가 하나도 없으면 1~2단계 생략
+    prefilter = index['prefilter']
+    if prefilter is not None and prefilter.search(product_name_lower):
+        # 1. 패턴 DB 매칭 (브랜드, 캐릭터)
+        for pattern_lower, pattern_re, category in index['patterns']:
             if pattern_lower in product_name_lower:
                 # 실제 매칭된 단어 찾기 (대소문자 유지)
-                import re
-                match = re.search(re.escape(pattern), product_name, re.IGNORECASE)
+                match = pattern_re.search(product_name)
                 if match:
                     matched_word = match.group()
-                    if not any(w['word'].lower() == matched_word.lower() for w in found_suspicious):
+                    if matched_word.lower() not in found_suspicious_lower:
                         is_confirmed = category in ['brands', 'characters']
                         found_suspicious.append({
                             'word': matched_word,
@@ -3563,39 +6029,44 @@ def check_product_name_suspicious(product_name: str, use_ai: bool = False, log_c
                             'source': 'pattern',
                             'confirmed': is_confirmed
                         })
-
-    # 2. 캐시에서 확인 (사용자 추가 / AI 확정)
-    for word in cache.get('confirmed_ip', []) + cache.get('user_ip', []):
-        if word.lower() in product_name_lower:
-            import re
-            match = re.search(re.escape(word), product_name, re.IGNORECASE)
-            if match and not any(w['word'].lower() == match.group().lower() for w in found_suspicious):
-                found_suspicious.append({
-                    'word': match.group(),
-                    'category': 'cached_ip',
-                    'source': 'cache',
-                    'confirmed': True
-                })
-
-    for word in cache.get('confirmed_safe', []) + cache.get('user_safe', []):
-        if word.lower() in product_name_lower:
-            found_safe.append(word)
+                        found_suspicious_lower.add(matched_word.lower())
+
+        # 2. 캐시에서 확인 (사용자 추가 / AI 확정)
+        for word_lower, word_re in index['ip_words']:
+            if word_lower in product_name_lower:
+                match = word_re.search(product_name)
+                if match and match.group().lower() not in found_suspicious_lower:
+                    found_suspicious.append({
+                        'word': match.group(),
+                        'category': 'cached_ip',
+                        'source': 'cache',
+                        'confirmed': True
+                    })
+                    found_suspicious_lower.add(match.group().lower())
+
+        for word_lower, word in index['safe_words']:
+            if word_lower in product_name_lower:
+                found_safe.append(word)
+                found_safe_lower.add(word_lower)
 
     # 3. 형태소 분석으로 추가 의심 단어 추출
-    suspicious_from_morpheme = extract_suspicious_words(product_name)
+    if morpheme_words is None:
+        morpheme_words = extract_suspicious_words(product_name)
+    suspicious_from_morpheme = morpheme_words
     for s in suspicious_from_morpheme:
         word = s['word']
         word_lower = word.lower()
 
         # 이미 처리됨?
-        if any(w['word'].lower() == word_lower for w in found_suspicious):
+        if word_lower in found_suspicious_lower:
             continue
-        if word_lower in [w.lower() for w in found_safe]:
+        if word_lower in found_safe_lower:
             continue
 
         # 캐시에서 확인된 안전 단어?
-        if word_lower in [w.lower() for w in cache.get('confirmed_safe', []) + cache.get('user_safe', [])]:
+        if word_lower in index['safe_lower']:
             found_safe.append(word)
+            found_safe_lower.add(word_lower)
             continue
 
         # AI 확인 필요
@@ -3614,21 +6085,16 @@ def check_product_name_suspicious(product_name: str, use_ai: bool = False, log_c
                 'source': 'ai',
                 'confirmed': True
             })
-            # 캐시에 저장
-            if word not in cache.get('confirmed_ip', []):
-                cache.setdefault('confirmed_ip', []).append(word)
 
         for word in ai_result.get('ip_safe', []):
             found_safe.append(word)
-            # 캐시에 저장
-            if word not in cache.get('confirmed_safe', []):
-                cache.setdefault('confirmed_safe', []).append(word)
 
         # 불확실한 단어는 needs_check에 남김
         needs_check = ai_result.get('ip_uncertain', [])
 
-        # 캐시 저장
-        save_product_name_check_cache(cache)
+        # 캐시에 저장 (파일 다시 읽어서 병합)
+        add_product_name_check_words(ai_result.get('ip_confirmed', []), 'confirmed_ip')
+        add_product_name_check_words(ai_result.get('ip_safe', []), 'confirmed_safe')
 
     result['suspicious_words'] = found_suspicious
     result['safe_words'] = found_safe
@@ -3703,10 +6169,16 @@ def batch_check_product_names(products: List[Dict], use_ai: bool = False, log_ca
 
     log(f"📋 상품명 검수 시작: {len(products)}개")
 
+    names = [product.get('uploadCommonProductName', '') or product.get('product_name', '') or product.get('name', '')
+             for product in products]
+
+    # 형태소 분석은 전체 상품명을 한 번에 (멀티스레드 + 캐시)
+    morpheme_results = extract_suspicious_words_batch(names)
+
     # 1단계: 패턴 매칭 (빠름)
     for i, product in enumerate(products):
-        name = product.get('uploadCommonProductName', '') or product.get('product_name', '') or product.get('name', '')
-        check_result = check_product_name_suspicious(name, use_ai=False)
+        name = names[i]
+        check_result = check_product_name_suspicious(name, use_ai=False, morpheme_words=morpheme_results[i])
         product['name_check_result'] = check_result
         all_needs_check.update(check_result.get('needs_ai_check', []))
 
@@ -3718,21 +6190,15 @@ def batch_check_product_names(products: List[Dict], use_ai: bool = False, log_ca
         log(f"🤖 AI 일괄 검증: {len(all_needs_check)}개 단어")
         ai_result = verify_ip_words_with_ai(list(all_needs_check)[:50], log_callback)
 
-        # 캐시 업데이트
-        cache = load_product_name_check_cache()
-        for word in ai_result.get('ip_confirmed', []):
-            if word not in cache.get('confirmed_ip', []):
-                cache.setdefault('confirmed_ip', []).append(word)
-        for word in ai_result.get('ip_safe', []):
-            if word not in cache.get('confirmed_safe', []):
-                cache.setdefault('confirmed_safe', []).append(word)
-        save_product_name_check_cache(cache)
+        # 캐시 업데이트 (파일 다시 읽어서 병합)
+        add_product_name_check_words(ai_result.get('ip_confirmed', []), 'confirmed_ip')
+        add_product_name_check_words(ai_result.get('ip_safe', []), 'confirmed_safe')
 
         # 결과 재반영
-        for product in products:
-            name = product.get('uploadCommonProductName', '') or product.get('product_name', '') or product.get('name', '')
+        for i, product in enumerate(products):
             # 재검수 (캐시 활용)
-            product['name_check_result'] = check_product_name_suspicious(name, use_ai=False)
+            product['name_check_result'] = check_product_name_suspicious(names[i], use_ai=False,
+                                                                         morpheme_words=morpheme_results[i])
 
     # 통계
     suspicious_count = sum(1 for p in products if p.get('name_check_result', {}).get('suspicious_words'))
@@ -3822,52 +6288,152 @@ DEFAULT_OPTION_PATTERNS = {
 }
 
 # 학습된 패턴 저장 파일
-OPTION_PATTERNS_FILE = "option_patterns.json"
+OPTION_PATTERNS_FILE = "option_patterns.json"            # 예전 학습 패턴 (읽기 전용으로 계속 사용)
+OPTION_PATTERNS_MEMORY_FILE = "option_patterns.jsonl"     # 학습 패턴 번역 메모리 (한 줄씩 추가만 함)
 
+# 옵션 패턴 캐시 (파일 버전이 바뀔 때만 다시 읽고 변환기 재생성)
+_option_pattern_state = {'version': None, 'patterns': None, 'learned': None, 'translator': None}
+_option_pattern_lock = threading.RLock()
+# 직접 넘겨받은 패턴 dict용 변환기 캐시 (같은 dict로 반복 호출 시 재컴파일 방지)
+_custom_option_translator = [(None, -1, None)]
+
+
+def _option_patterns_version():
+    """학습 패턴 파일 버전 (수정시각 + 크기)"""
+    version = []
+    for path in (OPTION_PATTERNS_FILE, OPTION_PATTERNS_MEMORY_FILE):
+        try:
+            st = os.stat(path)
+            version.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
 
-def load_option_patterns() -> Dict[str, str]:
-    """옵션명 변환 패턴 로드 (기본 + 학습된 패턴)"""
-    patterns = DEFAULT_OPTION_PATTERNS.copy()
+
+def _load_learned_option_patterns() -> Dict[str, str]:
+    """학습된 패턴 로드 (예전 JSON + 번역 메모리 JSONL, 나중에 추가된 줄이 우선)"""
+    learned = {}
 
     if os.path.exists(OPTION_PATTERNS_FILE):
         try:
             with open(OPTION_PATTERNS_FILE, 'r', encoding='utf-8') as f:
-                learned = json.load(f)
-                patterns.update(learned)
+                learned.update(json.load(f))
         except Exception as e:
             print(f"[WARNING] 옵션 패턴 로드 실패: {e}")
 
-    return patterns
+    if os.path.exists(OPTION_PATTERNS_MEMORY_FILE):
+        try:
+            with open(OPTION_PATTERNS_MEMORY_FILE, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 다른 프로그램이 쓰는 중인 마지막 줄 등은 건너뜀
+                    if entry.get('cn') and entry.get('kr'):
+                        learned[entry['cn']] = entry['kr']
+        except Exception as e:
+            print(f"[WARNING] 옵션 번역 메모리 로드 실패: {e}")
+
+    return learned
+
+
+def _compile_option_translator(patterns: Dict[str, str]):
+    """
+    패턴 dict → 최장일치 변환기 (정규식 1개)
+
+    긴 패턴을 앞에 둔 alternation이라 같은 위치에서는 항상 긴 패턴이 우선 적용됨
+    """
+    keys = sorted((k for k in patterns if k), key=len, reverse=True)
+    if not keys:
+        return None
+    return re.compile('|'.join(re.escape(k) for k in keys))
+
+
+def _get_option_pattern_state() -> Dict:
+    """기본 + 학습 패턴과 컴파일된 변환기 (파일이 바뀌었을 때만 재생성)"""
+    version = _option_patterns_version()
+    state = _option_pattern_state
+    if state['version'] != version:
+        with _option_pattern_lock:
+            if state['version'] != version:
+                learned = _load_learned_option_patterns()
+                patterns = DEFAULT_OPTION_PATTERNS.copy()
+                patterns.update(learned)
+                state['learned'] = learned
+                state['patterns'] = patterns
+                state['translator'] = _compile_option_translator(patterns)
+                state['version'] = version
+    return state
+
+
+def load_option_patterns() -> Dict[str, str]:
+    """옵션명 변환 패턴 로드 (기본 + 학습된 패턴)"""
+    return _get_option_pattern_state()['patterns'].copy()
+
+
+def save_option_patterns(new_patterns: Dict[str, str]) -> int:
+    """
+    옵션 변환 패턴 여러 개 저장 (학습)
+
+    번역 메모리 파일에 새 줄로 추가만 하므로 여러 프로그램이 동시에 학습해도
+    서로의 패턴을 덮어쓰지 않음. 기본 패턴이나 이미 같은 번역이 있으면 건너뜀
+
+    Returns:
+        실제로 저장된 패턴 수
+    """
+    with _option_pattern_lock:
+        learned = _get_option_pattern_state()['learned']
+        lines = []
+        for original, translated in new_patterns.items():
+            if not original or not translated:
+                continue
+            # 이미 기본 패턴에 있으면 스킵
+            if original in DEFAULT_OPTION_PATTERNS:
+                continue
+            # 이미 같은 번역으로 학습됨 → 중복 저장 안 함
+            if learned.get(original) == translated:
+                continue
+            lines.append(json.dumps({'cn': original, 'kr': translated}, ensure_ascii=False) + '\n')
+
+        if not lines:
+            return 0
+
+        try:
+            # 한 번의 write로 추가 (append 모드라 항상 파일 끝에 붙음)
+            with open(OPTION_PATTERNS_MEMORY_FILE, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+        except Exception as e:
+            print(f"[ERROR] 옵션 패턴 저장 실패: {e}")
+            return 0
+
+    return len(lines)
 
 
 def save_option_pattern(original: str, translated: str) -> bool:
     """새 옵션 변환 패턴 저장 (학습)"""
     if not original or not translated:
         return False
+    return save_option_patterns({original: translated}) > 0
 
-    # 기존 학습 패턴 로드
-    learned = {}
-    if os.path.exists(OPTION_PATTERNS_FILE):
-        try:
-            with open(OPTION_PATTERNS_FILE, 'r', encoding='utf-8') as f:
-                learned = json.load(f)
-        except:
-            pass
 
-    # 이미 기본 패턴에 있으면 스킵
-    if original in DEFAULT_OPTION_PATTERNS:
-        return False
+# 중국어(CJK 한자) 검색용
+_CJK_RE = re.compile('[\u4e00-\u9fff]')
 
-    # 새 패턴 추가
-    learned[original] = translated
 
-    try:
-        with open(OPTION_PATTERNS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(learned, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception as e:
-        print(f"[ERROR] 옵션 패턴 저장 실패: {e}")
-        return False
+def _get_option_translator(patterns: Dict[str, str] = None):
+    """clean_option_name용 (패턴 dict, 컴파일된 변환기)"""
+    if patterns is None:
+        state = _get_option_pattern_state()
+        return state['patterns'], state['translator']
+
+    cached_patterns, cached_size, translator = _custom_option_translator[0]
+    if cached_patterns is not patterns or cached_size != len(patterns):
+        translator = _compile_option_translator(patterns)
+        _custom_option_translator[0] = (patterns, len(patterns), translator)
+    return patterns, translator
 
 
 def clean_option_name(option_name: str, patterns: Dict[str, str] = None) -> Tuple[str, bool]:
@@ -3886,19 +6452,23 @@ def clean_option_name(option_name: str, patterns: Dict[str, str] = None) -> Tupl
     if not option_name:
         return '', True
 
-    if patterns is None:
-        patterns = load_option_patterns()
+    patterns, translator = _get_option_translator(patterns)
+    return _apply_option_translator(option_name, patterns, translator)
 
-    result = option_name
 
-    # 긴 패턴부터 먼저 적용 (부분 매칭 방지)
-    sorted_patterns = sorted(patterns.items(), key=lambda x: len(x[0]), reverse=True)
+def _apply_option_translator(option_name: str, patterns: Dict[str, str], translator) -> Tuple[str, bool]:
+    """컴파일된 변환기로 옵션명 정리 (clean_option_name 본체)"""
+    if not option_name:
+        return '', True
+
+    result = option_name
 
-    for original, translated in sorted_patterns:
-        result = result.replace(original, translated)
+    # 긴 패턴 우선 최장일치로 한 번에 치환 (부분 매칭 방지)
+    if translator is not None:
+        result = translator.sub(lambda m: patterns[m.group()], result)
 
     # 남은 중국어 확인 (CJK 유니코드 범위)
-    has_chinese = any('\u4e00' <= char <= '\u9fff' for char in result)
+    has_chinese = _CJK_RE.search(result) is not None
 
     return result.strip(), not has_chinese
 
@@ -3910,11 +6480,11 @@ def clean_option_names_batch(option_names: List[str]) -> List[Tuple[str, str, bo
     Returns:
         [(original, cleaned, fully_cleaned), ...]
     """
-    patterns = load_option_patterns()
+    patterns, translator = _get_option_translator()
     results = []
 
     for name in option_names:
-        cleaned, fully = clean_option_name(name, patterns)
+        cleaned, fully = _apply_option_translator(name, patterns, translator)
         results.append((name, cleaned, fully))
 
     return results
@@ -3933,8 +6503,7 @@ def clean_option_name_with_ai(option_name: str, log_callback=None) -> Tuple[str,
             log_callback(msg)
 
     # 1. 패턴 기반 정리 시도
-    patterns = load_option_patterns()
-    cleaned, fully_cleaned = clean_option_name(option_name, patterns)
+    cleaned, fully_cleaned = clean_option_name(option_name)
 
     if fully_cleaned:
         return cleaned, True
@@ -4029,13 +6598,13 @@ def clean_option_names_with_ai_batch(option_names: List[str], log_callback=None)
         if log_callback:
             log_callback(msg)
 
-    patterns = load_option_patterns()
+    patterns, translator = _get_option_translator()
     results = []
     needs_ai = []
 
     # 1. 패턴 기반 먼저 처리
     for name in option_names:
-        cleaned, fully = clean_option_name(name, patterns)
+        cleaned, fully = _apply_option_translator(name, patterns, translator)
         if fully:
             results.append((name, cleaned, True))
         else:
@@ -4095,18 +6664,16 @@ def clean_option_names_with_ai_batch(option_names: List[str], log_callback=None)
                     result_json = json.loads(json_match.group())
                     new_patterns = result_json.get('번역', {})
 
-                    # 새 패턴 저장
-                    for cn, kr in new_patterns.items():
-                        if cn and kr and save_option_pattern(cn, kr):
-                            log(f"  📚 패턴 학습: {cn} → {kr}")
+                    # 새 패턴 저장 (한 번에 추가)
+                    saved = save_option_patterns(new_patterns)
+                    if saved:
+                        log(f"  📚 패턴 학습: {saved}개")
                 except:
                     pass
     except Exception as e:
         log(f"❌ AI 번역 오류: {e}")
 
     # 4. 새 패턴 적용하여 재처리
-    patterns.update(new_patterns)
-
     for original, partial in needs_ai:
         # 새 패턴으로 다시 정리
         cleaned = partial
@@ -4121,13 +6688,7 @@ def clean_option_names_with_ai_batch(option_names: List[str], log_callback=None)
 
 def get_option_pattern_stats() -> Dict:
     """옵션 패턴 통계"""
-    learned = {}
-    if os.path.exists(OPTION_PATTERNS_FILE):
-        try:
-            with open(OPTION_PATTERNS_FILE, 'r', encoding='utf-8') as f:
-                learned = json.load(f)
-        except:
-            pass
+    learned = dict(_get_option_pattern_state()['learned'])
 
     return {
         'default_count': len(DEFAULT_OPTION_PATTERNS),
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 """
-불사자 멀티 터미널 런처
-- 여러 터미널 창에서 동시에 업로드 실행
-- 각 세션이 독립적으로 진행됨
+불사자 멀티 세션 런처
+- 선택한 그룹마다 업로드 세션 실행
+- 기본: 업로드 데몬(bulsaja_upload_daemon.py) 1개 프로세스에서 세션 실행
+  (모듈/캐시/HTTP 연결 풀 공유 → 세션 수가 늘어도 메모리/시작시간 거의 그대로)
+- "터미널 창으로 실행" 체크 시 기존처럼 세션마다 터미널 창 실행
 
 사용법:
     python bulsaja_multi_launcher.py
@@ -11,6 +13,7 @@
 import os
 import sys
 import json
+import time
 import subprocess
 import tempfile
 from pathlib import Path
@@ -34,6 +37,7 @@ class MultiLauncher:
 
         self.config = self._load_config()
         self.group_vars = {}  # {group_name: BooleanVar}
+        self.daemon_sessions = []  # 데몬에서 실행한 세션 번호
 
         self._create_ui()
 
@@ -56,8 +60,8 @@ class MultiLauncher:
         header = ttk.Frame(self.root, padding=10)
         header.pack(fill=tk.X)
 
-        ttk.Label(header, text="멀티 터미널 업로드", font=("맑은 고딕", 14, "bold")).pack()
-        ttk.Label(header, text="선택한 그룹마다 별도 터미널 창에서 업로드가 진행됩니다",
+        ttk.Label(header, text="멀티 세션 업로드", font=("맑은 고딕", 14, "bold")).pack()
+        ttk.Label(header, text="선택한 그룹마다 업로드 세션이 진행됩니다 (업로드 데몬 1개에서 실행)",
                  foreground="gray").pack()
 
         ttk.Separator(self.root, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=5)
@@ -118,6 +122,9 @@ class MultiLauncher:
         self.prevent_dup_var = tk.BooleanVar(value=self.config.get('prevent_duplicate', True))
         ttk.Checkbutton(row2, text="중복업로드 방지", variable=self.prevent_dup_var).pack(side=tk.LEFT, padx=20)
 
+        self.use_terminal_var = tk.BooleanVar(value=self.config.get('use_terminal', False))
+        ttk.Checkbutton(row2, text="터미널 창으로 실행", variable=self.use_terminal_var).pack(side=tk.LEFT)
+
         # 실행 버튼
         btn_frame = ttk.Frame(self.root, padding=10)
         btn_frame.pack(fill=tk.X)
@@ -125,13 +132,15 @@ class MultiLauncher:
         ttk.Button(btn_frame, text="전체 선택", command=self._select_all).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="전체 해제", command=self._deselect_all).pack(side=tk.LEFT, padx=5)
 
-        self.launch_btn = ttk.Button(btn_frame, text="▶ 터미널 실행", command=self._launch_terminals)
+        self.launch_btn = ttk.Button(btn_frame, text="▶ 세션 실행", command=self._launch)
         self.launch_btn.pack(side=tk.RIGHT, padx=5)
 
+        ttk.Button(btn_frame, text="■ 전체 중지", command=self._stop_daemon_sessions).pack(side=tk.RIGHT, padx=5)
+
         ttk.Button(btn_frame, text="닫기", command=self.root.destroy).pack(side=tk.RIGHT, padx=5)
 
         # 상태바
-        self.status_var = tk.StringVar(value="그룹을 선택하고 '터미널 실행'을 클릭하세요")
+        self.status_var = tk.StringVar(value="그룹을 선택하고 '세션 실행'을 클릭하세요")
         ttk.Label(self.root, textvariable=self.status_var, foreground="gray").pack(pady=5)
 
     def _load_groups(self):
@@ -184,8 +193,8 @@ class MultiLauncher:
         for var in self.group_vars.values():
             var.set(False)
 
-    def _launch_terminals(self):
-        """선택된 그룹마다 터미널 실행"""
+    def _launch(self):
+        """선택된 그룹마다 세션 실행 (데몬 또는 터미널)"""
         selected_groups = [name for name, var in self.group_vars.items() if var.get()]
 
         if not selected_groups:
@@ -199,8 +208,87 @@ class MultiLauncher:
         self.config['market_name'] = self.market_var.get()
         self.config['option_sort'] = self.sort_var.get()
         self.config['prevent_duplicate'] = self.prevent_dup_var.get()
+        self.config['use_terminal'] = self.use_terminal_var.get()
         self._save_config()
 
+        if self.use_terminal_var.get():
+            self._launch_terminals(selected_groups)
+        else:
+            self._launch_daemon_sessions(selected_groups)
+
+    def _ensure_daemon(self) -> bool:
+        """업로드 데몬 연결 (없으면 백그라운드로 실행 후 대기)"""
+        from bulsaja_upload_daemon import send_daemon_command
+
+        if send_daemon_command({'cmd': 'ping'}, timeout=1):
+            return True
+
+        script_path = Path(__file__).parent / "bulsaja_upload_daemon.py"
+        log_path = Path(__file__).parent / "log" / "upload_daemon.log"
+        log_path.parent.mkdir(exist_ok=True)
+        creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        with open(log_path, 'a', encoding='utf-8') as log_file:
+            subprocess.Popen([sys.executable, str(script_path), 'serve'],
+                             cwd=str(Path(__file__).parent), stdout=log_file, stderr=subprocess.STDOUT,
+                             creationflags=creationflags)
+
+        for _ in range(20):
+            time.sleep(0.5)
+            if send_daemon_command({'cmd': 'ping'}, timeout=1):
+                return True
+        return False
+
+    def _launch_daemon_sessions(self, selected_groups):
+        """데몬에 그룹별 세션 시작 요청"""
+        from bulsaja_upload_daemon import send_daemon_command
+
+        if not self._ensure_daemon():
+            messagebox.showerror("오류", "업로드 데몬을 시작할 수 없습니다 (log/upload_daemon.log 확인)")
+            return
+
+        launched = 0
+        for group_name in selected_groups:
+            response = send_daemon_command({'cmd': 'start', 'group': group_name, 'config': self.config.copy()})
+            if response and response.get('ok'):
+                self.daemon_sessions.append(response['session'])
+                launched += 1
+            else:
+                error = response.get('error') if response else '응답 없음'
+                messagebox.showerror("오류", f"세션 실행 실패 ({group_name}): {error}")
+
+        if launched > 0:
+            self.status_var.set(f"{launched}개 세션 실행 중")
+            self.root.after(2000, self._poll_daemon_status)
+
+    def _poll_daemon_status(self):
+        """데몬 세션 진행상황 표시 (2초마다)"""
+        from bulsaja_upload_daemon import send_daemon_command
+
+        response = send_daemon_command({'cmd': 'status'}, timeout=2)
+        if not response or not response.get('ok'):
+            self.status_var.set("업로드 데몬 연결 끊김")
+            return
+
+        sessions = [s for s in response.get('sessions', []) if s['session'] in self.daemon_sessions]
+        running = [s for s in sessions if s['state'] in ('running', 'stopping')]
+        success = sum(s['stats'].get('success', 0) for s in sessions)
+        failed = sum(s['stats'].get('failed', 0) for s in sessions)
+        progress = " | ".join(f"#{s['session']} {s['current']}/{s['stats'].get('total', 0)}" for s in running[:4])
+        self.status_var.set(f"실행 {len(running)}/{len(sessions)}개 세션 · 성공 {success} · 실패 {failed}"
+                            + (f"  ({progress})" if progress else ""))
+        if running:
+            self.root.after(2000, self._poll_daemon_status)
+
+    def _stop_daemon_sessions(self):
+        """데몬 세션 전체 중지 (진행 중인 상품까지만 처리)"""
+        from bulsaja_upload_daemon import send_daemon_command
+
+        for session_id in self.daemon_sessions:
+            send_daemon_command({'cmd': 'stop', 'session': session_id}, timeout=2)
+        self.status_var.set("중지 요청됨 - 진행 중인 상품까지만 처리 후 멈춥니다")
+
+    def _launch_terminals(self, selected_groups):
+        """선택된 그룹마다 터미널 실행 (기존 방식)"""
         # 각 그룹에 대해 터미널 실행
         script_path = Path(__file__).parent / "bulsaja_uploader_cli.py"
 
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+불사자 업로드 데몬 - 한 프로세스에서 여러 업로드 세션 실행
+멀티 런처(bulsaja_multi_launcher.py)가 세션마다 터미널/파이썬을 띄우던 방식 대체
+
+- 세션 = 스레드 (CLIUploader 재사용)
+- bulsaja_common 모듈/키워드/캐시, HTTP 연결 풀(토큰별 API 클라이언트 1개)을 세션 간 공유
+- 127.0.0.1 TCP 소켓으로 제어 (한 줄 = JSON 요청 1개, 응답도 JSON 한 줄)
+
+사용법:
+    python bulsaja_upload_daemon.py serve
+    python bulsaja_upload_daemon.py start --config config.json --group "그룹명"
+    python bulsaja_upload_daemon.py status
+    python bulsaja_upload_daemon.py stop --session 1
+    python bulsaja_upload_daemon.py shutdown
+
+제어 명령 (JSON):
+    {"cmd": "ping"}
+    {"cmd": "start", "group": "그룹명", "config": {...}}   → {"ok": true, "session": 1}
+    {"cmd": "stop", "session": 1}        (session 생략 시 전체 중지)
+    {"cmd": "status", "session": 1}      (session 생략 시 전체, "logs": N 으로 최근 로그 수)
+    {"cmd": "shutdown"}
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+# 공통 모듈
+sys.path.insert(0, str(Path(__file__).parent))
+from bulsaja_common import BulsajaAPIClient, load_bait_keywords
+from bulsaja_uploader_cli import CLIUploader
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 47800
+SESSION_LOG_LINES = 200   # 세션별 보관 로그 줄 수 (상태 조회용)
+
+
+class _DaemonTCPServer(socketserver.ThreadingTCPServer):
+    """데몬 명령 서버 (표준 클래스 속성은 건드리지 않고 서브클래스에서만 설정)"""
+    allow_reuse_address = True   # 재시작 직후 같은 포트 바로 사용
+    daemon_threads = True        # 연결 처리 스레드가 종료를 막지 않음
+
+
+class UploadSession:
+    """데몬 안에서 실행되는 업로드 세션 1개"""
+
+    def __init__(self, session_id: int, group_name: str, config: dict, api: BulsajaAPIClient):
+        self.session_id = session_id
+        self.group_name = group_name
+        self.config = config
+        self.state = "running"     # running / stopping / done / stopped / error
+        self.error = ""
+        self.started_at = time.time()
+        self.finished_at = None
+        self.logs = deque(maxlen=SESSION_LOG_LINES)
+        self.stop_event = threading.Event()
+        self.uploader = CLIUploader(config, session_id, group_name, api=api,
+                                    log_callback=self._log, stop_event=self.stop_event)
+        self.thread = threading.Thread(target=self._run, name=f"upload-session-{session_id}", daemon=True)
+
+    def _log(self, msg: str, level: str = "info"):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        level_tag = "" if level == "info" else f"{level.upper()} "
+        line = f"{timestamp} [S{self.session_id}] {level_tag}{msg}"
+        self.logs.append(line)
+        print(line, flush=True)
+
+    def _run(self):
+        try:
+            self.uploader.run_upload()
+            self.state = "stopped" if self.stop_event.is_set() else "done"
+        except Exception as e:
+            self.state = "error"
+            self.error = str(e)
+            self._log(f"세션 오류: {e}", "error")
+        finally:
+            self.finished_at = time.time()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        if self.state == "running":
+            self.state = "stopping"
+        self.stop_event.set()
+
+    def to_status(self, log_lines: int = 0) -> dict:
+        status = {
+            'session': self.session_id,
+            'group': self.group_name,
+            'market': self.uploader.market_name,
+            'state': self.state,
+            'current': self.uploader.current,
+            'stats': dict(self.uploader.stats),
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.error:
+            status['error'] = self.error
+        if log_lines:
+            status['logs'] = list(self.logs)[-log_lines:]
+        return status
+
+
+class UploadDaemon:
+    """여러 업로드 세션을 한 프로세스에서 관리"""
+
+    def __init__(self, host: str = DAEMON_HOST, port: int = DAEMON_PORT):
+        self.host = host
+        self.port = port
+        self.sessions: Dict[int, UploadSession] = {}
+        self._clients: Dict[tuple, BulsajaAPIClient] = {}   # (access, refresh) → 공유 클라이언트
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._server = None
+
+        # 공유 규칙 미리 로드 (세션들은 메모리 캐시 사용)
+        load_bait_keywords()
+
+    def _get_client(self, config: dict) -> BulsajaAPIClient:
+        """토큰별 API 클라이언트 1개를 세션 간 공유 (HTTP 연결 풀 공유)"""
+        key = (config.get('access_token', ''), config.get('refresh_token', ''))
+        client = self._clients.get(key)
+        if client is None:
+            client = BulsajaAPIClient(*key)
+            self._clients[key] = client
+        return client
+
+    def start_session(self, group_name: str, config: dict) -> int:
+        with self._lock:
+            session_id = self._next_id
+            self._next_id += 1
+            session = UploadSession(session_id, group_name, config, self._get_client(config))
+            self.sessions[session_id] = session
+        session.start()
+        return session_id
+
+    def stop_session(self, session_id: int = None) -> int:
+        """세션 중지 (None이면 전체) → 중지 요청한 세션 수"""
+        with self._lock:
+            targets = [self.sessions[session_id]] if session_id in self.sessions else \
+                ([] if session_id is not None else list(self.sessions.values()))
+        for session in targets:
+            session.stop()
+        return len(targets)
+
+    def status(self, session_id: int = None, log_lines: int = 0) -> list:
+        with self._lock:
+            sessions = [self.sessions[session_id]] if session_id in self.sessions else \
+                ([] if session_id is not None else list(self.sessions.values()))
+        return [s.to_status(log_lines) for s in sessions]
+
+    def handle(self, request: dict) -> dict:
+        """제어 명령 처리"""
+        cmd = request.get('cmd')
+        try:
+            if cmd == 'ping':
+                return {'ok': True, 'pid': os.getpid(), 'sessions': len(self.sessions)}
+            if cmd == 'start':
+                group_name = request.get('group')
+                if not group_name:
+                    return {'ok': False, 'error': 'group 필요'}
+                session_id = self.start_session(group_name, request.get('config') or {})
+                return {'ok': True, 'session': session_id}
+            if cmd == 'stop':
+                return {'ok': True, 'stopped': self.stop_session(request.get('session'))}
+            if cmd == 'status':
+                return {'ok': True, 'sessions': self.status(request.get('session'), int(request.get('logs', 0)))}
+            if cmd == 'shutdown':
+                self.stop_session()
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {'ok': True}
+            return {'ok': False, 'error': f'알 수 없는 명령: {cmd}'}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    def serve_forever(self):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    try:
+                        request = json.loads(raw.decode('utf-8'))
+                    except ValueError:
+                        response = {'ok': False, 'error': '잘못된 JSON'}
+                    else:
+                        response = daemon.handle(request)
+                    self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+
+        self._server = _DaemonTCPServer((self.host, self.port), Handler)
+        print(f"[DAEMON] 업로드 데몬 시작: {self.host}:{self.port} (pid {os.getpid()})", flush=True)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def shutdown(self, timeout: float = 30):
+        """세션 중지 → 진행 중인 상품 마무리 대기 → 서버 종료"""
+        self.stop_session()
+        deadline = time.time() + timeout
+        for session in list(self.sessions.values()):
+            session.thread.join(max(0, deadline - time.time()))
+        if self._server:
+            self._server.shutdown()
+
+
+def send_daemon_command(request: dict, host: str = DAEMON_HOST, port: int = DAEMON_PORT,
+                        timeout: float = 5) -> Optional[dict]:
+    """데몬에 명령 전송 → 응답 dict (데몬 없으면 None)"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall((json.dumps(request, ensure_ascii=False) + '\n').encode('utf-8'))
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        return json.loads(line.decode('utf-8')) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='불사자 업로드 데몬')
+    parser.add_argument('command', choices=['serve', 'start', 'stop', 'status', 'shutdown'])
+    parser.add_argument('--port', type=int, default=DAEMON_PORT, help='제어 포트')
+    parser.add_argument('--config', help='설정 파일 경로 (start)')
+    parser.add_argument('--group', help='마켓 그룹명 (start)')
+    parser.add_argument('--session', type=int, help='세션 번호 (stop/status)')
+    parser.add_argument('--logs', type=int, default=0, help='최근 로그 줄 수 (status)')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        UploadDaemon(port=args.port).serve_forever()
+        return
+
+    if args.command == 'start':
+        if not args.config or not args.group:
+            parser.error('start에는 --config, --group 필요')
+        with open(args.config, 'r', encoding='utf-8') as f:
+            request = {'cmd': 'start', 'group': args.group, 'config': json.load(f)}
+    elif args.command in ('stop', 'status'):
+        request = {'cmd': args.command, 'session': args.session, 'logs': args.logs}
+    else:
+        request = {'cmd': args.command}
+
+    response = send_daemon_command(request, port=args.port)
+    if response is None:
+        print(f"데몬에 연결할 수 없습니다 (포트 {args.port})")
+        sys.exit(1)
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ from typing import List, Dict, Optional
 # 공통 모듈
 sys.path.insert(0, str(Path(__file__).parent))
 from bulsaja_common import (
-    filter_bait_options, select_main_option, BulsajaAPIClient, load_bait_keywords
+    filter_bait_options, select_main_option, BulsajaAPIClient, load_bait_keywords, UploadJournal
 )
 
 # 콘솔 색상 (Windows)
@@ -44,13 +44,22 @@ def colored(text, color):
 class CLIUploader:
     """CLI 업로더"""
 
-    def __init__(self, config: dict, session_id: int, group_name: str):
+    def __init__(self, config: dict, session_id: int, group_name: str,
+                 api: BulsajaAPIClient = None, log_callback=None, stop_event=None):
+        """
+        Args:
+            api: 공유 API 클라이언트 (데몬에서 세션 간 HTTP 풀 공유, 없으면 새로 생성)
+            log_callback: (msg, level) 로그 수신 함수 (없으면 콘솔 출력)
+            stop_event: threading.Event - set되면 현재 상품까지만 처리하고 중지
+        """
         self.config = config
         self.session_id = session_id
         self.group_name = group_name
+        self.log_callback = log_callback
+        self.stop_event = stop_event
 
         # API 클라이언트
-        self.api = BulsajaAPIClient(
+        self.api = api or BulsajaAPIClient(
             config.get('access_token', ''),
             config.get('refresh_token', '')
         )
@@ -64,6 +73,7 @@ class CLIUploader:
         self.skip_sku_update = config.get('skip_sku_update', False)
         self.skip_price_update = config.get('skip_price_update', False)
         self.prevent_duplicate = config.get('prevent_duplicate', True)
+        self.upload_delay = config.get('upload_delay', 1.5)   # 상품 사이 대기 (초)
 
         # 통계
         self.stats = {
@@ -72,9 +82,14 @@ class CLIUploader:
             'skipped': 0,
             'total': 0
         }
+        self.current = 0  # 현재 처리 중인 상품 번호 (상태 조회용)
 
     def log(self, msg: str, level: str = "info"):
         """로그 출력"""
+        if self.log_callback:
+            self.log_callback(msg, level)
+            return
+
         timestamp = datetime.now().strftime("%H:%M:%S")
         session_tag = f"[S{self.session_id}]"
 
@@ -143,10 +158,9 @@ class CLIUploader:
     def get_products(self) -> List[dict]:
         """상품 목록 조회"""
         try:
-            products = self.api.get_product_list(
-                group_name=self.group_name,
-                status_filters=self.status_filters,
-                limit=self.upload_count
+            status_filters = [str(s) for s in self.status_filters] if self.status_filters else None
+            products, _ = self.api.get_products_by_group(
+                self.group_name, 0, self.upload_count, status_filters
             )
             return products
         except Exception as e:
@@ -172,7 +186,7 @@ class CLIUploader:
                 skus = detail.get('uploadSkus', [])
                 if skus:
                     # 미끼 옵션 필터링
-                    filtered_skus = filter_bait_options(skus, load_bait_keywords())
+                    filtered_skus, _ = filter_bait_options(skus, load_bait_keywords())
 
                     # 옵션 정렬 및 제한
                     if self.option_sort == 'price_asc':
@@ -190,19 +204,14 @@ class CLIUploader:
                         selected_skus[0]['main_product'] = True
 
             # 3. 업로드 요청
-            result = self.api.upload_product(
-                product_id=product_id,
-                market_id=market_id,
-                prevent_duplicate=self.prevent_duplicate
-            )
+            ok, message = self.api.upload_product(product_id, self.market_name)
 
-            if result and result.get('code') == 1:
+            if ok:
                 self.log(f"업로드 성공: {product_name}", "success")
                 self.stats['success'] += 1
                 return True
             else:
-                error_msg = result.get('message', '알 수 없는 오류') if result else '응답 없음'
-                self.log(f"업로드 실패: {product_name} - {error_msg}", "error")
+                self.log(f"업로드 실패: {product_name} - {message or '알 수 없는 오류'}", "error")
                 self.stats['failed'] += 1
                 return False
 
@@ -211,25 +220,46 @@ class CLIUploader:
             self.stats['failed'] += 1
             return False
 
+    def is_stopped(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
     def run(self):
-        """업로드 실행"""
+        """업로드 실행 (터미널)"""
         print()
         print(colored("=" * 60, Colors.CYAN))
         print(colored(f"  불사자 업로더 CLI - 세션 #{self.session_id}", Colors.BOLD))
         print(colored("=" * 60, Colors.CYAN))
         print()
 
+        self.run_upload()
+
+        # 결과 출력
+        print()
+        print(colored("=" * 60, Colors.CYAN))
+        print(colored(f"  세션 #{self.session_id} 완료", Colors.BOLD))
+        print(colored("=" * 60, Colors.CYAN))
+        print()
+        print(f"  총 처리: {self.stats['total']}개")
+        print(f"  {colored('성공', Colors.GREEN)}: {self.stats['success']}개")
+        print(f"  {colored('실패', Colors.RED)}: {self.stats['failed']}개")
+        print(f"  {colored('건너뜀', Colors.YELLOW)}: {self.stats['skipped']}개")
+        print()
+
+        # 창 유지
+        input("Enter를 누르면 창이 닫힙니다...")
+
+    def run_upload(self) -> dict:
+        """업로드 본체 (터미널/데몬 공용) → 통계 반환"""
         self.log(f"그룹: {self.group_name}")
         self.log(f"마켓: {self.market_name}")
         self.log(f"업로드 수: {self.upload_count}")
         self.log(f"옵션 수: {self.option_count}")
-        print()
 
         # 마켓 ID 조회
         market_id = self.get_market_id()
         if not market_id:
             self.log("마켓 ID를 찾을 수 없어 종료합니다", "error")
-            return
+            return self.stats
 
         self.log(f"마켓 ID: {market_id}")
 
@@ -237,37 +267,50 @@ class CLIUploader:
         products = self.get_products()
         if not products:
             self.log("업로드할 상품이 없습니다", "warning")
-            return
+            return self.stats
+
+        # 체크포인트 저널 (중지/오류 후 재실행 시 끝난 상품 건너뛰기)
+        journal = UploadJournal(f"cli_{self.group_name}_{self.market_name}")
+        pending = journal.pending_products(products, [self.market_name])
+        if len(pending) < len(products):
+            self.log(f"이어하기: {len(products) - len(pending)}개 상품 완료됨 → 건너뜀", "warning")
+            self.stats['skipped'] += len(products) - len(pending)
+            products = pending
 
         self.stats['total'] = len(products)
         self.log(f"대상 상품: {len(products)}개")
-        print()
-        print(colored("-" * 40, Colors.CYAN))
-        print()
+        self.log("-" * 40)
 
         # 각 상품 처리
-        for i, product in enumerate(products):
-            self.log(f"[{i+1}/{len(products)}]", "progress")
-            self.process_product(product, market_id)
-
-            # 딜레이
-            if i < len(products) - 1:
-                time.sleep(1.5)
-
-        # 결과 출력
-        print()
-        print(colored("=" * 60, Colors.CYAN))
-        print(colored(f"  세션 #{self.session_id} 완료", Colors.BOLD))
-        print(colored("=" * 60, Colors.CYAN))
-        print()
-        print(f"  총 처리: {self.stats['total']}개")
-        print(f"  {colored('성공', Colors.GREEN)}: {self.stats['success']}개")
-        print(f"  {colored('실패', Colors.RED)}: {self.stats['failed']}개")
-        print(f"  {colored('건너뜀', Colors.YELLOW)}: {self.stats['skipped']}개")
-        print()
+        completed = False
+        try:
+            for i, product in enumerate(products):
+                if self.is_stopped():
+                    self.log("중지 요청 - 다음 실행에서 이어서 진행됩니다", "warning")
+                    break
+                product_id = product.get('ID', product.get('id', ''))
+                self.current = i + 1
+                self.log(f"[{i+1}/{len(products)}]", "progress")
+                journal.record(product_id, self.market_name, 'upload', 'started')
+                ok = self.process_product(product, market_id)
+                journal.record(product_id, self.market_name, 'upload', 'success' if ok else 'failed')
+
+                # 딜레이 (중지 요청 시 바로 깨어남)
+                if i < len(products) - 1:
+                    if self.stop_event is not None:
+                        self.stop_event.wait(self.upload_delay)
+                    else:
+                        time.sleep(self.upload_delay)
+            else:
+                completed = True
+        finally:
+            # 정상 완료만 저널 보관, 중지(Ctrl+C)/오류 시 남겨서 이어하기
+            if completed:
+                journal.finish()
+            else:
+                journal.close()
 
-        # 창 유지
-        input("Enter를 누르면 창이 닫힙니다...")
+        return self.stats
 
 
 def main():
@@ -5,6 +5,8 @@
 
 사용법:
     python bulsaja_uploader_server.py --server http://서버주소:8000 --token 인증토큰
+    python bulsaja_uploader_server.py --server http://서버주소:8000 --token 인증토큰 --queue --api-key 키
+        (작업 큐 모드: 서버의 업로드 작업을 청크 단위로 가져가서 처리, 놀면 다른 PC 작업 일부를 가져감)
 """
 
 import os
@@ -12,6 +14,8 @@ import sys
 import json
 import time
 import asyncio
+import socket
+import uuid
 import argparse
 import threading
 from datetime import datetime
@@ -34,7 +38,7 @@ except ImportError:
 # 공통 모듈
 sys.path.insert(0, str(Path(__file__).parent))
 from bulsaja_common import (
-    filter_bait_options, select_main_option, BulsajaAPIClient, load_bait_keywords
+    filter_bait_options, select_main_option, BulsajaAPIClient, load_bait_keywords, UploadJournal
 )
 
 
@@ -83,6 +87,13 @@ class ServerConnectedUploader:
         self.status_filters = bulsaja_config.get('status_filters', ['0', '1', '2'])
         self.market_name = bulsaja_config.get('market_name', '스마트스토어')
         self.prevent_duplicate = bulsaja_config.get('prevent_duplicate', True)
+        self.upload_delay = bulsaja_config.get('upload_delay', 1.5)   # 상품 사이 대기 (초)
+
+        # 작업 큐 모드
+        self.api_key = bulsaja_config.get('server_api_key', '')
+        # 임대 소유자 ID (큐 상태 API로 다른 사용자에게 보임 → 인증 토큰 대신 무작위 값)
+        self.client_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self._market_ids: Dict[tuple, int] = {}   # (그룹, 마켓) → market_id
 
     def log(self, msg: str, level: str = "info"):
         """로그 출력"""
@@ -129,7 +140,7 @@ class ServerConnectedUploader:
             "error": error
         })
 
-    def get_market_id(self, group_name: str) -> Optional[int]:
+    def get_market_id(self, group_name: str, market_name: str = None) -> Optional[int]:
         """마켓 ID 조회"""
         market_type_map = {
             '스마트스토어': 'SMARTSTORE',
@@ -137,7 +148,7 @@ class ServerConnectedUploader:
             'G마켓/옥션': 'ESM',
             '쿠팡': 'COUPANG'
         }
-        target_type = market_type_map.get(self.market_name, 'SMARTSTORE')
+        target_type = market_type_map.get(market_name or self.market_name, 'SMARTSTORE')
 
         try:
             groups_url = f"{self.api.BASE_URL}/market/groups/"
@@ -171,17 +182,15 @@ class ServerConnectedUploader:
     def get_products(self, group_name: str, limit: int) -> List[dict]:
         """상품 목록 조회"""
         try:
-            return self.api.get_product_list(
-                group_name=group_name,
-                status_filters=self.status_filters,
-                limit=limit
-            )
+            status_filters = [str(s) for s in self.status_filters] if self.status_filters else None
+            products, _ = self.api.get_products_by_group(group_name, 0, limit, status_filters)
+            return products
         except Exception as e:
             self.log(f"상품 목록 조회 실패: {e}", "error")
             return []
 
-    def process_product(self, product: dict, market_id: int) -> bool:
-        """단일 상품 처리"""
+    def process_product(self, product: dict, market_name: str = None) -> bool:
+        """단일 상품 처리 (market_name 생략 시 설정값)"""
         product_id = product.get('ID', product.get('id', ''))
         product_name = product.get('uploadCommonProductName', product.get('name', ''))[:30]
 
@@ -194,7 +203,7 @@ class ServerConnectedUploader:
             # SKU 처리
             skus = detail.get('uploadSkus', [])
             if skus:
-                filtered_skus = filter_bait_options(skus, load_bait_keywords())
+                filtered_skus, _ = filter_bait_options(skus, load_bait_keywords())
                 if self.option_sort == 'price_asc':
                     filtered_skus.sort(key=lambda x: x.get('_origin_price', 0))
                 elif self.option_sort == 'price_desc':
@@ -206,13 +215,10 @@ class ServerConnectedUploader:
                     selected_skus[0]['main_product'] = True
 
             # 업로드
-            result = self.api.upload_product(
-                product_id=product_id,
-                market_id=market_id,
-                prevent_duplicate=self.prevent_duplicate
-            )
-
-            return result and result.get('code') == 1
+            ok, message = self.api.upload_product(product_id, market_name or self.market_name)
+            if not ok:
+                self.log(f"업로드 실패: {product_name} - {message or '알 수 없는 오류'}", "error")
+            return ok
         except Exception as e:
             self.log(f"처리 오류: {product_name} - {e}", "error")
             return False
@@ -227,6 +233,8 @@ class ServerConnectedUploader:
         self.log(f"작업 시작: {job_id} - 그룹: {group_name}", "progress")
 
         stats = {'success': 0, 'failed': 0, 'total': 0}
+        journal = None
+        completed = False
 
         try:
             # 마켓 ID 조회
@@ -241,6 +249,13 @@ class ServerConnectedUploader:
                 await self.send_result(False, stats, "업로드할 상품이 없습니다")
                 return
 
+            # 체크포인트 저널 (연결 끊김/재시작 후 같은 그룹 재할당 시 끝난 상품 건너뛰기)
+            journal = UploadJournal(f"server_{group_name}_{self.market_name}")
+            pending = journal.pending_products(products, [self.market_name])
+            if len(pending) < len(products):
+                self.log(f"이어하기: {len(products) - len(pending)}개 상품 완료됨 → 건너뜀", "warning")
+                products = pending
+
             stats['total'] = len(products)
 
             # 진행상황 초기 전송
@@ -254,20 +269,25 @@ class ServerConnectedUploader:
                 await self.send_progress(i, stats['total'], product_name)
 
                 # 상품 처리
-                if self.process_product(product, market_id):
+                product_id = product.get('ID', product.get('id', ''))
+                journal.record(product_id, self.market_name, 'upload', 'started')
+                if self.process_product(product):
                     stats['success'] += 1
+                    journal.record(product_id, self.market_name, 'upload', 'success')
                     self.log(f"[{i+1}/{stats['total']}] 성공: {product_name}", "success")
                 else:
                     stats['failed'] += 1
+                    journal.record(product_id, self.market_name, 'upload', 'failed')
                     self.log(f"[{i+1}/{stats['total']}] 실패: {product_name}", "error")
 
                 # 딜레이
                 if i < len(products) - 1:
-                    await asyncio.sleep(1.5)
+                    await asyncio.sleep(self.upload_delay)
 
             # 완료 전송
             await self.send_progress(stats['total'], stats['total'])
             await self.send_result(True, stats)
+            completed = True
 
             self.log(f"작업 완료: 성공 {stats['success']}, 실패 {stats['failed']}", "success")
 
@@ -275,6 +295,12 @@ class ServerConnectedUploader:
             self.log(f"작업 실행 오류: {e}", "error")
             await self.send_result(False, stats, str(e))
         finally:
+            # 정상 완료만 저널 보관, 중단 시 남겨서 다음 할당에서 이어하기
+            if journal:
+                if completed:
+                    journal.finish()
+                else:
+                    journal.close()
             self.current_job = None
 
     async def connect_and_listen(self):
@@ -341,7 +367,89 @@ class ServerConnectedUploader:
         if retry_count >= max_retries:
             self.log("최대 재연결 시도 횟수 초과", "error")
 
-    def run(self):
+    # ==================== 작업 큐 모드 ====================
+
+    def _queue_post(self, path: str, payload: dict) -> Optional[dict]:
+        """작업 큐 API 호출 (실패 시 None)"""
+        try:
+            response = requests.post(f"{self.server_url}/api/upload-queue/{path}", json=payload,
+                                     headers={'X-API-Key': self.api_key}, timeout=15)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self.log(f"작업 큐 통신 실패 ({path}): {e}", "warning")
+            return None
+
+    def process_chunk(self, chunk: dict) -> Dict[str, str]:
+        """
+        청크 처리 - 상품마다 완료 보고 + 남은 목록 갱신
+
+        하트비트 응답의 product_ids가 이 클라이언트 몫:
+        다른 PC가 뒤쪽을 가져가면 목록이 줄고, 리스가 회수되면 ok=False → 중단
+        """
+        chunk_id = chunk['chunk_id']
+        group_name = chunk.get('group_name', '')
+        market_name = chunk.get('market_name') or self.market_name
+        remaining = list(chunk.get('product_ids', []))
+        results: Dict[str, str] = {}
+        unreported: Dict[str, str] = {}
+
+        key = (group_name, market_name)
+        if key not in self._market_ids:
+            market_id = self.get_market_id(group_name, market_name)
+            if not market_id:
+                self.log(f"마켓 ID를 찾을 수 없습니다: {group_name} / {market_name}", "error")
+                return results
+            self._market_ids[key] = market_id
+
+        tag = " (다른 PC 작업 분할)" if chunk.get('stolen') else ""
+        self.log(f"청크 {chunk_id}: {group_name} / {market_name} - {len(remaining)}개{tag}", "progress")
+
+        while remaining and self.running:
+            product_id = remaining.pop(0)
+            ok = self.process_product({'ID': product_id}, market_name)
+            status = 'success' if ok else 'failed'
+            results[product_id] = status
+            unreported[product_id] = status
+            self.log(f"[{len(results)}] {'성공' if ok else '실패'}: {product_id}", "success" if ok else "error")
+
+            # 상품마다 보고 → 서버가 아는 진행 위치가 실제와 1개 이상 벌어지지 않음
+            # (작업을 나눠 줄 때 뒤쪽 절반만 떼어가므로 처리 중인 상품과 겹치지 않음)
+            if remaining:
+                beat = self._queue_post('heartbeat', {'client_id': self.client_id, 'chunk_id': chunk_id,
+                                                      'done': unreported})
+                if beat is not None:   # 통신 실패면 보고는 다음에 몰아서
+                    unreported = {}
+                    if not beat.get('ok') or beat.get('cancelled'):
+                        self.log("청크 회수/취소됨 → 중단", "warning")
+                        return results
+                    allowed = set(beat.get('product_ids', []))
+                    if len(allowed) < len(remaining):
+                        self.log(f"다른 PC가 {len(remaining) - len(allowed)}개 가져감", "warning")
+                    remaining = [pid for pid in remaining if pid in allowed]
+
+            if remaining:
+                time.sleep(self.upload_delay)
+
+        self._queue_post('complete', {'client_id': self.client_id, 'chunk_id': chunk_id, 'done': unreported})
+        return results
+
+    def run_queue_worker(self, idle_wait: float = 5.0):
+        """작업 큐 모드 - 청크 가져오기 → 처리 → 반복 (작업 없으면 대기)"""
+        self.log(f"작업 큐 모드: {self.client_id}", "progress")
+        total = {'success': 0, 'failed': 0}
+        while self.running:
+            response = self._queue_post('claim', {'client_id': self.client_id})
+            chunk = response.get('chunk') if response else None
+            if not chunk:
+                time.sleep(idle_wait)
+                continue
+            results = self.process_chunk(chunk)
+            for status in results.values():
+                total['success' if status == 'success' else 'failed'] += 1
+            self.log(f"누적: 성공 {total['success']}, 실패 {total['failed']}")
+
+    def run(self, queue_mode: bool = False):
         """실행"""
         print()
         print(colored("=" * 60, Colors.CYAN))
@@ -357,7 +465,10 @@ class ServerConnectedUploader:
             os.system('color')
 
         try:
-            asyncio.run(self.connect_and_listen())
+            if queue_mode:
+                self.run_queue_worker()
+            else:
+                asyncio.run(self.connect_and_listen())
         except KeyboardInterrupt:
             self.log("사용자 종료", "warning")
         finally:
@@ -369,6 +480,8 @@ def main():
     parser.add_argument('--server', required=True, help='서버 URL (예: http://192.168.0.100:8000)')
     parser.add_argument('--token', required=True, help='클라이언트 인증 토큰')
     parser.add_argument('--config', default='bulsaja_config.json', help='불사자 설정 파일')
+    parser.add_argument('--queue', action='store_true', help='작업 큐 모드 (여러 PC가 작업 분배)')
+    parser.add_argument('--api-key', default='', help='서버 API 키 (작업 큐 모드)')
 
     args = parser.parse_args()
 
@@ -391,8 +504,10 @@ def main():
         }
 
     # 업로더 실행
+    if args.api_key:
+        bulsaja_config['server_api_key'] = args.api_key
     uploader = ServerConnectedUploader(args.server, args.token, bulsaja_config)
-    uploader.run()
+    uploader.run(queue_mode=args.queue)
 
 
 if __name__ == "__main__":
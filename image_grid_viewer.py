@@ -4,7 +4,7 @@ PyQt6 이미지 그리드 뷰어 - 성능 최적화 버전
 - 8x50 그리드 (400개 이미지)
 - QThreadPool을 이용한 병렬 다운로드
 - 이미지 리사이징 최적화
-- 플레이스홀더 및 캐싱 적용
+- 플레이스홀더 및 캐싱 적용 (메모리 + 공유 디스크 캐시)
 """
 
 import sys
@@ -21,6 +21,13 @@ from urllib.request import urlopen
 from urllib.error import URLError
 import time
 
+# 공유 디스크 캐시 (불사자 공통 모듈 - 없으면 매번 직접 다운로드)
+try:
+    from bulsaja_common import get_image_cache
+    DISK_CACHE_AVAILABLE = True
+except ImportError:
+    DISK_CACHE_AVAILABLE = False
+
 
 # ============================================================
 # 이미지 캐시 (메모리 캐싱으로 중복 다운로드 방지)
@@ -92,9 +99,16 @@ class ImageDownloadWorker(QRunnable):
                 self.signals.finished.emit(self.index, cached)
                 return
 
-            # 2. HTTP 요청으로 이미지 다운로드
-            with urlopen(self.url, timeout=10) as response:
-                data = response.read()
+            # 2. 디스크 캐시 (50px 표시용 작은 렌디션) → 없으면 HTTP 요청으로 다운로드
+            if DISK_CACHE_AVAILABLE:
+                path = get_image_cache().get_file(self.url, min_side=max(self.size.width(), self.size.height()))
+                if not path:
+                    raise ValueError("이미지 다운로드 실패")
+                with open(path, 'rb') as f:
+                    data = f.read()
+            else:
+                with urlopen(self.url, timeout=10) as response:
+                    data = response.read()
 
             # 3. QImage로 로드
             image = QImage()
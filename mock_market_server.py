@@ -0,0 +1,562 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 마켓 API 목 서버 (불사자 / 네이버 커머스 / 11번가)
+실제 API를 호출하지 않고 업로더/동기화 처리량을 측정하기 위한 로컬 서버
+
+- 응답 형태는 실제 응답(bulsaja uploadfields.txt, 중복옵션상세업로드필드.txt 등)에서
+  프로그램이 읽는 필드만 재현 (상품 데이터는 seed 기반으로 매번 동일하게 생성)
+- 지연(평균 + 편차), 오류율(503), 레이트리밋(서비스별 초당 요청 수 초과 시 429) 설정
+- 경로별 요청 수/오류/제한/처리시간 통계: GET /__stats, 초기화: POST /__reset
+
+경로:
+    불사자   /api/manage/list/serverside, /api/manage/sourcing-product/{id},
+             /api/sourcing/uploadfields/{id} (GET/PUT), /api/market/groups/,
+             /api/market/group/{id}/markets, /api/market/group/{id}/meta/,
+             /api/market/{id}/upload/, /api/manage/category/bulsaja_category,
+             /api/manage/groups, /api/sourcing/bulk-update-groups
+    네이버   /naver/external/v1/oauth2/token, /naver/external/v1/products/search,
+             /naver/external/v1/products/origin-products/bulk-update
+    11번가   /11st/rest/prodmarketservice/prodmarket (XML),
+             /11st/rest/prodstatservice/stat/stopdisplay/{prdNo}, .../startdisplay/{prdNo}
+
+사용법:
+    python mock_market_server.py --port 8900 --latency 80 --jitter 30 --error-rate 0.01 --rate-limit 20
+
+    각 프로그램은 환경변수로 목 서버를 바라보게 함:
+        BULSAJA_API_BASE=http://127.0.0.1:8900/api
+        NAVER_COMMERCE_API_HOST=http://127.0.0.1:8900/naver
+        ELEVENST_API_HOST=http://127.0.0.1:8900/11st
+"""
+
+import re
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+MARKET_TYPES = ["SMARTSTORE", "ST11", "ESM", "COUPANG"]
+CATEGORY_NAMES = {
+    'ss': "생활/건강>생활용품>세탁용품>빨래건조대",
+    'esm': "생활용품>세탁용품>빨래건조대",
+    'est': "해외직구>리빙/생활>생활용품>세탁/청소용품",
+    'cp': "생활용품>건강용품>건강액세서리>기타건강액세서리",
+}
+NAME_WORDS = ["접이식", "스텐", "대형", "가정용", "휴대용", "원룸", "빨래건조대", "수납함",
+              "정리대", "선반", "캠핑", "미니", "다용도", "북유럽", "원목", "철제"]
+OPTION_WORDS = ["블랙", "화이트", "그레이", "베이지", "대형", "소형", "세트", "단품"]
+
+
+@dataclass
+class MockConfig:
+    """목 서버 동작 설정"""
+    latency_ms: float = 50          # 평균 응답 지연
+    jitter_ms: float = 20           # 지연 표준편차
+    upload_latency_ms: float = 0    # 마켓 업로드 지연 (0이면 latency_ms 사용)
+    error_rate: float = 0.0         # 503 응답 비율 (0~1)
+    rate_limit: float = 0           # 서비스별 초당 요청 수 (0이면 제한 없음)
+    products: int = 500             # 상품 수 (불사자/네이버/11번가 공통)
+    sku_min: int = 3
+    sku_max: int = 12
+    groups: int = 3                 # 불사자 마켓 그룹 수 ("1. 목그룹" ...)
+    seed: int = 42
+
+
+class _TokenBucket:
+    """서비스별 레이트리밋 (초과 시 429 + Retry-After)"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockMarketData:
+    """seed 기반 상품 데이터 (같은 설정이면 매번 같은 응답)"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.group_names = [f"{i}. 목그룹" for i in range(1, config.groups + 1)]
+        self.updated_fields: Dict[str, int] = {}   # product_id → PUT uploadfields 횟수
+        self.uploads: Dict[str, int] = {}          # market_type → 업로드 수
+        self.display_changes = 0
+        self.bulk_updated = 0
+        self._lock = threading.Lock()
+
+    def product_id(self, idx: int) -> str:
+        return f"U01MOCK{idx:08d}"
+
+    def product_index(self, product_id: str) -> Optional[int]:
+        m = re.match(r'^U01MOCK(\d{8})$', product_id)
+        if not m:
+            return None
+        idx = int(m.group(1))
+        return idx if idx < self.config.products else None
+
+    def _rng(self, idx: int) -> random.Random:
+        return random.Random(self.config.seed * 1_000_003 + idx)
+
+    def product_name(self, idx: int) -> str:
+        rng = self._rng(idx)
+        return " ".join(rng.sample(NAME_WORDS, 5))
+
+    def list_row(self, idx: int) -> Dict:
+        """상품 목록(/manage/list/serverside) 행"""
+        return {
+            'ID': self.product_id(idx),
+            'uploadCommonProductName': self.product_name(idx),
+            'status': "0",
+            'uploadedMarkets': "",
+            'groupFile': None,
+            'marketGroupName': self.group_names[idx % len(self.group_names)],
+        }
+
+    def detail(self, idx: int) -> Dict:
+        """상품 상세 / uploadfields"""
+        rng = self._rng(idx)
+        name = self.product_name(idx)
+        sku_count = rng.randint(self.config.sku_min, self.config.sku_max)
+        props = [{'vid': v, 'name': OPTION_WORDS[v % len(OPTION_WORDS)] + str(v)} for v in range(sku_count)]
+        skus = []
+        for v in range(sku_count):
+            price = round(rng.uniform(20, 300), 2)
+            skus.append({
+                'id': f"{idx}-{v}",
+                'text': props[v]['name'],
+                '_text': props[v]['name'],
+                'prop_val_ids': [v],
+                '_origin_price': price,
+                'origin_price': price,
+                'stock': rng.choice([0, 50, 200, 999]),
+                'main_product': v == 0,
+                'exclude': False,
+                'urlRef': f"https://cdn.bulsaja.com/mock/{idx}/{v}.jpg",
+            })
+        group_id = 100 + idx % len(self.group_names)
+        return {
+            'ID': self.product_id(idx),
+            'uploadBulsajaCode': f"MOCK{idx}",
+            'uploadTrackcopyCode': f"TRACK{idx}",
+            'uploadSelectedMarketGroupId': group_id,
+            'uploadCommonProductName': name,
+            'uploadSmartStoreProductName': name,
+            'uploadCoupangProductName': name,
+            'uploadSkus': skus,
+            'uploadSkuProps': {
+                'mainOption': {'prop_name': "색상", 'pid': 1, 'values': props},
+                'subOption': [],
+            },
+            'uploadThumbnails': [f"https://cdn.bulsaja.com/mock/{idx}/thumb{t}.jpg" for t in range(5)],
+            'uploadVideoUrls': [],
+            'uploadDetailContents': {'contents': [f"https://cdn.bulsaja.com/mock/{idx}/detail.jpg"]},
+            'uploadCategory': {
+                'cp_category': {'name': CATEGORY_NAMES['cp'], 'code': "64086"},
+            },
+            'uploadSearchCategory': {'name': CATEGORY_NAMES['cp'], 'code': "64086"},
+            'uploadSmartStoreTags': [],
+            'uploadCommonTags': [],
+            'uploadBrand': "",
+            'uploadOverseaDeliveryFee': rng.choice([0, 3000, 5000]),
+            'uploadRecentExchangeRate': 215,
+            'uploadBase_price': {'card_fee': 3.3, 'raise_digit': 100, 'percent_margin': 30,
+                                 'discount_rate': 37, 'plus_margin': 10000},
+            'uploadedMarkets': "",
+            'uploadNotices': None,
+            'tags': [],
+            'origin_price': skus[0]['_origin_price'],
+        }
+
+    def category_map(self, keyword: str) -> Dict:
+        return {market: [{'name': name, 'code': str(50000000 + i), 'id': market,
+                          'search': keyword, 'needCert': False}]
+                for i, (market, name) in enumerate(CATEGORY_NAMES.items())}
+
+    def naver_item(self, idx: int) -> Dict:
+        rng = self._rng(idx)
+        sale_price = rng.randrange(10000, 200000, 100)
+        return {
+            'originProductNo': 9_000_000_000 + idx,
+            'channelProducts': [{
+                'channelProductNo': 8_000_000_000 + idx,
+                'name': self.product_name(idx),
+                'statusType': "SALE",
+                'salePrice': sale_price,
+                'discountedPrice': sale_price - sale_price // 10 // 100 * 100,
+                'regDate': "2026-01-01T00:00:00.000+09:00",
+                'sellerManagementCode': self.product_id(idx),
+            }],
+        }
+
+    def elevenst_prd_no(self, idx: int) -> str:
+        return str(7_000_000_000 + idx)
+
+
+class MockMarketServer:
+    """목 서버 (백그라운드 스레드 실행 또는 serve_forever)"""
+
+    def __init__(self, config: MockConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.data = MockMarketData(self.config)
+        self.buckets = {name: _TokenBucket(self.config.rate_limit) for name in ('bulsaja', 'naver', '11st')}
+        self._stats: Dict[str, Dict] = {}
+        self._stats_lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """각 프로그램을 목 서버로 향하게 하는 환경변수"""
+        return {
+            'BULSAJA_API_BASE': f"{self.base_url}/api",
+            'NAVER_COMMERCE_API_HOST': f"{self.base_url}/naver",
+            'ELEVENST_API_HOST': f"{self.base_url}/11st",
+        }
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-market-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ---------- 통계 ----------
+
+    def _record(self, route: str, status: int, elapsed: float):
+        with self._stats_lock:
+            st = self._stats.setdefault(route, {'count': 0, 'errors': 0, 'throttled': 0, 'times': []})
+            st['count'] += 1
+            if status == 429:
+                st['throttled'] += 1
+            elif status >= 500:
+                st['errors'] += 1
+            st['times'].append(elapsed)
+
+    def stats(self) -> Dict[str, Dict]:
+        """경로별 {count, errors, throttled, p50_ms, p95_ms}"""
+        with self._stats_lock:
+            result = {}
+            for route, st in sorted(self._stats.items()):
+                times = sorted(st['times'])
+                result[route] = {
+                    'count': st['count'],
+                    'errors': st['errors'],
+                    'throttled': st['throttled'],
+                    'p50_ms': round(percentile(times, 50) * 1000, 1),
+                    'p95_ms': round(percentile(times, 95) * 1000, 1),
+                }
+            return result
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    # ---------- 요청 처리 ----------
+
+    def _delay(self, upload: bool = False):
+        mean = self.config.upload_latency_ms if upload and self.config.upload_latency_ms else self.config.latency_ms
+        with self._rng_lock:
+            ms = self._rng.gauss(mean, self.config.jitter_ms) if self.config.jitter_ms else mean
+            fail = self._rng.random() < self.config.error_rate
+        if ms > 0:
+            time.sleep(ms / 1000)
+        return fail
+
+    def dispatch(self, method: str, path: str, query: Dict, body: bytes) -> Tuple[str, int, str, bytes]:
+        """(경로 이름, 상태코드, content-type, 본문)"""
+        if path.startswith('/api/'):
+            service, handler = 'bulsaja', self._bulsaja
+        elif path.startswith('/naver/'):
+            service, handler = 'naver', self._naver
+        elif path.startswith('/11st/'):
+            service, handler = '11st', self._elevenst
+        elif path == '/__stats':
+            return '__stats', 200, 'application/json', _json_bytes(self.stats())
+        elif path == '/__reset' and method == 'POST':
+            self.reset_stats()
+            return '__reset', 200, 'application/json', _json_bytes({'ok': True})
+        else:
+            return 'unknown', 404, 'application/json', _json_bytes({'error': 'not found'})
+
+        if not self.buckets[service].take():
+            return f"{service}:throttled", 429, 'application/json', _json_bytes({'error': 'Too Many Requests'})
+
+        route, upload, respond = handler(method, path, query, body)
+        if route is None:
+            return f"{service}:unknown", 404, 'application/json', _json_bytes({'error': 'not found'})
+        if self._delay(upload):
+            return route, 503, 'application/json', _json_bytes({'error': 'Service Unavailable (mock)'})
+        status, content_type, payload = respond()
+        return route, status, content_type, payload
+
+    def _bulsaja(self, method: str, path: str, query: Dict, body: bytes):
+        data = self.data
+        path = path[len('/api'):]
+        req = _json_body(body)
+
+        if path == '/manage/list/serverside' and method == 'POST':
+            def respond():
+                request = req.get('request', {})
+                start = int(request.get('startRow', 0))
+                end = min(int(request.get('endRow', 100)), data.config.products)
+                group = (request.get('filterModel') or {}).get('marketGroupName', {}).get('filter')
+                rows = [data.list_row(i) for i in range(start, end)]
+                if group:
+                    rows = [dict(r, marketGroupName=group) for r in rows]
+                return _ok({'rowData': rows, 'lastRow': data.config.products})
+            return 'bulsaja:list', False, respond
+
+        m = re.match(r'^/(manage/sourcing-product|sourcing/uploadfields)/([^/]+)$', path)
+        if m:
+            idx = data.product_index(m.group(2))
+            kind = 'detail' if m.group(1).startswith('manage') else 'uploadfields'
+            if method == 'PUT' and kind == 'uploadfields':
+                def respond():
+                    if idx is None:
+                        return _error(404, '상품 없음')
+                    with data._lock:
+                        data.updated_fields[m.group(2)] = data.updated_fields.get(m.group(2), 0) + 1
+                    return _ok({'message': 'OK'})
+                return 'bulsaja:uploadfields_put', False, respond
+
+            def respond():
+                if idx is None:
+                    return _error(404, '상품 없음')
+                detail = data.detail(idx)
+                return _ok({'message': 'OK', 'data': detail} if kind == 'detail' else {'payload': detail})
+            return f"bulsaja:{kind}", False, respond
+
+        if path == '/market/groups/':
+            def respond():
+                return _ok([{'id': 100 + i, 'name': name, 'markets': []}
+                            for i, name in enumerate(data.group_names)])
+            return 'bulsaja:market_groups', False, respond
+
+        m = re.match(r'^/market/group/(\d+)/(markets|meta/)$', path)
+        if m:
+            group_id = int(m.group(1))
+            if m.group(2) == 'markets':
+                def respond():
+                    return _ok([{'id': group_id * 10 + i, 'type': t, 'name': t}
+                                for i, t in enumerate(MARKET_TYPES)])
+                return 'bulsaja:group_markets', False, respond
+            return 'bulsaja:group_meta', False, lambda: _ok({'data': {'isAllowSingleItem': True}})
+
+        m = re.match(r'^/market/(\d+)/upload/$', path)
+        if m and method == 'POST':
+            def respond():
+                if data.product_index(str(req.get('productId', ''))) is None:
+                    return _ok({'success': False, 'message': '상품 없음'})
+                market = MARKET_TYPES[int(m.group(1)) % 10 % len(MARKET_TYPES)]
+                with data._lock:
+                    data.uploads[market] = data.uploads.get(market, 0) + 1
+                return _ok({'success': True, 'status': 'SUCCESS', 'message': '업로드 요청 완료'})
+            return 'bulsaja:upload', True, respond
+
+        if path == '/manage/category/bulsaja_category' and method == 'POST':
+            return 'bulsaja:category', False, lambda: _ok(
+                {'success': True, 'data': {'categoryMap': data.category_map(req.get('keyword', ''))}})
+
+        if path == '/manage/groups':
+            if method == 'GET':
+                return 'bulsaja:tags', False, lambda: _ok([{'name': '업로드실패'}])
+            return 'bulsaja:tag_create', False, lambda: _ok({'success': True})
+
+        if path == '/sourcing/bulk-update-groups' and method == 'POST':
+            return 'bulsaja:tag_apply', False, lambda: _ok({'success': True})
+
+        return None, False, None
+
+    def _naver(self, method: str, path: str, query: Dict, body: bytes):
+        data = self.data
+        path = path[len('/naver'):]
+
+        if path == '/external/v1/oauth2/token' and method == 'POST':
+            return 'naver:token', False, lambda: _ok(
+                {'access_token': 'mock-naver-token', 'expires_in': 10800, 'token_type': 'Bearer'})
+
+        if path == '/external/v1/products/search' and method == 'POST':
+            req = _json_body(body)
+
+            def respond():
+                page = max(1, int(req.get('page', 1)))
+                size = max(1, int(req.get('size', 50)))
+                start = (page - 1) * size
+                end = min(start + size, data.config.products)
+                items = [data.naver_item(i) for i in range(start, end)]
+                return _ok({'contents': items, 'page': page, 'size': size,
+                            'totalElements': data.config.products,
+                            'totalPages': -(-data.config.products // size)})
+            return 'naver:search', False, respond
+
+        if path == '/external/v1/products/origin-products/bulk-update' and method == 'PUT':
+            req = _json_body(body)
+
+            def respond():
+                nos = req.get('originProductNos') or []
+                with data._lock:
+                    data.bulk_updated += len(nos)
+                return _ok({'requestedCount': len(nos)})
+            return 'naver:bulk_update', False, respond
+
+        return None, False, None
+
+    def _elevenst(self, method: str, path: str, query: Dict, body: bytes):
+        data = self.data
+        path = path[len('/11st'):]
+
+        if path == '/rest/prodmarketservice/prodmarket' and method == 'POST':
+            text = body.decode('euc-kr', errors='ignore')
+
+            def respond():
+                limit = int(_xml_value(text, 'limit') or 100)
+                start = int(_xml_value(text, 'start') or 1)
+                end = min(start - 1 + limit, data.config.products)
+                parts = ['<?xml version="1.0" encoding="euc-kr" standalone="yes"?>',
+                         '<ns2:products xmlns:ns2="http://skt.tmall.business.openapi.spring.service.client.domain/">']
+                for i in range(start - 1, end):
+                    parts.append(f"<ns2:product><prdNo>{data.elevenst_prd_no(i)}</prdNo>"
+                                 f"<prdNm>{data.product_name(i)}</prdNm><selStatCd>103</selStatCd></ns2:product>")
+                parts.append('</ns2:products>')
+                return 200, 'text/xml;charset=euc-kr', "\n".join(parts).encode('euc-kr', errors='ignore')
+            return '11st:prodmarket', False, respond
+
+        m = re.match(r'^/rest/prodstatservice/stat/(stopdisplay|startdisplay)/(\d+)$', path)
+        if m and method == 'PUT':
+            def respond():
+                with data._lock:
+                    data.display_changes += 1
+                xml = ('<?xml version="1.0" encoding="euc-kr" standalone="yes"?>'
+                       '<ClientMessage><resultCode>200</resultCode>'
+                       f"<message>{'전시중지' if m.group(1) == 'stopdisplay' else '전시재개'} 처리되었습니다.</message>"
+                       f"<productNo>{m.group(2)}</productNo></ClientMessage>")
+                return 200, 'text/xml;charset=euc-kr', xml.encode('euc-kr')
+            return f"11st:{m.group(1)}", False, respond
+
+        return None, False, None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive (실제 클라이언트 연결 재사용과 동일하게)
+
+            def _handle(self):
+                started = time.perf_counter()
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                try:
+                    route, status, content_type, payload = server.dispatch(
+                        self.command, parsed.path, parse_qs(parsed.query), body)
+                except Exception as e:
+                    route, status, content_type, payload = 'exception', 500, 'application/json', \
+                        _json_bytes({'error': str(e)})
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 429:
+                    self.send_header('Retry-After', '1')
+                self.end_headers()
+                self.wfile.write(payload)
+                if not route.startswith('__'):
+                    server._record(route, status, time.perf_counter() - started)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _json_bytes(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_body(body: bytes) -> Dict:
+    try:
+        result = json.loads(body.decode('utf-8')) if body else {}
+        return result if isinstance(result, dict) else {}
+    except ValueError:
+        return {}
+
+
+def _ok(obj) -> Tuple[int, str, bytes]:
+    return 200, 'application/json', _json_bytes(obj)
+
+
+def _error(status: int, message: str) -> Tuple[int, str, bytes]:
+    return status, 'application/json', _json_bytes({'error': message})
+
+
+def _xml_value(text: str, tag: str) -> Optional[str]:
+    m = re.search(rf'<{tag}>\s*([^<]*?)\s*</{tag}>', text)
+    return m.group(1) if m else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='불사자/네이버/11번가 목 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=50, help='평균 지연 (ms)')
+    parser.add_argument('--jitter', type=float, default=20, help='지연 표준편차 (ms)')
+    parser.add_argument('--upload-latency', type=float, default=0, help='마켓 업로드 평균 지연 (ms, 0=latency)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503 응답 비율 (0~1)')
+    parser.add_argument('--rate-limit', type=float, default=0, help='서비스별 초당 요청 수 (0=제한 없음)')
+    parser.add_argument('--products', type=int, default=500, help='상품 수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    config = MockConfig(latency_ms=args.latency, jitter_ms=args.jitter, upload_latency_ms=args.upload_latency,
+                        error_rate=args.error_rate, rate_limit=args.rate_limit,
+                        products=args.products, seed=args.seed)
+    server = MockMarketServer(config, args.host, args.port)
+    print(f"[MOCK] 목 서버 시작: {server.base_url}")
+    for key, value in server.env().items():
+        print(f"  {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -39,13 +39,19 @@ except ImportError:
 # 불사자 API 클라이언트
 from bulsaja_common import BulsajaAPIClient
 
+# 텍스트 사전 판별 (글자 흔적 없는 이미지는 OCR 생략)
+if CV2_AVAILABLE:
+    from thumbnail_analyzer import may_have_text
+
 
 class OCRTester:
     """OCR 테스트 클래스"""
 
-    def __init__(self, output_dir: str = "ocr_output"):
+    def __init__(self, output_dir: str = "ocr_output", prefilter: bool = True):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prefilter = prefilter and CV2_AVAILABLE
+        self.prefilter_skipped = 0
 
         # EasyOCR 리더 (중국어 간체 + 영어)
         if EASYOCR_AVAILABLE:
@@ -80,6 +86,13 @@ class OCRTester:
         if not self.reader:
             return []
 
+        if self.prefilter:
+            img = cv2.imread(image_path)
+            if img is not None and not may_have_text(img):
+                print("  [SKIP] 사전 판별: 텍스트 없음 (OCR 생략)")
+                self.prefilter_skipped += 1
+                return []
+
         try:
             # EasyOCR로 텍스트 감지
             results = self.reader.readtext(image_path)
@@ -336,6 +349,8 @@ def main():
     print("=" * 60)
     print(f"분석 이미지: {len(results)}개")
     print(f"총 감지 텍스트: {total_texts}개")
+    if tester.prefilter_skipped:
+        print(f"OCR 생략 (사전 판별): {tester.prefilter_skipped}개")
     print(f"출력 폴더: {output_dir}")
     print("\n출력 파일:")
     print("  - *_original.jpg : 원본 이미지")
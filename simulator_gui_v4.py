@@ -76,15 +76,16 @@ from PyQt6.QtGui import QPixmap, QImage, QFont, QColor, QPainter
 try:
     from bulsaja_common import (
         BulsajaAPIClient, extract_tokens_from_browser,
-        filter_bait_options, select_main_option,
+        filter_bait_options, select_main_option, prefetch_image_hashes,
         load_bait_keywords, save_bait_keywords,
         load_banned_words, load_excluded_words, check_product_safety,
         load_category_risk_settings, save_category_risk_settings,
         DEFAULT_CATEGORY_RISK_SETTINGS, get_category_risk_level,
         MARKET_IDS, DEFAULT_BAIT_KEYWORDS,
-        analyze_products_for_ip, verify_ip_words_with_ai,  # 지재권 분석
+        analyze_products_for_ip, verify_ip_words_with_ai, preload_morpheme_analyzer,  # 지재권 분석
         check_product_name_suspicious, batch_check_product_names,  # 상품명 검수
-        load_ai_config, save_ai_config, DEFAULT_AI_CONFIG  # AI 설정
+        load_ai_config, save_ai_config, DEFAULT_AI_CONFIG,  # AI 설정
+        get_image_cache, get_image_cache_stats  # 이미지 디스크 캐시
     )
     BULSAJA_API_AVAILABLE = True
 except ImportError:
@@ -247,17 +248,25 @@ class ImageDownloadWorker(QRunnable):
                 self.signals.finished.emit(self.product_id, cached)
                 return
 
-            # HTTP 요청 (헤더 필수 - CDN 차단 방지)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Referer': 'https://www.bulsaja.com/'
-            }
-            req = Request(self.url, headers=headers)
-            with urlopen(req, timeout=10) as response:
-                data = response.read()
+            # 공유 디스크 캐시 (요청 크기 이상인 가장 작은 렌디션 → 큰 원본 디코딩 생략)
+            image = QImage()
+            if BULSAJA_API_AVAILABLE:
+                path = get_image_cache().get_file(self.url, min_side=max(cache_size))
+                if not path:
+                    raise ValueError("이미지 다운로드 실패")
+                with open(path, 'rb') as f:
+                    data = f.read()
+            else:
+                # HTTP 요청 (헤더 필수 - CDN 차단 방지)
+                headers = {
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                    'Referer': 'https://www.bulsaja.com/'
+                }
+                req = Request(self.url, headers=headers)
+                with urlopen(req, timeout=10) as response:
+                    data = response.read()
 
             # QImage 로드
-            image = QImage()
             if not image.loadFromData(data):
                 raise ValueError("이미지 로드 실패")
 
@@ -299,6 +308,7 @@ class CollectWorker(QThread):
         self.api_client = api_client
         self.groups = groups
         self.settings = settings
+        self.image_hash_match = settings.get('image_hash_match', False)  # 썸네일 이미지 해시 매칭
         self.is_running = True
 
     def stop(self):
@@ -327,57 +337,77 @@ class CollectWorker(QThread):
                     max_products = self.settings.get('max_products', 0)
                     status_filters = self.settings.get('status_filters')
 
-                    # 0이면 전체 조회 (100000개까지)
-                    limit = max_products if max_products > 0 else 100000
+                    # 0이면 전체 조회
+                    max_rows = max_products if max_products > 0 else None
 
-                    products, total = self.api_client.get_products_by_group(
-                        group_name, 0, limit, status_filters
-                    )
+                    # 카테고리 수집 옵션
+                    fetch_category = self.settings.get('fetch_category', False)
 
-                    if products:
-                        # 카테고리 수집 옵션
-                        fetch_category = self.settings.get('fetch_category', False)
+                    # 페이지 단위로 받으면서 바로 검수 (다음 페이지는 백그라운드로 미리 받음)
+                    group_products = []
+                    for products, total in self.api_client.iter_products_by_group(
+                        group_name, page_size=500, max_rows=max_rows, status_filters=status_filters
+                    ):
+                        if not self.is_running:
+                            break
 
                         if fetch_category:
-                            self.log.emit(f"   📂 카테고리 수집 중... ({len(products)}개)")
+                            self.log.emit(f"   📂 카테고리 수집 중... ({len(group_products) + len(products)}/{total}개)")
 
-                        # 각 상품 검수 처리
-                        for i, p in enumerate(products):
+                        for p in products:
                             p['group_name'] = group_name
 
-                            # 상품 상세에서 카테고리/옵션 정보 가져오기 (get_product_detail 사용)
-                            if fetch_category:
-                                try:
-                                    prod_id = p.get('ID', '') or p.get('id', '')
-                                    product_detail = self.api_client.get_product_detail(prod_id)
-                                    if product_detail:
-                                        # 카테고리 (항상 덮어쓰기)
-                                        p['uploadCategory'] = product_detail.get('uploadCategory', {})
-                                        # 썸네일 (항상 덮어쓰기 - 상세 API가 더 정확)
-                                        p['uploadThumbnails'] = product_detail.get('uploadThumbnails', [])
-                                        # SKU (항상 덮어쓰기 - 옵션 이미지에 필수!)
-                                        p['uploadSkus'] = product_detail.get('uploadSkus', [])
-                                        # SKU 속성
-                                        p['uploadSkuProps'] = product_detail.get('uploadSkuProps', {})
-                                        # 가격 정보
-                                        p['uploadCommonSalePrice'] = product_detail.get('uploadCommonSalePrice', 0)
-                                        # 추가 정보
-                                        p['uploadCommonProductName'] = product_detail.get('uploadCommonProductName', p.get('uploadCommonProductName', ''))
-                                        p['uploadCommonTags'] = product_detail.get('uploadCommonTags', [])
-                                        p['base_price'] = product_detail.get('base_price', {})
-                                    # 10개마다 진행 로그
-                                    if (i + 1) % 10 == 0:
-                                        self.log.emit(f"      {i + 1}/{len(products)} 상세 조회...")
-                                except Exception as uf_e:
+                        # 상품 상세에서 카테고리/옵션 정보 가져오기 (동시 조회, 끝나는 순서대로 반영)
+                        if fetch_category:
+                            products_by_id = {(p.get('ID', '') or p.get('id', '')): p for p in products}
+                            done = 0
+                            for prod_id, product_detail, error in self.api_client.get_product_details_bulk(
+                                list(products_by_id.keys()), concurrency=8
+                            ):
+                                done += 1
+                                p = products_by_id[prod_id]
+                                if error:
                                     self.log.emit(f"      ⚠️ {prod_id[:10]}... 상세 조회 실패")
-
+                                elif product_detail:
+                                    # 카테고리 (항상 덮어쓰기)
+                                    p['uploadCategory'] = product_detail.get('uploadCategory', {})
+                                    # 썸네일 (항상 덮어쓰기 - 상세 API가 더 정확)
+                                    p['uploadThumbnails'] = product_detail.get('uploadThumbnails', [])
+                                    # SKU (항상 덮어쓰기 - 옵션 이미지에 필수!)
+                                    p['uploadSkus'] = product_detail.get('uploadSkus', [])
+                                    # SKU 속성
+                                    p['uploadSkuProps'] = product_detail.get('uploadSkuProps', {})
+                                    # 가격 정보
+                                    p['uploadCommonSalePrice'] = product_detail.get('uploadCommonSalePrice', 0)
+                                    # 추가 정보
+                                    p['uploadCommonProductName'] = product_detail.get('uploadCommonProductName', p.get('uploadCommonProductName', ''))
+                                    p['uploadCommonTags'] = product_detail.get('uploadCommonTags', [])
+                                    p['base_price'] = product_detail.get('base_price', {})
+                                # 50개마다 진행 로그
+                                if done % 50 == 0:
+                                    self.log.emit(f"      {len(group_products) + done}/{total} 상세 조회...")
+
+                        # 썸네일/옵션 이미지 해시 일괄 준비 (스레드풀, 캐시된 이미지는 다운로드 안 함)
+                        if self.image_hash_match and BULSAJA_API_AVAILABLE:
+                            image_urls = []
+                            for p in products:
+                                thumbs = p.get('uploadThumbnails', []) or []
+                                if thumbs:
+                                    image_urls.append(thumbs[0])
+                                    image_urls.extend(s.get('urlRef') or s.get('image') or '' for s in (p.get('uploadSkus', []) or []))
+                            prefetch_image_hashes(image_urls, log_callback=self.log.emit)
+
+                        for p in products:
                             self._inspect_product(p, bait_keywords, excluded_words, check_level, option_count)
-                        all_products.extend(products)
+                        group_products.extend(products)
+
+                    if group_products:
+                        all_products.extend(group_products)
 
                         # 안전/위험 카운트
-                        safe_count = sum(1 for p in products if p.get('is_safe', True))
-                        unsafe_count = len(products) - safe_count
-                        self.log.emit(f"   ✅ {len(products)}개 수집 (안전:{safe_count} 위험:{unsafe_count})")
+                        safe_count = sum(1 for p in group_products if p.get('is_safe', True))
+                        unsafe_count = len(group_products) - safe_count
+                        self.log.emit(f"   ✅ {len(group_products)}개 수집 (안전:{safe_count} 위험:{unsafe_count})")
                     else:
                         self.log.emit(f"   ⏭️ 상품 없음")
 
@@ -510,7 +540,11 @@ class CollectWorker(QThread):
 
                 # 대표옵션 선택 (이미지 있는 최저가)
                 if valid_skus:
-                    main_idx, main_method = select_main_option(product_name, valid_skus)
+                    main_idx, main_method = select_main_option(
+                        product_name, valid_skus,
+                        thumbnails=thumbnails if self.image_hash_match else None,
+                        use_image_hash=self.image_hash_match
+                    )
                     main_sku = valid_skus[main_idx]
 
                     product['main_option_name'] = main_sku.get('text_ko', '') or main_sku.get('optionName', '')
@@ -650,6 +684,10 @@ class SimulatorGUIv4(QMainWindow):
         # 설정 로드
         self.config = load_config()
 
+        # 형태소 분석기(Kiwi) 백그라운드 로드 (첫 검수 대기 제거)
+        if BULSAJA_API_AVAILABLE:
+            preload_morpheme_analyzer()
+
         self._build_ui()
 
     def _build_ui(self):
@@ -866,6 +904,12 @@ class SimulatorGUIv4(QMainWindow):
         self.fetch_category_check.setToolTip("uploadCategory 정보 수집 (카테고리별 위험도 판단에 필요)")
         inspect_layout.addWidget(self.fetch_category_check)
 
+        # 대표옵션 이미지 해시 매칭
+        self.image_hash_check = QCheckBox("썸네일 이미지 매칭")
+        self.image_hash_check.setChecked(False)
+        self.image_hash_check.setToolTip("대표 썸네일과 그림이 같은 옵션을 대표옵션으로 선택\n(URL이 달라도 이미지 해시로 비교, 해시는 캐시에 저장)")
+        inspect_layout.addWidget(self.image_hash_check)
+
         inspect_layout.addStretch()
         scroll_layout.addWidget(inspect_group)
 
@@ -1511,6 +1555,7 @@ class SimulatorGUIv4(QMainWindow):
             'check_level': check_level,
             'option_count': self.option_count_spin.value(),
             'fetch_category': self.fetch_category_check.isChecked(),  # 카테고리 수집
+            'image_hash_match': self.image_hash_check.isChecked(),  # 썸네일 이미지 매칭
         }
 
         max_p = self.max_products_spin.value()
@@ -2963,72 +3008,65 @@ ID: {product.get('ID', '')}
             QMessageBox.warning(self, "경고", "분석할 상품이 없습니다.")
             return
 
-        self._log(f"🔍 썸네일 분석 시작: {len(products_to_analyze)}개 상품 (멀티스레드)")
+        self._log(f"🔍 썸네일 분석 시작: {len(products_to_analyze)}개 상품 (다운로드/OCR 병렬)")
         self.thumbnail_analysis_btn.setEnabled(False)
         self.thumbnail_analysis_btn.setText("분석중...")
         QApplication.processEvents()
 
-        # 멀티스레드 분석 함수
-        def analyze_single_product(product):
-            """단일 상품 썸네일 분석"""
-            try:
-                analyzer = ThumbnailAnalyzer()
-                thumbnails = product.get('all_thumbnails', []) or product.get('uploadThumbnails', []) or []
-
-                if not thumbnails or len(thumbnails) < 2:
-                    return None
-
-                best_idx, best_score, action = analyzer.get_best_thumbnail(thumbnails)
-                return {
-                    'product': product,
-                    'best_idx': best_idx,
-                    'best_score': best_score,
-                    'thumbnails': thumbnails
-                }
-            except Exception as e:
-                return None
+        # 상품별 썸네일 목록 (2개 미만은 고를 게 없음)
+        thumbnails_by_key = {}
+        for i, product in enumerate(products_to_analyze):
+            thumbnails = product.get('all_thumbnails', []) or product.get('uploadThumbnails', []) or []
+            if len(thumbnails) >= 2:
+                thumbnails_by_key[i] = thumbnails
 
-        # 멀티스레드로 병렬 분석 (최대 4개 동시)
+        # 전체 썸네일을 한 번에 분석 (상품 경계 없이 배치 OCR), 상품이 끝나는 대로 적용
         changed_count = 0
         analyzed_count = 0
+        analyzer = ThumbnailAnalyzer(verbose=False)
+        image_cache_before = get_image_cache_stats()
 
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {executor.submit(analyze_single_product, p): p for p in products_to_analyze}
-
-            for future in futures:
-                result = future.result()
-                if result:
-                    analyzed_count += 1
-                    product = result['product']
-                    best_idx = result['best_idx']
-                    best_score = result['best_score']
-                    thumbnails = result['thumbnails']
-
-                    # 최고 점수 썸네일을 메인으로 자동 설정
-                    if best_idx != 0 and best_idx < len(thumbnails):
-                        # 썸네일 순서 변경 (best를 맨 앞으로)
-                        new_thumbnails = [thumbnails[best_idx]] + [t for i, t in enumerate(thumbnails) if i != best_idx]
-                        product['uploadThumbnails'] = new_thumbnails
-                        product['all_thumbnails'] = new_thumbnails
-                        product['uploadCommonThumbnail'] = new_thumbnails[0]
-                        product['thumbnail_url'] = new_thumbnails[0]
-                        changed_count += 1
-
-                        self._log(f"  ✅ {product.get('uploadCommonProductName', '')[:25]}... #{best_idx+1}→#1 (점수:{best_score.total_score if best_score else 0})")
-                    else:
-                        self._log(f"  ⏭️ {product.get('uploadCommonProductName', '')[:25]}... 이미 최적")
+        try:
+            for key, results in analyzer.analyze_products(thumbnails_by_key):
+                QApplication.processEvents()
+                best_idx, best_score, action = analyzer.pick_best(results)
+                if not best_score:
+                    continue
+                analyzed_count += 1
+                product = products_to_analyze[key]
+                thumbnails = thumbnails_by_key[key]
+
+                # 최고 점수 썸네일을 메인으로 자동 설정
+                if best_idx != 0 and best_idx < len(thumbnails):
+                    # 썸네일 순서 변경 (best를 맨 앞으로)
+                    new_thumbnails = [thumbnails[best_idx]] + [t for i, t in enumerate(thumbnails) if i != best_idx]
+                    product['uploadThumbnails'] = new_thumbnails
+                    product['all_thumbnails'] = new_thumbnails
+                    product['uploadCommonThumbnail'] = new_thumbnails[0]
+                    product['thumbnail_url'] = new_thumbnails[0]
+                    changed_count += 1
+
+                    self._log(f"  ✅ {product.get('uploadCommonProductName', '')[:25]}... #{best_idx+1}→#1 (점수:{best_score.total_score})")
+                else:
+                    self._log(f"  ⏭️ {product.get('uploadCommonProductName', '')[:25]}... 이미 최적")
 
-                    # 분석 결과 저장
-                    product['_thumbnail_analysis'] = {
-                        'total_score': best_score.total_score if best_score else 0,
-                        'is_nukki': best_score.is_nukki if best_score else False,
-                        'recommendation': best_score.recommendation if best_score else 'unknown'
-                    }
+                # 분석 결과 저장
+                product['_thumbnail_analysis'] = {
+                    'total_score': best_score.total_score,
+                    'is_nukki': best_score.is_nukki,
+                    'recommendation': best_score.recommendation
+                }
+        except Exception as e:
+            self._log(f"❌ 썸네일 분석 오류: {e}")
 
         self.thumbnail_analysis_btn.setEnabled(True)
         self.thumbnail_analysis_btn.setText("🔍 썸네일자동선택")
 
         self._log(f"✅ 분석 완료: {analyzed_count}개 분석, {changed_count}개 변경")
+        image_stats = {k: v - image_cache_before.get(k, 0) for k, v in get_image_cache_stats().items()}
+        if image_stats['hit'] + image_stats['miss']:
+            self._log(f"♻️ 이미지 캐시: 디스크 {image_stats['hit'] + image_stats['revalidated']} "
+                      f"/ 다운로드 {image_stats['miss'] + image_stats['changed']}")
 
         # 테이블 새로고침 (변경된 썸네일 반영)
         if changed_count > 0:
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""테스트 공용 설정 - 저장소 루트 모듈(bulsaja_common 등) import 경로 + 목 서버 픽스처"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mock_market_server import MockConfig, MockMarketServer
+
+
+@pytest.fixture
+def mock_server():
+    """지연/오류 없는 목 서버 (상품 8개)"""
+    server = MockMarketServer(MockConfig(latency_ms=0, jitter_ms=0, products=8))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def api_client(mock_server):
+    """목 서버를 향하는 실제 BulsajaAPIClient"""
+    from bulsaja_common import BulsajaAPIClient
+    client = BulsajaAPIClient("mock-access", "mock-refresh")
+    client.BASE_URL = f"{mock_server.base_url}/api"
+    return client
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """저널/캐시 파일은 임시 폴더에 생성"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""업로드 데몬 세션 → CLIUploader → BulsajaAPIClient 전체 경로 (목 서버)"""
+
+from bulsaja_upload_daemon import UploadDaemon
+
+
+def _run_session(daemon: UploadDaemon, group: str, config: dict) -> dict:
+    response = daemon.handle({'cmd': 'start', 'group': group, 'config': config})
+    assert response['ok'], response
+    session = daemon.sessions[response['session']]
+    session.thread.join(30)
+    assert not session.thread.is_alive()
+    return daemon.status(response['session'], log_lines=50)[0]
+
+
+def test_daemon_session_uploads_group_products(mock_server, api_client):
+    config = {'access_token': "mock-access", 'refresh_token': "mock-refresh",
+              'market_name': "스마트스토어", 'upload_count': 5, 'upload_delay': 0}
+    daemon = UploadDaemon(port=0)
+    daemon._clients[("mock-access", "mock-refresh")] = api_client
+
+    status = _run_session(daemon, mock_server.data.group_names[0], config)
+
+    assert status['state'] == "done", status.get('logs')
+    assert status['stats']['total'] == 5
+    assert status['stats']['success'] == 5
+    assert status['stats']['failed'] == 0
+    assert mock_server.data.uploads.get('SMARTSTORE') == 5
+
+
+
+def test_daemon_session_resumes_from_journal(mock_server, api_client):
+    """중지된 세션을 다시 시작하면 끝난 상품은 건너뜀"""
+    config = {'access_token': "mock-access", 'refresh_token': "mock-refresh",
+              'market_name': "스마트스토어", 'upload_count': 5, 'upload_delay': 0}
+    daemon = UploadDaemon(port=0)
+    daemon._clients[("mock-access", "mock-refresh")] = api_client
+    group = mock_server.data.group_names[0]
+
+    # 2개 업로드 후 중지
+    uploaded = []
+    original = api_client.upload_product
+
+    def upload_then_stop(product_id, market_name="스마트스토어"):
+        result = original(product_id, market_name)
+        uploaded.append(product_id)
+        if len(uploaded) == 2:
+            daemon.stop_session()
+        return result
+
+    api_client.upload_product = upload_then_stop
+    first = _run_session(daemon, group, config)
+    assert first['state'] == "stopped"
+    assert first['stats']['success'] == 2
+
+    api_client.upload_product = original
+    second = _run_session(daemon, group, config)
+    assert second['state'] == "done", second.get('logs')
+    assert second['stats']['skipped'] == 2
+    assert second['stats']['success'] == 3
+    assert mock_server.data.uploads.get('SMARTSTORE') == 5
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""작업 큐 워커 - 청크 가져오기 → 업로드 → 성공 보고 (서버 큐는 UploadWorkQueue 직접 사용, 불사자 API는 목 서버)"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("websockets")   # bulsaja_uploader_server import 조건
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "web_system" / "modules"))
+
+from bulsaja_uploader_server import ServerConnectedUploader
+from upload_queue import UploadWorkQueue
+
+
+def _make_worker(queue: UploadWorkQueue, api_client) -> ServerConnectedUploader:
+    uploader = ServerConnectedUploader("http://queue.invalid", "pc1",
+                                       {'market_name': "스마트스토어", 'upload_delay': 0})
+    uploader.api = api_client
+
+    def queue_post(path: str, payload: dict):
+        # 서버 /api/upload-queue/* 대신 큐 객체 직접 호출
+        if path == 'claim':
+            return {'chunk': queue.claim(payload['client_id'])}
+        if path == 'heartbeat':
+            return queue.heartbeat(payload['client_id'], payload['chunk_id'], payload.get('done'))
+        if path == 'complete':
+            return queue.complete(payload['client_id'], payload['chunk_id'], payload.get('done'))
+        raise AssertionError(path)
+
+    uploader._queue_post = queue_post
+    return uploader
+
+
+def test_claimed_chunk_reports_successes(mock_server, api_client):
+    queue = UploadWorkQueue()
+    data = mock_server.data
+    product_ids = [data.product_id(i) for i in range(6)]
+    job = queue.create_job(data.group_names[0], product_ids, market_name="스마트스토어", chunk_size=6)
+    uploader = _make_worker(queue, api_client)
+
+    chunk = queue.claim(uploader.client_id)
+    results = uploader.process_chunk(chunk)
+
+    assert results == {pid: 'success' for pid in product_ids}
+    summary = queue.status(job['job_id'])[0]
+    assert summary['finished']
+    assert summary['success'] == 6
+    assert summary['failed'] == 0
+    assert data.uploads.get('SMARTSTORE') == 6
+
+
+def test_failed_upload_is_reported_as_failed(mock_server, api_client):
+    """목 서버에 없는 상품 → 업로드 실패로 보고 (나머지는 성공)"""
+    queue = UploadWorkQueue()
+    data = mock_server.data
+    product_ids = [data.product_id(0), "U01MOCK99999999", data.product_id(1)]
+    job = queue.create_job(data.group_names[0], product_ids, market_name="스마트스토어")
+    uploader = _make_worker(queue, api_client)
+
+    results = uploader.process_chunk(queue.claim(uploader.client_id))
+
+    assert results[data.product_id(0)] == 'success'
+    assert results[data.product_id(1)] == 'success'
+    assert results["U01MOCK99999999"] == 'failed'
+    summary = queue.status(job['job_id'])[0]
+    assert summary['success'] == 2 and summary['failed'] == 1
@@ -4,18 +4,26 @@
 - 누끼 감지 (배경 분석)
 - 중국어 텍스트 감지 (OCR)
 - 점수 기반 최적 썸네일 선택
+- 대량 분석: 다운로드 스레드 + OCR 프로세스 풀 (워커당 모델 1회 로딩, 축소 이미지 배치 OCR)
+- 텍스트 사전 판별: 글자 줄/글자 배열이 안 보이는 이미지는 OCR 생략
 
 사용법:
     python thumbnail_analyzer.py U01KF9YZQN29TCSFKVX11CQ2FQ7
+    python thumbnail_analyzer.py --eval-prefilter ocr_test/ocr_output   # 사전 판별 정확도 (OCR 판정 기준)
 """
 
 import os
 import sys
 import json
-import requests
+import time
+import queue
+import atexit
+import threading
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator, Iterable
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import tempfile
 
 try:
@@ -36,7 +44,18 @@ except ImportError:
 
 # 불사자 API 클라이언트
 sys.path.insert(0, str(Path(__file__).parent))
-from bulsaja_common import BulsajaAPIClient
+from bulsaja_common import BulsajaAPIClient, get_image_cache
+
+# 대량 분석 설정
+DOWNLOAD_WORKERS = 16                                # 동시 다운로드 수
+OCR_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # OCR 프로세스 수 (워커마다 모델 ~수백MB)
+OCR_BATCH_SIZE = 8                                   # readtext_batched 1회당 이미지 수
+OCR_MAX_SIDE = 640                                   # OCR 입력 긴 변 (썸네일 800~1000px → 축소해도 글자 인식 충분)
+OCR_MIN_CONFIDENCE = 0.3                             # 이 신뢰도 이상인 텍스트만 카운트
+
+# 텍스트 사전 판별 (OCR 전 단계, 이미지당 ~10ms)
+TEXT_PREFILTER_SIDE = 480                            # 판별용 축소 이미지 긴 변
+TEXT_PREFILTER_MIN_CHARS = 3                         # 한 줄로 늘어선 글자 후보가 이 수 이상이면 텍스트 의심
 
 
 @dataclass
@@ -54,12 +73,236 @@ class ThumbnailScore:
     recommendation: str  # "best", "good", "needs_nukki", "needs_translate", "poor"
 
 
+def text_verdict(text_count: int) -> Tuple[bool, int, int]:
+    """텍스트 수 → (has_text, text_count, score)"""
+    if text_count == 0:
+        # 텍스트 없음 → 좋음
+        return False, 0, 30
+    elif text_count <= 2:
+        # 텍스트 적음 → 약간 감점
+        return True, text_count, 10
+    elif text_count <= 5:
+        # 텍스트 보통 → 감점
+        return True, text_count, -10
+    else:
+        # 텍스트 많음 → 큰 감점
+        return True, text_count, -30
+
+
+def make_score(url: str, index: int, is_nukki: bool, nukki_score: int,
+               text: Tuple[bool, int, int], center_score: int) -> ThumbnailScore:
+    """개별 검사 결과 → 총점 + 추천 등급"""
+    has_text, text_count, text_score = text
+    total_score = nukki_score + text_score + center_score
+
+    if is_nukki and not has_text:
+        recommendation = "best"  # 누끼 + 텍스트 없음 = 최고
+    elif is_nukki and has_text:
+        recommendation = "needs_translate"  # 누끼 + 텍스트 = 번역 필요
+    elif not is_nukki and not has_text:
+        recommendation = "needs_nukki"  # 배경 있음 + 텍스트 없음 = 누끼 제거 필요
+    elif not is_nukki and has_text and text_count <= 3:
+        recommendation = "needs_both"  # 둘 다 필요
+    else:
+        recommendation = "poor"  # 복잡함
+
+    return ThumbnailScore(
+        url=url, index=index, total_score=total_score,
+        is_nukki=is_nukki, nukki_score=nukki_score,
+        has_text=has_text, text_count=text_count, text_score=text_score,
+        center_score=center_score, recommendation=recommendation
+    )
+
+
+def error_score(url: str, index: int) -> ThumbnailScore:
+    return ThumbnailScore(
+        url=url, index=index, total_score=-100,
+        is_nukki=False, nukki_score=0,
+        has_text=False, text_count=0, text_score=0,
+        center_score=0, recommendation="error"
+    )
+
+
+def prepare_ocr_input(img: np.ndarray, side: int = OCR_MAX_SIDE) -> np.ndarray:
+    """
+    OCR 입력 준비: BGR → RGB, 긴 변 side로 축소 후 흰색 여백으로 정사각형 맞춤
+    (크기가 같아야 readtext_batched로 묶을 수 있음, 비율 유지해서 글자 왜곡 없음)
+    """
+    h, w = img.shape[:2]
+    scale = min(1.0, side / max(h, w))
+    if scale < 1.0:
+        img = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    h, w = img.shape[:2]
+    canvas = np.full((side, side, 3), 255, dtype=np.uint8)
+    canvas[:h, :w] = img
+    return cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB)
+
+
+# ==================== 텍스트 사전 판별 ====================
+# 확실히 글자가 없는 이미지만 걸러내고, 애매하면 OCR로 보냄 (놓치는 것보다 OCR 한 번 더 하는 게 나음)
+# - 글자 줄: 밝기 변화(그래디언트)를 가로로 이은 영역 중 글자 줄 모양(가로로 길고, 획이 반복)
+# - 글자 배열: 높이가 비슷한 작은 덩어리가 같은 줄에 3개 이상 (그래디언트 + 적응 이진화 양쪽 극성)
+
+
+def _aligned_char_count(binary: np.ndarray) -> int:
+    """이진 이미지에서 같은 줄에 양옆 이웃이 있는 글자 후보 수"""
+    H = binary.shape[0]
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    x, y, w, h, area = stats[1:].T.astype(float)
+    fill = area / np.maximum(w * h, 1)
+    keep = (h >= 6) & (h <= H * 0.15) & (w >= 2) & (w <= h * 2) & (fill >= 0.15) & (fill <= 0.9)
+    x, y, w, h = x[keep], y[keep], w[keep], h[keep]
+    if len(x) < 3 or len(x) > 3000:   # 후보가 너무 많으면 질감(노이즈) → 글자 배열로 안 봄
+        return 0
+    cx, cy = x + w / 2, y + h / 2
+    min_h = np.minimum(h[:, None], h[None, :])
+    gap = np.abs(cx[:, None] - cx[None, :]) - (w[:, None] + w[None, :]) / 2
+    neighbor = ((np.maximum(h[:, None], h[None, :]) / min_h < 1.5)      # 높이 비슷
+                & (np.abs(cy[:, None] - cy[None, :]) < min_h * 0.35)   # 같은 줄
+                & (gap < min_h * 1.5))                                 # 글자 간격
+    np.fill_diagonal(neighbor, False)
+    return int((neighbor.sum(axis=1) >= 2).sum())
+
+
+def _text_line_count(gray: np.ndarray, edges: np.ndarray) -> int:
+    """그래디언트 영역 중 글자 줄 모양 수"""
+    H, W = gray.shape
+    closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, W // 60), 1)))
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    count = 0
+    for contour in contours:
+        x, y, cw, ch = cv2.boundingRect(contour)
+        if ch < 5 or ch > H * 0.1 or cw < ch * 2 or cw < W * 0.04:
+            continue
+        fill = cv2.countNonZero(edges[y:y + ch, x:x + cw]) / (cw * ch)
+        if not 0.25 <= fill <= 0.9:
+            continue
+        # 획 반복: 박스 안을 이진화해서 가로 방향 명암 전환 수 (민짜 막대/테두리 제외)
+        _, ink = cv2.threshold(gray[y:y + ch, x:x + cw], 0, 1, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        transitions = max(np.count_nonzero(np.diff(ink[r])) for r in (ch // 3, ch // 2, 2 * ch // 3))
+        if transitions / (cw / ch) >= 1.5:
+            count += 1
+    return count
+
+
+def text_presence(img: np.ndarray) -> Tuple[int, int]:
+    """
+    텍스트 흔적 측정 (OCR 없이)
+
+    Returns:
+        (글자 줄 수, 줄로 늘어선 글자 후보 수)
+    """
+    h, w = img.shape[:2]
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    scale = TEXT_PREFILTER_SIDE / max(h, w)
+    if scale < 1.0:
+        gray = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    _, edges = cv2.threshold(gradient, max(otsu, 50), 255, cv2.THRESH_BINARY)  # 하한: 배경 노이즈 무시
+
+    chars = _aligned_char_count(edges)
+    if chars < TEXT_PREFILTER_MIN_CHARS:
+        # 글자가 물체 윤곽에 붙어 있으면 그래디언트로는 분리 안 됨 → 밝기 이진화로 한 번 더 (어두운/밝은 글자)
+        for mode in (cv2.THRESH_BINARY_INV, cv2.THRESH_BINARY):
+            binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, mode, 15, 12)
+            chars = max(chars, _aligned_char_count(binary))
+    return _text_line_count(gray, edges), chars
+
+
+def may_have_text(img: np.ndarray) -> bool:
+    """False = 텍스트 없음 확실 (OCR 생략), True = OCR로 확인 필요"""
+    lines, chars = text_presence(img)
+    return lines > 0 or chars >= TEXT_PREFILTER_MIN_CHARS
+
+
+# ==================== OCR 프로세스 풀 ====================
+# 워커 프로세스마다 easyocr 모델을 1번만 로딩 → 배치 단위로 readtext
+# (easyocr는 GIL/torch 스레드 때문에 스레드로는 병렬이 안 됨)
+
+_worker_reader = None
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _ocr_worker_init(torch_threads: int):
+    global _worker_reader
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)  # 워커끼리 코어 나눠 쓰기 (과다 구독 방지)
+    except ImportError:
+        pass
+    _worker_reader = easyocr.Reader(['ch_sim', 'en'], gpu=False, verbose=False)
+
+
+def _count_texts(results) -> int:
+    return sum(1 for r in results if r[2] >= OCR_MIN_CONFIDENCE)
+
+
+def _ocr_worker_batch(images: List[np.ndarray]) -> List[int]:
+    """워커: 같은 크기 이미지 묶음 → 이미지별 텍스트 수"""
+    try:
+        batched = _worker_reader.readtext_batched(images, batch_size=len(images))
+        return [_count_texts(results) for results in batched]
+    except Exception:
+        # 배치 실패 시 1장씩 (한 장 때문에 묶음 전체를 잃지 않도록)
+        counts = []
+        for img in images:
+            try:
+                counts.append(_count_texts(_worker_reader.readtext(img)))
+            except Exception:
+                counts.append(-1)
+        return counts
+
+
+def get_ocr_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    공유 OCR 프로세스 풀 (프로세스 전체에 1개, 분석기 여러 개가 같은 워커 사용)
+
+    첫 호출 시 OCR_WORKERS개로 생성 → 크기를 바꾸려면 첫 분석 전에 OCR_WORKERS를 설정하거나
+    shutdown_ocr_pool() 후 다시 호출 (워커마다 모델을 다시 로드하므로 자주 바꾸지 말 것)
+    """
+    global _ocr_pool
+    if not EASYOCR_AVAILABLE:
+        return None
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            workers = OCR_WORKERS
+            torch_threads = max(1, (os.cpu_count() or 2) // workers)
+            _ocr_pool = ProcessPoolExecutor(max_workers=workers, initializer=_ocr_worker_init,
+                                            initargs=(torch_threads,))
+            atexit.register(shutdown_ocr_pool)
+        return _ocr_pool
+
+
+def shutdown_ocr_pool():
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown(wait=False, cancel_futures=True)
+            _ocr_pool = None
+
+
 class ThumbnailAnalyzer:
     """썸네일 분석기"""
 
-    def __init__(self):
+    def __init__(self, download_workers: int = DOWNLOAD_WORKERS, verbose: bool = True, prefilter: bool = True):
         self.ocr_reader = None
         self._ocr_loaded = False
+        self.download_workers = download_workers
+        self.verbose = verbose
+        self.prefilter = prefilter
+        self.stats = {'ocr': 0, 'prefilter_skip': 0}   # OCR 실행 / 사전 판별로 생략
+        self._ocr_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _needs_ocr(self, img: np.ndarray) -> bool:
+        """사전 판별 → OCR 필요 여부 (통계 기록)"""
+        needed = not self.prefilter or may_have_text(img)
+        with self._stats_lock:
+            self.stats['ocr' if needed else 'prefilter_skip'] += 1
+        return needed
 
     def _load_ocr(self):
         """OCR 모델 지연 로딩"""
@@ -70,21 +313,16 @@ class ThumbnailAnalyzer:
             print("  OCR 모델 로딩 완료")
 
     def download_image(self, url: str) -> Optional[np.ndarray]:
-        """이미지 다운로드 및 numpy 배열로 변환"""
+        """이미지 다운로드 및 numpy 배열로 변환 (공유 디스크 캐시 → 재분석 시 다시 받지 않음)"""
+        data = get_image_cache().get_bytes(url)
+        if not data:
+            return None
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Referer': 'https://www.bulsaja.com/'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-
             # 바이트를 numpy 배열로 변환
-            img_array = np.frombuffer(response.content, np.uint8)
-            img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-            return img
+            img_array = np.frombuffer(data, np.uint8)
+            return cv2.imdecode(img_array, cv2.IMREAD_COLOR)
         except Exception as e:
-            print(f"    [ERROR] 이미지 다운로드 실패: {e}")
+            print(f"    [ERROR] 이미지 디코딩 실패: {e}")
             return None
 
     def check_nukki(self, img: np.ndarray) -> Tuple[bool, int]:
@@ -172,31 +410,19 @@ class ThumbnailAnalyzer:
         if img is None or not EASYOCR_AVAILABLE:
             return False, 0, 0
 
+        if not self._needs_ocr(img):
+            return text_verdict(0)
+
         self._load_ocr()
         if self.ocr_reader is None:
             return False, 0, 0
 
         try:
-            # BGR to RGB
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            results = self.ocr_reader.readtext(img_rgb)
+            # 배치 분석과 같은 입력 (축소 RGB)
+            results = self.ocr_reader.readtext(prepare_ocr_input(img))
 
             # 신뢰도 0.3 이상인 텍스트만 카운트
-            confident_texts = [r for r in results if r[2] >= 0.3]
-            text_count = len(confident_texts)
-
-            if text_count == 0:
-                # 텍스트 없음 → 좋음
-                return False, 0, 30
-            elif text_count <= 2:
-                # 텍스트 적음 → 약간 감점
-                return True, text_count, 10
-            elif text_count <= 5:
-                # 텍스트 보통 → 감점
-                return True, text_count, -10
-            else:
-                # 텍스트 많음 → 큰 감점
-                return True, text_count, -30
+            return text_verdict(_count_texts(results))
 
         except Exception as e:
             print(f"    [ERROR] OCR 실패: {e}")
@@ -246,12 +472,7 @@ class ThumbnailAnalyzer:
 
         img = self.download_image(url)
         if img is None:
-            return ThumbnailScore(
-                url=url, index=index, total_score=-100,
-                is_nukki=False, nukki_score=0,
-                has_text=False, text_count=0, text_score=0,
-                center_score=0, recommendation="error"
-            )
+            return error_score(url, index)
 
         # 1. 누끼 체크
         is_nukki, nukki_score = self.check_nukki(img)
@@ -265,35 +486,155 @@ class ThumbnailAnalyzer:
         center_score = self.check_center_object(img)
         print(f"      중앙객체: {center_score}점")
 
-        # 총점 계산
-        total_score = nukki_score + text_score + center_score
-        print(f"      총점: {total_score}점")
-
-        # 추천 등급 결정
-        if is_nukki and not has_text:
-            recommendation = "best"  # 누끼 + 텍스트 없음 = 최고
-        elif is_nukki and has_text:
-            recommendation = "needs_translate"  # 누끼 + 텍스트 = 번역 필요
-        elif not is_nukki and not has_text:
-            recommendation = "needs_nukki"  # 배경 있음 + 텍스트 없음 = 누끼 제거 필요
-        elif not is_nukki and has_text and text_count <= 3:
-            recommendation = "needs_both"  # 둘 다 필요
-        else:
-            recommendation = "poor"  # 복잡함
+        score = make_score(url, index, is_nukki, nukki_score, (has_text, text_count, text_score), center_score)
+        print(f"      총점: {score.total_score}점")
+        return score
 
-        return ThumbnailScore(
-            url=url, index=index, total_score=total_score,
-            is_nukki=is_nukki, nukki_score=nukki_score,
-            has_text=has_text, text_count=text_count, text_score=text_score,
-            center_score=center_score, recommendation=recommendation
-        )
+    # ==================== 대량 분석 파이프라인 ====================
+    def _download_and_inspect(self, url: str):
+        """다운로드 스레드: 다운로드 + 가벼운 검사(누끼/중앙/텍스트 사전 판별) + OCR 입력 준비 (원본은 여기서 버림)"""
+        img = self.download_image(url)
+        if img is None:
+            return None
+        is_nukki, nukki_score = self.check_nukki(img)
+        center_score = self.check_center_object(img)
+        if not EASYOCR_AVAILABLE or not self._needs_ocr(img):
+            return is_nukki, nukki_score, center_score, None
+        return is_nukki, nukki_score, center_score, prepare_ocr_input(img)
+
+    def analyze_stream(self, items: Iterable[Tuple[object, int, str]]) -> Iterator[Tuple[object, ThumbnailScore]]:
+        """
+        썸네일 대량 분석 - 끝나는 순서대로 결과 반환
+
+        Args:
+            items: [(key, index, url), ...] - key는 호출측 구분값 (상품 ID 등)
+
+        Yields:
+            (key, ThumbnailScore)
+
+        다운로드는 스레드 풀, OCR은 공유 프로세스 풀에 OCR_BATCH_SIZE장씩 묶어서 보냄
+        동시에 처리 중인 이미지(다운로드 + OCR 대기/진행)는 max_inflight개까지만 → 수천 장이어도 메모리 일정
+        """
+        pool = get_ocr_pool()
+        max_inflight = self.download_workers + OCR_WORKERS * OCR_BATCH_SIZE * 2
+        items = iter(items)
+        downloads = ThreadPoolExecutor(max_workers=self.download_workers)
+        fallback = None    # 프로세스 풀이 죽으면 이 프로세스에서 1스레드로 OCR
+        completed = queue.Queue()
+        pending = {}       # future → ('download', item) / ('ocr', [(item, 검사결과), ...])
+        batch = []
+        downloading = 0
+        inflight = 0       # 아직 결과를 내지 않은 이미지 수
+
+        def track(future, kind, payload):
+            pending[future] = (kind, payload)
+            future.add_done_callback(completed.put)
+
+        def submit_batch():
+            nonlocal pool, fallback
+            entries = batch[:]
+            batch.clear()
+            if pool is not None:
+                try:
+                    track(pool.submit(_ocr_worker_batch, [inspected[3] for _, inspected in entries]), 'ocr', entries)
+                    return
+                except (BrokenProcessPool, RuntimeError):
+                    pool = None
+            if fallback is None:
+                fallback = ThreadPoolExecutor(max_workers=1)
+            track(fallback.submit(self._ocr_in_process, entries), 'ocr', entries)
+
+        def refill():
+            # 처리 중인 이미지가 max_inflight개 미만일 때만 다음 다운로드 시작 (완료될 때마다 보충)
+            nonlocal downloading, inflight
+            while inflight < max_inflight:
+                item = next(items, None)
+                if item is None:
+                    return
+                track(downloads.submit(self._download_and_inspect, item[2]), 'download', item)
+                downloading += 1
+                inflight += 1
+
+        try:
+            refill()
+            while pending:
+                future = completed.get()
+                kind, payload = pending.pop(future)
+                if kind == 'download':
+                    downloading -= 1
+                    key, index, url = payload
+                    inspected = future.result()
+                    if inspected is None:
+                        inflight -= 1
+                        yield key, error_score(url, index)
+                    elif not EASYOCR_AVAILABLE:
+                        # OCR 없음 → 텍스트 검사 없이 바로 결과
+                        inflight -= 1
+                        yield key, make_score(url, index, inspected[0], inspected[1], (False, 0, 0), inspected[2])
+                    elif inspected[3] is None:
+                        # 사전 판별로 텍스트 없음 확정 → OCR 생략
+                        inflight -= 1
+                        yield key, make_score(url, index, inspected[0], inspected[1], text_verdict(0), inspected[2])
+                    else:
+                        batch.append((payload, inspected))
+                    refill()
+                    # 배치가 찼거나, 진행 중인 다운로드가 없으면 덜 찬 배치도 보냄
+                    if len(batch) >= OCR_BATCH_SIZE or (batch and downloading == 0):
+                        submit_batch()
+                    continue
+
+                try:
+                    counts = future.result()
+                except BrokenProcessPool:
+                    pool = None
+                    counts = self._ocr_in_process(payload)
+                inflight -= len(payload)
+                refill()
+                for ((key, index, url), inspected), count in zip(payload, counts):
+                    text = text_verdict(count) if count >= 0 else (False, 0, 0)
+                    score = make_score(url, index, inspected[0], inspected[1], text, inspected[2])
+                    if self.verbose:
+                        print(f"  [{index+1}] 총점 {score.total_score}점 (누끼 {score.nukki_score}, "
+                              f"텍스트 {score.text_count}개, 중앙 {score.center_score})")
+                    yield key, score
+        finally:
+            downloads.shutdown(wait=False, cancel_futures=True)
+            if fallback is not None:
+                fallback.shutdown(wait=False, cancel_futures=True)
+
+    def _ocr_in_process(self, entries) -> List[int]:
+        """프로세스 풀이 죽었을 때 대체 경로 (이 프로세스의 리더로 1장씩)"""
+        counts = []
+        with self._ocr_lock:
+            self._load_ocr()
+            for _, inspected in entries:
+                try:
+                    counts.append(_count_texts(self.ocr_reader.readtext(inspected[3])))
+                except Exception:
+                    counts.append(-1)
+        return counts
+
+    def analyze_products(self, products: Dict[str, List[str]]) -> Iterator[Tuple[str, List[ThumbnailScore]]]:
+        """
+        여러 상품 썸네일 한꺼번에 분석 (상품 경계 없이 배치 OCR)
+
+        Yields:
+            (상품 키, 점수순 정렬된 결과) - 상품의 썸네일이 모두 끝나는 대로
+        """
+        remaining = {key: len(urls) for key, urls in products.items() if urls}
+        collected = {key: [] for key in remaining}
+        items = [(key, i, url) for key, urls in products.items() for i, url in enumerate(urls)]
+        for key, score in self.analyze_stream(items):
+            collected[key].append(score)
+            remaining[key] -= 1
+            if remaining[key] == 0:
+                results = collected.pop(key)
+                results.sort(key=lambda x: x.total_score, reverse=True)
+                yield key, results
 
     def analyze_thumbnails(self, urls: List[str]) -> List[ThumbnailScore]:
         """여러 썸네일 분석 및 순위 매기기"""
-        results = []
-        for i, url in enumerate(urls):
-            result = self.analyze_thumbnail(url, i)
-            results.append(result)
+        results = [score for _, score in self.analyze_stream([(None, i, url) for i, url in enumerate(urls)])]
 
         # 점수순 정렬
         results.sort(key=lambda x: x.total_score, reverse=True)
@@ -309,8 +650,11 @@ class ThumbnailAnalyzer:
             - score_info: 점수 정보
             - action_needed: 필요한 작업 ("none", "translate", "nukki", "both")
         """
-        results = self.analyze_thumbnails(urls)
+        return self.pick_best(self.analyze_thumbnails(urls))
 
+    @staticmethod
+    def pick_best(results: List[ThumbnailScore]) -> Tuple[int, ThumbnailScore, str]:
+        """점수순 정렬된 결과 → (best_index, score_info, action_needed)"""
         if not results:
             return 0, None, "error"
 
@@ -331,6 +675,89 @@ class ThumbnailAnalyzer:
         return best.index, best, action
 
 
+def load_sample_images(source: str) -> List[Tuple[str, np.ndarray]]:
+    """평가용 이미지: 폴더(하위 포함 jpg/png/webp) 또는 URL 목록 파일(한 줄에 1개)"""
+    images = []
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.rglob("*")):
+            if file.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp'):
+                img = cv2.imdecode(np.fromfile(str(file), np.uint8), cv2.IMREAD_COLOR)
+                if img is not None:
+                    images.append((str(file.relative_to(path)), img))
+    else:
+        analyzer = ThumbnailAnalyzer(verbose=False)
+        with open(path, 'r', encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip()]
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            for url, img in zip(urls, pool.map(analyzer.download_image, urls)):
+                if img is not None:
+                    images.append((url, img))
+    return images
+
+
+def evaluate_prefilter(images: List[Tuple[str, np.ndarray]]) -> Dict:
+    """
+    텍스트 사전 판별 정확도 - 현재 OCR 판정(신뢰도 0.3 이상 텍스트 1개 이상)을 정답으로
+
+    - recall: OCR이 텍스트를 찾은 이미지 중 사전 판별이 OCR로 보낸 비율 (낮으면 텍스트를 놓침)
+    - precision: 사전 판별이 OCR로 보낸 이미지 중 실제 텍스트가 있던 비율 (낮으면 OCR 절약이 적음)
+    """
+    analyzer = ThumbnailAnalyzer(verbose=False, prefilter=False)
+    analyzer._load_ocr()
+    tp = fp = fn = tn = 0
+    prefilter_time = ocr_time = ocr_time_flagged = 0.0
+    missed = []
+    for name, img in images:
+        started = time.perf_counter()
+        flagged = may_have_text(img)
+        prefilter_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        has_text = _count_texts(analyzer.ocr_reader.readtext(prepare_ocr_input(img))) > 0
+        elapsed = time.perf_counter() - started
+        ocr_time += elapsed
+        if flagged:
+            ocr_time_flagged += elapsed
+
+        if has_text and flagged:
+            tp += 1
+        elif has_text:
+            fn += 1
+            missed.append(name)
+        elif flagged:
+            fp += 1
+        else:
+            tn += 1
+
+    total = len(images)
+    with_prefilter = prefilter_time + ocr_time_flagged
+    return {
+        'images': total, 'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+        'precision': tp / (tp + fp) if tp + fp else 1.0,
+        'recall': tp / (tp + fn) if tp + fn else 1.0,
+        'skip_rate': (tn + fn) / total if total else 0.0,
+        'prefilter_ms': prefilter_time / total * 1000 if total else 0.0,
+        'ocr_ms': ocr_time / total * 1000 if total else 0.0,
+        'speedup': ocr_time / with_prefilter if with_prefilter else 0.0,
+        'missed': missed,
+    }
+
+
+def print_prefilter_report(report: Dict):
+    print("=" * 60)
+    print("텍스트 사전 판별 평가 (기준: 현재 OCR 판정)")
+    print("=" * 60)
+    print(f"이미지: {report['images']}개  (TP {report['tp']} / FP {report['fp']} / FN {report['fn']} / TN {report['tn']})")
+    print(f"recall: {report['recall']:.1%}  (텍스트 있는 이미지를 OCR로 보낸 비율)")
+    print(f"precision: {report['precision']:.1%}  (OCR로 보낸 이미지 중 텍스트 있던 비율)")
+    print(f"OCR 생략: {report['skip_rate']:.1%}")
+    print(f"이미지당: 사전 판별 {report['prefilter_ms']:.1f}ms / OCR {report['ocr_ms']:.0f}ms "
+          f"→ 텍스트 검사 {report['speedup']:.1f}배 빠름")
+    for name in report['missed']:
+        print(f"  놓침: {name}")
+
+
 def load_tokens() -> Tuple[str, str]:
     """토큰 로드"""
     config_file = Path(__file__).parent / "bulsaja_uploader_config.json"
@@ -346,6 +773,17 @@ def main():
         print("opencv-python이 필요합니다: pip install opencv-python pillow")
         return
 
+    if len(sys.argv) > 2 and sys.argv[1] == '--eval-prefilter':
+        if not EASYOCR_AVAILABLE:
+            print("easyocr가 필요합니다 (정답 = OCR 판정): pip install easyocr")
+            return
+        images = load_sample_images(sys.argv[2])
+        if not images:
+            print(f"[ERROR] 이미지 없음: {sys.argv[2]}")
+            return
+        print_prefilter_report(evaluate_prefilter(images))
+        return
+
     # 상품 ID
     product_id = sys.argv[1] if len(sys.argv) > 1 else "U01KF9YZQN29TCSFKVX11CQ2FQ7"
 
@@ -18,7 +18,7 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 # ================= 11번가 API 설정 =================
-BASE_URL = "http://api.11st.co.kr"
+BASE_URL = os.environ.get("ELEVENST_API_HOST", "http://api.11st.co.kr")  # 목 서버 벤치마크 시 교체
 MULTI_SEARCH_PATH = "/rest/prodmarketservice/prodmarket"
 STOP_PATH = "/rest/prodstatservice/stat/stopdisplay"
 START_PATH = "/rest/prodstatservice/stat/startdisplay"
@@ -92,7 +92,7 @@ def aio_log(msg: str):
 
 
 # ================= 상수/엔드포인트 =================
-API_HOST = "https://api.commerce.naver.com"
+API_HOST = os.environ.get("NAVER_COMMERCE_API_HOST", "https://api.commerce.naver.com")  # 목 서버 벤치마크 시 교체
 TOKEN_URL = f"{API_HOST}/external/v1/oauth2/token"
 SEARCH_URL = f"{API_HOST}/external/v1/products/search"
 ORIGIN_DELETE_URL_V2 = f"{API_HOST}/external/v2/products/origin-products"
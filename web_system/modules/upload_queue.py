@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업로드 작업 분배 큐 (리스 기반 + 작업 훔치기)
+- 작업(job) = 그룹 상품 ID 목록 → 청크(chunk)로 나눠서 대기열에 넣음
+- 클라이언트가 청크를 가져가면(claim) 일정 시간 리스(lease) 부여
+- 하트비트로 리스 연장 + 완료된 상품 보고
+- 리스 만료(클라이언트 죽음/연결 끊김) → 남은 상품은 다시 대기열로
+- 대기열이 비었는데 놀고 있는 클라이언트 → 가장 많이 남은 청크의 뒤쪽 절반을 가져감
+  (원래 클라이언트는 다음 하트비트 응답에서 줄어든 목록을 받음)
+"""
+
+import time
+import uuid
+import threading
+from typing import Dict, List, Optional
+
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_LEASE_SECONDS = 120    # 하트비트 없이 이 시간이 지나면 리스 만료
+MIN_STEAL_SIZE = 4             # 남은 상품이 이보다 적으면 훔치지 않음 (왕복 비용이 더 큼)
+
+
+class UploadWorkQueue:
+    """업로드 작업 큐 (스레드 안전, 서버 프로세스 메모리)"""
+
+    def __init__(self, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.lease_seconds = lease_seconds
+        self.jobs: Dict[str, Dict] = {}
+        self.chunks: Dict[str, Dict] = {}
+        self.pending: List[str] = []   # 대기 청크 ID (앞에서부터 배정)
+        self.chunk_jobs: Dict[str, str] = {}   # chunk_id → job_id (회수된 청크의 늦은 보고용)
+        self._lock = threading.Lock()
+
+    # ---------- 작업 생성/취소 ----------
+
+    def create_job(self, group_name: str, product_ids: List[str], market_name: str = "",
+                   settings: Dict = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """상품 ID 목록 → 청크로 나눠서 대기열에 추가"""
+        product_ids = list(dict.fromkeys(str(pid) for pid in product_ids if pid))
+        chunk_size = max(1, int(chunk_size or DEFAULT_CHUNK_SIZE))
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'job_id': job_id,
+            'group_name': group_name,
+            'market_name': market_name,
+            'settings': settings or {},
+            'total': len(product_ids),
+            'results': {},          # {product_id: status}
+            'created_at': time.time(),
+            'finished_at': None,
+            'cancelled': False,
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+            for i in range(0, len(product_ids), chunk_size):
+                self._add_chunk(job_id, product_ids[i:i + chunk_size])
+            if not product_ids:
+                job['finished_at'] = time.time()
+        return self._job_summary(job)
+
+    def _add_chunk(self, job_id: str, product_ids: List[str], front: bool = False) -> str:
+        chunk_id = uuid.uuid4().hex[:12]
+        self.chunk_jobs[chunk_id] = job_id
+        self.chunks[chunk_id] = {
+            'chunk_id': chunk_id,
+            'job_id': job_id,
+            'product_ids': list(product_ids),   # 이 청크에 남은(미완료) 상품
+            'client_id': None,
+            'lease_expires': 0,
+        }
+        if front:
+            self.pending.insert(0, chunk_id)    # 만료로 돌아온 작업은 먼저 배정
+        else:
+            self.pending.append(chunk_id)
+        return chunk_id
+
+    def cancel_job(self, job_id: str) -> bool:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return False
+            job['cancelled'] = True
+            for chunk_id in [c for c, chunk in self.chunks.items() if chunk['job_id'] == job_id]:
+                self.chunks.pop(chunk_id, None)
+            self.pending = [c for c in self.pending if c in self.chunks]
+            job['finished_at'] = job['finished_at'] or time.time()
+            return True
+
+    # ---------- 클라이언트 ----------
+
+    def claim(self, client_id: str) -> Optional[Dict]:
+        """청크 배정 (대기열 → 없으면 다른 클라이언트 작업 훔치기)"""
+        now = time.time()
+        with self._lock:
+            self._reap_expired(now)
+
+            chunk = None
+            while self.pending and chunk is None:
+                chunk = self.chunks.get(self.pending.pop(0))
+            stolen = False
+            if chunk is None:
+                chunk = self._steal(client_id)
+                stolen = chunk is not None
+            if chunk is None:
+                return None
+
+            chunk['client_id'] = client_id
+            chunk['lease_expires'] = now + self.lease_seconds
+            return self._chunk_payload(chunk, stolen=stolen)
+
+    def _steal(self, client_id: str) -> Optional[Dict]:
+        """가장 많이 남은 리스 청크의 뒤쪽 절반을 새 청크로 분리"""
+        victims = [c for c in self.chunks.values()
+                   if c['client_id'] and c['client_id'] != client_id
+                   and len(c['product_ids']) >= MIN_STEAL_SIZE]
+        if not victims:
+            return None
+        victim = max(victims, key=lambda c: len(c['product_ids']))
+        half = len(victim['product_ids']) // 2
+        stolen_ids = victim['product_ids'][-half:]
+        victim['product_ids'] = victim['product_ids'][:-half]
+        chunk_id = self._add_chunk(victim['job_id'], stolen_ids)
+        self.pending.remove(chunk_id)
+        return self.chunks[chunk_id]
+
+    def heartbeat(self, client_id: str, chunk_id: str, done: Dict[str, str] = None) -> Dict:
+        """
+        리스 연장 + 진행 보고
+
+        Args:
+            done: {product_id: status} 이번 하트비트까지 끝난 상품
+
+        Returns:
+            {'ok', 'product_ids': 아직 이 클라이언트 몫인 상품 (훔쳐간 상품 제외),
+             'cancelled': 작업 취소 여부}
+        """
+        now = time.time()
+        with self._lock:
+            self._record_done(chunk_id, done)
+            chunk = self.chunks.get(chunk_id)
+            if not chunk or chunk['client_id'] != client_id:
+                # 리스 만료로 회수됨 (또는 작업 취소) → 클라이언트는 이 청크 중단
+                return {'ok': False, 'product_ids': [], 'cancelled': True}
+            chunk['lease_expires'] = now + self.lease_seconds
+            job = self.jobs.get(chunk['job_id'], {})
+            return {'ok': True, 'product_ids': list(chunk['product_ids']),
+                    'cancelled': job.get('cancelled', False),
+                    'lease_expires': chunk['lease_expires']}
+
+    def complete(self, client_id: str, chunk_id: str, done: Dict[str, str] = None) -> Dict:
+        """청크 완료 보고 (남은 상품이 있으면 대기열로 반환)"""
+        with self._lock:
+            self._record_done(chunk_id, done)
+            chunk = self.chunks.get(chunk_id)
+            if chunk and chunk['client_id'] == client_id:
+                self.chunks.pop(chunk_id)
+                if chunk['product_ids']:
+                    # 처리 못 하고 돌려준 상품 → 다른 클라이언트가 가져가도록
+                    self._add_chunk(chunk['job_id'], chunk['product_ids'], front=True)
+                self._check_job_finished(chunk['job_id'])
+            return {'ok': True}
+
+    # ---------- 내부 ----------
+
+    def _record_done(self, chunk_id: str, done: Dict[str, str]):
+        if not done:
+            return
+        # 이미 회수된 청크라도 결과는 기록 (다시 배정된 쪽에서 중복 처리 방지)
+        job_id = self.chunk_jobs.get(chunk_id)
+        job = self.jobs.get(job_id) if job_id else None
+        if job is None:
+            return
+        job['results'].update(done)
+        for chunk in self.chunks.values():
+            if chunk['job_id'] == job_id:
+                chunk['product_ids'] = [pid for pid in chunk['product_ids'] if pid not in done]
+        self._check_job_finished(job_id)
+
+    def _reap_expired(self, now: float):
+        """리스 만료 청크 → 남은 상품 대기열로"""
+        for chunk in list(self.chunks.values()):
+            if chunk['client_id'] and chunk['lease_expires'] < now:
+                self.chunks.pop(chunk['chunk_id'])
+                if chunk['product_ids']:
+                    self._add_chunk(chunk['job_id'], chunk['product_ids'], front=True)
+
+    def _check_job_finished(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if not job or job['finished_at']:
+            return
+        remaining = any(c['product_ids'] for c in self.chunks.values() if c['job_id'] == job_id)
+        if not remaining:
+            job['finished_at'] = time.time()
+            for chunk_id in [c for c, chunk in self.chunks.items() if chunk['job_id'] == job_id]:
+                self.chunks.pop(chunk_id, None)
+            self.pending = [c for c in self.pending if c in self.chunks]
+
+    def _chunk_payload(self, chunk: Dict, stolen: bool = False) -> Dict:
+        job = self.jobs[chunk['job_id']]
+        return {
+            'job_id': job['job_id'],
+            'chunk_id': chunk['chunk_id'],
+            'group_name': job['group_name'],
+            'market_name': job['market_name'],
+            'settings': job['settings'],
+            'product_ids': list(chunk['product_ids']),
+            'lease_seconds': self.lease_seconds,
+            'stolen': stolen,
+        }
+
+    def _job_summary(self, job: Dict) -> Dict:
+        chunks = [c for c in self.chunks.values() if c['job_id'] == job['job_id']]
+        results = job['results']
+        elapsed_end = job['finished_at'] or time.time()
+        return {
+            'job_id': job['job_id'],
+            'group_name': job['group_name'],
+            'market_name': job['market_name'],
+            'total': job['total'],
+            'done': len(results),
+            'success': sum(1 for s in results.values() if s == 'success'),
+            'failed': sum(1 for s in results.values() if s not in ('success', 'skipped')),
+            'pending_chunks': sum(1 for c in chunks if not c['client_id']),
+            'leased_chunks': sum(1 for c in chunks if c['client_id']),
+            'clients': sorted({c['client_id'] for c in chunks if c['client_id']}),
+            'elapsed': round(elapsed_end - job['created_at'], 1),
+            'finished': job['finished_at'] is not None,
+            'cancelled': job['cancelled'],
+        }
+
+    def status(self, job_id: str = None) -> List[Dict]:
+        with self._lock:
+            self._reap_expired(time.time())
+            jobs = [self.jobs[job_id]] if job_id in self.jobs else \
+                ([] if job_id else list(self.jobs.values()))
+            return [self._job_summary(job) for job in jobs]
@@ -45,6 +45,7 @@ from apscheduler.triggers.cron import CronTrigger
 from modules.delivery_check import DeliveryChecker
 from modules.ali_tracking import AliTrackingCollector
 from modules.daily_sync import DailyJournalSyncer
+from modules.upload_queue import UploadWorkQueue
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.jobstores.memory import MemoryJobStore
 
@@ -59,6 +60,28 @@ from playwright.async_api import async_playwright, Page, BrowserContext
 # ========== 설정 ==========
 APP_DIR = Path(__file__).resolve().parent
 
+# 공유 이미지 디스크 캐시 (상위 폴더 bulsaja_common - 없으면 aiohttp로 직접 다운로드)
+# 폴더는 서버 작업 폴더가 아니라 프로젝트 루트 기준 → 데스크톱 도구와 같은 캐시 사용
+sys.path.append(str(APP_DIR.parent))
+try:
+    from bulsaja_common import ImageDiskCache
+    IMAGE_DISK_CACHE_AVAILABLE = True
+except ImportError:
+    IMAGE_DISK_CACHE_AVAILABLE = False
+IMAGE_DISK_CACHE_PATH = APP_DIR.parent / "image_cache"
+_image_disk_cache = None
+_image_disk_cache_lock = threading.Lock()
+
+
+def get_image_disk_cache() -> "ImageDiskCache":
+    """공유 이미지 캐시 (IMAGE_DISK_CACHE_PATH, 처음 쓸 때 생성)"""
+    global _image_disk_cache
+    if _image_disk_cache is None:
+        with _image_disk_cache_lock:
+            if _image_disk_cache is None:
+                _image_disk_cache = ImageDiskCache(str(IMAGE_DISK_CACHE_PATH))
+    return _image_disk_cache
+
 # .env 파일 로드 (현재 폴더 또는 상위 폴더)
 env_path = APP_DIR / ".env"
 if not env_path.exists():
@@ -1322,6 +1345,17 @@ class SMSBrowserManager:
             return self.image_cache[sender].get(element_idx)
         return None
     
+    async def _fetch_http_image(self, src: str) -> Optional[bytes]:
+        """HTTP 이미지 바이트 (공유 디스크 캐시 → 없으면 aiohttp로 직접 다운로드)"""
+        if IMAGE_DISK_CACHE_AVAILABLE:
+            return await asyncio.get_running_loop().run_in_executor(None, get_image_disk_cache().get_bytes, src)
+        import aiohttp
+        async with aiohttp.ClientSession() as session:
+            async with session.get(src, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status == 200:
+                    return await resp.read()
+        return None
+    
     async def init_playwright(self):
         """Playwright 초기화 (async)"""
         if self.playwright is None:
@@ -2420,21 +2454,19 @@ class SMSBrowserManager:
                             print(f"[{profile_id}] 썸네일 src: {src[:80] if src else 'None'}...")
                             
                             if src and src.startswith('http'):
-                                # HTTP URL이면 직접 다운로드
-                                import aiohttp
-                                async with aiohttp.ClientSession() as session:
-                                    async with session.get(src, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                                        if resp.status == 200:
-                                            ext = 'jpg' if 'jpeg' in resp.content_type or 'jpg' in resp.content_type else 'png'
-                                            filename = f"thumb_{element_idx}_{int(datetime.now().timestamp())}.{ext}"
-                                            filepath = download_dir / filename
-                                            with open(filepath, 'wb') as f:
-                                                f.write(await resp.read())
-                                            print(f"[{profile_id}] 썸네일 HTTP 다운로드 성공")
-                                            result_path = f"/downloads/{profile_id}/{filename}"
-                                            if sender:
-                                                self._add_to_image_cache(sender, f"thumb_{element_idx}", result_path)
-                                            return result_path
+                                # HTTP URL이면 직접 다운로드 (공유 디스크 캐시 → 서버 재시작 후에도 같은 src는 재다운로드 없음)
+                                data = await self._fetch_http_image(src)
+                                if data:
+                                    ext = 'png' if data[:4] == b'\x89PNG' else 'jpg'
+                                    filename = f"thumb_{element_idx}_{int(datetime.now().timestamp())}.{ext}"
+                                    filepath = download_dir / filename
+                                    with open(filepath, 'wb') as f:
+                                        f.write(data)
+                                    print(f"[{profile_id}] 썸네일 HTTP 다운로드 성공")
+                                    result_path = f"/downloads/{profile_id}/{filename}"
+                                    if sender:
+                                        self._add_to_image_cache(sender, f"thumb_{element_idx}", result_path)
+                                    return result_path
                             
                             elif src and src.startswith('blob:'):
                                 # blob URL은 JavaScript로 fetch
@@ -3158,6 +3190,7 @@ gsheet = GoogleSheetManager()
 sms_manager = SMSBrowserManager()
 ws_manager = ConnectionManager()
 bulsaja_manager = BulsajaManager()
+upload_queue = UploadWorkQueue()
 
 # ========== FastAPI 앱 ==========
 @asynccontextmanager
@@ -9172,6 +9205,64 @@ async def download_client_legacy():
     raise HTTPException(status_code=404, detail="클라이언트 파일 없음. 관리자에게 문의하세요.")
 
 
+# ========== 업로드 작업 분배 API (여러 PC가 청크 단위로 가져감) ==========
+class UploadJobRequest(BaseModel):
+    group_name: str
+    product_ids: List[str]
+    market_name: str = ""
+    settings: Dict = {}
+    chunk_size: int = 50
+
+class UploadClaimRequest(BaseModel):
+    client_id: str
+
+class UploadChunkReport(BaseModel):
+    client_id: str
+    chunk_id: str
+    done: Dict[str, str] = {}   # {product_id: status}
+
+@app.post("/api/upload-queue/jobs")
+async def create_upload_job(request: Request, req: UploadJobRequest):
+    """업로드 작업 등록 - 상품 ID 목록을 청크로 나눠서 대기열에 추가"""
+    get_current_user(request)
+    job = upload_queue.create_job(req.group_name, req.product_ids, req.market_name,
+                                  req.settings, req.chunk_size)
+    return {"success": True, "job": job}
+
+@app.post("/api/upload-queue/jobs/{job_id}/cancel")
+async def cancel_upload_job(request: Request, job_id: str):
+    """업로드 작업 취소 (처리 중인 클라이언트는 다음 하트비트에서 중단)"""
+    get_current_user(request)
+    return {"success": upload_queue.cancel_job(job_id)}
+
+@app.get("/api/upload-queue/status")
+async def get_upload_queue_status(request: Request, job_id: Optional[str] = None):
+    """업로드 작업 진행 상황"""
+    get_current_user(request)
+    return {"success": True, "jobs": upload_queue.status(job_id)}
+
+@app.post("/api/upload-queue/claim")
+async def claim_upload_chunk(request: Request, req: UploadClaimRequest):
+    """클라이언트가 처리할 청크 가져가기 (없으면 다른 클라이언트 작업 일부를 가져감)"""
+    get_current_user(request)
+    chunk = upload_queue.claim(req.client_id)
+    if not chunk:
+        return {"success": True, "chunk": None}
+    return {"success": True, "chunk": chunk}
+
+@app.post("/api/upload-queue/heartbeat")
+async def upload_chunk_heartbeat(request: Request, req: UploadChunkReport):
+    """리스 연장 + 완료 상품 보고 → 아직 이 클라이언트 몫인 상품 목록 반환"""
+    get_current_user(request)
+    return upload_queue.heartbeat(req.client_id, req.chunk_id, req.done)
+
+@app.post("/api/upload-queue/complete")
+async def complete_upload_chunk(request: Request, req: UploadChunkReport):
+    """청크 완료 보고 (남은 상품은 대기열로 반환)"""
+    get_current_user(request)
+    return upload_queue.complete(req.client_id, req.chunk_id, req.done)
+
+
 # ========== 11번가 API 상품수 조회 ==========
 import xml.etree.ElementTree as ET
 